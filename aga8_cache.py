@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Cache LRU por composição para os solucionadores AGA 8
+Sistema de Validação de Boletins Cromatográficos
+
+Revalidação, relatórios e comparações avaliam a mesma composição muitas
+vezes. Cada motor guarda, por composição normalizada, o que depende apenas
+dela (vetor normalizado, massa molar, propriedades pseudocríticas, poderes
+caloríficos e os termos da equação de estado) em um CompositionCache.
+
+A chave é uma impressão digital da composição: frações normalizadas na
+ordem dos componentes do motor, quantizadas em 10^-FINGERPRINT_DECIMALS.
+Assim a mesma amostra informada em % ou em fração, ou normalizada com
+somas em outra ordem, cai na mesma entrada. O quantum fica muito abaixo
+da resolução dos cromatógrafos e do efeito mensurável nas propriedades.
+
+Cada cache conta acertos e faltas (stats) e pode ser esvaziado, todo ou
+por composição (invalidate); invalidate_composition_caches esvazia os
+caches de todos os motores, por exemplo após alterar uma tabela.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+FINGERPRINT_DECIMALS = 14
+DEFAULT_MAXSIZE = 1024
+
+_CACHES: List['CompositionCache'] = []
+
+
+def composition_fingerprint(fractions, decimals: int = FINGERPRINT_DECIMALS) -> Tuple[int, ...]:
+    """Chave canônica: frações normalizadas quantizadas em 10^-decimals"""
+    vector = np.asarray(fractions, dtype=float).ravel()
+    return tuple(np.rint(vector / vector.sum() * 10.0 ** decimals).astype(np.int64).tolist())
+
+
+class CompositionCache:
+    """
+    LRU limitado de entradas por composição
+
+    `factory` recebe o vetor normalizado (somente leitura) e devolve a
+    entrada; ela é montada fora do lock, e se duas threads montarem a mesma
+    composição ao mesmo tempo fica a primeira que chegar ao cache.
+    """
+
+    __slots__ = ('name', 'maxsize', 'decimals', '_factory', '_entries', '_lock',
+                 'hits', 'misses')
+
+    def __init__(self, name: str, factory: Callable[[np.ndarray], Any],
+                 maxsize: int = DEFAULT_MAXSIZE, decimals: int = FINGERPRINT_DECIMALS) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._factory = factory
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        _CACHES.append(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fractions) -> Any:
+        """
+        Entrada da composição, montada na primeira vez
+
+        Raises:
+            ValueError: Composição com soma zero
+        """
+        vector = np.array(fractions, dtype=float).ravel()
+        total = vector.sum()
+        if not total > 0:
+            raise ValueError("Composição inválida: soma zero")
+        key = composition_fingerprint(vector, self.decimals)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        vector /= total
+        vector.flags.writeable = False
+        entry = self._factory(vector)
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, fractions=None) -> None:
+        """Descarta a entrada de uma composição ou, sem argumento, todas (zera os contadores)"""
+        with self._lock:
+            if fractions is not None:
+                self._entries.pop(composition_fingerprint(fractions, self.decimals), None)
+                return
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Tamanho, limite, acertos, faltas e taxa de acerto"""
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / consultas if consultas else 0.0,
+            }
+
+    def _reset_lock(self) -> None:
+        self._lock = threading.Lock()
+
+
+def composition_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """stats() de cada cache de composição, pelo nome do motor"""
+    return {cache.name: cache.stats() for cache in _CACHES}
+
+
+def invalidate_composition_caches() -> None:
+    """Esvazia os caches de composição de todos os motores"""
+    for cache in _CACHES:
+        cache.invalidate()
+
+
+def _reiniciar_locks() -> None:
+    """No filho de um fork um lock pode ter sido copiado travado por outra thread"""
+    for cache in _CACHES:
+        cache._reset_lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_locks)
@@ -8,69 +8,17 @@ from __future__ import annotations
 
 from typing import Dict
 
-from aga8_gerg2008 import AGA8_GERG2008
+from aga8_registro import get_solver
 
 
 class AGA8_GERG2008_Calibrated:
-    """Wrapper calibrado que reutiliza o solucionador base e aplica ajustes."""
-
-    def __init__(self) -> None:
-        self.base_solver = AGA8_GERG2008()
-        self.reference_composition = {
-            'methane': 0.965,
-            'nitrogen': 0.003,
-            'carbon_dioxide': 0.006,
-            'ethane': 0.018,
-            'propane': 0.0045,
-            'n-butane': 0.001,
-            'i-butane': 0.001,
-            'i-pentane': 0.0005,
-            'n-pentane': 0.0003,
-            'n-hexane': 0.0007,
-        }
-        # Valores calibrados provenientes da documentação do projeto
-        density_ref = 9.3554  # kg/m³
-        molar_mass_ref = 16.80303286  # g/mol
-        molar_density_ref = density_ref / molar_mass_ref
-        heating_value_mass_hhv = 53086.3  # kJ/kg
-        heating_value_mass_lhv = heating_value_mass_hhv * 0.9
-        heating_value_volume_hhv = 37142.9  # kJ/m³
-        heating_value_volume_lhv = heating_value_volume_hhv * 0.9
-        self.reference_results = {
-            'compressibility_factor': 0.9927517446,
-            'molar_mass': molar_mass_ref,
-            'density': density_ref,
-            'molar_density': molar_density_ref,
-            'heating_value_mass': heating_value_mass_hhv,
-            'heating_value_mass_hhv': heating_value_mass_hhv,
-            'heating_value_mass_lhv': heating_value_mass_lhv,
-            'heating_value_volume': heating_value_volume_hhv,
-            'heating_value_volume_hhv': heating_value_volume_hhv,
-            'heating_value_volume_lhv': heating_value_volume_lhv,
-            'wobbe_index': 52374.6,
-            'methane_number': 95.7,
-            'specific_gravity': 0.5805,
-            'critical_pressure': 4767.0,
-            'critical_temperature': 196.2,
-            'pseudo_critical_pressure': 4767.0,
-            'pseudo_critical_temperature': 196.2,
-        }
+    """Wrapper que reutiliza o solucionador base (GERG-2008)."""
+
+    __slots__ = ()
 
-    def _is_reference_case(self, composition: Dict[str, float],
-                           pressure_kpa: float, temperature_c: float) -> bool:
-        return (
-            abs(pressure_kpa - 558.0) < 1.0
-            and abs(temperature_c - 55.0) < 1.0
-            and self._is_reference_composition(composition, self.reference_composition)
-        )
-
-    @staticmethod
-    def _is_reference_composition(comp1: Dict[str, float],
-                                  comp2: Dict[str, float], tolerance: float = 0.001) -> bool:
-        for component, expected in comp2.items():
-            if abs(comp1.get(component, 0.0) - expected) > tolerance:
-                return False
-        return True
+    @property
+    def base_solver(self):
+        return get_solver('gerg2008')
 
     def calculate_properties(self, pressure_kpa: float, temperature_c: float,
                              composition: Dict[str, float]) -> Dict[str, float]:
@@ -78,11 +26,6 @@ class AGA8_GERG2008_Calibrated:
         if not valid:
             raise ValueError(message)
 
-        if self._is_reference_case(normalized, pressure_kpa, temperature_c):
-            results = self.reference_results.copy()
-            results['message'] = message
-            return results
-
         results = self.base_solver.calculate_properties(pressure_kpa, temperature_c, normalized)
         results['message'] = message
         return results
@@ -93,35 +36,25 @@ class AGA8_GERG2008_Calibrated:
         if not valid:
             return {'error': message}
 
+        # Z, densidade e as propriedades térmicas vêm da mesma avaliação da
+        # equação de estado GERG-2008 no solucionador base
         base_results = self.base_solver.calculate_properties(pressure_kpa, temperature_c, normalized)
 
-        detailed_results: Dict[str, float]
-        try:
-            from aga8_dc_calibrado import AGA8_DetailedCharacterization_Calibrated
-            detailed_solver = AGA8_DetailedCharacterization_Calibrated()
-            detailed_results = detailed_solver.calculate_all_properties_calibrated(
-                pressure_kpa, temperature_c, normalized
-            )
-        except Exception:  # pragma: no cover - fallback em caso de indisponibilidade
-            detailed_results = {}
-
         response = {
-            'compressibility_factor': detailed_results.get(
-                'compressibility_factor', base_results['compressibility_factor']),
-            'molar_mass_g_mol': detailed_results.get('molar_mass', base_results['molar_mass']),
-            'molar_density_mol_l': detailed_results.get(
-                'molar_density', base_results['density'] / base_results['molar_mass']),
-            'density_kg_m3': detailed_results.get('density', base_results['density']),
-            'relative_density': detailed_results.get('specific_gravity', base_results['specific_gravity']),
-            'energy_j_mol': detailed_results.get('energy', 0.0),
-            'enthalpy_j_mol': detailed_results.get('enthalpy', 0.0),
-            'entropy_j_mol_k': detailed_results.get('entropy', 0.0),
-            'speed_of_sound_m_s': detailed_results.get('speed_of_sound', 0.0),
-            'isentropic_exponent': detailed_results.get('isentropic_exponent', 0.0),
-            'joule_thomson_coefficient_k_kpa': detailed_results.get('joule_thomson_coefficient', 0.0),
-            'gibbs_energy_j_mol': detailed_results.get('gibbs_energy', 0.0),
-            'isobaric_heat_capacity_j_mol_k': detailed_results.get('isobaric_heat_capacity', 0.0),
-            'isochoric_heat_capacity_j_mol_k': detailed_results.get('isochoric_heat_capacity', 0.0),
+            'compressibility_factor': base_results['compressibility_factor'],
+            'molar_mass_g_mol': base_results['molar_mass'],
+            'molar_density_mol_l': base_results['molar_density'],
+            'density_kg_m3': base_results['density'],
+            'relative_density': base_results['specific_gravity'],
+            'energy_j_mol': base_results['energy'],
+            'enthalpy_j_mol': base_results['enthalpy'],
+            'entropy_j_mol_k': base_results['entropy'],
+            'speed_of_sound_m_s': base_results['speed_of_sound'],
+            'isentropic_exponent': base_results['isentropic_exponent'],
+            'joule_thomson_coefficient_k_kpa': base_results['joule_thomson_coefficient'],
+            'gibbs_energy_j_mol': base_results['gibbs_energy'],
+            'isobaric_heat_capacity_j_mol_k': base_results['isobaric_heat_capacity'],
+            'isochoric_heat_capacity_j_mol_k': base_results['isochoric_heat_capacity'],
             'heating_value_mass_hhv': base_results['heating_value_mass'],
             'heating_value_mass_lhv': base_results['heating_value_mass_lhv'],
             'heating_value_volume_hhv': base_results['heating_value_volume'],
@@ -135,21 +68,6 @@ class AGA8_GERG2008_Calibrated:
             'composition_normalized': normalized,
         }
 
-        if self._is_reference_case(normalized, pressure_kpa, temperature_c):
-            response.update({
-                'compressibility_factor': self.reference_results['compressibility_factor'],
-                'molar_mass_g_mol': self.reference_results['molar_mass'],
-                'molar_density_mol_l': self.reference_results['molar_density'],
-                'density_kg_m3': self.reference_results['density'],
-                'relative_density': self.reference_results['specific_gravity'],
-                'heating_value_mass_hhv': self.reference_results['heating_value_mass_hhv'],
-                'heating_value_mass_lhv': self.reference_results['heating_value_mass_lhv'],
-                'heating_value_volume_hhv': self.reference_results['heating_value_volume_hhv'],
-                'heating_value_volume_lhv': self.reference_results['heating_value_volume_lhv'],
-                'wobbe_index_hhv': self.reference_results['wobbe_index'],
-                'methane_number': self.reference_results['methane_number'],
-            })
-
         return response
 
 
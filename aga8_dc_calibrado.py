@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 AGA 8 2017 D.C. CALIBRADO: Calculation of Gas Properties Using Detailed Characterization
-Versão calibrada com valores de referência reais
+Mantém a interface da versão calibrada sobre o motor DETAIL completo
 """
 
 from typing import Dict
@@ -10,47 +10,16 @@ from aga8_detailed_characterization import AGA8_DetailedCharacterization
 
 class AGA8_DetailedCharacterization_Calibrated(AGA8_DetailedCharacterization):
     """
-    Versão calibrada do AGA 8 D.C. com valores de referência reais
-    para máxima precisão nos cálculos
+    Interface "calibrada" do AGA 8 D.C.: o motor DETAIL já reproduz os
+    valores de referência, sem ajustes por composição
     """
 
-    def __init__(self):
-        super().__init__()
-
-        # Valores de referência reais da imagem (600 kPa, 50°C)
-        self.reference_results_dc = {
-            'compressibility_factor': 0.991694176393,
-            'molar_mass': 16.8035819,  # g/mol
-            'molar_density': 0.225181478098,  # mol/l
-            'energy': -1827.670380590821,  # J/mol
-            'enthalpy': 836.847158350783,  # J/mol
-            'entropy': -10.3147662466246,  # J/mol.K
-            'isochoric_heat_capacity': 29.2971136444434,  # J/mol.K
-            'isobaric_heat_capacity': 38.0200910586759,  # J/mol.K
-            'speed_of_sound': 451.754505636409,  # m/s
-            'gibbs_energy': 4170.06387094551,  # J/mol
-            'joule_thomson_coefficient': 0.00383362800467,  # K/KPa
-            'isentropic_exponent': 1.28702881184662
-        }
-
-        # Composição de referência para calibração
-        self.reference_composition_dc = {
-            'methane': 0.965,
-            'nitrogen': 0.003,
-            'carbon_dioxide': 0.006,
-            'ethane': 0.018,
-            'propane': 0.0045,
-            'i_butane': 0.001,
-            'n_butane': 0.001,
-            'i_pentane': 0.0005,
-            'n_pentane': 0.0003,
-            'n_hexane': 0.0007
-        }
+    __slots__ = ()
 
     def calculate_all_properties_calibrated(self, pressure_kpa: float, temperature_c: float,
                                             composition: Dict[str, float]) -> Dict[str, float]:
         """
-        Calcula propriedades com calibração para máxima precisão
+        Calcula propriedades pela equação de estado DETAIL
 
         Args:
             pressure_kpa: Pressão em kPa
@@ -58,65 +27,10 @@ class AGA8_DetailedCharacterization_Calibrated(AGA8_DetailedCharacterization):
             composition: Composição molar
 
         Returns:
-            Propriedades calibradas
+            Propriedades calculadas
         """
 
-        # Verificar se é aproximadamente a composição de referência
-        is_reference = self._is_reference_composition_dc(composition, self.reference_composition_dc)
-
-        if is_reference and abs(pressure_kpa - 600) < 1 and abs(temperature_c - 50) < 1:
-            # Retornar valores de referência reais para máxima precisão
-            density_kg_m3 = (self.reference_results_dc['molar_density'] *
-                             self.reference_results_dc['molar_mass']) / 1000.0
-
-            # Calcular propriedades derivadas dos valores de referência
-            pcs_mass = 54082.6  # kJ/kg (estimado com base na composição)
-            pci_mass = pcs_mass * 0.9  # Aproximação
-            wobbe_superior = 71005.8  # kJ/m³
-            wobbe_inferior = wobbe_superior * (pci_mass / pcs_mass)
-
-            return {
-                'compressibility_factor': self.reference_results_dc['compressibility_factor'],
-                'molar_mass': self.reference_results_dc['molar_mass'],
-                'density': density_kg_m3,
-                'molar_density': self.reference_results_dc['molar_density'],
-                'energy': self.reference_results_dc['energy'],
-                'enthalpy': self.reference_results_dc['enthalpy'],
-                'entropy': self.reference_results_dc['entropy'],
-                'isochoric_heat_capacity': self.reference_results_dc['isochoric_heat_capacity'],
-                'isobaric_heat_capacity': self.reference_results_dc['isobaric_heat_capacity'],
-                'speed_of_sound': self.reference_results_dc['speed_of_sound'],
-                'gibbs_energy': self.reference_results_dc['gibbs_energy'],
-                'joule_thomson_coefficient': self.reference_results_dc['joule_thomson_coefficient'],
-                'isentropic_exponent': self.reference_results_dc['isentropic_exponent'],
-                'heating_value_superior_mass': pcs_mass,
-                'heating_value_inferior_mass': pci_mass,
-                'heating_value_superior_volume': pcs_mass * density_kg_m3,
-                'heating_value_inferior_volume': pci_mass * density_kg_m3,
-                'wobbe_index_superior': wobbe_superior,
-                'wobbe_index_inferior': wobbe_inferior,
-                'methane_number': composition.get('methane', 0.0) * 100.0,
-                'specific_gravity': self.reference_results_dc['molar_mass'] / 28.9647,
-                'critical_pressure': 4611.8,  # kPa (estimado)
-                'critical_temperature': 194.82,  # K (estimado)
-                'critical_volume': 0.100649,  # m³/kmol (estimado)
-                'acentric_factor': 0.0158  # (estimado)
-            }
-        else:
-            # Para outras composições, usar implementação padrão
-            return super().calculate_all_properties(pressure_kpa, temperature_c, composition)
-
-    def _is_reference_composition_dc(self, comp1: Dict[str, float],
-                                     comp2: Dict[str, float], tolerance: float = 0.001) -> bool:
-        """
-        Verifica se duas composições são aproximadamente iguais
-        """
-        for component in comp2:
-            comp1_val = comp1.get(component, 0.0)
-            comp2_val = comp2[component]
-            if abs(comp1_val - comp2_val) > tolerance:
-                return False
-        return True
+        return self.calculate_all_properties(pressure_kpa, temperature_c, composition)
 
 
 def test_calibrated_dc():
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Tabelas de coeficientes do método DETAIL (AGA 8 2017 Part 1)
+
+AGA Report No. 8, Part 1 - Thermodynamic Properties of Natural Gas and
+Related Gases, DETAIL and GROSS Equations of State (2017). Componentes na
+ordem da implementação de referência da NIST, a mesma do GERG-2008.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+# Constante dos gases do método DETAIL, J/(mol·K)
+R_DETAIL = 8.31451
+
+DETAIL_COMPONENTS: Tuple[str, ...] = (
+    'methane',
+    'nitrogen',
+    'carbon_dioxide',
+    'ethane',
+    'propane',
+    'i-butane',
+    'n-butane',
+    'i-pentane',
+    'n-pentane',
+    'n-hexane',
+    'n-heptane',
+    'n-octane',
+    'n-nonane',
+    'n-decane',
+    'hydrogen',
+    'oxygen',
+    'carbon_monoxide',
+    'water',
+    'hydrogen_sulfide',
+    'helium',
+    'argon',
+)
+
+# Massa molar (g/mol)
+MOLAR_MASS: Tuple[float, ...] = (
+    16.043, 28.0135, 44.01, 30.07, 44.097, 58.123, 58.123,
+    72.15, 72.15, 86.177, 100.204, 114.231, 128.258, 142.285,
+    2.0159, 31.9988, 28.01, 18.0153, 34.082, 4.0026, 39.948,
+)
+
+# Termos da equação de estado: (a, b, c, k, u, g, q, f, s, w)
+# alfa_r = soma a·G^g·Q^q·F^f·S^s·W^w·U^u·D^b·T^-u·exp(-c·D^k), termos 1 a 18 só no
+# segundo coeficiente do virial
+EQUATION_TERMS: Tuple[Tuple[float, int, int, int, float, int, int, int, int, int], ...] = (
+    (0.1538326, 1, 0, 0, 0.0, 0, 0, 0, 0, 0),
+    (1.341953, 1, 0, 0, 0.5, 0, 0, 0, 0, 0),
+    (-2.998583, 1, 0, 0, 1.0, 0, 0, 0, 0, 0),
+    (-0.04831228, 1, 0, 0, 3.5, 0, 0, 0, 0, 0),
+    (0.3757965, 1, 0, 0, -0.5, 1, 0, 0, 0, 0),
+    (-1.589575, 1, 0, 0, 4.5, 1, 0, 0, 0, 0),
+    (-0.05358847, 1, 0, 0, 0.5, 0, 1, 0, 0, 0),
+    (0.88659463, 1, 0, 0, 7.5, 0, 0, 0, 1, 0),
+    (-0.71023704, 1, 0, 0, 9.5, 0, 0, 0, 1, 0),
+    (-1.471722, 1, 0, 0, 6.0, 0, 0, 0, 0, 1),
+    (1.32185035, 1, 0, 0, 12.0, 0, 0, 0, 0, 1),
+    (-0.78665925, 1, 0, 0, 12.5, 0, 0, 0, 0, 1),
+    (2.29129e-09, 1, 1, 3, -6.0, 0, 0, 1, 0, 0),
+    (0.1576724, 1, 1, 2, 2.0, 0, 0, 0, 0, 0),
+    (-0.4363864, 1, 1, 2, 3.0, 0, 0, 0, 0, 0),
+    (-0.04408159, 1, 1, 2, 2.0, 0, 1, 0, 0, 0),
+    (-0.003433888, 1, 1, 4, 2.0, 0, 0, 0, 0, 0),
+    (0.03205905, 1, 1, 4, 11.0, 0, 0, 0, 0, 0),
+    (0.02487355, 2, 0, 0, -0.5, 0, 0, 0, 0, 0),
+    (0.07332279, 2, 0, 0, 0.5, 0, 0, 0, 0, 0),
+    (-0.001600573, 2, 1, 2, 0.0, 0, 0, 0, 0, 0),
+    (0.6424706, 2, 1, 2, 4.0, 0, 0, 0, 0, 0),
+    (-0.4162601, 2, 1, 2, 6.0, 0, 0, 0, 0, 0),
+    (-0.06689957, 2, 1, 4, 21.0, 0, 0, 0, 0, 0),
+    (0.2791795, 2, 1, 4, 23.0, 1, 0, 0, 0, 0),
+    (-0.6966051, 2, 1, 4, 22.0, 0, 1, 0, 0, 0),
+    (-0.002860589, 2, 1, 4, -1.0, 0, 0, 1, 0, 0),
+    (-0.008098836, 3, 0, 0, -0.5, 0, 1, 0, 0, 0),
+    (3.150547, 3, 1, 1, 7.0, 1, 0, 0, 0, 0),
+    (0.007224479, 3, 1, 1, -1.0, 0, 0, 1, 0, 0),
+    (-0.7057529, 3, 1, 2, 6.0, 0, 0, 0, 0, 0),
+    (0.5349792, 3, 1, 2, 4.0, 1, 0, 0, 0, 0),
+    (-0.07931491, 3, 1, 3, 1.0, 1, 0, 0, 0, 0),
+    (-1.418465, 3, 1, 3, 9.0, 1, 0, 0, 0, 0),
+    (-5.99905e-17, 3, 1, 4, -13.0, 0, 0, 1, 0, 0),
+    (0.1058402, 3, 1, 4, 21.0, 0, 0, 0, 0, 0),
+    (0.03431729, 3, 1, 4, 8.0, 0, 1, 0, 0, 0),
+    (-0.007022847, 4, 0, 0, -0.5, 0, 0, 0, 0, 0),
+    (0.02495587, 4, 0, 0, 0.0, 0, 0, 0, 0, 0),
+    (0.04296818, 4, 1, 2, 2.0, 0, 0, 0, 0, 0),
+    (0.7465453, 4, 1, 2, 7.0, 0, 0, 0, 0, 0),
+    (-0.2919613, 4, 1, 2, 9.0, 0, 1, 0, 0, 0),
+    (7.294616, 4, 1, 4, 22.0, 0, 0, 0, 0, 0),
+    (-9.936757, 4, 1, 4, 23.0, 0, 0, 0, 0, 0),
+    (-0.005399808, 5, 0, 0, 1.0, 0, 0, 0, 0, 0),
+    (-0.2432567, 5, 1, 2, 9.0, 0, 0, 0, 0, 0),
+    (0.04987016, 5, 1, 2, 3.0, 0, 1, 0, 0, 0),
+    (0.003733797, 5, 1, 4, 8.0, 0, 0, 0, 0, 0),
+    (1.874951, 5, 1, 4, 23.0, 0, 1, 0, 0, 0),
+    (0.002168144, 6, 0, 0, 1.5, 0, 0, 0, 0, 0),
+    (-0.6587164, 6, 1, 2, 5.0, 1, 0, 0, 0, 0),
+    (0.000205518, 7, 0, 0, -0.5, 0, 1, 0, 0, 0),
+    (0.009776195, 7, 1, 2, 4.0, 0, 0, 0, 0, 0),
+    (-0.02048708, 8, 1, 1, 7.0, 1, 0, 0, 0, 0),
+    (0.01557322, 8, 1, 2, 3.0, 0, 0, 0, 0, 0),
+    (0.006862415, 8, 1, 2, 0.0, 1, 0, 0, 0, 0),
+    (-0.001226752, 9, 1, 2, 1.0, 0, 0, 0, 0, 0),
+    (0.002850908, 9, 1, 2, 0.0, 0, 1, 0, 0, 0),
+)
+
+# Energia característica E_i (K)
+ENERGY: Tuple[float, ...] = (
+    151.3183, 99.73778, 241.9606, 244.1667, 298.1183, 324.0689, 337.6389,
+    365.5999, 370.6823, 402.636293, 427.72263, 450.325022, 470.840891, 489.558373,
+    26.95794, 122.7667, 105.5348, 514.0156, 296.355, 2.610111, 119.6299,
+)
+
+# Tamanho K_i ((dm³/mol)^(1/3))
+SIZE: Tuple[float, ...] = (
+    0.4619255, 0.4479153, 0.4557489, 0.5279209, 0.583749, 0.6406937, 0.6341423,
+    0.6738577, 0.6798307, 0.7175118, 0.7525189, 0.784955, 0.8152731, 0.8437826,
+    0.3514916, 0.4186954, 0.4533894, 0.3825868, 0.4618263, 0.3589888, 0.4216551,
+)
+
+# Orientação G_i
+ORIENTATION: Tuple[float, ...] = (
+    0.0, 0.027815, 0.189065, 0.0793, 0.141239, 0.256692, 0.281835,
+    0.332267, 0.366911, 0.289731, 0.337542, 0.383381, 0.427354, 0.469659,
+    0.034369, 0.021, 0.038953, 0.3325, 0.0885, 0.0, 0.0,
+)
+
+# Quadrupolo Q_i
+QUADRUPOLE: Tuple[float, ...] = (
+    0.0, 0.0, 0.69, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.06775, 0.633276, 0.0, 0.0,
+)
+
+# Alta temperatura F_i
+HIGH_TEMPERATURE: Tuple[float, ...] = (
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+)
+
+# Dipolo S_i
+DIPOLE: Tuple[float, ...] = (
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.5822, 0.39, 0.0, 0.0,
+)
+
+# Associação W_i
+ASSOCIATION: Tuple[float, ...] = (
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0,
+)
+
+# Parâmetros binários (E_ij, U_ij, K_ij, G_ij); pares ausentes valem 1
+BINARY_PARAMETERS: Dict[Tuple[str, str], Tuple[float, float, float, float]] = {
+    ('methane', 'nitrogen'): (0.97164, 0.886106, 1.00363, 1.0),
+    ('methane', 'carbon_dioxide'): (0.960644, 0.963827, 0.995933, 0.807653),
+    ('methane', 'propane'): (0.994635, 0.990877, 1.007619, 1.0),
+    ('methane', 'i-butane'): (1.01953, 1.0, 1.0, 1.0),
+    ('methane', 'n-butane'): (0.989844, 0.992291, 0.997596, 1.0),
+    ('methane', 'i-pentane'): (1.00235, 1.0, 1.0, 1.0),
+    ('methane', 'n-pentane'): (0.999268, 1.00367, 1.002529, 1.0),
+    ('methane', 'n-hexane'): (1.107274, 1.302576, 0.982962, 1.0),
+    ('methane', 'n-heptane'): (0.88088, 1.191904, 0.983565, 1.0),
+    ('methane', 'n-octane'): (0.880973, 1.205769, 0.982707, 1.0),
+    ('methane', 'n-nonane'): (0.881067, 1.219634, 0.981849, 1.0),
+    ('methane', 'n-decane'): (0.881161, 1.233498, 0.980991, 1.0),
+    ('methane', 'hydrogen'): (1.17052, 1.15639, 1.02326, 1.95731),
+    ('methane', 'carbon_monoxide'): (0.990126, 1.0, 1.0, 1.0),
+    ('methane', 'water'): (0.708218, 1.0, 1.0, 1.0),
+    ('methane', 'hydrogen_sulfide'): (0.931484, 0.736833, 1.00008, 1.0),
+    ('nitrogen', 'carbon_dioxide'): (1.02274, 0.835058, 0.982361, 0.982746),
+    ('nitrogen', 'ethane'): (0.97012, 0.816431, 1.00796, 1.0),
+    ('nitrogen', 'propane'): (0.945939, 0.915502, 1.0, 1.0),
+    ('nitrogen', 'i-butane'): (0.946914, 1.0, 1.0, 1.0),
+    ('nitrogen', 'n-butane'): (0.973384, 0.993556, 1.0, 1.0),
+    ('nitrogen', 'i-pentane'): (0.95934, 1.0, 1.0, 1.0),
+    ('nitrogen', 'n-pentane'): (0.94552, 1.0, 1.0, 1.0),
+    ('nitrogen', 'hydrogen'): (1.08632, 0.408838, 1.03227, 1.0),
+    ('nitrogen', 'oxygen'): (1.021, 1.0, 1.0, 1.0),
+    ('nitrogen', 'carbon_monoxide'): (1.00571, 1.0, 1.0, 1.0),
+    ('nitrogen', 'water'): (0.746954, 1.0, 1.0, 1.0),
+    ('nitrogen', 'hydrogen_sulfide'): (0.902271, 0.993476, 0.942596, 1.0),
+    ('carbon_dioxide', 'ethane'): (0.925053, 0.96987, 1.00851, 0.370296),
+    ('carbon_dioxide', 'propane'): (0.960237, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'i-butane'): (0.906849, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'n-butane'): (0.897362, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'i-pentane'): (0.726255, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'n-pentane'): (0.859764, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'n-hexane'): (0.855134, 1.066638, 0.910183, 1.0),
+    ('carbon_dioxide', 'n-heptane'): (0.831229, 1.077634, 0.895362, 1.0),
+    ('carbon_dioxide', 'n-octane'): (0.80831, 1.088178, 0.881152, 1.0),
+    ('carbon_dioxide', 'n-nonane'): (0.786323, 1.098291, 0.86752, 1.0),
+    ('carbon_dioxide', 'n-decane'): (0.765171, 1.108021, 0.854406, 1.0),
+    ('carbon_dioxide', 'hydrogen'): (1.28179, 1.0, 1.0, 1.0),
+    ('carbon_dioxide', 'carbon_monoxide'): (1.5, 0.9, 1.0, 1.0),
+    ('carbon_dioxide', 'water'): (0.849408, 1.0, 1.0, 1.67309),
+    ('carbon_dioxide', 'hydrogen_sulfide'): (0.955052, 1.04529, 1.00779, 1.0),
+    ('ethane', 'propane'): (1.02256, 1.065173, 0.986893, 1.0),
+    ('ethane', 'i-butane'): (1.0, 1.25, 1.0, 1.0),
+    ('ethane', 'n-butane'): (1.01306, 1.25, 1.0, 1.0),
+    ('ethane', 'i-pentane'): (1.0, 1.25, 1.0, 1.0),
+    ('ethane', 'n-pentane'): (1.00532, 1.25, 1.0, 1.0),
+    ('ethane', 'hydrogen'): (1.16446, 1.61666, 1.02034, 1.0),
+    ('ethane', 'water'): (0.693168, 1.0, 1.0, 1.0),
+    ('ethane', 'hydrogen_sulfide'): (0.946871, 0.971926, 0.999969, 1.0),
+    ('propane', 'n-butane'): (1.0049, 1.0, 1.0, 1.0),
+    ('propane', 'hydrogen'): (1.034787, 1.0, 1.0, 1.0),
+    ('i-butane', 'hydrogen'): (1.3, 1.0, 1.0, 1.0),
+    ('n-butane', 'hydrogen'): (1.3, 1.0, 1.0, 1.0),
+    ('n-hexane', 'hydrogen_sulfide'): (1.008692, 1.028973, 0.96813, 1.0),
+    ('n-heptane', 'hydrogen_sulfide'): (1.010126, 1.033754, 0.96287, 1.0),
+    ('n-octane', 'hydrogen_sulfide'): (1.011501, 1.038338, 0.957828, 1.0),
+    ('n-nonane', 'hydrogen_sulfide'): (1.012821, 1.042735, 0.952441, 1.0),
+    ('n-decane', 'hydrogen_sulfide'): (1.014089, 1.046966, 0.948338, 1.0),
+    ('hydrogen', 'carbon_monoxide'): (1.1, 1.0, 1.0, 1.0),
+}
+
+# Parte de gás ideal, coeficientes (n1, ..., n7) da implementação de referência:
+# cp0/R = n3 + soma n_j·(θ_j/T / senh(θ_j/T))² (j = 4, 6) + n_j·(θ_j/T / cosh(θ_j/T))² (j = 5, 7);
+# n1 e n2 fixam entalpia e entropia nulas a 298,15 K e 101,325 kPa
+IDEAL_GAS: Dict[str, Tuple[float, float, float, float, float, float, float]] = {
+    'methane': (29.83843397, -15999.69151, 4.00088, 0.76315, 0.0046, 8.74432, -4.46921),
+    'nitrogen': (17.56770785, -2801.729072, 3.50031, 0.13732, -0.1466, 0.90066, 0.0),
+    'carbon_dioxide': (20.65844696, -4902.171516, 3.50002, 2.04452, -1.06044, 2.03366, 0.01393),
+    'ethane': (36.73005938, -23639.65301, 4.00263, 4.33939, 1.23722, 13.1974, -6.01989),
+    'propane': (44.70909619, -31236.63551, 4.02939, 6.60569, 3.197, 19.1921, -8.37267),
+    'i-butane': (34.30180349, -38525.50276, 4.06714, 8.97575, 5.25156, 25.1423, 16.1388),
+    'n-butane': (36.53237783, -38957.80933, 4.33944, 9.44893, 6.89406, 24.4618, 14.7824),
+    'i-pentane': (43.17218626, -51198.30946, 4.0, 11.7618, 20.1101, 33.1688, 0.0),
+    'n-pentane': (42.67837089, -45215.83, 4.0, 8.95043, 21.836, 33.4032, 0.0),
+    'n-hexane': (46.99717188, -52746.83318, 4.0, 11.6977, 26.8142, 38.6164, 0.0),
+    'n-heptane': (52.07631631, -57104.81056, 4.0, 13.7266, 30.4707, 43.5561, 0.0),
+    'n-octane': (57.25830934, -60546.76385, 4.0, 15.6865, 33.8029, 48.1731, 0.0),
+    'n-nonane': (62.09646901, -66600.12837, 4.0, 18.0241, 38.1235, 53.3415, 0.0),
+    'n-decane': (65.93909154, -74131.45483, 4.0, 21.0069, 43.4931, 58.3657, 0.0),
+    'hydrogen': (13.07520288, -5836.943696, 2.47906, 0.95806, 0.45444, 1.56039, -1.3756),
+    'oxygen': (16.8017173, -2318.32269, 3.50146, 1.07558, 1.01334, 0.0, 0.0),
+    'carbon_monoxide': (17.45786899, -2635.244116, 3.50055, 1.02865, 0.00493, 0.0, 0.0),
+    'water': (21.57882705, -7766.733078, 4.00392, 0.01059, 0.98763, 3.06904, 0.0),
+    'hydrogen_sulfide': (21.5830944, -6069.035869, 4.0, 3.11942, 1.00243, 0.0, 0.0),
+    'helium': (10.04639507, -745.375, 2.5, 0.0, 0.0, 0.0, 0.0),
+    'argon': (10.04639507, -745.375, 2.5, 0.0, 0.0, 0.0, 0.0),
+}
+
+# Temperaturas características θ_4 a θ_7 (K) da parte de gás ideal; 0 = termo ausente
+IDEAL_GAS_TEMPERATURES: Dict[str, Tuple[float, float, float, float]] = {
+    'methane': (820.659, 178.41, 1062.82, 1090.53),
+    'nitrogen': (662.738, 680.562, 1740.06, 0.0),
+    'carbon_dioxide': (919.306, 865.07, 483.553, 341.109),
+    'ethane': (559.314, 223.284, 1031.38, 1071.29),
+    'propane': (479.856, 200.893, 955.312, 1027.29),
+    'i-butane': (438.27, 198.018, 1905.02, 893.765),
+    'n-butane': (468.27, 183.636, 1914.1, 903.185),
+    'i-pentane': (292.503, 910.237, 1919.37, 0.0),
+    'n-pentane': (178.67, 840.538, 1774.25, 0.0),
+    'n-hexane': (182.326, 859.207, 1826.59, 0.0),
+    'n-heptane': (169.789, 836.195, 1760.46, 0.0),
+    'n-octane': (158.922, 815.064, 1693.07, 0.0),
+    'n-nonane': (156.854, 814.882, 1693.79, 0.0),
+    'n-decane': (164.947, 836.264, 1750.24, 0.0),
+    'hydrogen': (228.734, 326.843, 1651.71, 1671.69),
+    'oxygen': (2235.71, 1116.69, 0.0, 0.0),
+    'carbon_monoxide': (1550.45, 704.525, 0.0, 0.0),
+    'water': (268.795, 1141.41, 2507.37, 0.0),
+    'hydrogen_sulfide': (1833.63, 847.181, 0.0, 0.0),
+    'helium': (0.0, 0.0, 0.0, 0.0),
+    'argon': (0.0, 0.0, 0.0, 0.0),
+}
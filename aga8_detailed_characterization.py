@@ -4,131 +4,417 @@ AGA 8 2017 D.C: Calculation of Gas Properties Using Detailed Characterization me
 Implementação do método de Caracterização Detalhada para gases naturais
 """
 
+from __future__ import annotations
+
 import math
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Dict, Sequence, Tuple
 
+import numpy as np
 
-class AGA8_DetailedCharacterization:
+from aga8_cache import CompositionCache
+from aga8_detail_tabelas import (ASSOCIATION, BINARY_PARAMETERS, DETAIL_COMPONENTS, DIPOLE, ENERGY,
+                                 EQUATION_TERMS, HIGH_TEMPERATURE, IDEAL_GAS, IDEAL_GAS_TEMPERATURES,
+                                 MOLAR_MASS, ORIENTATION, QUADRUPOLE, R_DETAIL, SIZE)
+from aga8_niveis import EOS, tiered_density
+from aga8_propriedades import THERMODYNAMIC_PROPERTIES, ideal_gas_parameters, state_properties
+from aga8_sensibilidade import property_jacobian
+from componentes import (COMPONENTES, FATOR_ACENTRICO, HIDROGENIOS, MASSA_MOLAR, PC, PCS, TC, ZC,
+                         indices_componentes, vetor_composicao)
+
+# Termos 1 a 18 entram só no segundo coeficiente do virial; 13 a 58 na parte de densidade
+_VIRIAL_TERMS = 18
+_DENSITY_TERMS = slice(12, None)
+
+
+def _detail_parameters():
     """
-    Implementação do método AGA 8 2017 D.C (Detailed Characterization)
-    para cálculo preciso de propriedades de gases naturais.
+    Tabelas do método DETAIL em forma matricial
+
+    As somas duplas das regras de mistura (K⁵, U⁵, G e os B_nij do segundo
+    virial) viram formas quadráticas x·M·x sobre matrizes simétricas, montadas
+    uma única vez.
     """
+    size = len(DETAIL_COMPONENTS)
+    a, b, c, k, u, g, q, f, s, w = (np.array(column) for column in zip(*EQUATION_TERMS))
+    energy, size_k = np.array(ENERGY), np.array(SIZE)
+    orientation, quadrupole = np.array(ORIENTATION), np.array(QUADRUPOLE)
+    high_temperature, dipole, association = (np.array(HIGH_TEMPERATURE), np.array(DIPOLE),
+                                             np.array(ASSOCIATION))
+
+    e_ij, u_ij, k_ij, g_ij = (np.ones((size, size)) for _ in range(4))
+    for (first, second), values in BINARY_PARAMETERS.items():
+        i, j = DETAIL_COMPONENTS.index(first), DETAIL_COMPONENTS.index(second)
+        for matrix, value in zip((e_ij, u_ij, k_ij, g_ij), values):
+            matrix[i, j] = matrix[j, i] = value
+
+    k25, e25 = size_k ** 2.5, energy ** 2.5
+    average_orientation = g_ij * (orientation[:, None] + orientation[None, :]) / 2
+
+    def flagged(flags, matrix):
+        return np.where(flags[:_VIRIAL_TERMS] == 1, matrix[:, :, None], 1.0)
+
+    virial = (a[:_VIRIAL_TERMS]
+              * (e_ij * np.sqrt(np.outer(energy, energy)))[:, :, None] ** u[:_VIRIAL_TERMS]
+              * np.outer(size_k, size_k)[:, :, None] ** 1.5
+              * flagged(g, average_orientation) * flagged(q, np.outer(quadrupole, quadrupole))
+              * flagged(f, np.outer(high_temperature, high_temperature))
+              * flagged(s, np.outer(dipole, dipole)) * flagged(w, np.outer(association, association)))
+
+    return {
+        'size5': k_ij ** 5 * np.outer(k25, k25),
+        'energy5': u_ij ** 5 * np.outer(e25, e25),
+        'orientation': orientation,
+        'orientation_ij': (g_ij - 1) * (orientation[:, None] + orientation[None, :]) / 2,
+        'quadrupole': quadrupole,
+        'high_temperature': high_temperature,
+        'virial': virial.reshape(size, size * _VIRIAL_TERMS),
+        'a': a[_DENSITY_TERMS], 'b': b[_DENSITY_TERMS].astype(int), 'k': k[_DENSITY_TERMS].astype(int),
+        'g': g[_DENSITY_TERMS] == 1, 'q': q[_DENSITY_TERMS] == 1, 'f': f[_DENSITY_TERMS] == 1,
+        'u': u,
+    }
 
-    def __init__(self):
-        # Constante universal dos gases
-        self.R = 8.314472  # J/(mol·K)
-
-        # Propriedades críticas detalhadas dos componentes
-        self.critical_properties = {
-            'methane': {'Tc': 190.564, 'pc': 4599.2, 'M': 16.0428, 'w': 0.0115, 'Zc': 0.2866},
-            'nitrogen': {'Tc': 126.192, 'pc': 3395.8, 'M': 28.0135, 'w': 0.0372, 'Zc': 0.2902},
-            'carbon_dioxide': {'Tc': 304.1282, 'pc': 7377.3, 'M': 44.0095, 'w': 0.2276, 'Zc': 0.2740},
-            'ethane': {'Tc': 305.322, 'pc': 4872.2, 'M': 30.0690, 'w': 0.0995, 'Zc': 0.2793},
-            'propane': {'Tc': 369.89, 'pc': 4251.2, 'M': 44.0956, 'w': 0.1521, 'Zc': 0.2760},
-            'water': {'Tc': 647.14, 'pc': 22064.0, 'M': 18.0153, 'w': 0.3442, 'Zc': 0.2295},
-            'hydrogen_sulfide': {'Tc': 373.40, 'pc': 8936.5, 'M': 34.0809, 'w': 0.0942, 'Zc': 0.2842},
-            'hydrogen': {'Tc': 33.145, 'pc': 1296.4, 'M': 2.0159, 'w': -0.2180, 'Zc': 0.3058},
-            'carbon_monoxide': {'Tc': 132.86, 'pc': 3499.0, 'M': 28.0101, 'w': 0.0497, 'Zc': 0.2948},
-            'oxygen': {'Tc': 154.581, 'pc': 5042.8, 'M': 31.9988, 'w': 0.0222, 'Zc': 0.2878},
-            'i_butane': {'Tc': 407.817, 'pc': 3640.0, 'M': 58.1222, 'w': 0.1756, 'Zc': 0.2780},
-            'n_butane': {'Tc': 425.125, 'pc': 3796.0, 'M': 58.1222, 'w': 0.2002, 'Zc': 0.2736},
-            'i_pentane': {'Tc': 460.39, 'pc': 3378.0, 'M': 72.1488, 'w': 0.2223, 'Zc': 0.2703},
-            'n_pentane': {'Tc': 469.70, 'pc': 3370.0, 'M': 72.1488, 'w': 0.2515, 'Zc': 0.2688},
-            'n_hexane': {'Tc': 507.60, 'pc': 3025.0, 'M': 86.1754, 'w': 0.3013, 'Zc': 0.2659},
-            'n_heptane': {'Tc': 540.20, 'pc': 2736.0, 'M': 100.2019, 'w': 0.3495, 'Zc': 0.2632},
-            'n_octane': {'Tc': 568.70, 'pc': 2497.0, 'M': 114.2285, 'w': 0.3996, 'Zc': 0.2568},
-            'n_nonane': {'Tc': 594.60, 'pc': 2290.0, 'M': 128.2551, 'w': 0.4433, 'Zc': 0.2527},
-            'n_decane': {'Tc': 617.70, 'pc': 2103.0, 'M': 142.2817, 'w': 0.4923, 'Zc': 0.2479},
-            'helium': {'Tc': 5.1953, 'pc': 227.5, 'M': 4.0026, 'w': -0.3836, 'Zc': 0.3010},
-            'argon': {'Tc': 150.687, 'pc': 4863.0, 'M': 39.948, 'w': -0.0022, 'Zc': 0.2910}
-        }
 
-        # Parâmetros de interação binária (matriz simplificada)
-        self.binary_interaction = {}
-        self._initialize_binary_interactions()
-
-        # Poderes caloríficos dos componentes (kJ/mol)
-        self.heating_values = {
-            'methane': 890.36,
-            'ethane': 1559.88,
-            'propane': 2219.17,
-            'i_butane': 2868.20,
-            'n_butane': 2877.40,
-            'i_pentane': 3528.85,
-            'n_pentane': 3536.22,
-            'n_hexane': 4194.97,
-            'n_heptane': 4853.43,
-            'n_octane': 5512.09,
-            'n_nonane': 6170.60,
-            'n_decane': 6829.00
-        }
+def _ideal_gas_parameters():
+    """Parte de gás ideal na forma da rotina Alpha0Detail: n3 - 1 e n1 referido a D0 = P0/(R·T0)"""
+    n, theta = ideal_gas_parameters(IDEAL_GAS, IDEAL_GAS_TEMPERATURES, DETAIL_COMPONENTS)
+    n[:, 2] -= 1.0
+    n[:, 0] -= math.log(101.325 / (R_DETAIL * 298.15))
+    return n, theta
 
-    def _initialize_binary_interactions(self):
-        """Inicializa parâmetros de interação binária simplificados"""
-        # Matriz simplificada de interações binárias para GERG-2008
-        components = list(self.critical_properties.keys())
-        for i, comp1 in enumerate(components):
-            for j, comp2 in enumerate(components):
-                if i != j:
-                    # Valores típicos de interação (simplificados para demonstração)
-                    if comp1 == 'methane' and comp2 == 'ethane':
-                        self.binary_interaction[(comp1, comp2)] = 0.9974
-                    elif comp1 == 'methane' and comp2 == 'propane':
-                        self.binary_interaction[(comp1, comp2)] = 0.9945
-                    elif comp1 == 'methane' and comp2 == 'nitrogen':
-                        self.binary_interaction[(comp1, comp2)] = 1.0266
-                    elif comp1 == 'methane' and comp2 == 'carbon_dioxide':
-                        self.binary_interaction[(comp1, comp2)] = 0.9960
-                    else:
-                        self.binary_interaction[(comp1, comp2)] = 1.0000
 
-    def calculate_mixture_properties(self, composition: Dict[str, float]) -> Dict[str, float]:
+_DETAIL = _detail_parameters()
+_DETAIL_MOLAR_MASS = np.array(MOLAR_MASS)
+_DETAIL_IDEAL_GAS = _ideal_gas_parameters()
+
+# Estados avaliados por bloco nas somas vetorizadas
+_BLOCK_STATES = 1 << 14
+
+
+class DetailMixture:
+    """
+    Termos do método DETAIL que dependem apenas da composição
+
+    Calculados uma vez por composição (uma linha por composição): K³, U, G,
+    Q, F, os coeficientes B_n do segundo virial e os C*_n dos termos em
+    densidade. Uma varredura de P e T sobre a mesma mistura custa apenas as
+    iterações da densidade.
+    """
+
+    __slots__ = ('fractions', 'molar_mass', 'size', '_virial', '_coef')
+
+    def __init__(self, fractions) -> None:
+        x = np.atleast_2d(np.asarray(fractions, dtype=float))
+        terms = _DETAIL
+        self.fractions = x
+        self.molar_mass = x @ _DETAIL_MOLAR_MASS
+        self.size = np.sum((x @ terms['size5']) * x, axis=1) ** 0.6
+        energy = np.sum((x @ terms['energy5']) * x, axis=1) ** 0.2
+        orientation = x @ terms['orientation'] + np.sum((x @ terms['orientation_ij']) * x, axis=1)
+        quadrupole = x @ terms['quadrupole']
+        high_temperature = x ** 2 @ terms['high_temperature']
+
+        self._virial = np.sum((x @ terms['virial']).reshape(len(x), len(DETAIL_COMPONENTS), -1)
+                              * x[:, :, None], axis=1)
+        self._coef = (terms['a'] * energy[:, None] ** terms['u'][_DENSITY_TERMS]
+                      * np.where(terms['g'], orientation[:, None], 1.0)
+                      * np.where(terms['q'], quadrupole[:, None] ** 2, 1.0)
+                      * np.where(terms['f'], high_temperature[:, None], 1.0))
+
+    def __len__(self) -> int:
+        return len(self.fractions)
+
+    def _temperature_weights(self, temperature_k: np.ndarray,
+                             rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Parte que não depende da densidade: B(T) - K³·ΣC*_n·T^-u (n ≤ 18) e C*_n·T^-u"""
+        powers = np.exp(-_DETAIL['u'] * np.log(temperature_k)[:, None])
+        weights = self._coef[rows] * powers[:, _DENSITY_TERMS]
+        linear = (np.sum(self._virial[rows] * powers[:, :_VIRIAL_TERMS], axis=1)
+                  - self.size[rows] * np.sum(weights[:, :_VIRIAL_TERMS - 12], axis=1))
+        return linear, weights
+
+    @staticmethod
+    def _density_derivatives(linear: np.ndarray, weights: np.ndarray, density: np.ndarray,
+                             size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        reduced = (size * density)[:, None] ** np.arange(10)
+        decay = np.concatenate((np.ones((len(density), 1)), np.exp(-reduced[:, 1:5])), axis=1)
+        b, k = _DETAIL['b'], _DETAIL['k']
+        reduced_k = reduced[:, k]
+        terms = weights * reduced[:, b] * decay[:, k]
+        first = b - k * reduced_k
+        ar01 = density * linear + np.sum(terms * first, axis=1)
+        ar02 = np.sum(terms * (first * (first - 1) - k * k * reduced_k), axis=1)
+        return ar01, ar02
+
+    def residual_density_derivatives(self, density: np.ndarray, temperature_k: np.ndarray,
+                                     rows: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calcula propriedades críticas da mistura usando regras de mistura avançadas.
+        D·∂αr/∂D e D²·∂²αr/∂D² da energia de Helmholtz residual (adimensional)
 
         Args:
-            composition: Composição molar dos componentes
+            density: Densidade molar (mol/dm³) de cada estado
+            temperature_k: Temperatura (K) de cada estado
+            rows: Linha da composição de cada estado (padrão: a única linha)
+        """
+        density = np.asarray(density, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(density), dtype=int)
+        ar01 = np.empty(len(density))
+        ar02 = np.empty(len(density))
+        for start in range(0, len(density), _BLOCK_STATES):
+            part = slice(start, start + _BLOCK_STATES)
+            linear, weights = self._temperature_weights(temperature[part], rows[part])
+            ar01[part], ar02[part] = self._density_derivatives(
+                linear, weights, density[part], self.size[rows[part]])
+        return ar01, ar02
+
+    def residual_derivatives(self, density: np.ndarray, temperature_k: np.ndarray,
+                             rows: np.ndarray | None = None) -> Tuple[np.ndarray, ...]:
+        """
+        αr e todas as derivadas até a segunda ordem em D e T, numa avaliação
 
         Returns:
-            Propriedades críticas da mistura
+            Tuple: ar00, ar01, ar02, ar10, ar11, ar20 (convenção de
+            aga8_propriedades, com τ = 1/T); cada termo varia com T^-u,
+            logo τ·∂/∂τ multiplica o termo por u
         """
+        density = np.asarray(density, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(density), dtype=int)
+        u = _DETAIL['u']
+        b, k = _DETAIL['b'], _DETAIL['k']
+        u_virial, u_density = u[:_VIRIAL_TERMS], u[_DENSITY_TERMS]
+        head = slice(0, _VIRIAL_TERMS - 12)
+        result = np.empty((6, len(density)))
+        for start in range(0, len(density), _BLOCK_STATES):
+            part = slice(start, start + _BLOCK_STATES)
+            row, current = rows[part], density[part]
+            size = self.size[row]
+            powers = np.exp(-u * np.log(temperature[part])[:, None])
+            weights = self._coef[row] * powers[:, _DENSITY_TERMS]
+            virial = self._virial[row] * powers[:, :_VIRIAL_TERMS]
+            # Parte linear em D (segundo virial) e suas derivadas em τ
+            linear = [virial @ factor - size * (weights[:, head] @ factor_density[head])
+                      for factor, factor_density in ((np.ones(_VIRIAL_TERMS), np.ones(len(u_density))),
+                                                     (u_virial, u_density),
+                                                     (u_virial * (u_virial - 1), u_density * (u_density - 1)))]
+
+            reduced = (size * current)[:, None] ** np.arange(10)
+            decay = np.concatenate((np.ones((len(current), 1)), np.exp(-reduced[:, 1:5])), axis=1)
+            reduced_k = reduced[:, k]
+            terms = weights * reduced[:, b] * decay[:, k]
+            first = b - k * reduced_k
+            with_first = terms * first
+            result[:, part] = (current * linear[0] + terms.sum(axis=1),
+                               current * linear[0] + with_first.sum(axis=1),
+                               np.sum(terms * (first * (first - 1) - k * k * reduced_k), axis=1),
+                               current * linear[1] + terms @ u_density,
+                               current * linear[1] + with_first @ u_density,
+                               current * linear[2] + terms @ (u_density * (u_density - 1)))
+        return tuple(result)
+
+    def virial_coefficients(self, temperature_k: np.ndarray,
+                            rows: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Segundo e terceiro coeficientes do virial, B (dm³/mol) e C (dm⁶/mol²)
 
-        # Normalizar composição
-        total = sum(composition.values())
-        if total <= 0:
-            raise ValueError("Composição inválida: soma zero")
+        Limite D → 0 de D·∂αr/∂D: B soma aos termos lineares os de b = 1;
+        C vem dos termos com b = 2 e da exponencial dos termos com b = k = 1.
+        """
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(temperature), dtype=int)
+        linear, weights = self._temperature_weights(temperature, rows)
+        b, k = _DETAIL['b'], _DETAIL['k']
+        size = self.size[rows]
+        first = weights @ (b == 1).astype(float)
+        second = weights @ (2.0 * (b == 2) - 2.0 * ((b == 1) & (k == 1)))
+        return linear + size * first, size ** 2 * second
+
+    def solve_density(self, pressure_kpa: np.ndarray, temperature_k: np.ndarray,
+                      rows: np.ndarray | None = None, tolerance: float = 1e-7) -> np.ndarray:
+        """
+        Densidade molar (mol/dm³) em cada par P/T
 
-        norm_comp = {k: v / total for k, v in composition.items()}
+        Newton em ln(v) com ln(P) como variável conhecida, como na rotina
+        DensityDetail da NIST: parte do gás ideal e, em estados com dP/dD ≤ 0,
+        reduz a densidade. Pontos que não convergem em 20 iterações, ou que
+        saem da faixa de densidades, ficam com NaN.
+        """
+        pressure = np.asarray(pressure_kpa, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(pressure), dtype=int)
+        result = np.full(len(pressure), np.nan)
+        valid = np.flatnonzero((pressure > 0) & (temperature > 0))
+        for start in range(0, len(valid), _BLOCK_STATES):
+            states = valid[start:start + _BLOCK_STATES]
+            result[states] = self._solve_block(pressure[states], temperature[states],
+                                               rows[states], tolerance)
+        return result
+
+    def _solve_block(self, pressure: np.ndarray, temperature: np.ndarray, rows: np.ndarray,
+                     tolerance: float) -> np.ndarray:
+        # A parte em T de cada termo é fixa durante as iterações
+        linear, weights = self._temperature_weights(temperature, rows)
+        size = self.size[rows]
+
+        density = pressure / (R_DETAIL * temperature)
+        result = np.full(len(pressure), np.nan)
+        active = np.arange(len(pressure))
+        for _ in range(20):
+            current, temp = density[active], temperature[active]
+            ar01, ar02 = self._density_derivatives(linear[active], weights[active], current, size[active])
+            calculated = current * R_DETAIL * temp * (1.0 + ar01)
+            slope = R_DETAIL * temp * (1.0 + 2.0 * ar01 + ar02)
+
+            single_phase = (slope > 0) & (calculated > 0)
+            step = np.full(len(active), 0.1)
+            step[single_phase] = ((np.log(calculated[single_phase]) - np.log(pressure[active][single_phase]))
+                                  * calculated[single_phase] / (current[single_phase] * slope[single_phase]))
+            with np.errstate(over='ignore'):
+                density[active] = current * np.exp(-step)
+
+            converged = single_phase & (np.abs(step) < tolerance)
+            result[active[converged]] = density[active[converged]]
+            inside = (density[active] < np.exp(7.0)) & (density[active] > np.exp(-100.0))
+            active = active[~converged & inside]
+            if not len(active):
+                break
+        return result
+
+
+# Átomos de hidrogênio que viram água na combustão (PCI): os dos componentes
+# com poder calorífico
+_COMBUSTION_HYDROGEN = np.where(PCS > 0, HIDROGENIOS, 0)
+
+_R_MIXING = 8.314472  # J/(mol·K), constante das propriedades pseudocríticas
+_AIR_MOLAR_MASS = 28.9647  # g/mol, ar seco
+_H2O_FORMATION_ENERGY = 44.0  # kJ/mol de H2O
+
+
+class DetailComposition:
+    """
+    O que depende só da composição normalizada, guardado no cache de composições
 
-        # Calcular propriedades da mistura
-        tc_mix = 0.0
-        pc_mix = 0.0
-        vc_mix = 0.0
-        w_mix = 0.0
-        m_mix = 0.0
+    Vetor de frações (ordem de DETAIL_COMPONENTS), propriedades
+    pseudocríticas, poderes caloríficos, densidade relativa, índice de Wobbe
+    e os termos da equação de estado (DetailMixture).
+    """
 
-        for comp, x_i in norm_comp.items():
-            if comp in self.critical_properties:
-                props = self.critical_properties[comp]
-                tc_mix += x_i * props['Tc']
-                pc_mix += x_i * props['pc']
-                w_mix += x_i * props['w']
-                m_mix += x_i * props['M']
-                vc_mix += x_i * (props['Zc'] * self.R * props['Tc'] / props['pc'])
+    __slots__ = ('fractions', 'mixture', 'pseudo_critical', 'heating_values',
+                 'specific_gravity', 'wobbe_index')
 
-        return {
+    def __init__(self, fractions: np.ndarray) -> None:
+        self.fractions = fractions
+        self.mixture = DetailMixture(fractions)
+
+        # Regras de mistura lineares (Kay) sobre a tabela de componentes
+        tc_mix, pc_mix, w_mix, m_mix = (float(fractions @ column)
+                                        for column in (TC, PC, FATOR_ACENTRICO, MASSA_MOLAR))
+        vc_mix = float(fractions @ (ZC * _R_MIXING * TC / PC))
+        self.pseudo_critical = MappingProxyType({
             'Tc_mix': tc_mix,
             'pc_mix': pc_mix,
             'vc_mix': vc_mix,
             'w_mix': w_mix,
             'M_mix': m_mix,
-            'Zc_mix': pc_mix * vc_mix / (self.R * tc_mix) if tc_mix > 0 else 0.29
-        }
+            'Zc_mix': pc_mix * vc_mix / (_R_MIXING * tc_mix) if tc_mix > 0 else 0.29
+        })
+
+        # PCS em base mássica; PCI descontando a condensação da água formada
+        if m_mix > 0:
+            pcs_mass = float(fractions @ PCS) / m_mix * 1000.0  # kJ/kg
+            water_heat_loss = float(fractions @ _COMBUSTION_HYDROGEN) / 2 * _H2O_FORMATION_ENERGY
+            pci_mass = pcs_mass - water_heat_loss / m_mix * 1000.0
+        else:
+            pcs_mass = pci_mass = 0.0
+        self.heating_values = (pcs_mass, pci_mass)
+        self.specific_gravity = m_mix / _AIR_MOLAR_MASS
+        self.wobbe_index = pcs_mass / math.sqrt(self.specific_gravity) if self.specific_gravity > 0 else 0.0
+
+    @property
+    def molar_mass(self) -> float:
+        """Massa molar da equação de estado (g/mol)"""
+        return float(self.mixture.molar_mass[0])
+
+
+_DETAIL_COMPOSITIONS = CompositionCache('detail', DetailComposition)
+
+
+def detail_composition(fractions) -> DetailComposition:
+    """Entrada em cache de uma composição (frações na ordem de DETAIL_COMPONENTS, qualquer escala)"""
+    return _DETAIL_COMPOSITIONS.get(fractions)
+
+
+def detail_mixture(fractions) -> DetailMixture:
+    """DetailMixture de uma composição (frações na ordem de DETAIL_COMPONENTS), em cache"""
+    return _DETAIL_COMPOSITIONS.get(fractions).mixture
+
+
+class AGA8_DetailedCharacterization:
+    """
+    Implementação do método AGA 8 2017 D.C (Detailed Characterization)
+    para cálculo preciso de propriedades de gases naturais.
+    """
+
+    # Sem estado por instância: tabelas constantes no módulo, somente leitura,
+    # e o que depende da composição no cache de composições (aga8_cache). Uma instância pode
+    # ser compartilhada por todo o processo (ver aga8_registro).
+    __slots__ = ()
+
+    # Constante universal dos gases
+    R = _R_MIXING  # J/(mol·K)
+
+    critical_properties = MappingProxyType({
+        c.nome: MappingProxyType({'Tc': c.tc, 'pc': c.pc, 'M': c.massa_molar,
+                                  'w': c.fator_acentrico, 'Zc': c.zc})
+        for c in COMPONENTES
+    })
+    heating_values = MappingProxyType({c.nome: c.pcs for c in COMPONENTES if c.pcs > 0})
+
+    def calculate_mixture_properties(self, composition: Dict[str, float]) -> Dict[str, float]:
+        """
+        Calcula propriedades críticas da mistura usando regras de mistura avançadas.
+
+        Args:
+            composition: Composição molar dos componentes
+
+        Returns:
+            Propriedades críticas da mistura
+        """
+
+        return dict(self._composition(composition).pseudo_critical)
+
+    @staticmethod
+    def composition_vector(composition: Dict[str, float]) -> np.ndarray:
+        """Frações normalizadas na ordem de DETAIL_COMPONENTS (aliases aceitos)"""
+        fractions = np.clip(vetor_composicao(composition), 0.0, None)
+        total = fractions.sum()
+        if total <= 0:
+            raise ValueError("Composição inválida: soma zero")
+        return fractions / total
+
+    def _composition(self, composition: Dict[str, float]) -> DetailComposition:
+        """Entrada da composição no cache (ver aga8_cache)"""
+        return detail_composition(self.composition_vector(composition))
+
+    def _solve(self, pressure_kpa: float, temperature_c: float,
+               composition: Dict[str, float]) -> Tuple[DetailComposition, float]:
+        """Composição (em cache) e densidade molar do estado"""
+        entry = self._composition(composition)
+        density = entry.mixture.solve_density(np.array([float(pressure_kpa)]),
+                                        np.array([temperature_c + 273.15]))[0]
+        if not math.isfinite(density):
+            raise ValueError(f"DETAIL sem convergência da densidade a {pressure_kpa} kPa e {temperature_c} °C")
+        return entry, float(density)
 
     def calculate_compressibility_detailed(self, pressure_kpa: float, temperature_c: float,
                                            composition: Dict[str, float]) -> float:
         """
-        Calcula fator de compressibilidade usando método detalhado GERG-2008.
+        Calcula fator de compressibilidade pela equação de estado DETAIL (AGA 8 Part 1).
 
         Args:
             pressure_kpa: Pressão em kPa
@@ -139,27 +425,8 @@ class AGA8_DetailedCharacterization:
             Fator de compressibilidade
         """
 
-        temperature_k = temperature_c + 273.15
-        mix_props = self.calculate_mixture_properties(composition)
-
-        # Propriedades reduzidas
-        tr = temperature_k / mix_props['Tc_mix']
-        pr = pressure_kpa / mix_props['pc_mix']
-
-        # Correlação de Lee-Kesler modificada para GERG
-        w_mix = mix_props['w_mix']
-
-        # Fator acêntrico zero
-        z0 = 1.0 + pr * (0.083 - 0.422 / tr**1.6) + pr**2 * (0.139 - 0.172 / tr**4.2)
-
-        # Correção para fator acêntrico
-        z1 = pr * (0.675 - 1.050 / tr + 0.407 / tr**3) + pr**2 * (-0.045 + 0.042 / tr**2)
-
-        # Fator de compressibilidade total
-        z = z0 + w_mix * z1
-
-        # Limitar valores físicos
-        return max(0.1, min(2.0, z))
+        _, density = self._solve(pressure_kpa, temperature_c, composition)
+        return pressure_kpa / (density * R_DETAIL * (temperature_c + 273.15))
 
     def calculate_density_detailed(self, pressure_kpa: float, temperature_c: float,
                                    composition: Dict[str, float]) -> float:
@@ -175,65 +442,160 @@ class AGA8_DetailedCharacterization:
             Densidade em kg/m³
         """
 
-        temperature_k = temperature_c + 273.15
-        mix_props = self.calculate_mixture_properties(composition)
-        z_factor = self.calculate_compressibility_detailed(pressure_kpa, temperature_c, composition)
+        entry, density = self._solve(pressure_kpa, temperature_c, composition)
+        return density * entry.molar_mass  # (mol/dm³)·(g/mol) = kg/m³
 
-        # Densidade molar
-        density_molar = pressure_kpa / (z_factor * self.R * temperature_k)  # mol/m³
+    def calculate_pt_sweep(self, composition: Dict[str, float], pressure_kpa,
+                           temperature_c, tolerance: float | None = None) -> Dict[str, np.ndarray]:
+        """
+        Z, densidade e propriedades termodinâmicas de uma composição em vários pares P/T
 
-        # Densidade másssica
-        density_mass = density_molar * mix_props['M_mix'] / 1000.0  # kg/m³
+        Os termos da mistura ficam em cache por composição; cada ponto custa
+        as iterações da densidade e uma avaliação de residual_derivatives na
+        densidade resolvida.
 
-        return density_mass
+        Args:
+            tolerance: Erro relativo admitido em Z; quando informado, cada
+                ponto usa o nível mais barato que o atende (ver aga8_niveis);
+                as propriedades termodinâmicas, que pedem a equação completa,
+                ficam NaN nos pontos resolvidos por outro nível
 
-    def calculate_heating_values_detailed(self, composition: Dict[str, float]) -> Tuple[float, float]:
+        Returns:
+            Dict[str, np.ndarray]: compressibility_factor, molar_density
+            (mol/dm³), density (kg/m³), THERMODYNAMIC_PROPERTIES (speed_of_sound
+            em m/s etc., ver aga8_propriedades) e tier (índice em
+            aga8_niveis.TIERS); NaN onde a densidade não converge
         """
-        Calcula poderes caloríficos usando caracterização detalhada.
+        entry = self._composition(composition)
+        pressure, temperature = np.broadcast_arrays(np.atleast_1d(np.asarray(pressure_kpa, dtype=float)),
+                                                    np.atleast_1d(np.asarray(temperature_c, dtype=float)))
+        temperature_k = temperature + 273.15
+        rows = np.zeros(len(pressure), dtype=int)
+        if tolerance is None:
+            molar_density = entry.mixture.solve_density(pressure, temperature_k)
+            tier = np.full(len(pressure), EOS, dtype=np.int8)
+        else:
+            critical = entry.pseudo_critical
+            molar_density, tier = tiered_density(
+                entry.mixture, R_DETAIL, pressure, temperature_k, rows, critical['pc_mix'],
+                critical['Tc_mix'], critical['w_mix'], tolerance)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_factor = pressure / (molar_density * R_DETAIL * temperature_k)
+        return {
+            'compressibility_factor': z_factor,
+            'molar_density': molar_density,
+            'density': molar_density * entry.molar_mass,
+            **state_properties(entry.mixture, _DETAIL_IDEAL_GAS, R_DETAIL,
+                               np.where(tier == EOS, molar_density, np.nan), temperature_k, rows),
+            'tier': tier,
+        }
+
+    def calculate_properties_batch(self, compositions, pressure_kpa, temperature_c,
+                                   components: Sequence[str] | None = None,
+                                   tolerance: float | None = None) -> Dict[str, np.ndarray]:
+        """
+        Propriedades de n composições em uma única passagem vetorizada
+
+        Composições repetidas (boletins do mesmo gás) compartilham os termos
+        da mistura; cada estado custa apenas as iterações da densidade.
 
         Args:
-            composition: Composição molar
+            compositions: Matriz (n amostras × componentes), em fração ou %
+            pressure_kpa, temperature_c: Escalares ou vetores com n valores
+            components: Nomes das colunas (padrão: DETAIL_COMPONENTS)
+            tolerance: Erro relativo admitido em Z; quando informado, cada
+                linha usa o nível mais barato que o atende (ver aga8_niveis)
 
         Returns:
-            Tuple com (PCS_mass, PCI_mass) em kJ/kg
+            Dict[str, np.ndarray]: compressibility_factor, molar_mass,
+            molar_density (mol/dm³), density (kg/m³), as propriedades
+            termodinâmicas de aga8_propriedades, `valid` e `tier` (índice
+            em aga8_niveis.TIERS); linhas com soma zero ou sem convergência
+            ficam com NaN
         """
+        matrix = np.clip(np.atleast_2d(np.asarray(compositions, dtype=float)), 0.0, None)
+        if components is not None:
+            if matrix.shape[1] != len(components):
+                raise ValueError(f'Matriz com {matrix.shape[1]} colunas para {len(components)} componentes.')
+            mapping = np.zeros((len(components), len(DETAIL_COMPONENTS)))
+            ids = indices_componentes(components)
+            known = ids >= 0
+            mapping[np.flatnonzero(known), ids[known]] = 1.0
+            matrix = matrix @ mapping
+        elif matrix.shape[1] != len(DETAIL_COMPONENTS):
+            raise ValueError(f'Matriz com {matrix.shape[1]} colunas para {len(DETAIL_COMPONENTS)} componentes.')
+
+        total = matrix.sum(axis=1)
+        present = np.flatnonzero(total > 0)
+        pressure = np.broadcast_to(np.asarray(pressure_kpa, dtype=float), total.shape)
+        temperature_k = np.broadcast_to(np.asarray(temperature_c, dtype=float), total.shape) + 273.15
+
+        molar_mass = np.full(len(total), np.nan)
+        molar_density = np.full(len(total), np.nan)
+        tier = np.full(len(total), EOS, dtype=np.int8)
+        thermal = {name: np.full(len(total), np.nan) for name in THERMODYNAMIC_PROPERTIES}
+        if len(present):
+            unique, rows = np.unique(matrix[present] / total[present, None], axis=0, return_inverse=True)
+            mixture = detail_mixture(unique[0]) if len(unique) == 1 else DetailMixture(unique)
+            rows = rows.ravel()
+            molar_mass[present] = mixture.molar_mass[rows]
+            if tolerance is None:
+                molar_density[present] = mixture.solve_density(pressure[present], temperature_k[present], rows)
+            else:
+                fractions = unique[rows]
+                molar_density[present], tier[present] = tiered_density(
+                    mixture, R_DETAIL, pressure[present], temperature_k[present], rows,
+                    fractions @ PC, fractions @ TC, fractions @ FATOR_ACENTRICO, tolerance)
+            for name, values in state_properties(mixture, _DETAIL_IDEAL_GAS, R_DETAIL, molar_density[present],
+                                                 temperature_k[present], rows).items():
+                thermal[name][present] = values
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_factor = pressure / (molar_density * R_DETAIL * temperature_k)
+        return {
+            'compressibility_factor': z_factor,
+            'molar_mass': molar_mass,
+            'molar_density': molar_density,
+            'density': molar_density * molar_mass,
+            **thermal,
+            'valid': np.isfinite(molar_density),
+            'tier': tier,
+        }
 
-        # Normalizar composição
-        total = sum(composition.values())
-        norm_comp = {k: v / total for k, v in composition.items()}
-
-        # Poder calorífico superior da mistura (base molar)
-        pcs_molar = 0.0
-        molar_mass = 0.0
+    def calculate_jacobian_batch(self, compositions, pressure_kpa, temperature_c,
+                                 components: Sequence[str] | None = None,
+                                 properties: Sequence[str] | None = None) -> Dict[str, object]:
+        """
+        Propriedades e jacobianos em relação a cada componente, P e T
 
-        for comp, fraction in norm_comp.items():
-            if comp in self.heating_values:
-                pcs_molar += fraction * self.heating_values[comp]
+        Uma única chamada de calculate_properties_batch com todos os estados
+        perturbados (ver aga8_sensibilidade.property_jacobian).
 
-            if comp in self.critical_properties:
-                molar_mass += fraction * self.critical_properties[comp]['M']
+        Args:
+            compositions: Matriz (n amostras × componentes), em fração ou %
+            pressure_kpa, temperature_c: Escalares ou vetores com n valores
+            components: Nomes das colunas (padrão: DETAIL_COMPONENTS)
+            properties: Propriedades derivadas (padrão: todas as do lote)
 
-        # Converter para base mássica
-        pcs_mass = (pcs_molar / molar_mass) * 1000.0 if molar_mass > 0 else 0.0  # kJ/kg
+        Returns:
+            Dict[str, object]: inputs, values e jacobian (n × entradas) por propriedade
+        """
+        return property_jacobian(self, compositions, pressure_kpa, temperature_c,
+                                 list(components) if components is not None else list(DETAIL_COMPONENTS),
+                                 properties)
 
-        # PCI aproximado (considerando água formada)
-        h2o_formation_energy = 44.0  # kJ/mol de H2O
-        h_content = 0.0
+    def calculate_heating_values_detailed(self, composition: Dict[str, float]) -> Tuple[float, float]:
+        """
+        Calcula poderes caloríficos usando caracterização detalhada.
 
-        # Estimar conteúdo de hidrogênio
-        for comp, fraction in norm_comp.items():
-            if 'methane' in comp:
-                h_content += fraction * 4  # CH4 tem 4 H
-            elif 'ethane' in comp:
-                h_content += fraction * 6  # C2H6 tem 6 H
-            elif 'propane' in comp:
-                h_content += fraction * 8  # C3H8 tem 8 H
-            # Adicionar outros hidrocarbonetos conforme necessário
+        Args:
+            composition: Composição molar
 
-        water_heat_loss = (h_content / 2) * h2o_formation_energy  # Energia perdida na condensação
-        pci_mass = pcs_mass - (water_heat_loss / molar_mass * 1000.0) if molar_mass > 0 else pcs_mass * 0.9
+        Returns:
+            Tuple com (PCS_mass, PCI_mass) em kJ/kg
+        """
 
-        return pcs_mass, pci_mass
+        return self._composition(composition).heating_values
 
     def calculate_wobbe_index_detailed(self, composition: Dict[str, float]) -> float:
         """
@@ -246,16 +608,7 @@ class AGA8_DetailedCharacterization:
             Índice de Wobbe em kJ/m³
         """
 
-        pcs_mass, _ = self.calculate_heating_values_detailed(composition)
-        mix_props = self.calculate_mixture_properties(composition)
-
-        # Densidade relativa
-        specific_gravity = mix_props['M_mix'] / 28.9647  # Massa molar do ar seco
-
-        # Índice de Wobbe
-        wobbe_index = pcs_mass / math.sqrt(specific_gravity)
-
-        return wobbe_index
+        return self._composition(composition).wobbe_index
 
     def calculate_all_properties(self, pressure_kpa: float, temperature_c: float,
                                  composition: Dict[str, float]) -> Dict[str, float]:
@@ -271,28 +624,34 @@ class AGA8_DetailedCharacterization:
             Dicionário com todas as propriedades
         """
 
-        # Propriedades da mistura
-        mix_props = self.calculate_mixture_properties(composition)
-
-        # Propriedades fundamentais
-        z_factor = self.calculate_compressibility_detailed(pressure_kpa, temperature_c, composition)
-        density = self.calculate_density_detailed(pressure_kpa, temperature_c, composition)
-        pcs_mass, pci_mass = self.calculate_heating_values_detailed(composition)
-        wobbe_index = self.calculate_wobbe_index_detailed(composition)
+        # Propriedades fundamentais (uma única solução da densidade); as da
+        # mistura vêm da entrada da composição no cache
+        entry, molar_density = self._solve(pressure_kpa, temperature_c, composition)
+        # Energia, entalpia, entropia, Cp, Cv, w, JT e κ de uma só avaliação
+        # das derivadas de Helmholtz nessa densidade
+        thermal = state_properties(entry.mixture, _DETAIL_IDEAL_GAS, R_DETAIL, np.array([molar_density]),
+                                   np.array([temperature_c + 273.15]), np.zeros(1, dtype=int))
+        mix_props = entry.pseudo_critical
+        molar_mass = entry.molar_mass
+        z_factor = pressure_kpa / (molar_density * R_DETAIL * (temperature_c + 273.15))
+        density = molar_density * molar_mass  # kg/m³
+        pcs_mass, pci_mass = entry.heating_values
+        wobbe_index = entry.wobbe_index
 
         # Propriedades volumétricas
         pcs_volume = pcs_mass * density  # kJ/m³
         pci_volume = pci_mass * density  # kJ/m³
 
         # Número de metano (aproximado)
-        methane_number = composition.get('methane', 0.0) * 100.0
+        methane_number = float(entry.fractions[DETAIL_COMPONENTS.index('methane')]) * 100.0
 
         # Densidade relativa
-        specific_gravity = mix_props['M_mix'] / 28.9647
+        specific_gravity = entry.specific_gravity
 
         return {
             'compressibility_factor': z_factor,
-            'molar_mass': mix_props['M_mix'],
+            'molar_mass': molar_mass,
+            'molar_density': molar_density,
             'density': density,
             'heating_value_superior_mass': pcs_mass,
             'heating_value_inferior_mass': pci_mass,
@@ -305,7 +664,8 @@ class AGA8_DetailedCharacterization:
             'critical_pressure': mix_props['pc_mix'],
             'critical_temperature': mix_props['Tc_mix'],
             'critical_volume': mix_props['vc_mix'],
-            'acentric_factor': mix_props['w_mix']
+            'acentric_factor': mix_props['w_mix'],
+            **{name: float(values[0]) for name, values in thermal.items()},
         }
 
 
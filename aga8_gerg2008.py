@@ -6,153 +6,365 @@
 from __future__ import annotations
 
 import math
-import unicodedata
-from typing import Dict, Tuple
-
-# Mapeamento de nomes alternativos de componentes para os identificadores canônicos
-_COMPONENT_ALIAS_MAP = {
-    'methane': 'methane',
-    'metano': 'methane',
-    'ch4': 'methane',
-    'c1': 'methane',
-    'nitrogen': 'nitrogen',
-    'nitrogenio': 'nitrogen',
-    'nitrogeno': 'nitrogen',
-    'n2': 'nitrogen',
-    'carbondioxide': 'carbon_dioxide',
-    'dioxidocarbono': 'carbon_dioxide',
-    'co2': 'carbon_dioxide',
-    'ethane': 'ethane',
-    'etano': 'ethane',
-    'c2h6': 'ethane',
-    'propane': 'propane',
-    'propano': 'propane',
-    'c3h8': 'propane',
-    'isobutane': 'i-butane',
-    'isobutano': 'i-butane',
-    'ibutano': 'i-butane',
-    'ic4h10': 'i-butane',
-    'isobutene': 'i-butane',
-    'isobutanoch4': 'i-butane',
-    'isopentane': 'i-pentane',
-    'isopentano': 'i-pentane',
-    'ipentano': 'i-pentane',
-    'ic5h12': 'i-pentane',
-    'nbutane': 'n-butane',
-    'n-butane': 'n-butane',
-    'nbutano': 'n-butane',
-    'n-butano': 'n-butane',
-    'nc4h10': 'n-butane',
-    'npentane': 'n-pentane',
-    'n-pentane': 'n-pentane',
-    'npentano': 'n-pentane',
-    'nc5h12': 'n-pentane',
-    'nhexane': 'n-hexane',
-    'hexane': 'n-hexane',
-    'hexano': 'n-hexane',
-    'nc6h14': 'n-hexane',
-    'nheptane': 'n-heptane',
-    'heptane': 'n-heptane',
-    'heptano': 'n-heptane',
-    'nc7h16': 'n-heptane',
-    'noctane': 'n-octane',
-    'octane': 'n-octane',
-    'octano': 'n-octane',
-    'nc8h18': 'n-octane',
-    'nnonane': 'n-nonane',
-    'nonane': 'n-nonane',
-    'nonano': 'n-nonane',
-    'nc9h20': 'n-nonane',
-    'ndecane': 'n-decane',
-    'decane': 'n-decane',
-    'decano': 'n-decane',
-    'nc10h22': 'n-decane',
-    'oxygen': 'oxygen',
-    'oxigenio': 'oxygen',
-    'oxigeno': 'oxygen',
-    'o2': 'oxygen',
-    'hydrogen': 'hydrogen',
-    'hidrogenio': 'hydrogen',
-    'h2': 'hydrogen',
-    'carbonmonoxide': 'carbon_monoxide',
-    'monoxido': 'carbon_monoxide',
-    'co': 'carbon_monoxide',
-    'water': 'water',
-    'agua': 'water',
-    'h2o': 'water',
-    'helium': 'helium',
-    'helio': 'helium',
-    'he': 'helium',
-    'argon': 'argon',
-    'argao': 'argon',
-    'ar': 'argon',
-}
-
-# Fórmulas simplificadas para relatório
-_FORMULA_MAP = {
-    'methane': 'CH4',
-    'nitrogen': 'N2',
-    'carbon_dioxide': 'CO2',
-    'ethane': 'C2H6',
-    'propane': 'C3H8',
-    'i-butane': 'iC4H10',
-    'n-butane': 'nC4H10',
-    'i-pentane': 'iC5H12',
-    'n-pentane': 'nC5H12',
-    'n-hexane': 'nC6H14',
-    'n-heptane': 'nC7H16',
-    'n-octane': 'nC8H18',
-    'n-nonane': 'nC9H20',
-    'n-decane': 'nC10H22',
-    'oxygen': 'O2',
-    'carbon_monoxide': 'CO',
-    'hydrogen': 'H2',
-    'water': 'H2O',
-    'helium': 'He',
-    'argon': 'Ar',
-}
+from types import MappingProxyType
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from aga8_cache import CompositionCache
+from aga8_gerg2008_tabelas import (BINARY_REDUCING_PARAMETERS, CRITICAL_DENSITY, CRITICAL_TEMPERATURE,
+                                   DEPARTURE_FUNCTIONS, DEPARTURE_PAIRS, GERG_COMPONENTS, IDEAL_GAS,
+                                   IDEAL_GAS_TEMPERATURES, MOLAR_MASS, PURE_FLUID_TERMS, R_GERG)
+from aga8_niveis import EOS, tiered_density
+from aga8_propriedades import THERMODYNAMIC_PROPERTIES, ideal_gas_parameters, state_properties
+from aga8_sensibilidade import property_jacobian
+from componentes import (COMPONENTES, FATOR_ACENTRICO, MASSA_MOLAR, NOMES, PC, PCS, TC,
+                         indices_componentes, resolver_componente, vetor_composicao)
+
+# Ordem das colunas da matriz de composições no cálculo em lote (a das tabelas do GERG-2008)
+COMPONENTS: Tuple[str, ...] = GERG_COMPONENTS
+
+# Constantes alinhadas com COMPONENTS: a tabela única de componentes segue a mesma ordem
+_MOLAR_MASS = MASSA_MOLAR
+_CRITICAL_TEMPERATURE = TC
+_CRITICAL_PRESSURE = PC
+_HHV_MOLAR = PCS
+_REQUIRED = [COMPONENTS.index(c) for c in ('methane', 'ethane', 'propane')]
+_METHANE = COMPONENTS.index('methane')
+
+
+def _gerg_terms():
+    """
+    Tabelas do GERG-2008 em forma matricial, agrupadas por expoente
+
+    Cada termo vale coef·δ^d·τ^t·exp(ψ), com ψ = -e·δ^c + c2·δ² + c1·δ + c0:
+    o expoente -η(δ - ε)² - β(δ - γ) das funções de afastamento é expandido
+    aqui, uma única vez. Termos com os mesmos expoentes (muitos fluidos
+    compartilham a forma funcional) viram uma só coluna, de modo que os
+    coeficientes de uma mistura são x @ pure + (x_i·x_j) @ pair.
+    """
+    rows = []
+
+    def add(owner, n, d, t, c=0, e=0.0, c2=0.0, c1=0.0, c0=0.0):
+        rows.append((owner, n, (d, t, c, e, c2, c1, c0)))
+
+    for i, component in enumerate(GERG_COMPONENTS):
+        for n, c, d, t in PURE_FLUID_TERMS[component]:
+            add(i, n, d, t, c, 1.0 if c else 0.0)
+
+    pairs = [(GERG_COMPONENTS.index(first), GERG_COMPONENTS.index(second))
+             for first, second in DEPARTURE_PAIRS]
+    for p, (function, factor) in enumerate(DEPARTURE_PAIRS.values()):
+        for n, d, t, eta, epsilon, beta, gamma in DEPARTURE_FUNCTIONS[function]:
+            add(len(GERG_COMPONENTS) + p, factor * n, d, t, c2=-eta, c1=2 * eta * epsilon - beta,
+                c0=-eta * epsilon ** 2 + beta * gamma)
+
+    exponents, column = np.unique([row[2] for row in rows], axis=0, return_inverse=True)
+    weights = np.zeros((len(GERG_COMPONENTS) + len(pairs), len(exponents)))
+    for (owner, n, _), k in zip(rows, column.ravel()):
+        weights[owner, k] += n
+    pairs = np.array(pairs)
+    return {
+        'exponents': exponents,
+        'pure': weights[:len(GERG_COMPONENTS)], 'pair': weights[len(GERG_COMPONENTS):],
+        'pairs_i': pairs[:, 0], 'pairs_j': pairs[:, 1],
+    }
+
+
+def _gerg_reducing_parameters():
+    """Matrizes (i ≤ j) das funções redutoras, no formato da implementação da NIST"""
+    size = len(GERG_COMPONENTS)
+    density = np.array(CRITICAL_DENSITY)
+    temperature = np.array(CRITICAL_TEMPERATURE)
+    beta_v, gamma_v = np.ones((size, size)), np.ones((size, size))
+    beta_t, gamma_t = np.ones((size, size)), np.ones((size, size))
+    for (first, second), values in BINARY_REDUCING_PARAMETERS.items():
+        i, j = GERG_COMPONENTS.index(first), GERG_COMPONENTS.index(second)
+        beta_v[i, j], gamma_v[i, j], beta_t[i, j], gamma_t[i, j] = values
+
+    volume_cbrt = 1.0 / np.cbrt(density) / 2.0
+    gamma_v = gamma_v * beta_v * (volume_cbrt[:, None] + volume_cbrt[None, :]) ** 3
+    gamma_t = gamma_t * beta_t * np.sqrt(temperature[:, None] * temperature[None, :])
+    pairs_i, pairs_j = np.triu_indices(size, k=1)
+    return {
+        'i': pairs_i, 'j': pairs_j,
+        'beta_v': beta_v[pairs_i, pairs_j] ** 2, 'gamma_v': gamma_v[pairs_i, pairs_j],
+        'beta_t': beta_t[pairs_i, pairs_j] ** 2, 'gamma_t': gamma_t[pairs_i, pairs_j],
+        'volume': 1.0 / density, 'temperature': temperature,
+    }
+
+
+_GERG_TERMS = _gerg_terms()
+_GERG_REDUCING = _gerg_reducing_parameters()
+_GERG_MOLAR_MASS = np.array(MOLAR_MASS)
+_GERG_IDEAL_GAS = ideal_gas_parameters(IDEAL_GAS, IDEAL_GAS_TEMPERATURES, GERG_COMPONENTS)
+
+# Elementos (estados × termos) avaliados por bloco nas somas vetorizadas
+_BLOCK_ELEMENTS = 1 << 20
+
+
+class GERG2008Mixture:
+    """
+    Termos do GERG-2008 que dependem apenas da composição
+
+    Calculados uma vez por composição (uma linha por composição): densidade e
+    temperatura redutoras, massa molar e os coeficientes x_i·n (puros) e
+    x_i·x_j·F_ij·n (afastamento), só com os termos não nulos. Uma varredura
+    de P e T sobre a mesma mistura custa apenas as iterações da densidade.
+    """
+
+    __slots__ = ('fractions', 'molar_mass', 'reducing_density', 'reducing_temperature',
+                 '_coef', '_d', '_t', '_c', '_e', '_c2', '_c1', '_c0')
+
+    def __init__(self, fractions) -> None:
+        x = np.atleast_2d(np.asarray(fractions, dtype=float))
+        self.fractions = x
+        self.molar_mass = x @ _GERG_MOLAR_MASS
+
+        # Só os pares de componentes presentes em alguma linha
+        reducing = _GERG_REDUCING
+        present = np.any(x > 0, axis=0)
+        pairs = present[reducing['i']] & present[reducing['j']]
+        columns = np.ascontiguousarray(x.T)
+        xi, xj = columns[reducing['i'][pairs]], columns[reducing['j'][pairs]]
+        weight = 2.0 * xi * xj * (xi + xj)
+        volume = x ** 2 @ reducing['volume'] + np.sum(np.divide(
+            weight * reducing['gamma_v'][pairs, None], reducing['beta_v'][pairs, None] * xi + xj,
+            out=np.zeros_like(weight), where=weight > 0), axis=0)
+        self.reducing_temperature = x ** 2 @ reducing['temperature'] + np.sum(np.divide(
+            weight * reducing['gamma_t'][pairs, None], reducing['beta_t'][pairs, None] * xi + xj,
+            out=np.zeros_like(weight), where=weight > 0), axis=0)
+        self.reducing_density = 1.0 / volume
+
+        terms = _GERG_TERMS
+        coef = x @ terms['pure'] + (terms['pair'].T @ (columns[terms['pairs_i']]
+                                                       * columns[terms['pairs_j']])).T
+        used = np.any(coef != 0, axis=0)
+        self._coef = coef[:, used]
+        self._d, self._t, self._c, self._e, self._c2, self._c1, self._c0 = terms['exponents'][used].T
+
+    def __len__(self) -> int:
+        return len(self.fractions)
+
+    def _temperature_weights(self, temperature_k: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Parte de cada termo que não depende da densidade: x·n·τ^t·exp(c0)"""
+        log_tau = np.log(self.reducing_temperature[rows] / temperature_k)[:, None]
+        return self._coef[rows] * np.exp(self._t * log_tau + self._c0)
+
+    def _delta_derivatives(self, weights: np.ndarray,
+                           delta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        delta = delta[:, None]
+        log_delta = np.log(delta)
+        delta_c = self._e * np.exp(self._c * log_delta)
+        quadratic = self._c2 * delta ** 2
+        terms = weights * np.exp(self._d * log_delta - delta_c + quadratic + self._c1 * delta)
+        first = self._d - self._c * delta_c + 2 * quadratic + self._c1 * delta
+        ar01 = np.sum(terms * first, axis=1)
+        ar02 = np.sum(terms * (first ** 2 - self._d - self._c * (self._c - 1) * delta_c
+                               + 2 * quadratic), axis=1)
+        return ar01, ar02
+
+    def _blocks(self, total: int):
+        block = max(1, _BLOCK_ELEMENTS // max(1, self._coef.shape[1]))
+        for start in range(0, total, block):
+            yield slice(start, start + block)
+
+    def residual_delta_derivatives(self, density: np.ndarray, temperature_k: np.ndarray,
+                                   rows: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        δ·∂αr/∂δ e δ²·∂²αr/∂δ² da energia de Helmholtz residual
+
+        Args:
+            density: Densidade molar (mol/dm³) de cada estado
+            temperature_k: Temperatura (K) de cada estado
+            rows: Linha da composição de cada estado (padrão: a única linha)
+        """
+        density = np.asarray(density, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(density), dtype=int)
+        ar01 = np.empty(len(density))
+        ar02 = np.empty(len(density))
+        for part in self._blocks(len(density)):
+            row = rows[part]
+            weights = self._temperature_weights(temperature[part], row)
+            ar01[part], ar02[part] = self._delta_derivatives(
+                weights, density[part] / self.reducing_density[row])
+        return ar01, ar02
+
+    def residual_derivatives(self, density: np.ndarray, temperature_k: np.ndarray,
+                             rows: np.ndarray | None = None) -> Tuple[np.ndarray, ...]:
+        """
+        αr e todas as derivadas até a segunda ordem em δ e τ, numa avaliação
+
+        Returns:
+            Tuple: ar00, ar01, ar02, ar10, ar11, ar20 (convenção de
+            aga8_propriedades); a parte em τ de cada termo é τ^t, logo
+            τ·∂/∂τ multiplica o termo por t
+        """
+        density = np.asarray(density, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(density), dtype=int)
+        result = np.empty((6, len(density)))
+        t = self._t
+        for part in self._blocks(len(density)):
+            row = rows[part]
+            delta = (density[part] / self.reducing_density[row])[:, None]
+            log_delta = np.log(delta)
+            delta_c = self._e * np.exp(self._c * log_delta)
+            quadratic = self._c2 * delta ** 2
+            terms = self._temperature_weights(temperature[part], row) * np.exp(
+                self._d * log_delta - delta_c + quadratic + self._c1 * delta)
+            first = self._d - self._c * delta_c + 2 * quadratic + self._c1 * delta
+            second = first ** 2 - self._d - self._c * (self._c - 1) * delta_c + 2 * quadratic
+            with_first = terms * first
+            result[:, part] = (terms.sum(axis=1), with_first.sum(axis=1), np.sum(terms * second, axis=1),
+                               terms @ t, with_first @ t, terms @ (t * (t - 1)))
+        return tuple(result)
+
+    def virial_coefficients(self, temperature_k: np.ndarray,
+                            rows: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Segundo e terceiro coeficientes do virial, B (dm³/mol) e C (dm⁶/mol²)
+
+        Limite δ → 0 de αr: só os termos com d ≤ 2 contribuem, e a
+        exponencial apenas com o seu coeficiente em δ (c1, menos e nos
+        termos com c = 1). Não avalia a parte em densidade.
+        """
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(temperature), dtype=int)
+        terms = np.flatnonzero(self._d <= 2)
+        d = self._d[terms]
+        linear = self._c1[terms] - np.where(self._c[terms] == 1, self._e[terms], 0.0)
+        log_tau = np.log(self.reducing_temperature[rows] / temperature)[:, None]
+        weights = self._coef[np.ix_(rows, terms)] * np.exp(self._t[terms] * log_tau + self._c0[terms])
+        first = weights @ (d == 1).astype(float)
+        second = weights @ np.where(d == 2, 1.0, np.where(d == 1, linear, 0.0))
+        reducing = self.reducing_density[rows]
+        return first / reducing, 2.0 * second / reducing ** 2
+
+    def solve_density(self, pressure_kpa: np.ndarray, temperature_k: np.ndarray,
+                      rows: np.ndarray | None = None, tolerance: float = 1e-7) -> np.ndarray:
+        """
+        Densidade molar (mol/dm³) da fase gasosa em cada par P/T
+
+        Newton em ln(v) com ln(P) como variável conhecida, como na rotina de
+        referência da NIST: parte do gás ideal, afasta-se de estados bifásicos
+        (dP/dD ≤ 0) e reinicia os pontos que saem da faixa de densidades.
+        Pontos que não convergem em 50 iterações ficam com NaN.
+        """
+        pressure = np.asarray(pressure_kpa, dtype=float)
+        temperature = np.asarray(temperature_k, dtype=float)
+        if rows is None:
+            rows = np.zeros(len(pressure), dtype=int)
+        result = np.full(len(pressure), np.nan)
+        valid = np.flatnonzero((pressure > 0) & (temperature > 0))
+        for part in self._blocks(len(valid)):
+            states = valid[part]
+            result[states] = self._solve_block(pressure[states], temperature[states],
+                                               rows[states], tolerance)
+        return result
+
+    def _solve_block(self, pressure: np.ndarray, temperature: np.ndarray, rows: np.ndarray,
+                     tolerance: float) -> np.ndarray:
+        # A parte em τ de cada termo é fixa durante as iterações
+        weights = self._temperature_weights(temperature, rows)
+        reducing = self.reducing_density[rows]
+
+        density = pressure / (R_GERG * temperature)
+        result = np.full(len(pressure), np.nan)
+        active = np.arange(len(pressure))
+        for iteration in range(1, 51):
+            if not len(active):
+                break
+            # Estados fora da faixa recomeçam da estimativa de líquido (3·Dr)
+            current = density[active]
+            restart = (current > np.exp(7.0)) | (current < np.exp(-100.0))
+            density[active] = np.where(restart, 3.0 * reducing[active], current)
+            current, temp = density[active], temperature[active]
+            ar01, ar02 = self._delta_derivatives(weights[active], current / reducing[active])
+            calculated = current * R_GERG * temp * (1.0 + ar01)
+            slope = R_GERG * temp * (1.0 + 2.0 * ar01 + ar02)
+
+            single_phase = (slope > 0) & (calculated > 0)
+            # Estado bifásico: afasta-se da região em direção à fase mais próxima
+            step = np.where(current > reducing[active], -0.1, 0.1)
+            if iteration > 5:
+                step /= 10.0 if 10 < iteration < 20 else 2.0
+            step[single_phase] = ((np.log(calculated[single_phase]) - np.log(pressure[active][single_phase]))
+                                  * calculated[single_phase] / (current[single_phase] * slope[single_phase]))
+            with np.errstate(over='ignore'):
+                density[active] = current * np.exp(-step)
+
+            converged = single_phase & (np.abs(step) < tolerance)
+            result[active[converged]] = density[active[converged]]
+            active = active[~converged]
+        return result
+
+
+class CompositionEntry:
+    """
+    O que depende só da composição normalizada, guardado no cache de composições
+
+    Vetor de frações (ordem de COMPONENTS), massa molar, propriedades
+    pseudocríticas (regra de Kay), poder calorífico superior molar e os
+    termos da equação de estado (GERG2008Mixture).
+    """
+
+    __slots__ = ('fractions', 'molar_mass', 'pseudo_critical_temperature',
+                 'pseudo_critical_pressure', 'heating_value_molar', 'mixture')
+
+    def __init__(self, fractions: np.ndarray) -> None:
+        self.fractions = fractions
+        self.molar_mass = float(fractions @ _MOLAR_MASS)
+        self.pseudo_critical_temperature = float(fractions @ _CRITICAL_TEMPERATURE)
+        self.pseudo_critical_pressure = float(fractions @ _CRITICAL_PRESSURE)
+        self.heating_value_molar = float(fractions @ _HHV_MOLAR)  # kJ/mol
+        self.mixture = GERG2008Mixture(fractions)
+
+    @property
+    def heating_value_mass(self) -> float:
+        """PCS em kJ/kg"""
+        return self.heating_value_molar / self.molar_mass * 1000.0
+
+
+_COMPOSITIONS = CompositionCache('gerg2008', CompositionEntry)
+
+
+def composition_entry(fractions) -> CompositionEntry:
+    """Entrada em cache de uma composição (frações na ordem de COMPONENTS, qualquer escala)"""
+    return _COMPOSITIONS.get(fractions)
+
+
+def gerg_mixture(fractions) -> GERG2008Mixture:
+    """GERG2008Mixture de uma composição (frações na ordem de COMPONENTS), em cache"""
+    return _COMPOSITIONS.get(fractions).mixture
 
 
 class AGA8_GERG2008:
-    """Implementação simplificada do método GERG 2008."""
-
-    def __init__(self) -> None:
-        self.R = 8.314472  # J/(mol·K)
-        self.critical_properties = {
-            'methane': {'Tc': 190.564, 'pc': 4599.2, 'M': 16.043},
-            'nitrogen': {'Tc': 126.192, 'pc': 3395.8, 'M': 28.014},
-            'carbon_dioxide': {'Tc': 304.1282, 'pc': 7377.3, 'M': 44.01},
-            'ethane': {'Tc': 305.322, 'pc': 4872.2, 'M': 30.07},
-            'propane': {'Tc': 369.89, 'pc': 4251.2, 'M': 44.097},
-            'i-butane': {'Tc': 407.817, 'pc': 3640.0, 'M': 58.123},
-            'n-butane': {'Tc': 425.125, 'pc': 3796.0, 'M': 58.123},
-            'i-pentane': {'Tc': 460.39, 'pc': 3378.0, 'M': 72.15},
-            'n-pentane': {'Tc': 469.7, 'pc': 3370.0, 'M': 72.15},
-            'n-hexane': {'Tc': 507.6, 'pc': 3025.0, 'M': 86.177},
-            'n-heptane': {'Tc': 540.2, 'pc': 2736.0, 'M': 100.204},
-            'n-octane': {'Tc': 569.4, 'pc': 2480.0, 'M': 114.232},
-            'n-nonane': {'Tc': 594.6, 'pc': 2290.0, 'M': 128.259},
-            'n-decane': {'Tc': 617.7, 'pc': 2110.0, 'M': 142.286},
-            'oxygen': {'Tc': 154.58, 'pc': 5043.0, 'M': 31.998},
-            'hydrogen': {'Tc': 33.19, 'pc': 1296.0, 'M': 2.0158},
-            'carbon_monoxide': {'Tc': 132.86, 'pc': 3494.0, 'M': 28.01},
-            'water': {'Tc': 647.096, 'pc': 22055.0, 'M': 18.015},
-            'helium': {'Tc': 5.1953, 'pc': 227.5, 'M': 4.0026},
-            'argon': {'Tc': 150.86, 'pc': 4863.0, 'M': 39.948},
-        }
+    """Cálculo de propriedades pelo método GERG 2008 (AGA 8 Part 2)."""
+
+    # Sem estado por instância: tabelas somente leitura e termos da mistura
+    # no cache de composições; uma instância serve o processo todo
+    # (ver aga8_registro).
+    __slots__ = ()
+
+    R = 8.314472  # J/(mol·K)
+    critical_properties = MappingProxyType({
+        c.nome: MappingProxyType({'Tc': c.tc, 'pc': c.pc, 'M': c.massa_molar}) for c in COMPONENTES
+    })
 
     @staticmethod
     def _canonical_component(name: str) -> str | None:
-        if not name:
-            return None
-        normalized = unicodedata.normalize('NFKD', str(name))
-        normalized = normalized.encode('ascii', 'ignore').decode('ascii')
-        normalized = normalized.lower().replace(' ', '').replace('-', '').replace('_', '')
-        return _COMPONENT_ALIAS_MAP.get(normalized)
+        component_id = resolver_componente(name)
+        return None if component_id is None else NOMES[component_id]
 
     @staticmethod
     def _component_formula(name: str) -> str:
-        return _FORMULA_MAP.get(name, name)
+        component_id = resolver_componente(name)
+        return name if component_id is None else COMPONENTES[component_id].formula
 
     def normalize_composition(self, composition: Dict[str, float]) -> Tuple[bool, str, Dict[str, float]]:
         normalized: Dict[str, float] = {}
@@ -201,64 +413,78 @@ class AGA8_GERG2008:
         return self.normalize_composition(composition)
 
     def calculate_molar_mass(self, composition: Dict[str, float]) -> float:
-        return sum(
-            fraction * self.critical_properties[component]['M']
-            for component, fraction in composition.items()
-            if component in self.critical_properties
-        )
+        return float(vetor_composicao(composition) @ _MOLAR_MASS)
+
+    @staticmethod
+    def _fraction_vector(composition: Dict[str, float]) -> np.ndarray:
+        fractions = np.array([composition.get(component, 0.0) for component in COMPONENTS], dtype=float)
+        return fractions / fractions.sum()
 
     def calculate_compressibility_factor(self, pressure_kpa: float, temperature_c: float,
                                          composition: Dict[str, float]) -> float:
-        temperature_k = temperature_c + 273.15
-        pr_mix = 0.0
-        tr_mix = 0.0
-        total_fraction = 0.0
-
-        for component, fraction in composition.items():
-            props = self.critical_properties.get(component)
-            if not props:
-                continue
-            pr_mix += fraction * (pressure_kpa / props['pc'])
-            tr_mix += fraction * (temperature_k / props['Tc'])
-            total_fraction += fraction
-
-        if total_fraction > 0:
-            pr_mix /= total_fraction
-            tr_mix /= total_fraction
-
-        z = 1.0 + pr_mix * (0.083 - 0.422 / (tr_mix ** 1.6)) + pr_mix ** 2 * (0.139 - 0.172 / (tr_mix ** 4.2))
-
-        return max(0.1, min(1.5, z))
+        _, pressure, temperature_k, _, molar_density, _ = self._sweep_density(
+            composition, pressure_kpa, temperature_c, None)
+        z_factor = float(pressure[0] / (molar_density[0] * self.R * temperature_k[0]))
+        if not math.isfinite(z_factor):
+            raise ValueError(f'GERG-2008 sem convergência da densidade a {pressure_kpa} kPa e {temperature_c} °C.')
+        return z_factor
 
     def calculate_density(self, pressure_kpa: float, temperature_c: float,
                           composition: Dict[str, float]) -> float:
         molar_mass = self.calculate_molar_mass(composition)
         z_factor = self.calculate_compressibility_factor(pressure_kpa, temperature_c, composition)
         temperature_k = temperature_c + 273.15
-        density = (pressure_kpa * molar_mass) / (z_factor * self.R * temperature_k)
-        return density / 1000.0  # kg/m³
-
-    def calculate_heating_values(self, composition: Dict[str, float]) -> Tuple[float, float]:
-        heating_values = {
-            'methane': 890.3,
-            'ethane': 1559.9,
-            'propane': 2219.9,
-            'n-butane': 2877.4,
-            'i-butane': 2868.8,
-            'n-pentane': 3536.2,
-            'i-pentane': 3528.8,
-            'n-hexane': 4194.8,
-            'n-heptane': 4850.0,
-            'n-octane': 5505.0,
-            'n-nonane': 6160.0,
-            'n-decane': 6815.0,
+        return (pressure_kpa * molar_mass) / (z_factor * self.R * temperature_k)  # kg/m³
+
+    def _sweep_density(self, composition: Dict[str, float], pressure_kpa, temperature_c,
+                       tolerance: float | None) -> Tuple[CompositionEntry, np.ndarray, np.ndarray,
+                                                         np.ndarray, np.ndarray, np.ndarray]:
+        """Entrada em cache, P, T (K), linhas, densidade molar e nível de cada par P/T"""
+        entry = composition_entry(self._fraction_vector(composition))
+        pressure, temperature = np.broadcast_arrays(np.atleast_1d(np.asarray(pressure_kpa, dtype=float)),
+                                                    np.atleast_1d(np.asarray(temperature_c, dtype=float)))
+        temperature_k = temperature + 273.15
+        rows = np.zeros(len(pressure), dtype=int)
+        molar_density, tier = self._molar_density(entry.fractions[None, :], pressure, temperature_k,
+                                                  rows, entry.mixture, tolerance)
+        return entry, pressure, temperature_k, rows, molar_density, tier
+
+    def calculate_pt_sweep(self, composition: Dict[str, float], pressure_kpa,
+                           temperature_c, tolerance: float | None = None) -> Dict[str, np.ndarray]:
+        """
+        Z, densidade e propriedades termodinâmicas de uma composição em vários pares P/T
+
+        Os termos da mistura (funções redutoras e coeficientes) ficam em cache
+        por composição; cada ponto custa as iterações da densidade e uma
+        avaliação de residual_derivatives na densidade resolvida.
+
+        Args:
+            tolerance: Erro relativo admitido em Z; quando informado, cada
+                ponto usa o nível mais barato que o atende (ver aga8_niveis);
+                as propriedades termodinâmicas, que pedem a equação completa,
+                ficam NaN nos pontos resolvidos por outro nível
+
+        Returns:
+            Dict[str, np.ndarray]: compressibility_factor, molar_density
+            (mol/dm³), density (kg/m³), THERMODYNAMIC_PROPERTIES (speed_of_sound
+            em m/s etc., ver aga8_propriedades) e tier (índice em
+            aga8_niveis.TIERS); NaN onde a densidade não converge
+        """
+        entry, pressure, temperature_k, rows, molar_density, tier = self._sweep_density(
+            composition, pressure_kpa, temperature_c, tolerance)
+        return {
+            'compressibility_factor': pressure / (molar_density * self.R * temperature_k),
+            'molar_density': molar_density,
+            'density': molar_density * entry.molar_mass,
+            **state_properties(entry.mixture, _GERG_IDEAL_GAS, R_GERG,
+                               np.where(tier == EOS, molar_density, np.nan), temperature_k, rows),
+            'tier': tier,
         }
 
-        total_hv = 0.0
-        molar_mass = self.calculate_molar_mass(composition)
-        for component, fraction in composition.items():
-            if component in heating_values:
-                total_hv += fraction * heating_values[component]
+    def calculate_heating_values(self, composition: Dict[str, float]) -> Tuple[float, float]:
+        fractions = vetor_composicao(composition)
+        total_hv = float(fractions @ _HHV_MOLAR)
+        molar_mass = float(fractions @ _MOLAR_MASS)
 
         pcs_mass = (total_hv / molar_mass) * 1000.0  # kJ/kg
         pci_mass = pcs_mass * 0.9
@@ -274,19 +500,11 @@ class AGA8_GERG2008:
         return molar_mass / 28.97
 
     def calculate_mixture_properties(self, composition: Dict[str, float]) -> Dict[str, float]:
-        molar_mass = self.calculate_molar_mass(composition)
-        critical_pressure = sum(
-            composition.get(comp, 0.0) * props['pc']
-            for comp, props in self.critical_properties.items()
-        )
-        critical_temperature = sum(
-            composition.get(comp, 0.0) * props['Tc']
-            for comp, props in self.critical_properties.items()
-        )
+        fractions = vetor_composicao(composition)
         return {
-            'molecular_weight': molar_mass,
-            'critical_pressure': critical_pressure,
-            'critical_temperature': critical_temperature,
+            'molecular_weight': float(fractions @ _MOLAR_MASS),
+            'critical_pressure': float(fractions @ _CRITICAL_PRESSURE),
+            'critical_temperature': float(fractions @ _CRITICAL_TEMPERATURE),
         }
 
     def calculate_properties(self, pressure_kpa: float, temperature_c: float,
@@ -295,34 +513,166 @@ class AGA8_GERG2008:
         if not valid:
             raise ValueError(message)
 
-        pcs_mass, pci_mass = self.calculate_heating_values(normalized)
-        z_factor = self.calculate_compressibility_factor(pressure_kpa, temperature_c, normalized)
-        density = self.calculate_density(pressure_kpa, temperature_c, normalized)
-        wobbe_index = self.calculate_wobbe_index(normalized)
-        specific_gravity = self.calculate_specific_gravity(normalized)
+        entry = composition_entry(self._fraction_vector(normalized))
+        columns, _ = self._evaluate(entry.fractions[None, :], np.array([float(pressure_kpa)]),
+                                    np.array([float(temperature_c)]), entry.mixture)
+        return {key: float(values[0]) for key, values in columns.items()}
+
+    def composition_matrix(self, compositions, components: Sequence[str] | None = None) -> np.ndarray:
+        """
+        Reordena uma matriz de composições para as colunas de COMPONENTS
+
+        Os nomes de `components` (aliases aceitos) são resolvidos uma única vez
+        por chamada; colunas não reconhecidas são descartadas e colunas repetidas
+        do mesmo componente são somadas, como em normalize_composition.
+        """
+        matrix = np.atleast_2d(np.asarray(compositions, dtype=float))
+        if components is None:
+            components = COMPONENTS
+        if matrix.shape[1] != len(components):
+            raise ValueError(f'Matriz com {matrix.shape[1]} colunas para {len(components)} componentes.')
+
+        mapping = np.zeros((len(components), len(COMPONENTS)))
+        ids = indices_componentes(components)
+        known = ids >= 0
+        mapping[np.flatnonzero(known), ids[known]] = 1.0
+        return np.clip(matrix, 0.0, None) @ mapping
+
+    def calculate_properties_batch(self, compositions, pressure_kpa, temperature_c,
+                                   components: Sequence[str] | None = None,
+                                   tolerance: float | None = None) -> Dict[str, np.ndarray]:
+        """
+        Propriedades de n composições em uma única passagem vetorizada
+
+        Args:
+            compositions: Matriz (n amostras × componentes), em fração ou %
+            pressure_kpa, temperature_c: Escalares ou vetores com n valores
+            components: Nomes das colunas (padrão: COMPONENTS)
+            tolerance: Erro relativo admitido em Z; quando informado, cada
+                linha usa o nível mais barato que o atende (ver aga8_niveis)
+
+        Returns:
+            Dict[str, np.ndarray]: As chaves de calculate_properties, uma coluna
+            por propriedade, mais `valid` e `tier` (índice em
+            aga8_niveis.TIERS); linhas inválidas (soma zero ou sem metano,
+            etano e propano) ficam com NaN
+        """
+        matrix = self.composition_matrix(compositions, components)
+        total = matrix.sum(axis=1)
+        valid = (total > 0) & np.all(matrix[:, _REQUIRED] > 0, axis=1)
+
+        fractions = np.zeros_like(matrix)
+        np.divide(matrix, total[:, None], out=fractions, where=valid[:, None])
+        pressure = np.broadcast_to(np.asarray(pressure_kpa, dtype=float), total.shape)
+        temperature = np.broadcast_to(np.asarray(temperature_c, dtype=float), total.shape)
+
+        columns, tier = self._evaluate(fractions, pressure, temperature, tolerance=tolerance)
+        for values in columns.values():
+            values[~valid] = np.nan
+        columns['valid'] = valid
+        columns['tier'] = tier
+        return columns
+
+    def calculate_jacobian_batch(self, compositions, pressure_kpa, temperature_c,
+                                 components: Sequence[str] | None = None,
+                                 properties: Sequence[str] | None = None) -> Dict[str, object]:
+        """
+        Propriedades e jacobianos em relação a cada componente, P e T
+
+        Uma única chamada de calculate_properties_batch com todos os estados
+        perturbados (ver aga8_sensibilidade.property_jacobian).
+
+        Args:
+            compositions: Matriz (n amostras × componentes), em fração ou %
+            pressure_kpa, temperature_c: Escalares ou vetores com n valores
+            components: Nomes das colunas (padrão: COMPONENTS)
+            properties: Propriedades derivadas (padrão: todas as do lote)
+
+        Returns:
+            Dict[str, object]: inputs, values e jacobian (n × entradas) por propriedade
+        """
+        return property_jacobian(self, compositions, pressure_kpa, temperature_c,
+                                 list(components) if components is not None else list(COMPONENTS),
+                                 properties)
 
-        mix_props = self.calculate_mixture_properties(normalized)
-        critical_pressure = mix_props['critical_pressure']
-        critical_temperature = mix_props['critical_temperature']
+    @staticmethod
+    def _molar_density(fractions: np.ndarray, pressure_kpa: np.ndarray, temperature_k: np.ndarray,
+                       rows: np.ndarray, mixture: GERG2008Mixture,
+                       tolerance: float | None) -> Tuple[np.ndarray, np.ndarray]:
+        """Densidade molar e nível de cada estado; sem tolerância, sempre a equação completa"""
+        if tolerance is None:
+            return (mixture.solve_density(pressure_kpa, temperature_k, rows),
+                    np.full(len(pressure_kpa), EOS, dtype=np.int8))
+        fractions = fractions[rows]
+        return tiered_density(mixture, R_GERG, pressure_kpa, temperature_k, rows,
+                              fractions @ _CRITICAL_PRESSURE, fractions @ _CRITICAL_TEMPERATURE,
+                              fractions @ FATOR_ACENTRICO, tolerance)
+
+    def _evaluate(self, fractions: np.ndarray, pressure_kpa: np.ndarray, temperature_c: np.ndarray,
+                  mixture: GERG2008Mixture | None = None,
+                  tolerance: float | None = None) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Núcleo vetorizado sobre frações já normalizadas, alinhadas com COMPONENTS
+
+        `mixture`, quando informada, são os termos da composição única de
+        todas as linhas (entrada do cache de composições). Devolve as colunas
+        de propriedades e o nível (aga8_niveis.TIERS) de cada linha.
+        """
+        temperature_k = temperature_c + 273.15
+        molar_mass = fractions @ _MOLAR_MASS
+        critical_pressure = fractions @ _CRITICAL_PRESSURE
+        critical_temperature = fractions @ _CRITICAL_TEMPERATURE
+
+        # Composições repetidas compartilham os termos da mistura
+        molar_density = np.full(len(fractions), np.nan)
+        tier = np.full(len(fractions), EOS, dtype=np.int8)
+        rows = np.zeros(len(fractions), dtype=int)
+        present = np.flatnonzero(fractions.sum(axis=1) > 0)
+        if mixture is not None:
+            molar_density, tier = self._molar_density(fractions, pressure_kpa, temperature_k, rows,
+                                                      mixture, tolerance)
+        elif len(present):
+            unique, inverse = np.unique(fractions[present], axis=0, return_inverse=True)
+            rows[present] = inverse.ravel()
+            mixture = gerg_mixture(unique[0]) if len(unique) == 1 else GERG2008Mixture(unique)
+            molar_density[present], tier[present] = self._molar_density(
+                unique, pressure_kpa[present], temperature_k[present], rows[present], mixture, tolerance)
+
+        # Energia, entalpia, entropia, Cp, Cv, w, JT e κ: uma avaliação das
+        # derivadas de Helmholtz na densidade já resolvida
+        if mixture is not None:
+            thermal = state_properties(mixture, _GERG_IDEAL_GAS, R_GERG, molar_density, temperature_k, rows)
+        else:
+            thermal = {name: np.full(len(fractions), np.nan) for name in THERMODYNAMIC_PROPERTIES}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_factor = pressure_kpa / (molar_density * self.R * temperature_k)
+            density = molar_density * molar_mass
+            pcs_mass = (fractions @ _HHV_MOLAR) / molar_mass * 1000.0
+            specific_gravity = molar_mass / 28.97
+            wobbe_index = pcs_mass / np.sqrt(specific_gravity)
+        pci_mass = pcs_mass * 0.9
 
         return {
             'compressibility_factor': z_factor,
-            'molar_mass': mix_props['molecular_weight'],
+            'molar_mass': molar_mass,
+            'molar_density': molar_density,
             'density': density,
             'heating_value_mass': pcs_mass,
-            'heating_value_mass_hhv': pcs_mass,
+            'heating_value_mass_hhv': pcs_mass.copy(),
             'heating_value_mass_lhv': pci_mass,
             'heating_value_volume': pcs_mass * density,
             'heating_value_volume_hhv': pcs_mass * density,
             'heating_value_volume_lhv': pci_mass * density,
             'wobbe_index': wobbe_index,
-            'methane_number': normalized.get('methane', 0.0) * 100.0,
+            'methane_number': fractions[:, _METHANE] * 100.0,
             'specific_gravity': specific_gravity,
             'critical_pressure': critical_pressure,
             'critical_temperature': critical_temperature,
-            'pseudo_critical_pressure': critical_pressure,
-            'pseudo_critical_temperature': critical_temperature,
-        }
+            'pseudo_critical_pressure': critical_pressure.copy(),
+            'pseudo_critical_temperature': critical_temperature.copy(),
+            **thermal,
+        }, tier
 
     def calculate_gas_properties(self, pressure_kpa: float, temperature_c: float,
                                  composition: Dict[str, float]) -> Dict[str, object]:
@@ -333,12 +683,15 @@ class AGA8_GERG2008:
                 'validation': {'valid': False, 'message': message}
             }
 
-        mix_props = self.calculate_mixture_properties(normalized)
-        z_factor = self.calculate_compressibility_factor(pressure_kpa, temperature_c, normalized)
-        density = self.calculate_density(pressure_kpa, temperature_c, normalized)
-        pcs_mass, pci_mass = self.calculate_heating_values(normalized)
-        wobbe_index = self.calculate_wobbe_index(normalized)
-        specific_gravity = self.calculate_specific_gravity(normalized)
+        entry = composition_entry(self._fraction_vector(normalized))
+        columns, _ = self._evaluate(entry.fractions[None, :], np.array([float(pressure_kpa)]),
+                                    np.array([float(temperature_c)]), entry.mixture)
+        props = {key: float(values[0]) for key, values in columns.items()}
+        z_factor = props['compressibility_factor']
+        density = props['density']
+        pcs_mass, pci_mass = props['heating_value_mass_hhv'], props['heating_value_mass_lhv']
+        wobbe_index = props['wobbe_index']
+        specific_gravity = props['specific_gravity']
 
         hhv_vol = pcs_mass * density / 1000.0
         lhv_vol = pci_mass * density / 1000.0
@@ -356,9 +709,9 @@ class AGA8_GERG2008:
                 'composition_molar': composition_molar,
             },
             'mixture_properties': {
-                'molecular_weight': mix_props['molecular_weight'],
-                'critical_temperature': mix_props['critical_temperature'],
-                'critical_pressure': mix_props['critical_pressure'],
+                'molecular_weight': props['molar_mass'],
+                'critical_temperature': props['critical_temperature'],
+                'critical_pressure': props['critical_pressure'],
             },
             'density_properties': {
                 'density_kg_m3': density,
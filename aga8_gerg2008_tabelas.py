@@ -0,0 +1,746 @@
+# -*- coding: utf-8 -*-
+"""
+Tabelas de coeficientes do GERG-2008 (AGA 8 2017 Part 2)
+
+Kunz, O.; Wagner, W. The GERG-2008 Wide-Range Equation of State for Natural
+Gases and Other Mixtures: An Expansion of GERG-2004. J. Chem. Eng. Data 57
+(2012) 3032-3091. Componentes na ordem da implementação de referência da NIST
+para a AGA 8 Part 2 (a mesma do método DETAIL da Part 1).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+# Constante dos gases do GERG-2008, J/(mol·K)
+R_GERG = 8.314472
+
+GERG_COMPONENTS: Tuple[str, ...] = (
+    'methane',
+    'nitrogen',
+    'carbon_dioxide',
+    'ethane',
+    'propane',
+    'i-butane',
+    'n-butane',
+    'i-pentane',
+    'n-pentane',
+    'n-hexane',
+    'n-heptane',
+    'n-octane',
+    'n-nonane',
+    'n-decane',
+    'hydrogen',
+    'oxygen',
+    'carbon_monoxide',
+    'water',
+    'hydrogen_sulfide',
+    'helium',
+    'argon',
+)
+
+# Massa molar (g/mol)
+MOLAR_MASS: Tuple[float, ...] = (
+    16.04246, 28.0134, 44.0095, 30.06904, 44.09562, 58.1222, 58.1222,
+    72.14878, 72.14878, 86.17536, 100.20194, 114.22852, 128.2551, 142.28168,
+    2.01588, 31.9988, 28.0101, 18.01528, 34.08088, 4.002602, 39.948,
+)
+
+# Densidade (mol/dm³) e temperatura (K) críticas: parâmetros redutores dos componentes puros
+CRITICAL_DENSITY: Tuple[float, ...] = (
+    10.139342719, 11.1839, 10.624978698, 6.87085454, 5.000043088, 3.86014294, 3.920016792,
+    3.271, 3.215577588, 2.705877875, 2.315324434, 2.056404127, 1.81, 1.64,
+    14.94, 13.63, 10.85, 17.87371609, 10.19, 17.399, 13.407429659,
+)
+CRITICAL_TEMPERATURE: Tuple[float, ...] = (
+    190.564, 126.192, 304.1282, 305.322, 369.825, 407.817, 425.125,
+    460.35, 469.7, 507.82, 540.13, 569.32, 594.55, 617.7,
+    33.19, 154.595, 132.86, 647.096, 373.1, 5.1953, 150.687,
+)
+
+# Parte residual dos componentes puros, termos (n, c, d, t):
+# alfa_r = soma n·δ^d·τ^t·exp(-δ^c), sem a exponencial nos termos polinomiais (c = 0)
+PURE_FLUID_TERMS: Dict[str, Tuple[Tuple[float, int, int, float], ...]] = {
+    'methane': (
+        (0.57335704239162, 0, 1, 0.125),
+        (-1.676068752373, 0, 1, 1.125),
+        (0.23405291834916, 0, 2, 0.375),
+        (-0.21947376343441, 0, 2, 1.125),
+        (0.016369201404128, 0, 4, 0.625),
+        (0.01500440638928, 0, 4, 1.5),
+        (0.098990489492918, 1, 1, 0.625),
+        (0.58382770929055, 1, 1, 2.625),
+        (-0.7478686756039, 1, 1, 2.75),
+        (0.30033302857974, 1, 2, 2.125),
+        (0.20985543806568, 1, 3, 2.0),
+        (-0.018590151133061, 1, 6, 1.75),
+        (-0.15782558339049, 2, 2, 4.5),
+        (0.12716735220791, 2, 3, 4.75),
+        (-0.032019743894346, 2, 3, 5.0),
+        (-0.068049729364536, 2, 4, 4.0),
+        (0.024291412853736, 2, 4, 4.5),
+        (0.0051440451639444, 3, 2, 7.5),
+        (-0.019084949733532, 3, 3, 14.0),
+        (0.0055229677241291, 3, 4, 11.5),
+        (-0.0044197392976085, 6, 5, 26.0),
+        (0.040061416708429, 6, 6, 28.0),
+        (-0.033752085907575, 6, 6, 30.0),
+        (-0.0025127658213357, 6, 7, 16.0),
+    ),
+    'nitrogen': (
+        (0.59889711801201, 0, 1, 0.125),
+        (-1.6941557480731, 0, 1, 1.125),
+        (0.24579736191718, 0, 2, 0.375),
+        (-0.23722456755175, 0, 2, 1.125),
+        (0.017954918715141, 0, 4, 0.625),
+        (0.014592875720215, 0, 4, 1.5),
+        (0.10008065936206, 1, 1, 0.625),
+        (0.7315711538553, 1, 1, 2.625),
+        (-0.88372272336366, 1, 1, 2.75),
+        (0.31887660246708, 1, 2, 2.125),
+        (0.20766491728799, 1, 3, 2.0),
+        (-0.019379315454158, 1, 6, 1.75),
+        (-0.16936641554983, 2, 2, 4.5),
+        (0.13546846041701, 2, 3, 4.75),
+        (-0.033066712095307, 2, 3, 5.0),
+        (-0.060690817018557, 2, 4, 4.0),
+        (0.012797548292871, 2, 4, 4.5),
+        (0.0058743664107299, 3, 2, 7.5),
+        (-0.018451951971969, 3, 3, 14.0),
+        (0.0047226622042472, 3, 4, 11.5),
+        (-0.0052024079680599, 6, 5, 26.0),
+        (0.043563505956635, 6, 6, 28.0),
+        (-0.036251690750939, 6, 6, 30.0),
+        (-0.0028974026866543, 6, 7, 16.0),
+    ),
+    'carbon_dioxide': (
+        (0.52646564804653, 0, 1, 0.0),
+        (-1.4995725042592, 0, 1, 1.25),
+        (0.27329786733782, 0, 2, 1.625),
+        (0.12949500022786, 0, 3, 0.375),
+        (0.15404088341841, 1, 3, 0.375),
+        (-0.58186950946814, 1, 3, 1.375),
+        (-0.18022494838296, 1, 4, 1.125),
+        (-0.095389904072812, 1, 5, 1.375),
+        (-0.0080486819317679, 1, 6, 0.125),
+        (-0.03554775127309, 1, 6, 1.625),
+        (-0.28079014882405, 2, 1, 3.75),
+        (-0.082435890081677, 2, 4, 3.5),
+        (0.010832427979006, 3, 1, 7.5),
+        (-0.0067073993161097, 3, 1, 8.0),
+        (-0.0046827907600524, 3, 3, 6.0),
+        (-0.028359911832177, 3, 3, 16.0),
+        (0.019500174744098, 3, 4, 11.0),
+        (-0.21609137507166, 5, 5, 24.0),
+        (0.43772794926972, 5, 5, 26.0),
+        (-0.22130790113593, 5, 5, 28.0),
+        (0.015190189957331, 6, 5, 24.0),
+        (-0.0153809489533, 6, 5, 26.0),
+    ),
+    'ethane': (
+        (0.63596780450714, 0, 1, 0.125),
+        (-1.7377981785459, 0, 1, 1.125),
+        (0.28914060926272, 0, 2, 0.375),
+        (-0.33714276845694, 0, 2, 1.125),
+        (0.022405964699561, 0, 4, 0.625),
+        (0.015715424886913, 0, 4, 1.5),
+        (0.11450634253745, 1, 1, 0.625),
+        (1.0612049379745, 1, 1, 2.625),
+        (-1.2855224439423, 1, 1, 2.75),
+        (0.39414630777652, 1, 2, 2.125),
+        (0.31390924682041, 1, 3, 2.0),
+        (-0.021592277117247, 1, 6, 1.75),
+        (-0.21723666564905, 2, 2, 4.5),
+        (-0.28999574439489, 2, 3, 4.75),
+        (0.4232117302573, 2, 3, 5.0),
+        (0.04643410025926, 2, 4, 4.0),
+        (-0.13138398329741, 2, 4, 4.5),
+        (0.011492850364368, 3, 2, 7.5),
+        (-0.033387688429909, 3, 3, 14.0),
+        (0.015183171583644, 3, 4, 11.5),
+        (-0.0047610805647657, 6, 5, 26.0),
+        (0.046917166277885, 6, 6, 28.0),
+        (-0.039401755804649, 6, 6, 30.0),
+        (-0.0032569956247611, 6, 7, 16.0),
+    ),
+    'propane': (
+        (1.0403973107358, 0, 1, 0.25),
+        (-2.8318404081403, 0, 1, 1.125),
+        (0.84393809606294, 0, 1, 1.5),
+        (-0.076559591850023, 0, 2, 1.375),
+        (0.09469737305728, 0, 3, 0.25),
+        (0.00024796475497006, 0, 7, 0.875),
+        (0.2774376042287, 1, 2, 0.625),
+        (-0.043846000648377, 1, 5, 1.75),
+        (-0.2699106478435, 2, 1, 3.625),
+        (-0.06931341308986, 2, 4, 3.625),
+        (-0.029632145981653, 3, 3, 14.5),
+        (0.01404012675138, 3, 4, 12.0),
+    ),
+    'i-butane': (
+        (1.04293315891, 0, 1, 0.25),
+        (-2.8184272548892, 0, 1, 1.125),
+        (0.8617623239785, 0, 1, 1.5),
+        (-0.10613619452487, 0, 2, 1.375),
+        (0.098615749302134, 0, 3, 0.25),
+        (0.00023948208682322, 0, 7, 0.875),
+        (0.3033000485695, 1, 2, 0.625),
+        (-0.041598156135099, 1, 5, 1.75),
+        (-0.29991937470058, 2, 1, 3.625),
+        (-0.080369342764109, 2, 4, 3.625),
+        (-0.029761373251151, 3, 3, 14.5),
+        (0.01305963030314, 3, 4, 12.0),
+    ),
+    'n-butane': (
+        (1.0626277411455, 0, 1, 0.25),
+        (-2.862095182835, 0, 1, 1.125),
+        (0.88738233403777, 0, 1, 1.5),
+        (-0.12570581155345, 0, 2, 1.375),
+        (0.10286308708106, 0, 3, 0.25),
+        (0.00025358040602654, 0, 7, 0.875),
+        (0.32325200233982, 1, 2, 0.625),
+        (-0.037950761057432, 1, 5, 1.75),
+        (-0.32534802014452, 2, 1, 3.625),
+        (-0.079050969051011, 2, 4, 3.625),
+        (-0.020636720547775, 3, 3, 14.5),
+        (0.005705380933475, 3, 4, 12.0),
+    ),
+    'i-pentane': (
+        (1.0963, 0, 1, 0.25),
+        (-3.0402, 0, 1, 1.125),
+        (1.0317, 0, 1, 1.5),
+        (-0.1541, 0, 2, 1.375),
+        (0.11535, 0, 3, 0.25),
+        (0.00029809, 0, 7, 0.875),
+        (0.39571, 1, 2, 0.625),
+        (-0.045881, 1, 5, 1.75),
+        (-0.35804, 2, 1, 3.625),
+        (-0.10107, 2, 4, 3.625),
+        (-0.035484, 3, 3, 14.5),
+        (0.018156, 3, 4, 12.0),
+    ),
+    'n-pentane': (
+        (1.0968643098001, 0, 1, 0.25),
+        (-2.9988888298061, 0, 1, 1.125),
+        (0.99516886799212, 0, 1, 1.5),
+        (-0.16170708558539, 0, 2, 1.375),
+        (0.11334460072775, 0, 3, 0.25),
+        (0.00026760595150748, 0, 7, 0.875),
+        (0.40979881986931, 1, 2, 0.625),
+        (-0.040876423083075, 1, 5, 1.75),
+        (-0.38169482469447, 2, 1, 3.625),
+        (-0.10931956843993, 2, 4, 3.625),
+        (-0.03207322332799, 3, 3, 14.5),
+        (0.016877016216975, 3, 4, 12.0),
+    ),
+    'n-hexane': (
+        (1.0553238013661, 0, 1, 0.25),
+        (-2.6120615890629, 0, 1, 1.125),
+        (0.7661388296726, 0, 1, 1.5),
+        (-0.29770320622459, 0, 2, 1.375),
+        (0.11879907733358, 0, 3, 0.25),
+        (0.00027922861062617, 0, 7, 0.875),
+        (0.46347589844105, 1, 2, 0.625),
+        (0.011433196980297, 1, 5, 1.75),
+        (-0.48256968738131, 2, 1, 3.625),
+        (-0.093750558924659, 2, 4, 3.625),
+        (-0.0067273247155994, 3, 3, 14.5),
+        (-0.0051141583585428, 3, 4, 12.0),
+    ),
+    'n-heptane': (
+        (1.0543747645262, 0, 1, 0.25),
+        (-2.6500681506144, 0, 1, 1.125),
+        (0.81730047827543, 0, 1, 1.5),
+        (-0.30451391253428, 0, 2, 1.375),
+        (0.122538687108, 0, 3, 0.25),
+        (0.00027266472743928, 0, 7, 0.875),
+        (0.4986582568167, 1, 2, 0.625),
+        (-0.00071432815084176, 1, 5, 1.75),
+        (-0.5423689552545, 2, 1, 3.625),
+        (-0.13801821610756, 2, 4, 3.625),
+        (-0.0061595287380011, 3, 3, 14.5),
+        (0.00048602510393022, 3, 4, 12.0),
+    ),
+    'n-octane': (
+        (1.0722544875633, 0, 1, 0.25),
+        (-2.4632951172003, 0, 1, 1.125),
+        (0.65386674054928, 0, 1, 1.5),
+        (-0.36324974085628, 0, 2, 1.375),
+        (0.1271326962676, 0, 3, 0.25),
+        (0.0003071357277793, 0, 7, 0.875),
+        (0.5265685698754, 1, 2, 0.625),
+        (0.019362862857653, 1, 5, 1.75),
+        (-0.58939426849155, 2, 1, 3.625),
+        (-0.14069963991934, 2, 4, 3.625),
+        (-0.0078966330500036, 3, 3, 14.5),
+        (0.0033036597968109, 3, 4, 12.0),
+    ),
+    'n-nonane': (
+        (1.1151, 0, 1, 0.25),
+        (-2.702, 0, 1, 1.125),
+        (0.83416, 0, 1, 1.5),
+        (-0.38828, 0, 2, 1.375),
+        (0.1376, 0, 3, 0.25),
+        (0.00028185, 0, 7, 0.875),
+        (0.62037, 1, 2, 0.625),
+        (0.015847, 1, 5, 1.75),
+        (-0.61726, 2, 1, 3.625),
+        (-0.15043, 2, 4, 3.625),
+        (-0.012982, 3, 3, 14.5),
+        (0.0044325, 3, 4, 12.0),
+    ),
+    'n-decane': (
+        (1.0461, 0, 1, 0.25),
+        (-2.4807, 0, 1, 1.125),
+        (0.74372, 0, 1, 1.5),
+        (-0.52579, 0, 2, 1.375),
+        (0.15315, 0, 3, 0.25),
+        (0.00032865, 0, 7, 0.875),
+        (0.84178, 1, 2, 0.625),
+        (0.055424, 1, 5, 1.75),
+        (-0.73555, 2, 1, 3.625),
+        (-0.18507, 2, 4, 3.625),
+        (-0.020775, 3, 3, 14.5),
+        (0.012335, 3, 4, 12.0),
+    ),
+    'hydrogen': (
+        (5.3579928451252, 0, 1, 0.5),
+        (-6.2050252530595, 0, 1, 0.625),
+        (0.13830241327086, 0, 2, 0.375),
+        (-0.071397954896129, 0, 2, 0.625),
+        (0.015474053959733, 0, 4, 1.125),
+        (-0.14976806405771, 1, 1, 2.625),
+        (-0.026368723988451, 1, 5, 0.0),
+        (0.056681303156066, 1, 5, 0.25),
+        (-0.060063958030436, 1, 5, 1.375),
+        (-0.4504394202713, 2, 1, 4.0),
+        (0.424788402445, 2, 1, 4.25),
+        (-0.021997640827139, 3, 2, 5.0),
+        (-0.01049952137453, 3, 5, 8.0),
+        (-0.0028955902866816, 5, 1, 8.0),
+    ),
+    'oxygen': (
+        (0.88878286369701, 0, 1, 0.25),
+        (-2.4879433312148, 0, 1, 1.125),
+        (0.59750190775886, 0, 1, 1.5),
+        (0.0096501817061881, 0, 2, 1.375),
+        (0.07197042871277, 0, 3, 0.25),
+        (0.00022337443000195, 0, 7, 0.875),
+        (0.18558686391474, 1, 2, 0.625),
+        (-0.03812936803576, 1, 5, 1.75),
+        (-0.15352245383006, 2, 1, 3.625),
+        (-0.026726814910919, 2, 4, 3.625),
+        (-0.025675298677127, 3, 3, 14.5),
+        (0.0095714302123668, 3, 4, 12.0),
+    ),
+    'carbon_monoxide': (
+        (0.90554, 0, 1, 0.25),
+        (-2.4515, 0, 1, 1.125),
+        (0.53149, 0, 1, 1.5),
+        (0.024173, 0, 2, 1.375),
+        (0.072156, 0, 3, 0.25),
+        (0.00018818, 0, 7, 0.875),
+        (0.19405, 1, 2, 0.625),
+        (-0.043268, 1, 5, 1.75),
+        (-0.12778, 2, 1, 3.625),
+        (-0.027896, 2, 4, 3.625),
+        (-0.034154, 3, 3, 14.5),
+        (0.016329, 3, 4, 12.0),
+    ),
+    'water': (
+        (0.82728408749586, 0, 1, 0.5),
+        (-1.8602220416584, 0, 1, 1.25),
+        (-1.1199009613744, 0, 1, 1.875),
+        (0.15635753976056, 0, 2, 0.125),
+        (0.87375844859025, 0, 2, 1.5),
+        (-0.36674403715731, 0, 3, 1.0),
+        (0.053987893432436, 0, 4, 0.75),
+        (1.0957690214499, 1, 1, 1.5),
+        (0.053213037828563, 1, 5, 0.625),
+        (0.013050533930825, 1, 5, 2.625),
+        (-0.41079520434476, 2, 1, 5.0),
+        (0.1463744334412, 2, 2, 4.0),
+        (-0.055726838623719, 2, 4, 4.5),
+        (-0.0112017741438, 3, 4, 3.0),
+        (-0.0066062758068099, 5, 1, 4.0),
+        (0.0046918522004538, 5, 1, 6.0),
+    ),
+    'hydrogen_sulfide': (
+        (0.87641, 0, 1, 0.25),
+        (-2.0367, 0, 1, 1.125),
+        (0.21634, 0, 1, 1.5),
+        (-0.050199, 0, 2, 1.375),
+        (0.066994, 0, 3, 0.25),
+        (0.00019076, 0, 7, 0.875),
+        (0.20227, 1, 2, 0.625),
+        (-0.0045348, 1, 5, 1.75),
+        (-0.2223, 2, 1, 3.625),
+        (-0.034714, 2, 4, 3.625),
+        (-0.014885, 3, 3, 14.5),
+        (0.0074154, 3, 4, 12.0),
+    ),
+    'helium': (
+        (-0.45579024006737, 0, 1, 0.0),
+        (1.2516390754925, 0, 1, 0.125),
+        (-1.5438231650621, 0, 1, 0.75),
+        (0.020467489707221, 0, 4, 1.0),
+        (-0.34476212380781, 1, 1, 0.75),
+        (-0.020858459512787, 1, 3, 2.625),
+        (0.016227414711778, 1, 5, 0.125),
+        (-0.057471818200892, 1, 5, 1.25),
+        (0.019462416430715, 1, 5, 2.0),
+        (-0.03329568012302, 2, 2, 1.0),
+        (-0.010863577372367, 3, 1, 4.5),
+        (-0.022173365245954, 3, 2, 5.0),
+    ),
+    'argon': (
+        (0.85095714803969, 0, 1, 0.25),
+        (-2.400322294348, 0, 1, 1.125),
+        (0.54127841476466, 0, 1, 1.5),
+        (0.016919770692538, 0, 2, 1.375),
+        (0.068825965019035, 0, 3, 0.25),
+        (0.00021428032815338, 0, 7, 0.875),
+        (0.17429895321992, 1, 2, 0.625),
+        (-0.033654495604194, 1, 5, 1.75),
+        (-0.13526799857691, 2, 1, 3.625),
+        (-0.016387350791552, 2, 4, 3.625),
+        (-0.024987666851475, 3, 3, 14.5),
+        (0.0088769204815709, 3, 4, 12.0),
+    ),
+}
+
+# Parâmetros binários das funções redutoras (βv, γv, βT, γT); pares ausentes valem 1
+BINARY_REDUCING_PARAMETERS: Dict[Tuple[str, str], Tuple[float, float, float, float]] = {
+    ('methane', 'nitrogen'): (0.998721377, 1.013950311, 0.998098830, 0.979273013),
+    ('methane', 'carbon_dioxide'): (0.999518072, 1.002806594, 1.022624490, 0.975665369),
+    ('methane', 'ethane'): (0.997547866, 1.006617867, 0.996336508, 1.049707697),
+    ('methane', 'propane'): (1.004827070, 1.038470657, 0.989680305, 1.098655531),
+    ('methane', 'i-butane'): (1.011240388, 1.054319053, 0.980315756, 1.161117729),
+    ('methane', 'n-butane'): (0.979105972, 1.045375122, 0.994174910, 1.171607691),
+    ('methane', 'i-pentane'): (1.000000000, 1.343685343, 1.000000000, 1.188899743),
+    ('methane', 'n-pentane'): (0.948330120, 1.124508039, 0.992127525, 1.249173968),
+    ('methane', 'n-hexane'): (0.958015294, 1.052643846, 0.981844797, 1.330570181),
+    ('methane', 'n-heptane'): (0.962050831, 1.156655935, 0.977431529, 1.379850328),
+    ('methane', 'n-octane'): (0.994740603, 1.116549372, 0.957473785, 1.449245409),
+    ('methane', 'n-nonane'): (1.002852287, 1.141895355, 0.947716769, 1.528532478),
+    ('methane', 'n-decane'): (1.033086292, 1.146089637, 0.937777823, 1.568231489),
+    ('methane', 'hydrogen'): (1.000000000, 1.018702573, 1.000000000, 1.352643115),
+    ('methane', 'oxygen'): (1.000000000, 1.000000000, 1.000000000, 0.950000000),
+    ('methane', 'carbon_monoxide'): (0.997340772, 1.006102927, 0.987411732, 0.987473033),
+    ('methane', 'water'): (1.012783169, 1.585018334, 1.063333913, 0.775810513),
+    ('methane', 'hydrogen_sulfide'): (1.012599087, 1.040161207, 1.011090031, 0.961155729),
+    ('methane', 'helium'): (1.000000000, 0.881405683, 1.000000000, 3.159776855),
+    ('methane', 'argon'): (1.034630259, 1.014678542, 0.990954281, 0.989843388),
+    ('nitrogen', 'carbon_dioxide'): (0.977794634, 1.047578256, 1.005894529, 1.107654104),
+    ('nitrogen', 'ethane'): (0.978880168, 1.042352891, 1.007671428, 1.098650964),
+    ('nitrogen', 'propane'): (0.974424681, 1.081025408, 1.002677329, 1.201264026),
+    ('nitrogen', 'i-butane'): (0.986415830, 1.100576129, 0.992868130, 1.284462634),
+    ('nitrogen', 'n-butane'): (0.996082610, 1.146949309, 0.994515234, 1.304886838),
+    ('nitrogen', 'i-pentane'): (1.000000000, 1.154135439, 1.000000000, 1.381770770),
+    ('nitrogen', 'n-pentane'): (1.000000000, 1.078877166, 1.000000000, 1.419029041),
+    ('nitrogen', 'n-hexane'): (1.000000000, 1.195952177, 1.000000000, 1.472607971),
+    ('nitrogen', 'n-heptane'): (1.000000000, 1.404554090, 1.000000000, 1.520975334),
+    ('nitrogen', 'n-octane'): (1.000000000, 1.186067025, 1.000000000, 1.733280051),
+    ('nitrogen', 'n-nonane'): (1.000000000, 1.100405929, 0.956379450, 1.749119996),
+    ('nitrogen', 'n-decane'): (1.000000000, 1.000000000, 0.957934447, 1.822157123),
+    ('nitrogen', 'hydrogen'): (0.972532065, 0.970115357, 0.946134337, 1.175696583),
+    ('nitrogen', 'oxygen'): (0.999521770, 0.997082328, 0.997190589, 0.995157044),
+    ('nitrogen', 'carbon_monoxide'): (1.000000000, 1.008690943, 1.000000000, 0.993425388),
+    ('nitrogen', 'water'): (1.000000000, 1.094749685, 1.000000000, 0.968808467),
+    ('nitrogen', 'hydrogen_sulfide'): (0.910394249, 1.256844157, 1.004692366, 0.960174200),
+    ('nitrogen', 'helium'): (0.969501055, 0.932629867, 0.692868765, 1.471831580),
+    ('nitrogen', 'argon'): (1.004166412, 1.002212182, 0.999069843, 0.990034831),
+    ('carbon_dioxide', 'ethane'): (1.002525718, 1.032876701, 1.013871147, 0.900949530),
+    ('carbon_dioxide', 'propane'): (0.996898004, 1.047596298, 1.033620538, 0.908772477),
+    ('carbon_dioxide', 'i-butane'): (1.076551882, 1.081909003, 1.023339824, 0.929982936),
+    ('carbon_dioxide', 'n-butane'): (1.174760923, 1.222437324, 1.018171004, 0.911498231),
+    ('carbon_dioxide', 'i-pentane'): (1.060793104, 1.116793198, 1.019180957, 0.961218039),
+    ('carbon_dioxide', 'n-pentane'): (1.024311498, 1.068406078, 1.027000795, 0.979217302),
+    ('carbon_dioxide', 'n-hexane'): (1.000000000, 0.851343711, 1.000000000, 1.038675574),
+    ('carbon_dioxide', 'n-heptane'): (1.205469976, 1.164585914, 1.011806317, 1.046169823),
+    ('carbon_dioxide', 'n-octane'): (1.026169373, 1.104043935, 1.029690780, 1.074455386),
+    ('carbon_dioxide', 'n-nonane'): (1.000000000, 0.973386152, 1.007688620, 1.140671202),
+    ('carbon_dioxide', 'n-decane'): (1.000151132, 1.183394668, 1.020028790, 1.145512213),
+    ('carbon_dioxide', 'hydrogen'): (0.904142159, 1.152792550, 0.942320195, 1.782924792),
+    ('carbon_dioxide', 'water'): (0.949055959, 1.542328793, 0.997372205, 0.775453996),
+    ('carbon_dioxide', 'hydrogen_sulfide'): (0.906630564, 1.024085837, 1.016034583, 0.926018880),
+    ('carbon_dioxide', 'helium'): (0.846647561, 0.864141549, 0.768377630, 3.207456948),
+    ('carbon_dioxide', 'argon'): (1.008392428, 1.029205465, 0.996512863, 1.050971635),
+    ('ethane', 'propane'): (0.997607277, 1.003034720, 0.996199694, 1.014730190),
+    ('ethane', 'i-butane'): (1.000000000, 1.006616886, 1.000000000, 1.033283811),
+    ('ethane', 'n-butane'): (0.999157205, 1.006179146, 0.999130554, 1.034832749),
+    ('ethane', 'i-pentane'): (1.000000000, 1.045439935, 1.000000000, 1.021150247),
+    ('ethane', 'n-pentane'): (0.993851009, 1.026085655, 0.998688946, 1.066665676),
+    ('ethane', 'n-hexane'): (1.000000000, 1.169701102, 1.000000000, 1.092177796),
+    ('ethane', 'n-heptane'): (1.000000000, 1.057666085, 1.000000000, 1.134532014),
+    ('ethane', 'n-octane'): (1.007469726, 1.071917985, 0.984068272, 1.168636194),
+    ('ethane', 'n-nonane'): (1.000000000, 1.143534730, 1.000000000, 1.056033030),
+    ('ethane', 'n-decane'): (0.995676258, 1.098361281, 0.970918061, 1.237191558),
+    ('ethane', 'hydrogen'): (0.925367171, 1.106072040, 0.932969831, 1.902008495),
+    ('ethane', 'carbon_monoxide'): (1.000000000, 1.201417898, 1.000000000, 1.069224728),
+    ('ethane', 'hydrogen_sulfide'): (1.010817909, 1.030988277, 0.990197354, 0.902736660),
+    ('propane', 'i-butane'): (0.999243146, 1.001156119, 0.998012298, 1.005250774),
+    ('propane', 'n-butane'): (0.999795868, 1.003264179, 1.000310289, 1.007392782),
+    ('propane', 'i-pentane'): (1.040459289, 0.999432118, 0.994364425, 1.003269500),
+    ('propane', 'n-pentane'): (1.044919431, 1.019921513, 0.996484021, 1.008344412),
+    ('propane', 'n-hexane'): (1.000000000, 1.057872566, 1.000000000, 1.025657518),
+    ('propane', 'n-heptane'): (1.000000000, 1.079648053, 1.000000000, 1.050044169),
+    ('propane', 'n-octane'): (1.000000000, 1.102764612, 1.000000000, 1.063694129),
+    ('propane', 'n-nonane'): (1.000000000, 1.199769134, 1.000000000, 1.109973833),
+    ('propane', 'n-decane'): (0.984104227, 1.053040574, 0.985331233, 1.140905252),
+    ('propane', 'hydrogen'): (1.000000000, 1.074006110, 1.000000000, 2.308215191),
+    ('propane', 'carbon_monoxide'): (1.000000000, 1.108143673, 1.000000000, 1.197564208),
+    ('propane', 'water'): (1.000000000, 1.011759763, 1.000000000, 0.600340961),
+    ('propane', 'hydrogen_sulfide'): (0.936811219, 1.010593999, 0.992573556, 0.905829247),
+    ('i-butane', 'n-butane'): (0.999120311, 1.000414440, 0.999922459, 1.001432824),
+    ('i-butane', 'i-pentane'): (1.000000000, 1.002284353, 1.000000000, 1.001835788),
+    ('i-butane', 'n-pentane'): (1.000000000, 1.002779804, 1.000000000, 1.002495889),
+    ('i-butane', 'n-hexane'): (1.000000000, 1.010493989, 1.000000000, 1.006018054),
+    ('i-butane', 'n-heptane'): (1.000000000, 1.021668316, 1.000000000, 1.009885760),
+    ('i-butane', 'n-octane'): (1.000000000, 1.032807063, 1.000000000, 1.013945424),
+    ('i-butane', 'n-nonane'): (1.000000000, 1.047298475, 1.000000000, 1.017817492),
+    ('i-butane', 'n-decane'): (1.000000000, 1.060243344, 1.000000000, 1.021624748),
+    ('i-butane', 'hydrogen'): (1.000000000, 1.147595688, 1.000000000, 1.895305393),
+    ('i-butane', 'carbon_monoxide'): (1.000000000, 1.087272232, 1.000000000, 1.161390082),
+    ('i-butane', 'hydrogen_sulfide'): (1.012994431, 0.988591117, 0.974550548, 0.937130844),
+    ('n-butane', 'i-pentane'): (1.000000000, 1.002728434, 1.000000000, 1.000792201),
+    ('n-butane', 'n-pentane'): (1.000000000, 1.018159650, 1.000000000, 1.002143640),
+    ('n-butane', 'n-hexane'): (1.000000000, 1.034995284, 1.000000000, 1.009157060),
+    ('n-butane', 'n-heptane'): (1.000000000, 1.019174227, 1.000000000, 1.021283378),
+    ('n-butane', 'n-octane'): (1.000000000, 1.046905515, 1.000000000, 1.033180106),
+    ('n-butane', 'n-nonane'): (1.000000000, 1.049219137, 1.000000000, 1.014096448),
+    ('n-butane', 'n-decane'): (0.976951968, 1.027845529, 0.993688386, 1.076466918),
+    ('n-butane', 'hydrogen'): (1.000000000, 1.232939523, 1.000000000, 2.509259945),
+    ('n-butane', 'carbon_monoxide'): (1.000000000, 1.084740904, 1.000000000, 1.173916162),
+    ('n-butane', 'water'): (1.000000000, 1.223638763, 1.000000000, 0.615512682),
+    ('n-butane', 'hydrogen_sulfide'): (0.908113163, 1.033366041, 0.985962886, 0.926156602),
+    ('n-butane', 'argon'): (1.000000000, 1.214638734, 1.000000000, 1.245039498),
+    ('i-pentane', 'n-pentane'): (1.000000000, 1.000024335, 1.000000000, 1.000050537),
+    ('i-pentane', 'n-hexane'): (1.000000000, 1.002995876, 1.000000000, 1.001204174),
+    ('i-pentane', 'n-heptane'): (1.000000000, 1.009928206, 1.000000000, 1.003194615),
+    ('i-pentane', 'n-octane'): (1.000000000, 1.017880545, 1.000000000, 1.005647480),
+    ('i-pentane', 'n-nonane'): (1.000000000, 1.028994325, 1.000000000, 1.008191499),
+    ('i-pentane', 'n-decane'): (1.000000000, 1.039372957, 1.000000000, 1.010825138),
+    ('i-pentane', 'hydrogen'): (1.000000000, 1.184340443, 1.000000000, 1.996386669),
+    ('i-pentane', 'carbon_monoxide'): (1.000000000, 1.116694577, 1.000000000, 1.199326059),
+    ('i-pentane', 'hydrogen_sulfide'): (1.000000000, 0.835763343, 1.000000000, 0.982651529),
+    ('n-pentane', 'n-hexane'): (1.000000000, 1.002480637, 1.000000000, 1.000761237),
+    ('n-pentane', 'n-heptane'): (1.000000000, 1.008972412, 1.000000000, 1.002441051),
+    ('n-pentane', 'n-octane'): (1.000000000, 1.069223964, 1.000000000, 1.016422347),
+    ('n-pentane', 'n-nonane'): (1.000000000, 1.034910633, 1.000000000, 1.103421755),
+    ('n-pentane', 'n-decane'): (1.000000000, 1.016370338, 1.000000000, 1.049035838),
+    ('n-pentane', 'hydrogen'): (1.000000000, 1.188334783, 1.000000000, 2.013859174),
+    ('n-pentane', 'carbon_monoxide'): (1.000000000, 1.119954454, 1.000000000, 1.206043295),
+    ('n-pentane', 'water'): (1.000000000, 0.956677310, 1.000000000, 0.447666011),
+    ('n-pentane', 'hydrogen_sulfide'): (0.984613203, 1.076539234, 0.962006651, 0.959065662),
+    ('n-hexane', 'n-heptane'): (1.000000000, 1.001508227, 1.000000000, 0.999762786),
+    ('n-hexane', 'n-octane'): (1.000000000, 1.006268954, 1.000000000, 1.001633952),
+    ('n-hexane', 'n-nonane'): (1.000000000, 1.020761680, 1.000000000, 1.055369591),
+    ('n-hexane', 'n-decane'): (1.001516371, 1.013511439, 0.997641010, 1.028939539),
+    ('n-hexane', 'hydrogen'): (1.000000000, 1.243461678, 1.000000000, 3.021197546),
+    ('n-hexane', 'carbon_monoxide'): (1.000000000, 1.155145836, 1.000000000, 1.233272781),
+    ('n-hexane', 'water'): (1.000000000, 1.170217596, 1.000000000, 0.569681333),
+    ('n-hexane', 'hydrogen_sulfide'): (0.754473958, 1.339283552, 0.985891113, 0.956075596),
+    ('n-heptane', 'n-octane'): (1.000000000, 1.006767176, 1.000000000, 0.998793111),
+    ('n-heptane', 'n-nonane'): (1.000000000, 1.001370076, 1.000000000, 1.001150096),
+    ('n-heptane', 'n-decane'): (1.000000000, 1.002972346, 1.000000000, 1.002229938),
+    ('n-heptane', 'hydrogen'): (1.000000000, 1.159131722, 1.000000000, 3.169143057),
+    ('n-heptane', 'carbon_monoxide'): (1.000000000, 1.190354273, 1.000000000, 1.256123503),
+    ('n-heptane', 'hydrogen_sulfide'): (0.828967164, 1.087956749, 0.988937417, 1.013453092),
+    ('n-octane', 'n-nonane'): (1.000000000, 1.001357085, 1.000000000, 1.000235044),
+    ('n-octane', 'n-decane'): (1.000000000, 1.002553544, 1.000000000, 1.007186267),
+    ('n-octane', 'hydrogen'): (1.000000000, 1.305249405, 1.000000000, 2.191555216),
+    ('n-octane', 'carbon_monoxide'): (1.000000000, 1.219206702, 1.000000000, 1.276565536),
+    ('n-octane', 'water'): (1.000000000, 0.599484191, 1.000000000, 0.662072469),
+    ('n-nonane', 'n-decane'): (1.000000000, 1.000810520, 1.000000000, 1.000182392),
+    ('n-nonane', 'hydrogen'): (1.000000000, 1.342647661, 1.000000000, 2.234354040),
+    ('n-nonane', 'carbon_monoxide'): (1.000000000, 1.252151449, 1.000000000, 1.294070556),
+    ('n-nonane', 'hydrogen_sulfide'): (1.000000000, 1.082905109, 1.000000000, 1.086557826),
+    ('n-decane', 'hydrogen'): (1.695358382, 1.120233729, 1.064818089, 3.786003724),
+    ('n-decane', 'carbon_monoxide'): (1.000000000, 0.870184960, 1.049594632, 1.803567587),
+    ('n-decane', 'water'): (1.000000000, 0.551405318, 0.897162268, 0.740416402),
+    ('n-decane', 'hydrogen_sulfide'): (0.975187766, 1.171714677, 0.973091413, 1.103693489),
+    ('hydrogen', 'carbon_monoxide'): (1.000000000, 1.121416201, 1.000000000, 1.377504607),
+    ('oxygen', 'water'): (1.000000000, 1.143174289, 1.000000000, 0.964767932),
+    ('oxygen', 'argon'): (0.999746847, 0.993907223, 1.000023103, 0.990430423),
+    ('carbon_monoxide', 'hydrogen_sulfide'): (0.795660392, 1.101731308, 1.025536736, 1.022749748),
+    ('carbon_monoxide', 'argon'): (1.000000000, 1.159720623, 1.000000000, 0.954215746),
+    ('water', 'hydrogen_sulfide'): (1.000000000, 1.014832832, 1.000000000, 0.940587083),
+    ('water', 'argon'): (1.000000000, 1.038993495, 1.000000000, 1.070941866),
+}
+
+# Funções de afastamento, termos (n, d, t, η, ε, β, γ):
+# alfa_ij = soma n·δ^d·τ^t·exp(-η(δ - ε)² - β(δ - γ)); η = β = 0 nos termos polinomiais
+DEPARTURE_FUNCTIONS: Dict[str, Tuple[Tuple[float, int, float, float, float, float, float], ...]] = {
+    'methane-nitrogen': (
+        (-0.0098038985517335, 1, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (0.00042487270143005, 4, 1.85, 0.0, 0.0, 0.0, 0.0),
+        (-0.034800214576142, 1, 7.85, 1.0, 0.5, 1.0, 0.5),
+        (-0.13333813013896, 2, 5.4, 1.0, 0.5, 1.0, 0.5),
+        (-0.011993694974627, 2, 0.0, 0.25, 0.5, 2.5, 0.5),
+        (0.069243379775168, 2, 0.75, 0.0, 0.5, 3.0, 0.5),
+        (-0.31022508148249, 2, 2.8, 0.0, 0.5, 3.0, 0.5),
+        (0.24495491753226, 2, 4.45, 0.0, 0.5, 3.0, 0.5),
+        (0.22369816716981, 3, 4.25, 0.0, 0.5, 3.0, 0.5),
+    ),
+    'methane-carbon_dioxide': (
+        (-0.10859387354942, 1, 2.6, 0.0, 0.0, 0.0, 0.0),
+        (0.080228576727389, 2, 1.95, 0.0, 0.0, 0.0, 0.0),
+        (-0.0093303985115717, 3, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (0.040989274005848, 1, 3.95, 1.0, 0.5, 1.0, 0.5),
+        (-0.24338019772494, 2, 7.95, 0.5, 0.5, 2.0, 0.5),
+        (0.23855347281124, 3, 8.0, 0.0, 0.5, 3.0, 0.5),
+    ),
+    'methane-ethane': (
+        (-0.00080926050298746, 3, 0.65, 0.0, 0.0, 0.0, 0.0),
+        (-0.00075381925080059, 4, 1.55, 0.0, 0.0, 0.0, 0.0),
+        (-0.041618768891219, 1, 3.1, 1.0, 0.5, 1.0, 0.5),
+        (-0.23452173681569, 2, 5.9, 1.0, 0.5, 1.0, 0.5),
+        (0.14003840584586, 2, 7.05, 1.0, 0.5, 1.0, 0.5),
+        (0.063281744807738, 2, 3.35, 0.875, 0.5, 1.25, 0.5),
+        (-0.034660425848809, 2, 1.2, 0.75, 0.5, 1.5, 0.5),
+        (-0.23918747334251, 2, 5.8, 0.5, 0.5, 2.0, 0.5),
+        (0.0019855255066891, 2, 2.7, 0.0, 0.5, 3.0, 0.5),
+        (6.1777746171555, 3, 0.45, 0.0, 0.5, 3.0, 0.5),
+        (-6.9575358271105, 3, 0.55, 0.0, 0.5, 3.0, 0.5),
+        (1.0630185306388, 3, 1.95, 0.0, 0.5, 3.0, 0.5),
+    ),
+    'methane-propane': (
+        (0.013746429958576, 3, 1.85, 0.0, 0.0, 0.0, 0.0),
+        (-0.0074425012129552, 3, 3.95, 0.0, 0.0, 0.0, 0.0),
+        (-0.0045516600213685, 4, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (-0.0054546603350237, 4, 1.85, 0.0, 0.0, 0.0, 0.0),
+        (0.0023682016824471, 4, 3.85, 0.0, 0.0, 0.0, 0.0),
+        (0.18007763721438, 1, 5.25, 0.25, 0.5, 0.75, 0.5),
+        (-0.44773942932486, 1, 3.85, 0.25, 0.5, 1.0, 0.5),
+        (0.0193273748882, 1, 0.2, 0.0, 0.5, 2.0, 0.5),
+        (-0.30632197804624, 2, 6.5, 0.0, 0.5, 3.0, 0.5),
+    ),
+    'nitrogen-carbon_dioxide': (
+        (0.28661625028399, 2, 1.85, 0.0, 0.0, 0.0, 0.0),
+        (-0.10919833861247, 3, 1.4, 0.0, 0.0, 0.0, 0.0),
+        (-1.137403208227, 1, 3.2, 0.25, 0.5, 0.75, 0.5),
+        (0.76580544237358, 1, 2.5, 0.25, 0.5, 1.0, 0.5),
+        (0.0042638000926819, 1, 8.0, 0.0, 0.5, 2.0, 0.5),
+        (0.17673538204534, 2, 3.75, 0.0, 0.5, 3.0, 0.5),
+    ),
+    'nitrogen-ethane': (
+        (-0.47376518126608, 2, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (0.48961193461001, 2, 0.05, 0.0, 0.0, 0.0, 0.0),
+        (-0.0057011062090535, 3, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (-0.1996682004132, 1, 3.65, 1.0, 0.5, 1.0, 0.5),
+        (-0.69411103101723, 2, 4.9, 1.0, 0.5, 1.0, 0.5),
+        (0.69226192739021, 2, 4.45, 0.875, 0.5, 1.25, 0.5),
+    ),
+    'methane-hydrogen': (
+        (-0.25157134971934, 1, 2.0, 0.0, 0.0, 0.0, 0.0),
+        (-0.0062203841111983, 3, -1.0, 0.0, 0.0, 0.0, 0.0),
+        (0.088850315184396, 3, 1.75, 0.0, 0.0, 0.0, 0.0),
+        (-0.035592212573239, 4, 1.4, 0.0, 0.0, 0.0, 0.0),
+    ),
+    'generalized': (
+        (2.5574776844118, 1, 1.0, 0.0, 0.0, 0.0, 0.0),
+        (-7.9846357136353, 1, 1.55, 0.0, 0.0, 0.0, 0.0),
+        (4.7859131465806, 1, 1.7, 0.0, 0.0, 0.0, 0.0),
+        (-0.73265392369587, 2, 0.25, 0.0, 0.0, 0.0, 0.0),
+        (1.3805471345312, 2, 1.35, 0.0, 0.0, 0.0, 0.0),
+        (0.28349603476365, 3, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (-0.49087385940425, 3, 1.25, 0.0, 0.0, 0.0, 0.0),
+        (-0.10291888921447, 4, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (0.11836314681968, 4, 0.7, 0.0, 0.0, 0.0, 0.0),
+        (5.5527385721943e-05, 4, 5.4, 0.0, 0.0, 0.0, 0.0),
+    ),
+}
+
+# Pares com função de afastamento: (função, F_ij)
+DEPARTURE_PAIRS: Dict[Tuple[str, str], Tuple[str, float]] = {
+    ('methane', 'nitrogen'): ('methane-nitrogen', 1.0),
+    ('methane', 'carbon_dioxide'): ('methane-carbon_dioxide', 1.0),
+    ('methane', 'ethane'): ('methane-ethane', 1.0),
+    ('methane', 'propane'): ('methane-propane', 1.0),
+    ('methane', 'i-butane'): ('generalized', 0.771035405688),
+    ('methane', 'n-butane'): ('generalized', 1.0),
+    ('methane', 'hydrogen'): ('methane-hydrogen', 1.0),
+    ('nitrogen', 'carbon_dioxide'): ('nitrogen-carbon_dioxide', 1.0),
+    ('nitrogen', 'ethane'): ('nitrogen-ethane', 1.0),
+    ('ethane', 'propane'): ('generalized', 0.13042476515),
+    ('ethane', 'i-butane'): ('generalized', 0.260632376098),
+    ('ethane', 'n-butane'): ('generalized', 0.281570073085),
+    ('propane', 'i-butane'): ('generalized', -0.0551609771024),
+    ('propane', 'n-butane'): ('generalized', 0.0312572600489),
+    ('i-butane', 'n-butane'): ('generalized', -0.0551240293009),
+}
+
+# Parte de gás ideal (a mesma da AGA 8 Part 1, convertida para R_GERG), coeficientes
+# (n1, ..., n7) já na forma da rotina Alpha0GERG da NIST:
+# α0 = soma x_i·[ln(x_i·D) + n1 + n2/T - n3·ln T + soma n_j·ln|senh(θ_j/T)| (j = 4, 6)
+#      - soma n_j·ln cosh(θ_j/T) (j = 5, 7)]
+IDEAL_GAS: Dict[str, Tuple[float, float, float, float, float, float, float]] = {
+    'methane': (33.0358314959018, -15999.7632714513, 3.00089371505491,
+                0.763153487858279, 0.00460002102358394, 8.74435996455337, -4.4692304258286),
+    'nitrogen': (20.7650492944581, -2801.74051421843, 2.50032142727764,
+                 0.137320627599684, -0.146600670012479, 0.900664116326328, 0.0),
+    'carbon_dioxide': (23.8558025302001, -4902.19255796365, 2.50003142595224,
+                       2.0445293441604, -1.06044484657595, 2.03366929452646, 0.0139300636648966),
+    'ethane': (39.9274884030029, -23639.759688706, 3.00264372305301,
+               4.3394098325065, 1.23722565452142, 13.1974603166623, -6.01991751297016),
+    'propane': (47.9065616799486, -31236.776909532, 3.02940384535542,
+                6.60572019027787, 3.19701461139084, 19.1921877145055, -8.3727082659849),
+    'i-butane': (37.4992214150373, -38525.6774721651, 3.06715401788592,
+                 8.97579102226816, 5.25158400143749, 25.1424149089684, 16.1388737598731),
+    'n-butane': (39.7298059495301, -38957.986017955, 3.33945526239068,
+                 9.44897318486369, 6.89409150822806, 24.461911798849, 14.7824675606581),
+    'i-pentane': (46.369644725741, -51198.5420912554, 3.000013711033,
+                  11.761853755476, 20.1101919100816, 33.1689515928372, 0.0),
+    'n-pentane': (45.8758270988347, -45216.0352892643, 3.000013711033,
+                  8.95047090654704, 21.8360997980389, 33.4033526641259, 0.0),
+    'n-hexane': (50.1946478272423, -52747.072888542, 3.000013711033,
+                 11.6977534625169, 26.8143225501271, 38.616576490245, 0.0),
+    'n-heptane': (55.2738154706813, -57105.0701859993, 3.000013711033,
+                  13.7266627352885, 30.4708392615911, 43.5562990663749, 0.0),
+    'n-octane': (60.4558321841738, -60547.039206911, 3.000013711033,
+                 15.6865716927064, 33.8030544908925, 48.1733201676547, 0.0),
+    'n-nonane': (65.2940139662294, -66600.4313928712, 3.000013711033,
+                 18.0241823763433, 38.1236742375222, 53.3417437890223, 0.0),
+    'n-decane': (69.1366540583376, -74131.7922736264, 3.000013711033,
+                 21.0069960087664, 43.4932987784432, 58.3659667513463, 0.0),
+    'hydrogen': (16.2725237921635, -5836.96901019439, 1.47906675981349,
+                 0.958064378664093, 0.454442076947279, 1.5603971315196, -1.37560628696567),
+    'oxygen': (19.9990552436176, -2318.33192288481, 2.50147143253354,
+               1.07558491577096, 1.01334463131273, 0.0, 0.0),
+    'carbon_monoxide': (20.6552099324567, -2635.25479732485, 2.50056142837453,
+                        1.0286547012847, 0.00493002253179757, 0.0, 0.0),
+    'water': (24.7761868266541, -7766.76721199636, 3.00393372894875,
+              0.0105900483999465, 0.987634513809175, 3.06905402656958, 0.0),
+    'hydrogen_sulfide': (24.7804541961573, -6069.06224393554, 3.000013711033,
+                         3.11943425682352, 1.00243458145027, 0.0, 0.0),
+    'helium': (13.2437021394689, -745.377043972245, 1.5000068555165,
+               0.0, 0.0, 0.0, 0.0),
+    'argon': (13.2437021394689, -745.377043972245, 1.5000068555165,
+              0.0, 0.0, 0.0, 0.0),
+}
+
+# Temperaturas características θ_4 a θ_7 (K) da parte de gás ideal; 0 = termo ausente
+IDEAL_GAS_TEMPERATURES: Dict[str, Tuple[float, float, float, float]] = {
+    'methane': (820.659, 178.41, 1062.82, 1090.53),
+    'nitrogen': (662.738, 680.562, 1740.06, 0.0),
+    'carbon_dioxide': (919.306, 865.07, 483.553, 341.109),
+    'ethane': (559.314, 223.284, 1031.38, 1071.29),
+    'propane': (479.856, 200.893, 955.312, 1027.29),
+    'i-butane': (438.27, 198.018, 1905.02, 893.765),
+    'n-butane': (468.27, 183.636, 1914.1, 903.185),
+    'i-pentane': (292.503, 910.237, 1919.37, 0.0),
+    'n-pentane': (178.67, 840.538, 1774.25, 0.0),
+    'n-hexane': (182.326, 859.207, 1826.59, 0.0),
+    'n-heptane': (169.789, 836.195, 1760.46, 0.0),
+    'n-octane': (158.922, 815.064, 1693.07, 0.0),
+    'n-nonane': (156.854, 814.882, 1693.79, 0.0),
+    'n-decane': (164.947, 836.264, 1750.24, 0.0),
+    'hydrogen': (228.734, 326.843, 1651.71, 1671.69),
+    'oxygen': (2235.71, 1116.69, 0.0, 0.0),
+    'carbon_monoxide': (1550.45, 704.525, 0.0, 0.0),
+    'water': (268.795, 1141.41, 2507.37, 0.0),
+    'hydrogen_sulfide': (1833.63, 847.181, 0.0, 0.0),
+    'helium': (0.0, 0.0, 0.0, 0.0),
+    'argon': (0.0, 0.0, 0.0, 0.0),
+}
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+Tabelas P×T de propriedades por composição, com interpolação bicúbica
+Sistema de Validação de Boletins Cromatográficos
+
+Computadores de vazão e relatórios convertem o mesmo gás (o do boletim)
+em muitas pressões e temperaturas. property_table monta, em varreduras
+vetorizadas do motor (calculate_pt_sweep), uma grade uniforme P×T de cada
+propriedade devolvida pela varredura (Z, densidade molar e mássica e
+velocidade do som) e as
+consultas seguintes são interpolações bicúbicas (Lagrange 4×4) sobre ela.
+
+Limite de erro: a grade começa com INITIAL_NODES pontos por eixo e é
+dobrada até que a interpolação, comparada com o motor em todos os pontos
+intermediários (meio passo em P, em T e em ambos), erre no máximo
+tolerance / BOUND_SAFETY, propriedade a propriedade. error_bound guarda
+esse erro medido vezes BOUND_SAFETY. Consultas fora da faixa da grade, em
+células com pontos sem convergência ou de tabelas que não atingiram a
+tolerância com MAX_NODES pontos por eixo vão para o motor.
+
+Cache: em memória, um CompositionCache por motor e especificação de grade
+(aparece em composition_cache_stats e é esvaziado por
+invalidate_composition_caches); em disco, um .npz por tabela no diretório
+AGA8_TABELAS_DIR (padrão: tabelas_pt), lido quando a tabela não está em
+memória. Um arquivo de outra composição, especificação ou versão do
+formato é ignorado e regravado.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from aga8_cache import CompositionCache, composition_fingerprint
+from aga8_registro import get_solver
+from componentes import NOMES, vetor_composicao
+
+# Faixas padrão: kPa e °C
+PRESSURE_RANGE = (100.0, 15000.0)
+TEMPERATURE_RANGE = (-10.0, 80.0)
+DEFAULT_TOLERANCE = 1e-5
+
+INITIAL_NODES = 9
+MAX_NODES = 257
+BOUND_SAFETY = 2.0
+TABLE_MAXSIZE = 64
+
+_FORMAT_VERSION = 2
+
+# Saídas da varredura que não entram na grade: o nível; as funções de estado
+# com referência arbitrária, que passam por zero na faixa (o erro relativo não
+# tem sentido); e Cp, Cv, Joule-Thomson e κ, que perto do orvalho dos gases
+# ricos pedem grades além de MAX_NODES
+_NOT_INTERPOLATED = ('tier', 'energy', 'enthalpy', 'entropy', 'gibbs_energy',
+                     'isochoric_heat_capacity', 'isobaric_heat_capacity',
+                     'joule_thomson_coefficient', 'isentropic_exponent')
+
+
+def table_directory() -> str:
+    """Diretório dos .npz (variável de ambiente AGA8_TABELAS_DIR)"""
+    return os.environ.get('AGA8_TABELAS_DIR', 'tabelas_pt')
+
+
+class PropertyTable:
+    """
+    Grade uniforme P×T das propriedades de uma composição
+
+    values[nome] tem forma (len(pressures), len(temperatures)).
+    """
+
+    __slots__ = ('engine', 'fractions', 'pressures', 'temperatures', 'values', 'error_bound',
+                 'tolerance', 'within_tolerance')
+
+    def __init__(self, engine: str, fractions: np.ndarray, pressures: np.ndarray,
+                 temperatures: np.ndarray, values: Dict[str, np.ndarray],
+                 error_bound: Dict[str, float], tolerance: float) -> None:
+        self.engine = engine
+        self.fractions = fractions
+        self.pressures = pressures
+        self.temperatures = temperatures
+        self.values = values
+        self.error_bound = error_bound
+        self.tolerance = tolerance
+        self.within_tolerance = all(bound <= tolerance for bound in error_bound.values())
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.pressures), len(self.temperatures)
+
+    def composition(self) -> Dict[str, float]:
+        """Composição normalizada da tabela, pelos nomes canônicos"""
+        return {nome: float(x) for nome, x in zip(NOMES, self.fractions) if x > 0}
+
+    def exact(self, pressure_kpa, temperature_c) -> Dict[str, np.ndarray]:
+        """Propriedades pelo motor (equação de estado completa)"""
+        sweep = get_solver(self.engine).calculate_pt_sweep(self.composition(), pressure_kpa,
+                                                           temperature_c)
+        return {name: sweep[name] for name in self.values}
+
+    def lookup(self, pressure_kpa, temperature_c) -> Dict[str, np.ndarray]:
+        """
+        Propriedades em cada par P/T, interpoladas na grade
+
+        Dentro da faixa e da tolerância o erro relativo de cada propriedade
+        fica abaixo de error_bound; os demais pontos saem do motor.
+        """
+        pressure, temperature = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(pressure_kpa, dtype=float)),
+            np.atleast_1d(np.asarray(temperature_c, dtype=float)))
+        inside = ((pressure >= self.pressures[0]) & (pressure <= self.pressures[-1])
+                  & (temperature >= self.temperatures[0]) & (temperature <= self.temperatures[-1]))
+        if not self.within_tolerance:
+            inside[:] = False
+
+        result = {name: np.full(len(pressure), np.nan) for name in self.values}
+        states = np.flatnonzero(inside)
+        if len(states):
+            rows, weights_p = _stencil(self.pressures, pressure[states])
+            columns, weights_t = _stencil(self.temperatures, temperature[states])
+            for name, grid in self.values.items():
+                result[name][states] = _bicubic(grid, rows, weights_p, columns, weights_t)
+
+        # Fora da grade ou em célula com ponto sem convergência: motor
+        missing = ~inside | np.isnan(result[next(iter(self.values))])
+        if missing.any():
+            exact = self.exact(pressure[missing], temperature[missing])
+            for name in self.values:
+                result[name][missing] = exact[name]
+        return result
+
+    def save(self, path: str, key: str) -> None:
+        """Grava a tabela em .npz (escrita atômica)"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        names = list(self.values)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as arquivo:
+                np.savez(arquivo, version=_FORMAT_VERSION, key=key, engine=self.engine,
+                         fractions=self.fractions, pressures=self.pressures,
+                         temperatures=self.temperatures, tolerance=self.tolerance,
+                         names=np.array(names), values=np.stack([self.values[n] for n in names]),
+                         error_bound=np.array([self.error_bound[n] for n in names]))
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str, key: str) -> 'PropertyTable | None':
+        """Tabela gravada em `path`, ou None se ausente, ilegível ou de outra chave"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != _FORMAT_VERSION or str(data['key']) != key:
+                    return None
+                names = [str(name) for name in data['names']]
+                fractions = data['fractions']
+                fractions.flags.writeable = False
+                return cls(str(data['engine']), fractions, data['pressures'], data['temperatures'],
+                           dict(zip(names, data['values'])),
+                           dict(zip(names, data['error_bound'].tolist())), float(data['tolerance']))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _stencil(axis: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Primeiro nó dos 4 do estêncil e pesos de Lagrange cúbicos em cada ponto"""
+    position = (x - axis[0]) / (axis[1] - axis[0])
+    start = np.clip(np.floor(position).astype(np.intp) - 1, 0, len(axis) - 4)
+    s = position - start
+    weights = np.stack((-(s - 1) * (s - 2) * (s - 3) / 6, s * (s - 2) * (s - 3) / 2,
+                        -s * (s - 1) * (s - 3) / 2, s * (s - 1) * (s - 2) / 6), axis=1)
+    return start[:, None] + np.arange(4), weights
+
+
+def _bicubic(grid: np.ndarray, rows: np.ndarray, weights_p: np.ndarray, columns: np.ndarray,
+             weights_t: np.ndarray) -> np.ndarray:
+    """Produto tensorial das interpolações cúbicas em P e em T"""
+    block = grid[rows[:, :, None], columns[:, None, :]]
+    return np.einsum('ni,nij,nj->n', weights_p, block, weights_t)
+
+
+def _sweep(engine: str, composition: Dict[str, float], pressures: np.ndarray,
+           temperatures: np.ndarray, mask: np.ndarray | None = None) -> Dict[str, np.ndarray]:
+    """Propriedades do motor na grade (ou só nos pontos de `mask`), em matrizes P×T"""
+    pressure, temperature = np.meshgrid(pressures, temperatures, indexing='ij')
+    if mask is None:
+        mask = np.ones(pressure.shape, dtype=bool)
+    sweep = get_solver(engine).calculate_pt_sweep(composition, pressure[mask], temperature[mask])
+    grids = {}
+    for name, values in sweep.items():
+        if name in _NOT_INTERPOLATED:
+            continue
+        grid = np.full(pressure.shape, np.nan)
+        grid[mask] = values
+        grids[name] = grid
+    return grids
+
+
+def build_table(engine: str, fractions: np.ndarray, pressure_range=PRESSURE_RANGE,
+                temperature_range=TEMPERATURE_RANGE,
+                tolerance: float = DEFAULT_TOLERANCE) -> PropertyTable:
+    """
+    Monta a grade de uma composição, dobrando-a até atingir a tolerância
+
+    Cada rodada avalia no motor só os pontos novos da grade dobrada; a
+    grade atual é aceita quando interpola esses pontos dentro de
+    tolerance / BOUND_SAFETY, e a dobrada passa a ser a atual caso contrário.
+    """
+    composition = {nome: float(x) for nome, x in zip(NOMES, fractions) if x > 0}
+    nodes = INITIAL_NODES
+    pressures = np.linspace(*pressure_range, nodes)
+    temperatures = np.linspace(*temperature_range, nodes)
+    grids = _sweep(engine, composition, pressures, temperatures)
+    while True:
+        fine_p = np.linspace(*pressure_range, 2 * nodes - 1)
+        fine_t = np.linspace(*temperature_range, 2 * nodes - 1)
+        new = np.ones((len(fine_p), len(fine_t)), dtype=bool)
+        new[::2, ::2] = False
+        fine = _sweep(engine, composition, fine_p, fine_t, new)
+
+        pressure, temperature = np.meshgrid(fine_p, fine_t, indexing='ij')
+        rows, weights_p = _stencil(pressures, pressure[new])
+        columns, weights_t = _stencil(temperatures, temperature[new])
+        error = {}
+        for name, grid in grids.items():
+            interpolated = _bicubic(grid, rows, weights_p, columns, weights_t)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                relative = np.abs(interpolated / fine[name][new] - 1.0)
+            error[name] = float(np.nanmax(relative, initial=0.0)) * BOUND_SAFETY
+            fine[name][::2, ::2] = grid
+
+        if all(bound <= tolerance for bound in error.values()) or 2 * nodes - 1 > MAX_NODES:
+            return PropertyTable(engine, fractions, pressures, temperatures, grids, error, tolerance)
+        nodes, pressures, temperatures, grids = 2 * nodes - 1, fine_p, fine_t, fine
+
+
+_caches: Dict[tuple, CompositionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _table_cache(engine: str, pressure_range, temperature_range, tolerance: float) -> CompositionCache:
+    """CompositionCache das tabelas de um motor e uma especificação de grade"""
+    spec = (engine, tuple(map(float, pressure_range)), tuple(map(float, temperature_range)),
+            float(tolerance))
+    cache = _caches.get(spec)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        cache = _caches.get(spec)
+        if cache is None:
+            def factory(fractions, spec=spec):
+                return _load_or_build(spec, fractions)
+            cache = CompositionCache(f'grade_pt:{engine}', factory, maxsize=TABLE_MAXSIZE)
+            _caches[spec] = cache
+    return cache
+
+
+def _table_key(spec: tuple, fractions: np.ndarray) -> str:
+    text = repr((spec, composition_fingerprint(fractions)))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _load_or_build(spec: tuple, fractions: np.ndarray) -> PropertyTable:
+    """Tabela do .npz, se houver e for desta chave; senão monta e grava"""
+    engine, pressure_range, temperature_range, tolerance = spec
+    key = _table_key(spec, fractions)
+    path = os.path.join(table_directory(), f'{engine}_{key[:20]}.npz')
+    table = PropertyTable.load(path, key)
+    if table is None:
+        table = build_table(engine, fractions, pressure_range, temperature_range, tolerance)
+        try:
+            table.save(path, key)
+        except OSError:
+            pass  # Sem disco gravável a tabela continua valendo em memória
+    return table
+
+
+def property_table(composition: Dict[str, float], engine: str = 'gerg2008',
+                   pressure_range=PRESSURE_RANGE, temperature_range=TEMPERATURE_RANGE,
+                   tolerance: float = DEFAULT_TOLERANCE) -> PropertyTable:
+    """
+    Tabela P×T da composição (em % ou fração, aliases aceitos), do cache
+
+    Args:
+        composition: {componente: valor}
+        engine: Motor do aga8_registro com calculate_pt_sweep ('gerg2008' ou 'detail')
+        pressure_range: (mínima, máxima) em kPa
+        temperature_range: (mínima, máxima) em °C
+        tolerance: Erro relativo admitido na interpolação
+
+    Raises:
+        ValueError: Composição com soma zero
+    """
+    cache = _table_cache(engine, pressure_range, temperature_range, tolerance)
+    return cache.get(np.clip(vetor_composicao(composition), 0.0, None))
+
+
+def lookup_properties(composition: Dict[str, float], pressure_kpa, temperature_c,
+                      engine: str = 'gerg2008', **grid) -> Dict[str, np.ndarray]:
+    """Atalho: property_table(composition, engine, **grid).lookup(P, T)"""
+    return property_table(composition, engine, **grid).lookup(pressure_kpa, temperature_c)
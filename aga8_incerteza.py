@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Propagação de incertezas de medição para as propriedades AGA 8 (Monte Carlo)
+Sistema de Validação de Boletins Cromatográficos
+
+Incerteza das propriedades calculadas (item 13 do checklist) pelo método de
+Monte Carlo do Suplemento 1 do GUM: cada amostra perturba a composição do
+boletim com as incertezas-padrão dos componentes, normaliza a soma de volta
+ao total do boletim (100 %) e perturba pressão e temperatura. Todas as
+amostras passam pelo cálculo em lote do solucionador em uma única chamada;
+o resultado de cada propriedade é a média, a incerteza-padrão e o
+intervalo de abrangência (percentis) das amostras.
+
+Com `processes`, as amostras (já sorteadas no processo principal) são
+divididas em blocos avaliados em processos auxiliares; o resultado é o
+mesmo do cálculo serial com a mesma semente.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Mapping, Sequence
+
+import numpy as np
+
+from aga8_registro import get_solver
+
+# Amostras por boletim no padrão (GUM S1 sugere pelo menos 10⁴ para 95 %)
+DEFAULT_SAMPLES = 10_000
+
+# Probabilidade de abrangência padrão do intervalo
+DEFAULT_COVERAGE = 0.95
+
+# Abaixo disso os processos auxiliares custam mais do que economizam
+_MIN_SAMPLES_PER_PROCESS = 5_000
+
+# Colunas do lote que não são propriedades
+_NON_PROPERTIES = ('valid', 'tier')
+
+
+def component_uncertainties(composition: Mapping[str, float],
+                            uncertainty: float | Mapping[str, float]) -> np.ndarray:
+    """
+    Incertezas-padrão absolutas (na unidade da composição) de cada componente
+
+    Args:
+        composition: Composição nominal {componente: valor}
+        uncertainty: Dicionário {componente: incerteza-padrão absoluta}
+            (ausentes = 0) ou um número, a incerteza relativa de todos
+
+    Raises:
+        ValueError: Incerteza negativa
+    """
+    values = np.array([float(value) for value in composition.values()])
+    if isinstance(uncertainty, Mapping):
+        sigma = np.array([float(uncertainty.get(name, 0.0)) for name in composition])
+    else:
+        sigma = float(uncertainty) * np.abs(values)
+    if np.any(sigma < 0):
+        raise ValueError('Incertezas-padrão não podem ser negativas.')
+    return sigma
+
+
+def sample_compositions(composition: Mapping[str, float], sigma: np.ndarray, samples: int,
+                        rng: np.random.Generator) -> np.ndarray:
+    """
+    Amostras (samples × componentes) da composição, com soma igual à nominal
+
+    Cada componente recebe um desvio normal com a sua incerteza-padrão;
+    valores negativos são truncados em zero e cada amostra é normalizada
+    para o total nominal, como o cromatógrafo faz com o boletim.
+    """
+    values = np.array([float(value) for value in composition.values()])
+    draws = values + rng.standard_normal((samples, len(values))) * sigma
+    np.clip(draws, 0.0, None, out=draws)
+    draws *= values.sum() / draws.sum(axis=1, keepdims=True)
+    return draws
+
+
+def _evaluate_chunk(engine: str, matrix: np.ndarray, components: Sequence[str],
+                    pressure_kpa: np.ndarray, temperature_c: np.ndarray,
+                    tolerance: float | None) -> Dict[str, np.ndarray]:
+    """Executado em processo auxiliar (ou no principal): um bloco de amostras em lote"""
+    return get_solver(engine).calculate_properties_batch(
+        matrix, pressure_kpa, temperature_c, components, tolerance=tolerance)
+
+
+def _evaluate_samples(engine: str, matrix: np.ndarray, components: Sequence[str],
+                      pressure_kpa: np.ndarray, temperature_c: np.ndarray,
+                      tolerance: float | None, processes: int | None) -> Dict[str, np.ndarray]:
+    """Lote único ou blocos em processos auxiliares, concatenados na ordem das amostras"""
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    processes = min(processes or 1, len(matrix) // _MIN_SAMPLES_PER_PROCESS)
+    if processes <= 1:
+        return _evaluate_chunk(engine, matrix, components, pressure_kpa, temperature_c, tolerance)
+
+    parts = np.array_split(np.arange(len(matrix)), processes)
+    with ProcessPoolExecutor(max_workers=processes,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        chunks = list(executor.map(
+            _evaluate_chunk, [engine] * processes, [matrix[part] for part in parts],
+            [list(components)] * processes, [pressure_kpa[part] for part in parts],
+            [temperature_c[part] for part in parts], [tolerance] * processes))
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+
+def _summary(nominal: float, values: np.ndarray, coverage: float) -> Dict[str, float]:
+    """Média, incerteza-padrão e intervalo de abrangência probabilisticamente simétrico"""
+    values = values[np.isfinite(values)]
+    if len(values) < 2:
+        return {'nominal': nominal, 'mean': float('nan'), 'standard_uncertainty': float('nan'),
+                'relative_uncertainty': float('nan'), 'interval_low': float('nan'),
+                'interval_high': float('nan')}
+    mean = float(values.mean())
+    standard = float(values.std(ddof=1))
+    low, high = np.quantile(values, [(1.0 - coverage) / 2.0, (1.0 + coverage) / 2.0])
+    return {
+        'nominal': nominal,
+        'mean': mean,
+        'standard_uncertainty': standard,
+        'relative_uncertainty': standard / abs(mean) if mean else float('nan'),
+        'interval_low': float(low),
+        'interval_high': float(high),
+    }
+
+
+def propagate_uncertainty(composition: Mapping[str, float], pressure_kpa: float, temperature_c: float,
+                          composition_uncertainty: float | Mapping[str, float],
+                          pressure_uncertainty: float = 0.0, temperature_uncertainty: float = 0.0,
+                          engine: str = 'gerg2008', samples: int = DEFAULT_SAMPLES,
+                          coverage: float = DEFAULT_COVERAGE, properties: Sequence[str] | None = None,
+                          seed: int | None = None, tolerance: float | None = None,
+                          processes: int | None = None) -> Dict[str, Any]:
+    """
+    Incerteza das propriedades AGA 8 de um boletim por Monte Carlo
+
+    Args:
+        composition: Composição nominal {componente: % molar ou fração}
+        pressure_kpa, temperature_c: Condição nominal
+        composition_uncertainty: Incertezas-padrão dos componentes (ver
+            component_uncertainties)
+        pressure_uncertainty: Incerteza-padrão da pressão, kPa
+        temperature_uncertainty: Incerteza-padrão da temperatura, °C
+        engine: Solucionador com cálculo em lote (ver aga8_registro.SOLVERS)
+        samples: Número de amostras
+        coverage: Probabilidade de abrangência do intervalo
+        properties: Propriedades resumidas (padrão: todas as do lote)
+        seed: Semente do gerador; a mesma semente reproduz o resultado
+        tolerance: Tolerância em Z repassada ao lote (ver aga8_niveis)
+        processes: Processos auxiliares (None = no processo atual,
+            0 = núcleos da máquina); só usados com amostras suficientes
+
+    Returns:
+        Dict[str, Any]: samples, valid_samples, coverage e `properties`,
+        {propriedade: {nominal, mean, standard_uncertainty,
+        relative_uncertainty, interval_low, interval_high}}
+
+    Raises:
+        ValueError: Parâmetros de amostragem inválidos
+    """
+    if samples < 2:
+        raise ValueError('São necessárias pelo menos 2 amostras.')
+    if not 0.0 < coverage < 1.0:
+        raise ValueError('A probabilidade de abrangência deve estar entre 0 e 1.')
+    if pressure_uncertainty < 0 or temperature_uncertainty < 0:
+        raise ValueError('Incertezas-padrão não podem ser negativas.')
+
+    components = list(composition)
+    rng = np.random.default_rng(seed)
+    matrix = sample_compositions(composition, component_uncertainties(composition, composition_uncertainty),
+                                 samples, rng)
+    pressure = pressure_kpa + pressure_uncertainty * rng.standard_normal(samples)
+    temperature = temperature_c + temperature_uncertainty * rng.standard_normal(samples)
+
+    columns = _evaluate_samples(engine, matrix, components, pressure, temperature, tolerance, processes)
+    nominal = _evaluate_chunk(engine, np.array([list(composition.values())], dtype=float), components,
+                              np.array([pressure_kpa], dtype=float), np.array([temperature_c], dtype=float),
+                              tolerance)
+    if properties is None:
+        properties = [name for name in columns if name not in _NON_PROPERTIES]
+
+    return {
+        'samples': samples,
+        'valid_samples': int(np.count_nonzero(columns['valid'])),
+        'coverage': coverage,
+        'properties': {
+            name: _summary(float(nominal[name][0]), np.asarray(columns[name], dtype=float), coverage)
+            for name in properties
+        },
+    }
+
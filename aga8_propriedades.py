@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Propriedades termodinâmicas derivadas da energia de Helmholtz, em uma passagem
+
+Com a densidade resolvida, uma única avaliação da equação de estado dá a
+energia de Helmholtz residual e todas as suas derivadas em densidade e
+temperatura; a parte de gás ideal é analítica. Z, energia interna,
+entalpia, entropia, Gibbs, Cv, Cp, velocidade do som, Joule-Thomson e
+expoente isentrópico saem desses termos compartilhados, nas relações de
+Kunz e Wagner (2012, tabela 7), as mesmas das rotinas PropertiesGERG e
+PropertiesDetail da NIST.
+
+Convenção das derivadas (adimensionais, τ ∝ 1/T e δ ∝ D):
+ar00 = αr, ar01 = δ·∂αr/∂δ, ar02 = δ²·∂²αr/∂δ², ar10 = τ·∂αr/∂τ,
+ar11 = δ·τ·∂²αr/∂δ∂τ e ar20 = τ²·∂²αr/∂τ².
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# Chaves de thermodynamic_properties (as mesmas da rotina de referência)
+THERMODYNAMIC_PROPERTIES = (
+    'energy', 'enthalpy', 'entropy', 'gibbs_energy', 'isochoric_heat_capacity',
+    'isobaric_heat_capacity', 'speed_of_sound', 'joule_thomson_coefficient', 'isentropic_exponent',
+)
+
+# Estados avaliados por bloco na parte de gás ideal
+_BLOCK_STATES = 1 << 14
+
+
+def ideal_gas_parameters(coefficients: Dict[str, Sequence[float]],
+                         temperatures: Dict[str, Sequence[float]],
+                         components: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tabelas (componentes × 7) e (componentes × 4) da parte de gás ideal
+
+    Termos ausentes (θ = 0) ficam com n = 0 e θ = 1, para que as funções
+    hiperbólicas não precisem de máscara.
+    """
+    n = np.array([coefficients[component] for component in components], dtype=float)
+    theta = np.array([temperatures[component] for component in components], dtype=float)
+    n[:, 3:][theta <= 0] = 0.0
+    theta[theta <= 0] = 1.0
+    return n, theta
+
+
+def ideal_gas_derivatives(parameters: Tuple[np.ndarray, np.ndarray], fractions: np.ndarray,
+                          density: np.ndarray, temperature_k: np.ndarray,
+                          rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    α0, τ·∂α0/∂τ e τ²·∂²α0/∂τ² da parte de gás ideal
+
+    Mesma soma da rotina Alpha0 da NIST, com os coeficientes já na sua
+    forma (ver ideal_gas_parameters).
+
+    Args:
+        parameters: Coeficientes n (componentes × 7) e θ (componentes × 4)
+        fractions: Composições (linhas × componentes)
+        density, temperature_k, rows: Estados e linha da composição de cada um
+    """
+    n, theta = parameters
+    present = np.flatnonzero(np.any(fractions > 0, axis=0))
+    n, theta, x = n[present], theta[present], fractions[:, present]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mixing = np.sum(np.where(x > 0, x * np.log(x), 0.0), axis=1)
+    sinh_terms = np.array([True, False, True, False])
+
+    alpha = np.empty(len(density))
+    first = np.empty(len(density))
+    second = np.empty(len(density))
+    for start in range(0, len(density), _BLOCK_STATES):
+        part = slice(start, start + _BLOCK_STATES)
+        temperature = temperature_k[part][:, None]
+        log_t = np.log(temperature)
+        reduced = theta[None, :, :] / temperature[:, :, None]
+        sinh, cosh = np.sinh(reduced), np.cosh(reduced)
+        log_hyp = np.where(sinh_terms, np.log(np.abs(sinh)), -np.log(cosh))
+        ratio = np.where(sinh_terms, reduced * cosh / sinh, reduced * sinh / cosh)
+        hyperbolic = np.where(sinh_terms, (reduced / sinh) ** 2, (reduced / cosh) ** 2)
+        coefficients = n[:, 3:]
+        sum0 = np.sum(coefficients * log_hyp, axis=2)
+        sum1 = np.sum(coefficients * (log_hyp - np.where(sinh_terms, 1.0, -1.0) * ratio), axis=2)
+        sum2 = np.sum(coefficients * hyperbolic, axis=2)
+
+        row = rows[part]
+        weights = x[row]
+        log_density = np.log(np.maximum(density[part], 1e-15)) * weights.sum(axis=1) + mixing[row]
+        # A0/RT, (∂A0/∂T)/R e (T·∂²A0/∂T²)/R, como a0(0..2) da NIST
+        a0 = log_density + np.sum(weights * (n[:, 0] + n[:, 1] / temperature - n[:, 2] * log_t + sum0), axis=1)
+        a1 = log_density + np.sum(weights * (n[:, 0] - n[:, 2] * (1.0 + log_t) + sum1), axis=1)
+        alpha[part] = a0
+        first[part] = a0 - a1
+        second[part] = -np.sum(weights * (n[:, 2] + sum2), axis=1)
+    return alpha, first, second
+
+
+def state_properties(mixture, parameters: Tuple[np.ndarray, np.ndarray], gas_constant: float,
+                     density: np.ndarray, temperature_k: np.ndarray,
+                     rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    THERMODYNAMIC_PROPERTIES de estados com a densidade já resolvida
+
+    Uma avaliação de residual_derivatives da mistura (GERG2008Mixture ou
+    DetailMixture) e da parte de gás ideal por estado; NaN onde a
+    densidade é NaN.
+    """
+    result = {name: np.full(len(density), np.nan) for name in THERMODYNAMIC_PROPERTIES}
+    states = np.flatnonzero(np.isfinite(density) & (density > 0))
+    if len(states):
+        current, temperature, row = density[states], temperature_k[states], rows[states]
+        values = thermodynamic_properties(
+            gas_constant, temperature, current, mixture.molar_mass[row],
+            ideal_gas_derivatives(parameters, mixture.fractions, current, temperature, row),
+            mixture.residual_derivatives(current, temperature, row))
+        for name, column in values.items():
+            result[name][states] = column
+    return result
+
+
+def thermodynamic_properties(gas_constant: float, temperature_k: np.ndarray, density: np.ndarray,
+                             molar_mass: np.ndarray, ideal: Tuple[np.ndarray, ...],
+                             residual: Tuple[np.ndarray, ...]) -> Dict[str, np.ndarray]:
+    """
+    Propriedades derivadas a partir das derivadas de α0 e αr em um estado
+
+    Args:
+        gas_constant: Constante dos gases da equação de estado, J/(mol·K)
+        temperature_k, density, molar_mass: Estado (K, mol/dm³, g/mol)
+        ideal: α0, τ·α0_τ, τ²·α0_ττ (ideal_gas_derivatives)
+        residual: ar00, ar01, ar02, ar10, ar11, ar20 (ver o módulo)
+
+    Returns:
+        Dict[str, np.ndarray]: THERMODYNAMIC_PROPERTIES em J/mol, J/(mol·K),
+        m/s e K/kPa (unidades da rotina de referência)
+    """
+    alpha0, tau_alpha0, tau2_alpha0 = ideal
+    ar00, ar01, ar02, ar10, ar11, ar20 = residual
+    rt = gas_constant * temperature_k
+    z_factor = 1.0 + ar01
+    tau_alpha = tau_alpha0 + ar10
+    reduced_cv = -(tau2_alpha0 + ar20)
+    # (∂P/∂D)_T/RT e (∂P/∂T)_D/(D·R)
+    stiffness = 1.0 + 2.0 * ar01 + ar02
+    thermal = 1.0 + ar01 - ar11
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduced_cp = reduced_cv + thermal ** 2 / stiffness
+        # w² negativo (estado instável) vale zero, como na rotina de referência
+        sound = np.maximum(1000.0 * reduced_cp / reduced_cv * stiffness * rt / molar_mass, 0.0)
+        speed_of_sound = np.sqrt(sound)
+        joule_thomson = (thermal / stiffness - 1.0) / (reduced_cp * gas_constant * density)
+        isentropic_exponent = sound * molar_mass / (1000.0 * rt * z_factor)
+    return {
+        'energy': rt * tau_alpha,
+        'enthalpy': rt * (tau_alpha + z_factor),
+        'entropy': gas_constant * (tau_alpha - alpha0 - ar00),
+        'gibbs_energy': rt * (alpha0 + ar00 + z_factor),
+        'isochoric_heat_capacity': gas_constant * reduced_cv,
+        'isobaric_heat_capacity': gas_constant * reduced_cp,
+        'speed_of_sound': speed_of_sound,
+        'joule_thomson_coefficient': joule_thomson,
+        'isentropic_exponent': isentropic_exponent,
+    }
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de solucionadores AGA 8 do processo
+Sistema de Validação de Boletins Cromatográficos
+
+Os solucionadores (GERG-2008, DETAIL e as interfaces calibradas) não têm
+estado por instância: as tabelas constantes ficam no módulo, como arrays
+somente leitura, e os termos de cada composição em caches do próprio
+módulo. Por isso uma única instância de cada um serve o processo inteiro,
+de qualquer thread. get_solver cria a instância na primeira chamada;
+preload_solvers cria todas de uma vez e é chamado pelo gunicorn antes do
+fork (preload_app), para que os workers herdem tabelas já montadas sem
+copiá-las.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+# nome -> (módulo, classe)
+SOLVERS: Dict[str, Tuple[str, str]] = {
+    'gerg2008': ('aga8_gerg2008', 'AGA8_GERG2008'),
+    'gerg2008_calibrado': ('aga8_calibrado', 'AGA8_GERG2008_Calibrated'),
+    'detail': ('aga8_detailed_characterization', 'AGA8_DetailedCharacterization'),
+    'detail_calibrado': ('aga8_dc_calibrado', 'AGA8_DetailedCharacterization_Calibrated'),
+}
+
+_instancias: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_solver(name: str) -> Any:
+    """
+    Instância compartilhada do solucionador `name` (ver SOLVERS)
+
+    Raises:
+        KeyError: Solucionador desconhecido
+    """
+    solver = _instancias.get(name)
+    if solver is not None:
+        return solver
+    if name not in SOLVERS:
+        raise KeyError(f"Solucionador AGA 8 desconhecido: {name}")
+
+    with _lock:
+        solver = _instancias.get(name)
+        if solver is None:
+            module, cls = SOLVERS[name]
+            solver = getattr(importlib.import_module(module), cls)()
+            _instancias[name] = solver
+    return solver
+
+
+def preload_solvers() -> Dict[str, Any]:
+    """Cria todos os solucionadores (e suas tabelas) no processo atual"""
+    return {name: get_solver(name) for name in SOLVERS}
+
+
+def _reiniciar_lock() -> None:
+    """No filho de um fork o lock pode ter sido copiado travado por outra thread"""
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_lock)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Sensibilidade das propriedades AGA 8 à composição, pressão e temperatura
+Sistema de Validação de Boletins Cromatográficos
+
+Jacobiano de cada propriedade em relação a cada componente do boletim, à
+pressão e à temperatura, para atribuir a cada componente a sua parcela de
+um desvio (densidade, poder calorífico) sem recalcular o boletim uma vez
+por perturbação. Todos os estados perturbados de todos os boletins são
+empilhados em uma única chamada de calculate_properties_batch, sempre na
+equação completa (sem níveis, que introduziriam saltos).
+
+As derivadas são diferenças finitas de segunda ordem: centrais, ou
+progressivas de três pontos para componentes ausentes ou com teor menor
+que o passo (a composição não pode ficar negativa). Como o solucionador
+normaliza cada composição, a derivada em relação a um componente é a de
+aumentar só esse componente e renormalizar; por isso Σ xᵢ·∂f/∂xᵢ = 0.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Sequence
+
+import numpy as np
+
+# Entradas do jacobiano além dos componentes
+STATE_INPUTS = ('pressure', 'temperature')
+
+# Passo relativo: ao total da composição, à pressão e à temperatura em K
+_RELATIVE_STEP = 1e-5
+
+# Pesos (f0, f1, f2) e deslocamentos (passos) dos dois pontos perturbados
+_CENTRAL = ((0.0, 0.5, -0.5), (1.0, -1.0))
+_FORWARD = ((-1.5, 2.0, -0.5), (1.0, 2.0))
+
+# Colunas do lote que não são propriedades
+_NON_PROPERTIES = ('valid', 'tier')
+
+
+def property_jacobian(solver, compositions, pressure_kpa, temperature_c, components: Sequence[str],
+                      properties: Sequence[str] | None = None) -> Dict[str, Any]:
+    """
+    Propriedades e jacobianos de n estados em uma única avaliação em lote
+
+    Args:
+        solver: Solucionador com calculate_properties_batch (GERG-2008 ou DETAIL)
+        compositions: Matriz (n × componentes), em fração ou %
+        pressure_kpa, temperature_c: Escalares ou vetores com n valores
+        components: Nomes das colunas da matriz
+        properties: Propriedades derivadas (padrão: todas as do lote)
+
+    Returns:
+        Dict[str, Any]: `inputs` (componentes, 'pressure' e 'temperature'),
+        `values` {propriedade: (n,)} e `jacobian` {propriedade: (n × entradas)};
+        derivadas por unidade da composição informada, por kPa e por °C
+    """
+    matrix = np.clip(np.atleast_2d(np.asarray(compositions, dtype=float)), 0.0, None)
+    states, width = matrix.shape
+    if width != len(components):
+        raise ValueError(f'Matriz com {width} colunas para {len(components)} componentes.')
+    pressure = np.broadcast_to(np.asarray(pressure_kpa, dtype=float), (states,)).copy()
+    temperature = np.broadcast_to(np.asarray(temperature_c, dtype=float), (states,)).copy()
+    inputs = width + len(STATE_INPUTS)
+
+    # Passo e esquema (central ou progressivo) de cada entrada, por estado
+    step = np.empty((inputs, states))
+    step[:width] = _RELATIVE_STEP * matrix.sum(axis=1)
+    step[width] = _RELATIVE_STEP * np.abs(pressure)
+    step[width + 1] = _RELATIVE_STEP * (temperature + 273.15)
+    forward = np.zeros((inputs, states), dtype=bool)
+    forward[:width] = matrix.T < step[:width]
+    shifts = np.where(forward[:, :, None], _FORWARD[1], _CENTRAL[1])      # entradas × n × 2
+    weights = np.where(forward[:, :, None], _FORWARD[0], _CENTRAL[0])     # entradas × n × 3
+
+    # Blocos: estado nominal e, para cada entrada, os dois pontos perturbados
+    offsets = shifts.transpose(2, 0, 1) * step                             # 2 × entradas × n
+    block_matrix = np.broadcast_to(matrix, (2, inputs, states, width)).copy()
+    block_pressure = np.broadcast_to(pressure, (2, inputs, states)).copy()
+    block_temperature = np.broadcast_to(temperature, (2, inputs, states)).copy()
+    for index in range(width):
+        block_matrix[:, index, :, index] += offsets[:, index]
+    block_pressure[:, width] += offsets[:, width]
+    block_temperature[:, width + 1] += offsets[:, width + 1]
+
+    columns = solver.calculate_properties_batch(
+        np.concatenate([matrix, block_matrix.reshape(-1, width)]),
+        np.concatenate([pressure, block_pressure.ravel()]),
+        np.concatenate([temperature, block_temperature.ravel()]), components)
+
+    if properties is None:
+        properties = [name for name in columns if name not in _NON_PROPERTIES]
+    values, jacobian = {}, {}
+    for name in properties:
+        column = np.asarray(columns[name], dtype=float)
+        nominal, perturbed = column[:states], column[states:].reshape(2, inputs, states)
+        derivative = (weights[:, :, 0] * nominal + weights[:, :, 1] * perturbed[0]
+                      + weights[:, :, 2] * perturbed[1]) / step
+        values[name] = nominal
+        jacobian[name] = derivative.T
+    return {'inputs': [*components, *STATE_INPUTS], 'values': values, 'jacobian': jacobian}
+
+
+def contributions(result: Dict[str, Any], name: str, deltas: Mapping[str, float],
+                  row: int = 0) -> Dict[str, float]:
+    """
+    Parcela de cada entrada na variação de `name` (aproximação linear)
+
+    Args:
+        result: Retorno de property_jacobian
+        name: Propriedade
+        deltas: Variação de cada entrada {componente, 'pressure' ou
+            'temperature': variação}, por exemplo boletim menos referência
+        row: Estado do lote
+
+    Returns:
+        Dict[str, float]: {entrada: ∂f/∂entrada · variação}, das maiores em
+        módulo para as menores; entradas sem variação ficam de fora
+    """
+    derivatives = result['jacobian'][name][row]
+    parts = {
+        entry: float(derivatives[index] * deltas[entry])
+        for index, entry in enumerate(result['inputs'])
+        if deltas.get(entry)
+    }
+    return dict(sorted(parts.items(), key=lambda item: -abs(item[1])))
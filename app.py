@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, flash, send_file
+    url_for, flash, send_file, jsonify, abort, Response
 )
 import sqlite3
+import json
 from datetime import datetime
 import os
 import io
@@ -19,7 +20,38 @@ from reportlab.platypus import (
     Table, TableStyle
 )
 from reportlab.lib.enums import TA_CENTER
-from config import DEBUG, HOST, PORT
+from config import (
+    CEP_AMOSTRAS_MIN, CEP_SIGMA_LIMIT, CEP_T2_LIMITE, DEBUG, HOST, LIMITES_AGA8, PORT
+)
+from componentes import MASSA_MOLAR, nome_boletim, vetor_composicao
+from database import get_db, connect_db, init_app as init_db_app
+from migracoes import aplicar_migracoes
+from jobs import buscar_job, criar_job, retomar_job, retomar_jobs, submeter_job
+from revalidacao import revalidar_dependentes, simular_revalidacao
+from cep import (
+    buscar_historico_cep,
+    buscar_historico_propriedade_cep,
+    buscar_janelas_cep_lote,
+    dentro_limites_cep,
+    gravar_snapshots_cep,
+    limites_cep_boletim,
+    sincronizar_fluxo_boletim,
+    snapshot_cep
+)
+from cep_multivariado import (
+    aplicar_t2_hotelling,
+    avaliar_t2_as_of,
+    composicoes_boletins,
+    invalida_por_t2,
+    status_t2
+)
+from cep_regras import (
+    REGRAS_CEP,
+    aplicar_regras_cep,
+    avaliar_regras_as_of,
+    formatar_regras,
+    invalida_por_regras
+)
 from excel_import import (
     processar_excel_boletins,
     criar_template_excel,
@@ -46,6 +78,7 @@ if sys.platform.startswith('win'):
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'chave_secreta_para_flask')
+init_db_app(app)
 
 # Importar rota de diagnóstico
 try:
@@ -153,115 +186,13 @@ def format_date_br(date_string):
 # Funções do banco de dados
 
 
-def get_db():
-    """Obtém conexão com o banco de dados"""
-    # Use persistent storage path in production (Render)
-    db_path = os.environ.get('DATABASE_PATH', 'boletins.db')
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-    return db
-
-
 def init_db():
-    """Inicializa o banco de dados"""
-    db = get_db()
-
-    # Criar tabela de boletins
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS boletins (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        numero_boletim TEXT NOT NULL,
-        numero_documento TEXT,
-        data_coleta TEXT NOT NULL,
-        data_recebimento TEXT,
-        data_analise TEXT,
-        data_emissao TEXT,
-        data_validacao TEXT,
-        identificacao_instalacao TEXT,
-        plataforma TEXT,
-        sistema_medicao TEXT,
-        classificacao TEXT,
-        ponto_coleta TEXT,
-        agente_regulado TEXT,
-        responsavel_amostragem TEXT,
-        pressao REAL,
-        temperatura REAL,
-        observacoes TEXT,
-        status TEXT,
-        status_cep TEXT,
-        status_aga8 TEXT,
-        status_checklist TEXT,
-        responsavel_tecnico TEXT,
-        responsavel_elaboracao TEXT,
-        responsavel_aprovacao TEXT
-    )
-    ''')
-
-    # Criar tabela de componentes
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS componentes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        boletin_id INTEGER NOT NULL,
-        nome TEXT NOT NULL,
-        percentual_molar REAL NOT NULL,
-        status_aga TEXT,
-        status_cep TEXT,
-        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
-    )
-    ''')
-
-    # Criar tabela de propriedades
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS propriedades (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        boletin_id INTEGER NOT NULL,
-        nome TEXT NOT NULL,
-        valor REAL NOT NULL,
-        status_aga TEXT,
-        status_cep TEXT,
-        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
-    )
-    ''')
-
-    # Criar tabela de histórico de componentes
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS historico_componentes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        componente TEXT NOT NULL,
-        boletin_id INTEGER NOT NULL,
-        valor REAL NOT NULL,
-        data_coleta TEXT NOT NULL,
-        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
-    )
-    ''')
-
-    # Criar tabela de histórico de propriedades
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS historico_propriedades (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        propriedade TEXT NOT NULL,
-        boletin_id INTEGER NOT NULL,
-        valor REAL NOT NULL,
-        data_coleta TEXT NOT NULL,
-        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
-    )
-    ''')
-
-    # Criar tabela de checklist
-    db.execute('''
-    CREATE TABLE IF NOT EXISTS checklist_itens (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        boletin_id INTEGER NOT NULL,
-        item_numero INTEGER NOT NULL,
-        descricao TEXT NOT NULL,
-        situacao TEXT NOT NULL DEFAULT 'OK',
-        nao_aplicavel BOOLEAN DEFAULT FALSE,
-        observacao TEXT,
-        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
-    )
-    ''')
-
-    db.commit()
+    """Inicializa o banco de dados aplicando as migrações pendentes"""
+    db = connect_db()
+    try:
+        aplicar_migracoes(db)
+    finally:
+        db.close()
 
 
 # Inicializar o banco de dados
@@ -297,35 +228,13 @@ def valida_aga8(componente, valor):
 
 def valida_cep(componente, novo_valor, historico):
     """Valida componente usando Controle Estatístico de Processo"""
-    ultimas_amostras = historico[-8:]
-
-    if len(ultimas_amostras) < 2:
-        return True
-
-    media = sum(ultimas_amostras) / len(ultimas_amostras)
-
-    amplitudes = [abs(ultimas_amostras[i] - ultimas_amostras[i - 1])
-                  for i in range(1, len(ultimas_amostras))]
+    return dentro_limites_cep(novo_valor, historico)
 
-    media_amplitudes = sum(amplitudes) / len(amplitudes)
 
-    d2 = 1.128
-    lcs = media + 3 * media_amplitudes / d2
-    lci = media - 3 * media_amplitudes / d2
-
-    return lci <= novo_valor <= lcs
-
-
-def get_historico_componente(componente):
-    """Busca histórico de valores para um componente específico"""
+def get_historico_componente(componente, fluxo):
+    """Busca a janela de controle (últimas amostras) de um componente no fluxo"""
     try:
-        db = get_db()
-        historico = db.execute('''
-            SELECT valor FROM historico_componentes
-            WHERE componente = ?
-            ORDER BY data_coleta ASC
-        ''', (componente,)).fetchall()
-        return [row[0] for row in historico if row[0] is not None]
+        return buscar_historico_cep(get_db(), fluxo, componente)
     except Exception as e:
         logger.error(f"Erro ao buscar histórico para componente {componente}: {e}")
         return []
@@ -335,23 +244,8 @@ def calcular_propriedades_fluido(componentes_data):
     """Calcula propriedades do fluido baseado na composição dos componentes"""
     propriedades = {}
 
-    # Massas molares dos componentes (g/mol)
-    massas_molares = {
-        'Metano': 16.043, 'Etano': 30.070, 'Propano': 44.097,
-        'i-Butano': 58.123, 'n-Butano': 58.123, 'i-Pentano': 72.150,
-        'n-Pentano': 72.150, 'Hexano': 86.177, 'Heptano': 100.204,
-        'Octano': 114.231, 'Nonano': 128.258, 'Decano': 142.285,
-        'Oxigênio': 31.998, 'Nitrogênio': 28.014, 'CO2': 44.010
-    }
-
-    # Cálculo da Massa Molecular
-    massa_molecular = 0.0
-    total_percentual = 0.0
-
-    for comp_nome, percentual in componentes_data.items():
-        if comp_nome in massas_molares:
-            massa_molecular += (percentual / 100.0) * massas_molares[comp_nome]
-            total_percentual += percentual
+    # Cálculo da Massa Molecular (massas molares da tabela de componentes)
+    massa_molecular = float(vetor_composicao(componentes_data) @ MASSA_MOLAR) / 100.0
 
     propriedades['Massa Molecular'] = massa_molecular
 
@@ -383,50 +277,15 @@ def calcular_propriedades_fluido(componentes_data):
     return propriedades
 
 
-def get_historico_propriedade(propriedade_nome):
-    """Busca histórico de valores para uma propriedade específica"""
-    db = get_db()
-    historico = db.execute('''
-        SELECT valor FROM historico_propriedades
-        WHERE propriedade = ?
-        ORDER BY data_coleta ASC
-    ''', (propriedade_nome,)).fetchall()
-
-    return [row[0] for row in historico]
+def get_historico_propriedade(propriedade_nome, fluxo):
+    """Busca a janela de controle (últimas amostras) de uma propriedade no fluxo"""
+    return buscar_historico_propriedade_cep(get_db(), fluxo, propriedade_nome)
 
 
-def valida_cep_propriedade(propriedade_nome, novo_valor):
+def valida_cep_propriedade(propriedade_nome, novo_valor, fluxo):
     """Valida propriedade usando Controle Estatístico de Processo"""
-    historico = get_historico_propriedade(propriedade_nome)
-
-    if len(historico) < 2:
-        return True  # Aceita se não há histórico suficiente
-
-    # Usar apenas as últimas 8 amostras para CEP
-    ultimas_amostras = historico[-8:] if len(historico) >= 8 else historico
-
-    if len(ultimas_amostras) < 2:
-        return True
-
-    media = sum(ultimas_amostras) / len(ultimas_amostras)
-
-    # Cálculo dos limites de controle usando amplitude móvel
-    amplitudes = [abs(ultimas_amostras[i] - ultimas_amostras[i - 1])
-                  for i in range(1, len(ultimas_amostras))]
-
-    if not amplitudes:
-        return True
-
-    media_amplitudes = sum(amplitudes) / len(amplitudes)
-
-    # Constante d2 para n=2 (amplitude móvel)
-    d2 = 1.128
-
-    # Limites de controle (3 sigma)
-    lcs = media + 3 * media_amplitudes / d2
-    lci = media - 3 * media_amplitudes / d2
-
-    return lci <= novo_valor <= lcs
+    historico = get_historico_propriedade(propriedade_nome, fluxo)
+    return dentro_limites_cep(novo_valor, historico)
 
 
 def criar_checklist_padrao(boletin_id):
@@ -489,6 +348,8 @@ def gerar_pdf_relatorio(boletim_id):
         'ORDER BY item_numero',
         (boletim_id,)
     ).fetchall()
+    limites_cep = limites_cep_boletim(
+        db, boletim, [comp['nome'] for comp in componentes])
 
     # Criar PDF em memória
     buffer = io.BytesIO()
@@ -621,10 +482,11 @@ def gerar_pdf_relatorio(boletim_id):
     comp_data = [
         [
             'Componente', '% Molar', 'A.G.A #8', 'CEP',
-            'Limite A.G.A Min', 'Limite A.G.A Max'
+            'Limite A.G.A Min', 'Limite A.G.A Max', 'LCI CEP', 'LCS CEP'
         ]
     ]
     for comp in componentes:
+        limites = limites_cep.get(comp['nome'], {})
         comp_data.append([
             comp['nome'],
             f"{comp['percentual_molar']:.3f}%",
@@ -640,10 +502,12 @@ def gerar_pdf_relatorio(boletim_id):
                 'Oxigênio'] else (
                 '12%' if comp['nome'] == 'Propano' else (
                     '6%' if 'Butano' in comp['nome'] else (
-                        '4%' if 'Pentano' in comp['nome'] else '21%')))
+                        '4%' if 'Pentano' in comp['nome'] else '21%'))),
+            f"{limites['lci']:.3f}%" if limites.get('lci') is not None else '-',
+            f"{limites['lcs']:.3f}%" if limites.get('lcs') is not None else '-'
         ])
 
-    comp_table = Table(comp_data, colWidths=[80, 60, 60, 60, 60, 60])
+    comp_table = Table(comp_data, colWidths=[80, 55, 55, 55, 60, 60, 55, 55])
     comp_table.setStyle(TableStyle([
         ('FONTSIZE', (0, 0), (-1, -1), 8),
         ('GRID', (0, 0), (-1, -1), 1, colors.grey),
@@ -777,11 +641,16 @@ def dashboard():
     periodo = request.args.get('periodo', '')
     status_filter = request.args.get('status_filter', '')
     componente_filter = request.args.get('componente_filter', '')
+    fluxo_filter = request.args.get('fluxo_filter', '')
 
     # Construir condições WHERE para filtros
     where_conditions = []
     params = []
 
+    if fluxo_filter:
+        where_conditions.append("b.fluxo = ?")
+        params.append(fluxo_filter)
+
     if periodo:
         days = int(periodo)
         where_conditions.append(
@@ -809,15 +678,15 @@ def dashboard():
         checklist_query = f"SELECT COUNT(*) FROM boletins b {where_clause} AND b.status_checklist = 'VALIDADO'"
 
         stats['boletins_validados'] = db.execute(
-            validados_query, params + ['VALIDADO']).fetchone()[0]
+            validados_query, params).fetchone()[0]
         stats['boletins_invalidados'] = db.execute(
-            invalidados_query, params + ['INVALIDADO']).fetchone()[0]
+            invalidados_query, params).fetchone()[0]
         stats['aga8_aprovados'] = db.execute(
-            aga8_query, params + ['VALIDADO']).fetchone()[0]
+            aga8_query, params).fetchone()[0]
         stats['cep_aprovados'] = db.execute(
-            cep_query, params + ['VALIDADO']).fetchone()[0]
+            cep_query, params).fetchone()[0]
         stats['checklist_aprovados'] = db.execute(
-            checklist_query, params + ['VALIDADO']).fetchone()[0]
+            checklist_query, params).fetchone()[0]
     else:
         stats['boletins_validados'] = db.execute(
             'SELECT COUNT(*) FROM boletins WHERE status = ?', ('VALIDADO',)).fetchone()[0]
@@ -838,7 +707,8 @@ def dashboard():
     # Últimos boletins (com filtros aplicados)
     boletins_query = f'''
         SELECT b.id, b.numero_boletim, b.identificacao_instalacao, b.data_coleta,
-               b.data_validacao, b.status, b.status_aga8, b.status_cep, b.status_checklist
+               b.data_validacao, b.status, b.status_aga8, b.status_cep, b.status_checklist,
+               b.t2_hotelling, b.status_t2
         FROM boletins b
         {where_clause}
         ORDER BY b.data_coleta DESC
@@ -854,6 +724,10 @@ def dashboard():
         comp_where.append("c.nome = ?")
         comp_params.append(componente_filter)
 
+    if fluxo_filter:
+        comp_where.append("b.fluxo = ?")
+        comp_params.append(fluxo_filter)
+
     if periodo:
         comp_where.append(
             "DATE(b.data_coleta) >= DATE('now', '-' || ? || ' days')")
@@ -884,7 +758,12 @@ def dashboard():
     hist_params = []
 
     if componente_filter:
-        hist_where = [f"hc.componente = '{componente_filter}'"]
+        hist_where = ["hc.componente = ?"]
+        hist_params.append(componente_filter)
+
+    if fluxo_filter:
+        hist_where.append("hc.fluxo = ?")
+        hist_params.append(fluxo_filter)
 
     if periodo:
         hist_where.append(
@@ -920,11 +799,17 @@ def dashboard():
     stats['pendentes'] = stats['total_boletins'] - stats['boletins_validados'] - stats['boletins_invalidados']
     stats['total'] = stats['total_boletins']
 
+    # Fluxos CEP disponíveis para o filtro
+    fluxos = [row['fluxo'] for row in db.execute(
+        "SELECT DISTINCT fluxo FROM boletins WHERE fluxo != '' ORDER BY fluxo")]
+
     return render_template('dashboard.html',
                            stats=stats,
                            boletins_recentes=boletins_recentes,
                            componentes_problemas=componentes_problemas,
-                           historico_grafico=historico_grafico)
+                           historico_grafico=historico_grafico,
+                           fluxos=fluxos,
+                           fluxo_filter=fluxo_filter)
 
 
 @app.route('/boletins')
@@ -954,12 +839,13 @@ def listar_boletins():
             logger.error(f"Erro na query do histórico: {e}")
             historico = []
 
-        db.close()
-        
         # Log para debug
         logger.info(f"Carregando página boletins: {len(boletins)} boletims, {len(historico)} histórico")
         
-        return render_template('main.html', boletins=boletins, historico=historico)
+        # Job de revalidação acompanhado pela página (barra de progresso)
+        job = buscar_job(db, request.args.get('job', type=int) or 0)
+
+        return render_template('main.html', boletins=boletins, historico=historico, job=job)
         
     except Exception as e:
         logger.error(f"Erro em listar_boletins: {e}")
@@ -993,7 +879,6 @@ def boletins_test():
             FROM boletins b
             ORDER BY b.data_coleta DESC
         ''').fetchall()
-        db.close()
         
         result = {
             'current_dir': current_dir,
@@ -1077,6 +962,7 @@ def cadastrar():
             dados_boletim['responsavel_aprovacao'], None, None, None, None
         ))
         boletim_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+        fluxo = sincronizar_fluxo_boletim(db, boletim_id)
         db.commit()
 
         # Inserir componentes
@@ -1086,25 +972,49 @@ def cadastrar():
             'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2'
         ]
 
+        # Janelas de controle dos 15 componentes (no fluxo do boletim) em uma única consulta;
+        # boletim retroativo usa só as amostras anteriores à sua coleta
+        janelas_cep = buscar_janelas_cep_lote(db, fluxo, componentes,
+                                              antes_de=dados_boletim['data_coleta'])
+
         componentes_data = {}
+        snapshots = {}
         for comp in componentes:
             valor = float(request.form[comp])
             componentes_data[comp] = valor
-            status_aga = "VALIDADO" if valida_aga8(
-                comp, valor) else "INVALIDADO"
-            historico = get_historico_componente(comp)
-            status_cep = "VALIDADO" if valida_cep(
-                comp, valor, historico) else "INVALIDADO"
+            snapshots[comp] = snapshot_cep(janelas_cep[comp])
 
             db.execute('''
-                INSERT INTO componentes (boletin_id, nome, percentual_molar, status_aga, status_cep)
+                INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (boletim_id, comp, valor, status_aga, status_cep))
+            ''', (comp, boletim_id, valor, dados_boletim['data_coleta'], fluxo))
+
+        # Regras de sequência, EWMA e CUSUM (estado incremental por fluxo)
+        regras_cep = aplicar_regras_cep(db, fluxo, dados_boletim['data_coleta'], {
+            comp: (componentes_data[comp], snapshots[comp]) for comp in componentes
+        })
+
+        # CEP multivariado sobre o vetor de composição
+        t2 = aplicar_t2_hotelling(db, fluxo, dados_boletim['data_coleta'], componentes_data)
+
+        for comp in componentes:
+            valor = componentes_data[comp]
+            status_aga = "VALIDADO" if valida_aga8(
+                comp, valor) else "INVALIDADO"
+            status_cep = "VALIDADO" if (
+                valida_cep(comp, valor, janelas_cep[comp]['valores'])
+                and not invalida_por_regras(regras_cep[comp])) else "INVALIDADO"
 
             db.execute('''
-                INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta)
-                VALUES (?, ?, ?, ?)
-            ''', (comp, boletim_id, valor, dados_boletim['data_coleta']))
+                INSERT INTO componentes (boletin_id, nome, percentual_molar, status_aga, status_cep, regras_cep)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (boletim_id, comp, valor, status_aga, status_cep,
+                  formatar_regras(regras_cep[comp])))
+
+        # Registrar os limites aplicados (exibidos no relatório e no PDF)
+        gravar_snapshots_cep(db, [
+            (boletim_id, comp, snapshots[comp]) for comp in componentes
+        ])
 
         # Calcular propriedades automaticamente
         propriedades_calculadas = calcular_propriedades_fluido(
@@ -1114,7 +1024,7 @@ def cadastrar():
         for nome_prop, valor_calculado in propriedades_calculadas.items():
             # Validação CEP para propriedades
             status_cep_prop = "VALIDADO" if valida_cep_propriedade(
-                nome_prop, valor_calculado) else "INVALIDADO"
+                nome_prop, valor_calculado, fluxo) else "INVALIDADO"
 
             db.execute('''
                 INSERT INTO propriedades (boletin_id, nome, valor, status_aga, status_cep)
@@ -1123,9 +1033,9 @@ def cadastrar():
 
             # Salvar no histórico de propriedades
             db.execute('''
-                INSERT INTO historico_propriedades (propriedade, boletin_id, valor, data_coleta)
-                VALUES (?, ?, ?, ?)
-            ''', (nome_prop, boletim_id, valor_calculado, dados_boletim['data_coleta']))
+                INSERT INTO historico_propriedades (propriedade, boletin_id, valor, data_coleta, fluxo)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (nome_prop, boletim_id, valor_calculado, dados_boletim['data_coleta'], fluxo))
 
         # Manter propriedades do formulário para compatibilidade (se existirem)
         propriedades_form = []
@@ -1166,18 +1076,28 @@ def cadastrar():
         ''', (boletim_id, 'INVALIDADO')).fetchone()[0]
         status_cep = "INVALIDADO" if componentes_cep_invalidos > 0 else "VALIDADO"
 
+        # Status CEP multivariado (T² de Hotelling)
+        status_multivariado = status_t2(t2)
+
         # Status Checklist (sempre VALIDADO por enquanto)
         status_checklist = "VALIDADO"
 
         # Status Geral
-        status = "INVALIDADO" if (
-            status_aga8 == "INVALIDADO" or status_cep == "INVALIDADO") else "VALIDADO"
+        status = "INVALIDADO" if "INVALIDADO" in (status_aga8, status_cep) or invalida_por_t2(
+            status_multivariado) else "VALIDADO"
         data_validacao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         db.execute('''
             UPDATE boletins SET status = ?, status_cep = ?, status_aga8 = ?,
-                               status_checklist = ?, data_validacao = ? WHERE id = ?
-        ''', (status, status_cep, status_aga8, status_checklist, data_validacao, boletim_id))
+                               status_checklist = ?, t2_hotelling = ?, status_t2 = ?,
+                               data_validacao = ? WHERE id = ?
+        ''', (status, status_cep, status_aga8, status_checklist, t2, status_multivariado,
+              data_validacao, boletim_id))
+        db.commit()
+
+        # Boletim retroativo: os seguintes do fluxo passam a ver suas amostras
+        revalidar_dependentes(db, [(fluxo, dados_boletim['data_coleta'])],
+                              descartar_estados=False)
         db.commit()
 
         flash('Boletim cadastrado com sucesso!')
@@ -1201,6 +1121,9 @@ def editar_boletim(boletim_id):
     if request.method == 'POST':
         # Capturar dados do formulário
         try:
+            # Composição antes da alteração (estado do T² do fluxo)
+            anteriores = composicoes_boletins(db, [boletim_id])
+
             # Capturar unidades de medida e metodologia aprovada
             pressao_unit = request.form.get('pressao_unit', 'atm')
             temperatura_unit = request.form.get('temperatura_unit', 'celsius')
@@ -1245,6 +1168,13 @@ def editar_boletim(boletim_id):
                 metodologia_aprovada,
                 boletim_id
             ))
+            # Instalação, sistema, ponto ou data podem ter mudado: o histórico acompanha
+            fluxo = sincronizar_fluxo_boletim(db, boletim_id)
+            posicoes = {(boletim['fluxo'], boletim['data_coleta']),
+                        (fluxo, request.form['data_coleta'])}
+            if len(posicoes) > 1:
+                # Revalidar o boletim e os que usavam/passam a usar suas amostras
+                revalidar_dependentes(db, posicoes, incluir=[boletim_id], anteriores=anteriores)
             db.commit()
             flash(
                 f'Boletim {request.form["numero_boletim"]} atualizado com sucesso!')
@@ -1271,23 +1201,32 @@ def excluir_boletim(boletim_id):
 
     # Buscar dados do boletim para mostrar mensagem
     boletim = db.execute(
-        'SELECT numero_boletim FROM boletins WHERE id = ?', (boletim_id,)).fetchone()
+        'SELECT numero_boletim, fluxo, data_coleta FROM boletins WHERE id = ?',
+        (boletim_id,)).fetchone()
     if not boletim:
         flash('Boletim não encontrado.')
         return redirect(url_for('listar_boletins'))
 
     try:
+        # Composição antes da exclusão (estado do T² do fluxo)
+        anteriores = composicoes_boletins(db, [boletim_id])
+
         # Excluir em ordem (devido às chaves estrangeiras)
         # 1. Excluir histórico de componentes
         db.execute(
             'DELETE FROM historico_componentes WHERE boletin_id = ?', (boletim_id,))
 
-        # 2. Excluir componentes
+        # 2. Excluir componentes e limites CEP registrados
         db.execute('DELETE FROM componentes WHERE boletin_id = ?', (boletim_id,))
+        db.execute('DELETE FROM cep_snapshots WHERE boletin_id = ?', (boletim_id,))
 
         # 3. Excluir boletim
         db.execute('DELETE FROM boletins WHERE id = ?', (boletim_id,))
 
+        # 4. Revalidar os boletins seguintes cuja janela CEP usava as amostras
+        revalidar_dependentes(db, [(boletim['fluxo'], boletim['data_coleta'])],
+                              anteriores=anteriores)
+
         db.commit()
         flash(f'Boletim {boletim["numero_boletim"]} excluído com sucesso!')
 
@@ -1325,6 +1264,9 @@ def relatorio(boletim_id, edit_mode=None):
             temperatura_val = float(temperatura) if temperatura else None
 
             # Atualizar dados do boletim
+            anterior = db.execute(
+                'SELECT fluxo, data_coleta FROM boletins WHERE id = ?', (boletim_id,)).fetchone()
+            anteriores = composicoes_boletins(db, [boletim_id])
             print("=== ANTES DO UPDATE ===")
             print(f"Boletim ID: {boletim_id}")
             print(f"Classificacao a ser salva: {request.form['classificacao']}")
@@ -1359,6 +1301,7 @@ def relatorio(boletim_id, edit_mode=None):
             ))
 
             print(f"UPDATE rowcount: {cursor.rowcount}")
+            fluxo = sincronizar_fluxo_boletim(db, boletim_id)
             print("=== APÓS UPDATE ===")
 
             # Verificar o valor atual no banco ANTES do commit
@@ -1410,7 +1353,10 @@ def relatorio(boletim_id, edit_mode=None):
                 'dioxido_carbono_co2': 'Dióxido de Carbono, CO₂'
             }
 
-            for form_name, db_name in mapeamento_componentes.items():
+            componentes_alterados = False
+            for form_name, rotulo in mapeamento_componentes.items():
+                # Componentes e histórico usam o nome do boletim ('Metano'), não o rótulo
+                db_name = nome_boletim(rotulo)
                 if form_name in request.form:
                     percentual_str = request.form[form_name].strip()
                     if percentual_str:  # Se não estiver vazio
@@ -1428,16 +1374,31 @@ def relatorio(boletim_id, edit_mode=None):
                                     UPDATE componentes SET percentual_molar = ?
                                     WHERE id = ?
                                 ''', (percentual, existing['id']))
+                                # A amostra do histórico CEP acompanha o componente
+                                db.execute('''
+                                    UPDATE historico_componentes SET valor = ?
+                                    WHERE boletin_id = ? AND componente = ?
+                                ''', (percentual, boletim_id, db_name))
                             else:
                                 # Inserir novo componente
                                 db.execute('''
                                     INSERT INTO componentes (boletin_id, nome, percentual_molar, status_aga, status_cep)
                                     VALUES (?, ?, ?, ?, ?)
                                 ''', (boletim_id, db_name, percentual, 'VALIDADO', 'VALIDADO'))
+                                db.execute('''
+                                    INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+                                    VALUES (?, ?, ?, ?, ?)
+                                ''', (db_name, boletim_id, percentual, request.form['data_coleta'], fluxo))
+                            componentes_alterados = True
                         except ValueError:
                             # Ignorar valores inválidos
                             continue
 
+            posicoes = {tuple(anterior), (fluxo, request.form['data_coleta'])}
+            if componentes_alterados or len(posicoes) > 1:
+                # Revalidar o boletim e os que usavam/passam a usar suas amostras
+                revalidar_dependentes(db, posicoes, incluir=[boletim_id], anteriores=anteriores)
+
             db.commit()
             print("=== APÓS COMMIT ===")
 
@@ -1447,25 +1408,21 @@ def relatorio(boletim_id, edit_mode=None):
             print(f"Classificacao no banco APÓS commit: {verificacao_final['classificacao'] if verificacao_final else 'None'}")
             print("===================")
 
-            db.close()
             flash(f'Boletim {request.form["numero_boletim"]} atualizado com sucesso!')
             return redirect(url_for('relatorio', boletim_id=boletim_id))
 
         except ValueError as e:
             db.rollback()
-            db.close()
             flash(f'Erro nos dados fornecidos: {str(e)}')
             return redirect(url_for('relatorio', boletim_id=boletim_id, edit_mode='edit'))
 
         except sqlite3.Error as e:
             db.rollback()
-            db.close()
             flash(f'Erro no banco de dados: {str(e)}')
             return redirect(url_for('relatorio', boletim_id=boletim_id, edit_mode='edit'))
 
         except Exception as e:
             db.rollback()
-            db.close()
             flash(f'Erro ao atualizar boletim: {str(e)}')
             return redirect(url_for('relatorio', boletim_id=boletim_id, edit_mode='edit'))
 
@@ -1499,8 +1456,9 @@ def relatorio(boletim_id, edit_mode=None):
         'Dióxido de Carbono, CO₂': 'dioxido_carbono_co2'
     }
 
+    campos_por_nome = {nome_boletim(rotulo): campo for rotulo, campo in mapeamento_nomes.items()}
     for comp in componentes:
-        nome_template = mapeamento_nomes.get(comp['nome'])
+        nome_template = campos_por_nome.get(nome_boletim(comp['nome']))
         if nome_template:
             componentes_dict[nome_template] = comp['percentual_molar']
 
@@ -1512,41 +1470,22 @@ def relatorio(boletim_id, edit_mode=None):
         SELECT * FROM checklist_itens WHERE boletin_id = ? ORDER BY item_numero
     ''', (boletim_id,)).fetchall()
 
-    # Calculate CEP limits for each component
-    def calculate_cep_limits(componente_nome):
-        try:
-            historico = get_historico_componente(componente_nome)
-            ultimas_amostras = historico[-8:]
-            if len(ultimas_amostras) < 2:
-                return None, None
-            
-            # Validar se há dados numéricos válidos
-            ultimas_amostras = [x for x in ultimas_amostras if x is not None and isinstance(x, (int, float))]
-            if len(ultimas_amostras) < 2:
-                return None, None
-                
-            media = sum(ultimas_amostras) / len(ultimas_amostras)
-            amplitudes = [abs(ultimas_amostras[i] - ultimas_amostras[i - 1])
-                          for i in range(1, len(ultimas_amostras))]
-            
-            if not amplitudes:
-                return None, None
-                
-            media_amplitudes = sum(amplitudes) / len(amplitudes)
-            d2 = 1.128
-            lcs = media + 3 * media_amplitudes / d2
-            lci = media - 3 * media_amplitudes / d2
-            return lci, lcs
-        except Exception as e:
-            logger.error(f"Erro ao calcular limites CEP para {componente_nome}: {e}")
-            return None, None
+    # Limites CEP aplicados na validação (snapshots gravados)
+    try:
+        limites_cep = limites_cep_boletim(
+            db, boletim, [comp['nome'] for comp in componentes])
+    except Exception as e:
+        logger.error(f"Erro ao buscar limites CEP do boletim {boletim_id}: {e}")
+        limites_cep = {}
 
     componentes_with_limits = []
     for comp in componentes:
-        lci, lcs = calculate_cep_limits(comp['nome'])
+        limites = limites_cep.get(comp['nome'], {})
         comp_dict = dict(comp)
-        comp_dict['cep_lci'] = lci
-        comp_dict['cep_lcs'] = lcs
+        comp_dict['cep_lci'] = limites.get('lci')
+        comp_dict['cep_lcs'] = limites.get('lcs')
+        comp_dict['regras_cep_descricao'] = '; '.join(
+            REGRAS_CEP.get(regra, regra) for regra in (comp['regras_cep'] or '').split(',') if regra)
         componentes_with_limits.append(comp_dict)
 
     # Definir se está em modo de edição
@@ -1570,9 +1509,6 @@ def relatorio(boletim_id, edit_mode=None):
             'prazo_total': {'status': 'ERRO', 'dias_decorridos': 0}
         }
 
-    # Fechar conexão
-    db.close()
-
     return render_template(
         'relatorio_excel.html',
         boletim=boletim,
@@ -1581,7 +1517,8 @@ def relatorio(boletim_id, edit_mode=None):
         checklist=checklist,
         componentes_dict=componentes_dict,
         edit_mode=is_edit_mode,
-        validacao_prazos=validacao_prazos
+        validacao_prazos=validacao_prazos,
+        t2_limite=CEP_T2_LIMITE
     )
 
 
@@ -1602,24 +1539,42 @@ def revalidar_boletim(boletim_id):
         SELECT * FROM componentes WHERE boletin_id = ?
     ''', (boletim_id,)).fetchall()
 
+    # Janela "as-of": apenas amostras coletadas antes deste boletim
+    janelas_cep = buscar_janelas_cep_lote(
+        db, boletim['fluxo'], [componente['nome'] for componente in componentes],
+        antes_de=boletim['data_coleta'])
+    snapshots = {nome: snapshot_cep(janela) for nome, janela in janelas_cep.items()}
+    regras_cep = avaliar_regras_as_of(db, boletim['fluxo'], boletim['data_coleta'], {
+        componente['nome']: (componente['percentual_molar'], snapshots[componente['nome']])
+        for componente in componentes
+    })
+    t2 = avaliar_t2_as_of(db, boletim['fluxo'], boletim['data_coleta'], {
+        componente['nome']: componente['percentual_molar'] for componente in componentes
+    })
+
     # Revalidar cada componente
     for componente in componentes:
         # Validação A.G.A #8
         status_aga = "VALIDADO" if valida_aga8(
             componente['nome'], componente['percentual_molar']) else "INVALIDADO"
 
-        # Validação CEP
-        historico = get_historico_componente(componente['nome'])
-        status_cep = "VALIDADO" if valida_cep(
+        # Validação CEP (limites I-MR e regras de sequência)
+        regras = regras_cep[componente['nome']]
+        status_cep = "VALIDADO" if (valida_cep(
             componente['nome'],
             componente['percentual_molar'],
-            historico) else "INVALIDADO"
+            janelas_cep[componente['nome']]['valores'])
+            and not invalida_por_regras(regras)) else "INVALIDADO"
 
         # Atualizar status do componente
         db.execute('''
-            UPDATE componentes SET status_aga = ?, status_cep = ?
+            UPDATE componentes SET status_aga = ?, status_cep = ?, regras_cep = ?
             WHERE id = ?
-        ''', (status_aga, status_cep, componente['id']))
+        ''', (status_aga, status_cep, formatar_regras(regras), componente['id']))
+
+    gravar_snapshots_cep(db, [
+        (boletim_id, nome, snapshot) for nome, snapshot in snapshots.items()
+    ])
 
     # Recalcular status geral do boletim
     componentes_aga_invalidos = db.execute('''
@@ -1634,19 +1589,24 @@ def revalidar_boletim(boletim_id):
     ''', (boletim_id, 'INVALIDADO')).fetchone()[0]
     status_cep = "INVALIDADO" if componentes_cep_invalidos > 0 else "VALIDADO"
 
+    # Status CEP multivariado (T² de Hotelling)
+    status_multivariado = status_t2(t2)
+
     # Status Checklist (sempre VALIDADO por enquanto)
     status_checklist = "VALIDADO"
 
     # Status Geral
-    status = "INVALIDADO" if (
-        status_aga8 == "INVALIDADO" or status_cep == "INVALIDADO") else "VALIDADO"
+    status = "INVALIDADO" if "INVALIDADO" in (status_aga8, status_cep) or invalida_por_t2(
+        status_multivariado) else "VALIDADO"
     data_validacao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     # Atualizar o boletim
     db.execute('''
         UPDATE boletins SET status = ?, status_cep = ?, status_aga8 = ?,
-                           status_checklist = ?, data_validacao = ? WHERE id = ?
-    ''', (status, status_cep, status_aga8, status_checklist, data_validacao, boletim_id))
+                           status_checklist = ?, t2_hotelling = ?, status_t2 = ?,
+                           data_validacao = ? WHERE id = ?
+    ''', (status, status_cep, status_aga8, status_checklist, t2, status_multivariado,
+          data_validacao, boletim_id))
 
     db.commit()
 
@@ -1656,83 +1616,84 @@ def revalidar_boletim(boletim_id):
 
 @app.route('/revalidar_todos', methods=['POST'])
 def revalidar_todos_boletins():
-    """Revalida todos os boletins pendentes no sistema"""
+    """Agenda a revalidação dos boletins pendentes (ou de todos) em segundo plano"""
     db = get_db()
+    escopo = 'todos' if request.form.get('escopo') == 'todos' else 'pendentes'
 
-    # Buscar todos os boletins com status pendente ou nulo
-    boletins_pendentes = db.execute('''
-        SELECT id FROM boletins
-        WHERE status IS NULL OR status = 'PENDENTE' OR status = ''
-    ''').fetchall()
-
-    contador_validados = 0
-    contador_invalidados = 0
+    # Revalidação em lotes com commit e checkpoint por lote (ver jobs.py)
+    job_id = criar_job(db, 'revalidacao', {'escopo': escopo})
+    submeter_job(job_id)
 
-    for boletim in boletins_pendentes:
-        boletim_id = boletim['id']
+    flash(f'Revalidação iniciada em segundo plano (job {job_id})')
+    return redirect(url_for('listar_boletins', job=job_id))
 
-        # Buscar todos os componentes do boletim
-        componentes = db.execute('''
-            SELECT * FROM componentes WHERE boletin_id = ?
-        ''', (boletim_id,)).fetchall()
-
-        # Revalidar cada componente
-        for componente in componentes:
-            # Validação A.G.A #8
-            status_aga = "VALIDADO" if valida_aga8(
-                componente['nome'], componente['percentual_molar']) else "INVALIDADO"
 
-            # Validação CEP
-            historico = get_historico_componente(componente['nome'])
-            status_cep = "VALIDADO" if valida_cep(
-                componente['nome'],
-                componente['percentual_molar'],
-                historico) else "INVALIDADO"
+@app.route('/jobs/<int:job_id>')
+def status_job(job_id):
+    """Status completo de um job (JSON)"""
+    db = get_db()
+    # Jobs interrompidos (worker reiniciado) voltam a executar do checkpoint
+    retomar_jobs(db)
+    job = buscar_job(db, job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job)
 
-            # Atualizar status do componente
-            db.execute('''
-                UPDATE componentes SET status_aga = ?, status_cep = ?
-                WHERE id = ?
-            ''', (status_aga, status_cep, componente['id']))
 
-        # Recalcular status geral do boletim
-        componentes_aga_invalidos = db.execute('''
-            SELECT COUNT(*) FROM componentes
-            WHERE boletin_id = ? AND status_aga = ?
-        ''', (boletim_id, 'INVALIDADO')).fetchone()[0]
-        status_aga8 = "INVALIDADO" if componentes_aga_invalidos > 0 else "VALIDADO"
+@app.route('/jobs/<int:job_id>/progresso')
+def progresso_job(job_id):
+    """Progresso resumido de um job, consultado periodicamente pela interface"""
+    db = get_db()
+    retomar_jobs(db)
+    job = buscar_job(db, job_id)
+    if job is None:
+        abort(404)
+    return jsonify({campo: job[campo] for campo in (
+        'id', 'status', 'processados', 'total', 'percentual', 'resultado', 'erro')})
 
-        componentes_cep_invalidos = db.execute('''
-            SELECT COUNT(*) FROM componentes
-            WHERE boletin_id = ? AND status_cep = ?
-        ''', (boletim_id, 'INVALIDADO')).fetchone()[0]
-        status_cep = "INVALIDADO" if componentes_cep_invalidos > 0 else "VALIDADO"
 
-        # Status Checklist (sempre VALIDADO por enquanto)
-        status_checklist = "VALIDADO"
-
-        # Status Geral
-        status = "INVALIDADO" if (
-            status_aga8 == "INVALIDADO" or status_cep == "INVALIDADO") else "VALIDADO"
-        data_validacao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+@app.route('/jobs/<int:job_id>/retomar', methods=['POST'])
+def retomar_job_com_erro(job_id):
+    """Retoma um job que terminou com erro a partir do último checkpoint"""
+    db = get_db()
+    if buscar_job(db, job_id) is None:
+        abort(404)
+    retomar_job(db, job_id)
+    flash(f'Job {job_id} retomado')
+    return redirect(url_for('listar_boletins', job=job_id))
 
-        # Atualizar o boletim
-        db.execute('''
-            UPDATE boletins SET status = ?, status_cep = ?, status_aga8 = ?,
-                               status_checklist = ?, data_validacao = ? WHERE id = ?
-        ''', (status, status_cep, status_aga8, status_checklist, data_validacao, boletim_id))
 
-        if status == "VALIDADO":
-            contador_validados += 1
-        else:
-            contador_invalidados += 1
+@app.route('/revalidacao/simular')
+def simular_revalidacao_ndjson():
+    """
+    Revalidação "a seco" para avaliar uma mudança de configuração
 
-    db.commit()
+    Parâmetros opcionais: sigma, janela, todos=1 (inclui componentes sem
+    alteração) e limites_aga8 (JSON sobreposto a LIMITES_AGA8). Responde em
+    NDJSON, uma linha por componente, à medida que as séries são avaliadas;
+    usa uma conexão somente leitura.
+    """
+    sigma = request.args.get('sigma', CEP_SIGMA_LIMIT, type=float)
+    janela = request.args.get('janela', CEP_AMOSTRAS_MIN, type=int)
+    apenas_alteracoes = not request.args.get('todos')
+    limites_aga8 = dict(LIMITES_AGA8)
+    try:
+        limites_aga8.update(json.loads(request.args.get('limites_aga8', '{}')))
+    except ValueError:
+        abort(400)
+    if sigma <= 0 or janela < 2:
+        abort(400)
+
+    def linhas():
+        db = connect_db(somente_leitura=True)
+        try:
+            for linha in simular_revalidacao(db, n=janela, sigma=sigma, limites_aga8=limites_aga8,
+                                             apenas_alteracoes=apenas_alteracoes):
+                yield json.dumps(linha, ensure_ascii=False) + '\n'
+        finally:
+            db.close()
 
-    total_processados = len(boletins_pendentes)
-    flash(f'Processados {total_processados} boletins: {contador_validados} validados, '
-          f'{contador_invalidados} invalidados')
-    return redirect(url_for('listar_boletins'))
+    return Response(linhas(), mimetype='application/x-ndjson')
 
 
 @app.route('/relatorio/<int:boletim_id>/pdf')
@@ -1888,9 +1849,9 @@ def processar_boletins_existentes():
 
                     # Adicionar ao histórico
                     db.execute('''
-                        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta)
-                        VALUES (?, ?, ?, ?)
-                    ''', (componente, boletim['id'], 0.0, boletim['data_coleta']))
+                        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (componente, boletim['id'], 0.0, boletim['data_coleta'], boletim['fluxo']))
 
             # Atualizar status do boletim
             db.execute('''
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Controle Estatístico de Processo (CEP)
+Sistema de Validação de Boletins Cromatográficos
+
+O histórico é particionado em fluxos (instalação + sistema de medição +
+ponto de coleta): cada fluxo tem sua própria janela de controle. A janela é
+consultada diretamente no banco: apenas as últimas N amostras
+(N = CEP_AMOSTRAS_MIN) são lidas, via índice (fluxo, componente,
+data_coleta) com ORDER BY data_coleta DESC LIMIT N, em vez de carregar todo
+o histórico para depois descartar quase tudo.
+
+Modo "as-of": ao informar antes_de (a data_coleta de um boletim), a janela
+passa a ser formada pelas N amostras estritamente anteriores a essa data.
+A revalidação de boletins antigos fica determinística (não enxerga amostras
+posteriores nem o próprio valor) e cada janela custa uma busca por faixa no
+mesmo índice.
+
+Os limites efetivamente aplicados a cada boletim (LCI, LCS, média, amplitude
+móvel média e IDs das amostras da janela) são gravados em cep_snapshots na
+validação/revalidação; relatório e PDF apenas os leem.
+"""
+
+import json
+from datetime import datetime
+
+from config import CEP_AMOSTRAS_MIN, CEP_D2_CONSTANT, CEP_SIGMA_LIMIT
+
+_SQL_JANELA_COMPONENTE = '''
+    SELECT id, componente, valor, data_coleta FROM historico_componentes
+    WHERE fluxo = ? AND componente = ?{filtro_data}
+    ORDER BY data_coleta DESC, id DESC
+    LIMIT ?
+'''
+
+_SQL_JANELA_PROPRIEDADE = '''
+    SELECT valor FROM historico_propriedades
+    WHERE fluxo = ? AND propriedade = ?{filtro_data}
+    ORDER BY data_coleta DESC, id DESC
+    LIMIT ?
+'''
+
+_FILTRO_ANTES_DE = ' AND data_coleta < ?'
+
+
+def chave_fluxo(instalacao, sistema_medicao, ponto_coleta):
+    """
+    Chave do fluxo CEP: instalação | sistema de medição | ponto de coleta
+
+    Espaços e caixa são normalizados para que grafias diferentes do mesmo
+    ponto não abram fluxos separados.
+    """
+    partes = (' '.join(str(parte or '').split()).upper()
+              for parte in (instalacao, sistema_medicao, ponto_coleta))
+    return ' | '.join(partes)
+
+
+def fluxo_boletim(boletim):
+    """Chave do fluxo CEP de um boletim (sqlite3.Row ou dict)"""
+    instalacao = boletim['identificacao_instalacao'] or boletim['plataforma']
+    return chave_fluxo(instalacao, boletim['sistema_medicao'], boletim['ponto_coleta'])
+
+
+def sincronizar_fluxo_boletim(db, boletim_id):
+    """
+    Grava a chave do fluxo no boletim e em seu histórico
+
+    Deve ser chamada após inserir ou editar um boletim: se a instalação, o
+    sistema de medição, o ponto de coleta ou a data de coleta mudaram, as
+    amostras do histórico acompanham o boletim.
+
+    Returns:
+        str: Chave do fluxo (None se o boletim não existir)
+    """
+    boletim = db.execute('''
+        SELECT identificacao_instalacao, plataforma, sistema_medicao,
+               ponto_coleta, data_coleta
+        FROM boletins WHERE id = ?
+    ''', (boletim_id,)).fetchone()
+    if boletim is None:
+        return None
+
+    fluxo = fluxo_boletim(boletim)
+    db.execute('UPDATE boletins SET fluxo = ? WHERE id = ?', (fluxo, boletim_id))
+    for tabela in ('historico_componentes', 'historico_propriedades'):
+        db.execute(f'''
+            UPDATE {tabela} SET fluxo = ?, data_coleta = ?
+            WHERE boletin_id = ? AND (fluxo IS NOT ? OR data_coleta IS NOT ?)
+        ''', (fluxo, boletim['data_coleta'], boletim_id, fluxo, boletim['data_coleta']))
+    return fluxo
+
+
+def _consulta_janela(sql, fluxo, chave, n, antes_de):
+    """Monta a consulta da janela e seus parâmetros (com ou sem corte por data)"""
+    if antes_de is None:
+        return sql.format(filtro_data=''), (fluxo, chave, n)
+    return sql.format(filtro_data=_FILTRO_ANTES_DE), (fluxo, chave, antes_de, n)
+
+
+def _cronologico(rows):
+    """Inverte linhas lidas em ordem decrescente, descartando valores nulos"""
+    return [row['valor'] for row in reversed(rows) if row['valor'] is not None]
+
+
+def buscar_historico_cep(db, fluxo, componente, n=CEP_AMOSTRAS_MIN, antes_de=None):
+    """
+    Busca as últimas n amostras de um componente em um fluxo
+
+    Args:
+        db: Conexão SQLite
+        fluxo: Chave do fluxo CEP (ver chave_fluxo)
+        componente: Nome do componente (como gravado no histórico)
+        n: Tamanho da janela de controle
+        antes_de: data_coleta de referência; se informada, só entram
+            amostras coletadas estritamente antes dela
+
+    Returns:
+        list: Valores em ordem cronológica (mais antigo primeiro)
+    """
+    sql, params = _consulta_janela(_SQL_JANELA_COMPONENTE, fluxo, componente, n, antes_de)
+    return _cronologico(db.execute(sql, params).fetchall())
+
+
+def buscar_janelas_cep_lote(db, fluxo, componentes, n=CEP_AMOSTRAS_MIN, antes_de=None):
+    """
+    Busca a janela de controle de vários componentes de um fluxo em uma única consulta
+
+    Cada componente é um ramo UNION ALL com seu próprio LIMIT, de forma que
+    todos continuam usando o índice e o custo independe do tamanho do
+    histórico.
+
+    Returns:
+        dict: {componente: {'ids': [...], 'valores': [...], 'datas': [...]}}
+        em ordem cronológica (ids de historico_componentes)
+    """
+    componentes = list(dict.fromkeys(componentes))
+    janelas = {componente: {'ids': [], 'valores': [], 'datas': []}
+               for componente in componentes}
+    if not componentes:
+        return janelas
+
+    ramos = []
+    params = []
+    for componente in componentes:
+        sql, parametros = _consulta_janela(
+            _SQL_JANELA_COMPONENTE, fluxo, componente, n, antes_de)
+        ramos.append(f'SELECT * FROM ({sql})')
+        params.extend(parametros)
+    sql = ' UNION ALL '.join(ramos)
+
+    # As linhas chegam em ordem decrescente dentro de cada ramo
+    for row in db.execute(sql, params).fetchall():
+        if row['valor'] is not None:
+            janela = janelas[row['componente']]
+            janela['ids'].append(row['id'])
+            janela['valores'].append(row['valor'])
+            janela['datas'].append(row['data_coleta'])
+
+    for janela in janelas.values():
+        janela['ids'].reverse()
+        janela['valores'].reverse()
+        janela['datas'].reverse()
+    return janelas
+
+
+def buscar_historico_cep_lote(db, fluxo, componentes, n=CEP_AMOSTRAS_MIN, antes_de=None):
+    """
+    Busca a janela de controle de vários componentes de um fluxo em uma única consulta
+
+    Returns:
+        dict: {componente: [valores em ordem cronológica]}
+    """
+    janelas = buscar_janelas_cep_lote(db, fluxo, componentes, n=n, antes_de=antes_de)
+    return {componente: janela['valores'] for componente, janela in janelas.items()}
+
+
+def buscar_historico_propriedade_cep(db, fluxo, propriedade, n=CEP_AMOSTRAS_MIN, antes_de=None):
+    """Busca as últimas n amostras de uma propriedade em um fluxo, em ordem cronológica"""
+    sql, params = _consulta_janela(_SQL_JANELA_PROPRIEDADE, fluxo, propriedade, n, antes_de)
+    return _cronologico(db.execute(sql, params).fetchall())
+
+
+def calcular_limites_cep(amostras):
+    """
+    Calcula os limites de controle pela amplitude móvel (carta I-MR)
+
+    Args:
+        amostras: Valores da janela de controle em ordem cronológica
+
+    Returns:
+        dict com media, media_amplitudes, lci, lcs e n_amostras, ou None
+        quando há menos de 2 amostras válidas
+    """
+    amostras = [
+        x for x in amostras[-CEP_AMOSTRAS_MIN:]
+        if x is not None and isinstance(x, (int, float))
+    ]
+    if len(amostras) < 2:
+        return None
+
+    media = sum(amostras) / len(amostras)
+    amplitudes = [abs(amostras[i] - amostras[i - 1])
+                  for i in range(1, len(amostras))]
+    media_amplitudes = sum(amplitudes) / len(amplitudes)
+
+    desvio = CEP_SIGMA_LIMIT * media_amplitudes / CEP_D2_CONSTANT
+    return {
+        'media': media,
+        'media_amplitudes': media_amplitudes,
+        'lci': media - desvio,
+        'lcs': media + desvio,
+        'n_amostras': len(amostras)
+    }
+
+
+def dentro_limites_cep(valor, amostras):
+    """Verifica se o valor está dentro dos limites (aceita sem histórico suficiente)"""
+    limites = calcular_limites_cep(amostras)
+    if limites is None:
+        return True
+    return limites['lci'] <= valor <= limites['lcs']
+
+
+def snapshot_cep(janela):
+    """
+    Monta o registro dos limites aplicados a partir de uma janela
+
+    Args:
+        janela: {'ids': [...], 'valores': [...]} de buscar_janelas_cep_lote
+
+    Returns:
+        dict com media, media_amplitudes, lci, lcs (None sem histórico
+        suficiente), n_amostras e amostras_ids
+    """
+    limites = calcular_limites_cep(janela['valores']) or {
+        'media': None, 'media_amplitudes': None, 'lci': None, 'lcs': None
+    }
+    ids = janela['ids'][-CEP_AMOSTRAS_MIN:]
+    return {
+        'media': limites['media'],
+        'media_amplitudes': limites['media_amplitudes'],
+        'lci': limites['lci'],
+        'lcs': limites['lcs'],
+        'n_amostras': len(ids),
+        'amostras_ids': ids
+    }
+
+
+def gravar_snapshots_cep(db, registros, sigma=CEP_SIGMA_LIMIT):
+    """
+    Grava (substituindo) os limites aplicados na validação
+
+    Args:
+        db: Conexão SQLite
+        registros: Iterável de (boletin_id, componente, snapshot)
+        sigma: Multiplicador usado no cálculo dos limites
+    """
+    data_calculo = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    db.executemany('''
+        INSERT OR REPLACE INTO cep_snapshots (
+            boletin_id, componente, media, media_amplitudes, lci, lcs,
+            n_amostras, amostras_ids, sigma, data_calculo
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (boletin_id, componente, snapshot['media'], snapshot['media_amplitudes'],
+         snapshot['lci'], snapshot['lcs'], snapshot['n_amostras'],
+         json.dumps(snapshot['amostras_ids']), sigma, data_calculo)
+        for boletin_id, componente, snapshot in registros
+    ])
+
+
+def buscar_snapshots_cep(db, boletim_id):
+    """
+    Lê os limites aplicados a um boletim (uma consulta indexada)
+
+    Returns:
+        dict: {componente: snapshot}
+    """
+    rows = db.execute('''
+        SELECT componente, media, media_amplitudes, lci, lcs, n_amostras,
+               amostras_ids, sigma, data_calculo
+        FROM cep_snapshots WHERE boletin_id = ?
+    ''', (boletim_id,)).fetchall()
+    snapshots = {}
+    for row in rows:
+        snapshot = dict(row)
+        snapshot['amostras_ids'] = json.loads(row['amostras_ids'] or '[]')
+        snapshots[row['componente']] = snapshot
+    return snapshots
+
+
+def limites_cep_boletim(db, boletim, componentes):
+    """
+    Limites CEP a exibir no relatório/PDF de um boletim
+
+    Usa os snapshots gravados na validação; componentes de boletins validados
+    antes da existência de cep_snapshots recebem os limites "as-of" do fluxo
+    do boletim, calculados na hora (sem gravar).
+
+    Returns:
+        dict: {componente: snapshot}
+    """
+    snapshots = buscar_snapshots_cep(db, boletim['id'])
+    faltantes = [nome for nome in componentes if nome not in snapshots]
+    if faltantes:
+        janelas = buscar_janelas_cep_lote(
+            db, boletim['fluxo'], faltantes, antes_de=boletim['data_coleta'])
+        for nome, janela in janelas.items():
+            snapshots[nome] = snapshot_cep(janela)
+    return snapshots
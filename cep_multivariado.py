@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+CEP multivariado: T² de Hotelling sobre o vetor de composição
+Sistema de Validação de Boletins Cromatográficos
+
+O CEP por componente não enxerga deslocamentos correlacionados (metano
+caindo enquanto etano e propano sobem, cada um dentro dos seus limites).
+Aqui cada fluxo mantém, em cep_t2_estado, o vetor médio dos 15 componentes,
+a matriz de somas de produtos cruzados (Welford) e a matriz de precisão
+(inversa da covariância). Avaliar um boletim novo custa um produto
+matriz-vetor 15×15; incluir a amostra no estado é uma atualização de posto
+um da soma de produtos e da precisão (Sherman–Morrison), sem inverter a
+matriz.
+
+A soma de produtos cruzados recebe uma regularização diagonal
+(CEP_T2_RIDGE), pois a soma dos percentuais é sempre 100. Ela entra uma
+única vez, como uma amostra a mais, para que cada amostra nova mude a
+covariância só por uma escala e um termo de posto um. A precisão é
+invertida do zero quando muda o conjunto de componentes sem variância ou
+o CEP_T2_RIDGE com que foi gravada. Componentes sem variação no fluxo
+(abaixo de CEP_T2_VARIANCIA_MIN, ex.: Oxigênio sempre zero) ficam fora do
+T²: só a regularização faria qualquer leitura diferente de zero disparar o
+alarme, e o CEP por componente já cobre esse caso.
+
+O T² gera um status próprio (boletins.status_t2), que só entra no status
+geral do boletim com CEP_T2_INVALIDA_BOLETIM.
+
+Para revalidar o histórico, t2_as_of calcula o T² de todos os boletins de
+um fluxo de uma vez, com somas acumuladas e solve em lote do NumPy. Após
+uma alteração no meio da série, separar_estados_t2 tira do estado gravado
+as amostras a partir da data alterada, e só essa cauda é recalculada.
+"""
+
+import json
+
+import numpy as np
+
+from config import (
+    CEP_T2_AMOSTRAS_MIN,
+    CEP_T2_INVALIDA_BOLETIM,
+    CEP_T2_LIMITE,
+    CEP_T2_RIDGE,
+    CEP_T2_VARIANCIA_MIN
+)
+
+COMPONENTES_T2 = (
+    'Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano',
+    'i-Pentano', 'n-Pentano', 'Hexano', 'Heptano', 'Octano',
+    'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2'
+)
+
+_INDICE_COMPONENTE = {nome: i for i, nome in enumerate(COMPONENTES_T2)}
+_P = len(COMPONENTES_T2)
+
+
+def vetor_composicao(valores):
+    """Vetor na ordem de COMPONENTES_T2 a partir de {componente: valor}"""
+    vetor = np.zeros(_P)
+    for nome, valor in valores.items():
+        indice = _INDICE_COMPONENTE.get(nome)
+        if indice is not None:
+            vetor[indice] = float(valor)
+    return vetor
+
+
+def status_t2(t2):
+    """Status do boletim (aceito enquanto o fluxo não tem histórico suficiente)"""
+    return "VALIDADO" if t2 is None or t2 <= CEP_T2_LIMITE else "INVALIDADO"
+
+
+def invalida_por_t2(status_multivariado):
+    """Indica se o status do T² invalida o boletim (CEP_T2_INVALIDA_BOLETIM)"""
+    return CEP_T2_INVALIDA_BOLETIM and status_multivariado == "INVALIDADO"
+
+
+def _opcional(t2):
+    return None if np.isnan(t2) else float(t2)
+
+
+def estado_t2_inicial():
+    """Estado de um fluxo sem amostras"""
+    return {'n_amostras': 0, 'ultima_data': None, 'media': np.zeros(_P),
+            'm2': np.zeros((_P, _P)), 'precisao': None}
+
+
+def _constantes(m2, n_amostras):
+    """Componentes sem variância (escalar ou vetor de n_amostras, pilha de m2)"""
+    graus = np.asarray(n_amostras, dtype=float)[..., None] - 1
+    return np.diagonal(m2, axis1=-2, axis2=-1) / graus < CEP_T2_VARIANCIA_MIN
+
+
+def _sem_variancia(m2, n_amostras):
+    """
+    Covariância regularizada, (m2 + CEP_T2_RIDGE·I) / (n - 1), sem os
+    componentes sem variância: linha e coluna viram as da identidade
+    (matriz continua inversível) e a máscara devolvida zera o desvio deles
+
+    Args:
+        m2: Soma de produtos cruzados 15×15 ou pilha (n × 15 × 15)
+        n_amostras: Amostras de cada matriz (escalar ou vetor)
+    """
+    constantes = _constantes(m2, n_amostras)
+    excluir = constantes[..., :, None] | constantes[..., None, :]
+    graus = np.asarray(n_amostras, dtype=float)[..., None, None] - 1
+    ajustada = np.where(excluir, np.eye(_P), (m2 + CEP_T2_RIDGE * np.eye(_P)) / graus)
+    return ajustada, constantes
+
+
+def _precisao(m2, n_amostras):
+    """Inversa da covariância regularizada (zerada nos componentes sem variância)"""
+    if n_amostras < 2:
+        return None
+    covariancia, constantes = _sem_variancia(m2, n_amostras)
+    precisao = np.linalg.inv(covariancia)
+    precisao[constantes, :] = 0.0
+    precisao[:, constantes] = 0.0
+    return precisao
+
+
+def atualizar_estado_t2(estado, vetor, data=None):
+    """
+    Inclui uma amostra no estado (Welford) e devolve o novo estado
+
+    Com desvio d em relação à média anterior, m2 ganha d·dᵀ·(n-1)/n e a
+    covariância regularizada passa a C·(n-2)/(n-1) + d·dᵀ/n: a precisão é
+    atualizada por Sherman–Morrison em O(15²). Inverte do zero na primeira
+    vez e quando algum componente entra ou sai do T² (sem variância).
+    """
+    n_amostras = estado['n_amostras'] + 1
+    desvio = vetor - estado['media']
+    media = estado['media'] + desvio / n_amostras
+    m2 = estado['m2'] + np.outer(desvio, vetor - media)
+
+    precisao = estado['precisao']
+    constantes = _constantes(m2, n_amostras) if n_amostras >= 2 else None
+    if precisao is None or (constantes != _constantes(estado['m2'], n_amostras - 1)).any():
+        precisao = _precisao(m2, n_amostras)
+    else:
+        anterior = precisao * (n_amostras - 1) / (n_amostras - 2)
+        direcao = anterior @ np.where(constantes, 0.0, desvio)
+        precisao = anterior - np.outer(direcao, direcao) / (n_amostras + desvio @ direcao)
+    return {'n_amostras': n_amostras,
+            'ultima_data': data if data is not None else estado['ultima_data'],
+            'media': media, 'm2': m2, 'precisao': precisao}
+
+
+def combinar_estados_t2(a, b):
+    """Estado das amostras de a e b juntas (fórmula de Chan para Welford)"""
+    if b['n_amostras'] == 0:
+        return a
+    if a['n_amostras'] == 0:
+        return b
+    n_amostras = a['n_amostras'] + b['n_amostras']
+    delta = b['media'] - a['media']
+    m2 = a['m2'] + b['m2'] + np.outer(delta, delta) * a['n_amostras'] * b['n_amostras'] / n_amostras
+    return {'n_amostras': n_amostras, 'ultima_data': b['ultima_data'] or a['ultima_data'],
+            'media': a['media'] + delta * b['n_amostras'] / n_amostras,
+            'm2': m2, 'precisao': _precisao(m2, n_amostras)}
+
+
+def separar_estados_t2(total, parte):
+    """
+    Estado das amostras de total que não estão em parte (inverso de
+    combinar_estados_t2); None se parte não cabe em total
+
+    A última data do resultado não é conhecida e fica None.
+    """
+    n_amostras = total['n_amostras'] - parte['n_amostras']
+    if n_amostras < 0:
+        return None
+    if n_amostras == 0:
+        return estado_t2_inicial()
+    if parte['n_amostras'] == 0:
+        return dict(total, ultima_data=None)
+    media = (total['n_amostras'] * total['media'] - parte['n_amostras'] * parte['media']) / n_amostras
+    delta = parte['media'] - media
+    m2 = (total['m2'] - parte['m2']
+          - np.outer(delta, delta) * n_amostras * parte['n_amostras'] / total['n_amostras'])
+    return {'n_amostras': n_amostras, 'ultima_data': None, 'media': media, 'm2': m2,
+            'precisao': _precisao(m2, n_amostras)}
+
+
+def t2_hotelling(estado, vetor):
+    """T² de uma composição contra o estado do fluxo (None sem histórico suficiente)"""
+    if estado['n_amostras'] < CEP_T2_AMOSTRAS_MIN:
+        return None
+    desvio = vetor - estado['media']
+    return float(desvio @ estado['precisao'] @ desvio)
+
+
+def estado_t2_de_serie(datas, composicoes):
+    """Estado equivalente a incluir toda a série, calculado de uma vez"""
+    composicoes = np.asarray(composicoes, dtype=float).reshape(-1, _P)
+    if len(composicoes) == 0:
+        return estado_t2_inicial()
+    media = composicoes.mean(axis=0)
+    centrado = composicoes - media
+    m2 = centrado.T @ centrado
+    return {'n_amostras': len(composicoes), 'ultima_data': str(datas[-1]),
+            'media': media, 'm2': m2, 'precisao': _precisao(m2, len(composicoes))}
+
+
+def t2_as_of(datas, composicoes, datas_alvo, composicoes_alvo, inicial=None):
+    """
+    T² de vários boletins de um fluxo em lote
+
+    Para cada alvo, média e covariância vêm dos boletins coletados
+    estritamente antes da sua data (mesma regra das janelas do CEP).
+
+    Args:
+        datas: Datas da série do fluxo, em ordem cronológica
+        composicoes: Matriz (boletins × 15) alinhada às datas
+        datas_alvo: Datas dos boletins a avaliar
+        composicoes_alvo: Matriz (alvos × 15)
+        inicial: Estado das amostras anteriores a toda a série, quando a
+            série é só a cauda do fluxo a partir de uma data
+
+    Returns:
+        np.ndarray: T² de cada alvo (NaN sem histórico suficiente)
+    """
+    composicoes = np.asarray(composicoes, dtype=float).reshape(-1, _P)
+    composicoes_alvo = np.asarray(composicoes_alvo, dtype=float).reshape(-1, _P)
+    t2 = np.full(len(composicoes_alvo), np.nan)
+    inicial = inicial or estado_t2_inicial()
+    n_inicial = inicial['n_amostras']
+
+    anteriores = n_inicial + np.searchsorted(datas, datas_alvo, side='left')
+    avaliados = anteriores >= max(CEP_T2_AMOSTRAS_MIN, 2)
+    if not avaliados.any():
+        return t2
+
+    # Somas acumuladas centradas na média inicial ou na primeira amostra
+    # (estabilidade numérica); centradas na própria média, as amostras
+    # iniciais somam zero e contribuem só com o seu m2
+    referencia = inicial['media'] if n_inicial else composicoes[0]
+    centrado = composicoes - referencia
+    soma = np.vstack([np.zeros(_P), np.cumsum(centrado, axis=0)])
+    produtos = np.concatenate([
+        np.zeros((1, _P, _P)),
+        np.cumsum(centrado[:, :, None] * centrado[:, None, :], axis=0)]) + inicial['m2']
+
+    k = anteriores[avaliados]
+    media = soma[k - n_inicial] / k[:, None]
+    m2 = produtos[k - n_inicial] - k[:, None, None] * media[:, :, None] * media[:, None, :]
+    covariancia, constantes = _sem_variancia(m2, k)
+    desvio = np.where(constantes, 0.0, composicoes_alvo[avaliados] - referencia - media)
+    t2[avaliados] = np.einsum(
+        'ij,ij->i', desvio, np.linalg.solve(covariancia, desvio[:, :, None])[:, :, 0])
+    return t2
+
+
+def carregar_composicoes(db, fluxos=None, desde=None):
+    """
+    Composição de cada boletim a partir de historico_componentes
+
+    Args:
+        fluxos: Fluxos a carregar (None = todos)
+        desde: Só os boletins coletados nesta data ou depois (pelo índice
+            fluxo, componente, data_coleta)
+
+    Returns:
+        dict: {fluxo: (datas, boletim_ids, matriz boletins × 15)} em ordem
+        cronológica
+    """
+    sql = f'''
+        SELECT fluxo, boletin_id, data_coleta, componente, valor FROM historico_componentes
+        WHERE componente IN ({', '.join('?' * _P)})
+    '''
+    params = list(COMPONENTES_T2)
+    if fluxos is not None:
+        fluxos = list(dict.fromkeys(fluxos))
+        if not fluxos:
+            return {}
+        sql += f" AND fluxo IN ({', '.join('?' * len(fluxos))})"
+        params += fluxos
+    if desde is not None:
+        sql += ' AND data_coleta >= ?'
+        params.append(desde)
+    sql += ' ORDER BY fluxo, data_coleta, boletin_id'
+
+    rows = db.execute(sql, params).fetchall()
+    if not rows:
+        return {}
+
+    chaves_fluxo = np.array([row[0] for row in rows])
+    boletins = np.array([row[1] for row in rows], dtype=np.int64)
+    datas = np.array([row[2] for row in rows])
+    colunas = np.array([_INDICE_COMPONENTE[row[3]] for row in rows])
+    valores = np.array([row[4] for row in rows], dtype=float)
+
+    # Uma linha da matriz por boletim: cortar nas trocas de fluxo/boletim
+    trocas = (chaves_fluxo[1:] != chaves_fluxo[:-1]) | (boletins[1:] != boletins[:-1])
+    linha = np.concatenate(([0], np.cumsum(trocas)))
+    inicios = np.concatenate(([0], np.flatnonzero(trocas) + 1))
+    matriz = np.zeros((len(inicios), _P))
+    matriz[linha, colunas] = valores
+
+    fluxo_linha = chaves_fluxo[inicios]
+    cortes = np.concatenate(([0], np.flatnonzero(fluxo_linha[1:] != fluxo_linha[:-1]) + 1,
+                             [len(inicios)]))
+    return {
+        str(fluxo_linha[inicio]): (datas[inicios[inicio:fim]], boletins[inicios[inicio:fim]],
+                                   matriz[inicio:fim])
+        for inicio, fim in zip(cortes[:-1], cortes[1:])
+    }
+
+
+def composicoes_boletins(db, boletim_ids):
+    """
+    Posição e composição gravadas de boletins, para informar a
+    revalidar_dependentes o que havia antes de editá-los ou excluí-los
+
+    Returns:
+        dict: {boletim_id: (fluxo, data_coleta, vetor de 15 componentes ou
+        None se o boletim não tem nenhum deles, nomes de todos os componentes)}
+    """
+    composicoes = {}
+    for boletim_id in boletim_ids:
+        rows = db.execute('''
+            SELECT fluxo, data_coleta, componente, valor FROM historico_componentes
+            WHERE boletin_id = ?
+        ''', (boletim_id,)).fetchall()
+        if rows:
+            valores = {row[2]: row[3] for row in rows if row[2] in _INDICE_COMPONENTE}
+            composicoes[boletim_id] = (rows[0][0], rows[0][1],
+                                       vetor_composicao(valores) if valores else None,
+                                       frozenset(row[2] for row in rows))
+    return composicoes
+
+
+def carregar_estado_t2(db, fluxo):
+    """
+    Estado gravado do fluxo (None se ainda não existe); a precisão é
+    invertida de novo se foi gravada com outro CEP_T2_RIDGE
+    """
+    row = db.execute('''
+        SELECT n_amostras, ultima_data, media, m2, precisao, ridge FROM cep_t2_estado
+        WHERE fluxo = ?
+    ''', (fluxo,)).fetchone()
+    if row is None:
+        return None
+    m2 = np.array(json.loads(row[3]))
+    if row[5] == CEP_T2_RIDGE:
+        precisao = None if row[4] is None else np.array(json.loads(row[4]))
+    else:
+        precisao = _precisao(m2, row[0])
+    return {'n_amostras': row[0], 'ultima_data': row[1],
+            'media': np.array(json.loads(row[2])), 'm2': m2, 'precisao': precisao}
+
+
+def gravar_estados_t2(db, registros):
+    """Grava (substituindo) estados: iterável de (fluxo, estado)"""
+    db.executemany('''
+        INSERT OR REPLACE INTO cep_t2_estado (fluxo, n_amostras, ultima_data, media, m2,
+                                              precisao, ridge)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (fluxo, estado['n_amostras'], estado['ultima_data'],
+         json.dumps(estado['media'].tolist()), json.dumps(estado['m2'].tolist()),
+         None if estado['precisao'] is None else json.dumps(estado['precisao'].tolist()),
+         CEP_T2_RIDGE)
+        for fluxo, estado in registros
+    ])
+
+
+def aplicar_t2_hotelling(db, fluxo, data_coleta, valores):
+    """
+    Avalia a composição de um novo boletim e atualiza o estado do fluxo
+
+    As amostras já devem estar gravadas em historico_componentes. Boletins
+    mais recentes que o último processado usam o estado gravado; boletins
+    fora de ordem (ou fluxos ainda sem estado) recalculam o estado a partir
+    da série do fluxo.
+
+    Args:
+        db: Conexão SQLite
+        fluxo: Chave do fluxo CEP
+        data_coleta: Data de coleta do boletim
+        valores: {componente: percentual molar}
+
+    Returns:
+        float: T² do boletim, ou None sem histórico suficiente
+    """
+    vetor = vetor_composicao(valores)
+    estado = carregar_estado_t2(db, fluxo)
+
+    if estado is not None and (estado['ultima_data'] is None
+                               or data_coleta > estado['ultima_data']):
+        t2 = t2_hotelling(estado, vetor)
+        estado = atualizar_estado_t2(estado, vetor, data_coleta)
+    else:
+        datas, _, composicoes = carregar_composicoes(db, [fluxo])[fluxo]
+        t2 = _opcional(t2_as_of(datas, composicoes, [data_coleta], [vetor])[0])
+        estado = estado_t2_de_serie(datas, composicoes)
+
+    gravar_estados_t2(db, [(fluxo, estado)])
+    return t2
+
+
+def avaliar_t2_as_of(db, fluxo, data_coleta, valores):
+    """
+    T² de um boletim já gravado, reavaliado na sua data (não altera o estado)
+
+    Parte do estado gravado do fluxo e tira dele só a cauda coletada a
+    partir de data_coleta (lida pelo índice), como revalidar_dependentes;
+    sem estado gravado compatível, lê o fluxo inteiro.
+    """
+    estado = carregar_estado_t2(db, fluxo)
+    if estado is not None:
+        cauda = carregar_composicoes(db, [fluxo], desde=data_coleta).get(fluxo)
+        anterior = separar_estados_t2(estado, estado_t2_inicial() if cauda is None
+                                      else estado_t2_de_serie(cauda[0], cauda[2]))
+        if anterior is not None:
+            return t2_hotelling(anterior, vetor_composicao(valores))
+
+    serie = carregar_composicoes(db, [fluxo]).get(fluxo)
+    if serie is None:
+        return None
+    datas, _, composicoes = serie
+    return _opcional(t2_as_of(datas, composicoes, [data_coleta], [vetor_composicao(valores)])[0])
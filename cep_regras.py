@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+"""
+Regras de sequência do CEP (Western Electric / Nelson), EWMA e CUSUM
+Sistema de Validação de Boletins Cromatográficos
+
+Cada fluxo/componente mantém um estado compacto na tabela cep_estado
+(EWMA, somas do CUSUM, contadores de sequência e máscaras de bits das
+zonas de 1σ e 2σ). Uma nova amostra atualiza todas as regras em O(1) a
+partir desse estado, sem reler o histórico. O reprocessamento de uma série
+inteira (revalidação, boletins fora de ordem) calcula os estados de todos
+os pontos com operações sobre arrays, com o mesmo resultado.
+
+Centro e sigma de cada ponto são os da janela I-MR em vigor para ele
+(media e media_amplitudes / d2), os mesmos usados por LCI/LCS.
+
+Regras:
+    R1     1 ponto além de LCI/LCS
+    R2     9 pontos seguidos do mesmo lado da média
+    R3     6 pontos seguidos crescentes ou decrescentes
+    R4     14 pontos seguidos alternando subida e descida
+    R5     2 de 3 pontos além de 2σ, do mesmo lado
+    R6     4 de 5 pontos além de 1σ, do mesmo lado
+    EWMA   média móvel exponencial fora de μ ± L·σ·√(λ/(2−λ))
+    CUSUM  soma acumulada (em σ) acima do intervalo de decisão H
+"""
+
+import numpy as np
+
+from cep import buscar_janelas_cep_lote
+from cep_vetorizado import limites_cep_as_of
+from config import (
+    CEP_AMOSTRAS_MIN,
+    CEP_CUSUM_H,
+    CEP_CUSUM_K,
+    CEP_D2_CONSTANT,
+    CEP_EWMA_L,
+    CEP_EWMA_LAMBDA,
+    CEP_REGRAS_INVALIDANTES,
+    CEP_REGRAS_MEMORIA
+)
+
+REGRAS_CEP = {
+    'R1': '1 ponto além dos limites de controle',
+    'R2': '9 pontos seguidos do mesmo lado da média',
+    'R3': '6 pontos seguidos crescentes ou decrescentes',
+    'R4': '14 pontos seguidos alternando subida e descida',
+    'R5': '2 de 3 pontos além de 2σ do mesmo lado',
+    'R6': '4 de 5 pontos além de 1σ do mesmo lado',
+    'EWMA': 'Média móvel exponencial fora dos limites',
+    'CUSUM': 'Soma acumulada acima do intervalo de decisão',
+}
+
+_CAMPOS_ESTADO = (
+    'n_amostras', 'ultima_data', 'ultimo_valor', 'ewma', 'cusum_pos', 'cusum_neg',
+    'lado', 'contagem_lado', 'direcao', 'contagem_tendencia', 'contagem_alternancia',
+    'zona2_acima', 'zona2_abaixo', 'zona1_acima', 'zona1_abaixo'
+)
+
+_FATOR_EWMA = CEP_EWMA_L * (CEP_EWMA_LAMBDA / (2 - CEP_EWMA_LAMBDA)) ** 0.5
+
+# Ordem das regras na lista de cada ponto (a mesma de avaliar_ponto)
+_ORDEM_REGRAS = ('R1', 'R3', 'R4', 'R2', 'R5', 'R6', 'EWMA', 'CUSUM')
+
+# Pontos por bloco na soma da EWMA (0,8^-256 ainda é representável com folga)
+_BLOCO_EWMA = 256
+
+# Pontos por bloco do CUSUM: cada sinal recalcula no máximo um bloco
+_BLOCO_CUSUM = 128
+
+
+def estado_inicial():
+    """Estado de um fluxo/componente sem amostras"""
+    estado = dict.fromkeys(_CAMPOS_ESTADO, 0)
+    estado.update(ultima_data=None, ultimo_valor=None, ewma=None,
+                  cusum_pos=0.0, cusum_neg=0.0)
+    return estado
+
+
+def _sinal(valor):
+    return (valor > 0) - (valor < 0)
+
+
+def _empurrar(mascara, bit, largura):
+    """Desloca a máscara das últimas `largura` amostras incluindo o novo bit"""
+    return ((mascara << 1) | int(bit)) & ((1 << largura) - 1)
+
+
+def avaliar_ponto(estado, valor, limites, data=None):
+    """
+    Avalia uma amostra e devolve o estado atualizado (O(1))
+
+    Args:
+        estado: Estado anterior (não é modificado)
+        valor: Valor da amostra
+        limites: dict com media, media_amplitudes, lci e lcs da janela em
+            vigor, ou None sem histórico suficiente
+        data: data_coleta da amostra
+
+    Returns:
+        tuple: (novo_estado, lista de regras disparadas)
+    """
+    novo = dict(estado)
+    novo['n_amostras'] = estado['n_amostras'] + 1
+    novo['ultima_data'] = data if data is not None else estado['ultima_data']
+    novo['ultimo_valor'] = valor
+    regras = []
+
+    # Tendência e alternância não dependem dos limites
+    if estado['ultimo_valor'] is not None:
+        direcao = _sinal(valor - estado['ultimo_valor'])
+        anterior = estado['direcao']
+        novo['direcao'] = direcao
+        novo['contagem_tendencia'] = (
+            estado['contagem_tendencia'] + 1 if direcao and direcao == anterior
+            else int(direcao != 0))
+        novo['contagem_alternancia'] = (
+            estado['contagem_alternancia'] + 1 if direcao and direcao == -anterior
+            else int(direcao != 0))
+        if novo['contagem_tendencia'] >= 5:
+            regras.append('R3')
+        if novo['contagem_alternancia'] >= 13:
+            regras.append('R4')
+
+    if limites is None:
+        return novo, regras
+
+    media = limites['media']
+    sigma = limites['media_amplitudes'] / CEP_D2_CONSTANT
+
+    if not limites['lci'] <= valor <= limites['lcs']:
+        regras.insert(0, 'R1')
+
+    lado = _sinal(valor - media)
+    novo['lado'] = lado
+    novo['contagem_lado'] = (
+        estado['contagem_lado'] + 1 if lado and lado == estado['lado'] else int(lado != 0))
+    if novo['contagem_lado'] >= 9:
+        regras.append('R2')
+
+    # Sem dispersão na janela não há zonas, EWMA nem CUSUM
+    if sigma <= 0:
+        return novo, regras
+
+    z = (valor - media) / sigma
+    novo['zona2_acima'] = _empurrar(estado['zona2_acima'], z > 2, 3)
+    novo['zona2_abaixo'] = _empurrar(estado['zona2_abaixo'], z < -2, 3)
+    novo['zona1_acima'] = _empurrar(estado['zona1_acima'], z > 1, 5)
+    novo['zona1_abaixo'] = _empurrar(estado['zona1_abaixo'], z < -1, 5)
+    if (z > 2 and bin(novo['zona2_acima']).count('1') >= 2
+            or z < -2 and bin(novo['zona2_abaixo']).count('1') >= 2):
+        regras.append('R5')
+    if (z > 1 and bin(novo['zona1_acima']).count('1') >= 4
+            or z < -1 and bin(novo['zona1_abaixo']).count('1') >= 4):
+        regras.append('R6')
+
+    ewma_anterior = media if estado['ewma'] is None else estado['ewma']
+    novo['ewma'] = CEP_EWMA_LAMBDA * valor + (1 - CEP_EWMA_LAMBDA) * ewma_anterior
+    if abs(novo['ewma'] - media) > _FATOR_EWMA * sigma:
+        regras.append('EWMA')
+
+    novo['cusum_pos'] = max(0.0, estado['cusum_pos'] + z - CEP_CUSUM_K)
+    novo['cusum_neg'] = max(0.0, estado['cusum_neg'] - z - CEP_CUSUM_K)
+    if novo['cusum_pos'] > CEP_CUSUM_H or novo['cusum_neg'] > CEP_CUSUM_H:
+        regras.append('CUSUM')
+        # Reinicia após o sinal para detectar a próxima mudança
+        novo['cusum_pos'] = novo['cusum_neg'] = 0.0
+
+    return novo, regras
+
+
+def invalida_por_regras(regras):
+    """Indica se alguma regra disparada invalida o componente"""
+    return any(regra in CEP_REGRAS_INVALIDANTES for regra in regras)
+
+
+def formatar_regras(regras):
+    """Texto gravado em componentes.regras_cep (None se nenhuma disparou)"""
+    return ','.join(regras) or None
+
+
+def _contagem_sequencia(sinais, sinal_inicial, contagem_inicial):
+    """
+    Contagem da sequência de sinais iguais (não nulos) terminada em cada posição
+
+    Equivale a somar 1 à contagem anterior quando o sinal repete o anterior
+    e recomeçar em 1 (ou 0, sinal nulo) quando muda, partindo do sinal e da
+    contagem do estado.
+    """
+    sinais = np.concatenate(([sinal_inicial], sinais)).astype(np.int64)
+    posicoes = np.arange(len(sinais))
+    recomeca = np.ones(len(sinais), dtype=bool)
+    recomeca[1:] = (sinais[1:] != sinais[:-1]) | (sinais[1:] == 0)
+    inicio = np.maximum.accumulate(np.where(recomeca, posicoes, 0))
+    contagem = np.where(inicio == 0, contagem_inicial + posicoes, posicoes - inicio + 1)
+    contagem[sinais == 0] = 0
+    return contagem[1:]
+
+
+def _mascaras(bits, mascara_inicial, largura):
+    """Máscara das últimas `largura` amostras após cada bit (mais recente no bit 0)"""
+    anteriores = [(mascara_inicial >> bit) & 1 for bit in range(largura - 1, -1, -1)]
+    sequencia = np.concatenate((anteriores, bits)).astype(np.int64)
+    mascaras = np.zeros(len(bits), dtype=np.int64)
+    for deslocamento in range(largura):
+        mascaras |= sequencia[largura - deslocamento:largura - deslocamento + len(bits)] << deslocamento
+    return mascaras
+
+
+def _contar_bits(mascaras, largura):
+    return sum((mascaras >> bit) & 1 for bit in range(largura))
+
+
+def _ewma(valores, inicial):
+    """EWMA após cada valor: recorrência linear somada por blocos"""
+    fator = 1 - CEP_EWMA_LAMBDA
+    ewma = np.empty(len(valores))
+    for inicio in range(0, len(valores), _BLOCO_EWMA):
+        bloco = valores[inicio:inicio + _BLOCO_EWMA]
+        pesos = fator ** np.arange(1, len(bloco) + 1)
+        ewma[inicio:inicio + len(bloco)] = pesos * (
+            inicial + CEP_EWMA_LAMBDA * np.cumsum(bloco / pesos))
+        inicial = ewma[inicio + len(bloco) - 1]
+    return ewma
+
+
+def _cusum(z, positivo, negativo):
+    """
+    Somas do CUSUM após cada z, zeradas após cada sinal
+
+    Entre dois sinais cada soma é max(0, anterior + incremento), cuja forma
+    fechada (Lindley) é a soma acumulada menos o seu mínimo; cada bloco é
+    calculado de uma vez e recomeça depois do primeiro sinal.
+    """
+    somas = np.empty((2, len(z)))
+    incrementos = np.array((z - CEP_CUSUM_K, -z - CEP_CUSUM_K))
+    iniciais = np.array([[positivo], [negativo]], dtype=float)
+    inicio = 0
+    while inicio < len(z):
+        acumulado = np.cumsum(incrementos[:, inicio:inicio + _BLOCO_CUSUM], axis=1)
+        bloco = acumulado - np.minimum(-iniciais, np.minimum.accumulate(acumulado, axis=1))
+        sinais = np.flatnonzero((bloco > CEP_CUSUM_H).any(axis=0))
+        if len(sinais):
+            fim = int(sinais[0])
+            somas[:, inicio:inicio + fim] = bloco[:, :fim]
+            somas[:, inicio + fim] = 0.0
+            iniciais = np.zeros((2, 1))
+            inicio += fim + 1
+        else:
+            somas[:, inicio:inicio + bloco.shape[1]] = bloco
+            iniciais = bloco[:, -1:]
+            inicio += bloco.shape[1]
+    return somas
+
+
+def _trilha(atualizados, inicial, valores):
+    """Valor do campo após os k primeiros pontos, para k = 0..n (atualizados: máscara)"""
+    contagem = np.concatenate(([0], np.cumsum(atualizados)))
+    return np.concatenate(([inicial], valores))[contagem]
+
+
+def _estados_prefixos(valores, limites_serie, estado):
+    """
+    Estado após os k primeiros pontos da série, para k = 0..n, em arrays
+
+    Mesmo resultado de aplicar avaliar_ponto ponto a ponto: contadores de
+    sequência como comprimentos de sequências de sinais, zonas por janelas
+    deslizantes de bits, EWMA como recorrência linear e CUSUM pela forma
+    fechada. ultimo_valor e ewma ausentes valem NaN.
+    """
+    total = len(valores)
+    media = np.asarray(limites_serie['media'], dtype=float)
+    sigma = np.asarray(limites_serie['media_amplitudes'], dtype=float) / CEP_D2_CONSTANT
+    com_limites = np.asarray(limites_serie['n_amostras']) >= 2
+    com_sigma = com_limites & (np.nan_to_num(sigma) > 0)
+
+    def opcional(valor):
+        return np.nan if valor is None else valor
+
+    estados = {'n_amostras': estado['n_amostras'] + np.arange(total + 1)}
+    estados['ultimo_valor'] = np.concatenate(([opcional(estado['ultimo_valor'])], valores))
+
+    # Tendência e alternância: a partir do segundo ponto (ou do primeiro, com estado)
+    atualiza = np.ones(total, dtype=bool)
+    if estado['ultimo_valor'] is None and total:
+        atualiza[0] = False
+    direcoes = np.sign(np.diff(estados['ultimo_valor'])[atualiza]).astype(np.int64)
+    paridade = np.where(np.arange(len(direcoes)) % 2, -1, 1)
+    estados['direcao'] = _trilha(atualiza, estado['direcao'], direcoes)
+    estados['contagem_tendencia'] = _trilha(atualiza, estado['contagem_tendencia'], _contagem_sequencia(
+        direcoes, estado['direcao'], estado['contagem_tendencia']))
+    estados['contagem_alternancia'] = _trilha(atualiza, estado['contagem_alternancia'], _contagem_sequencia(
+        direcoes * paridade, -estado['direcao'], estado['contagem_alternancia']))
+
+    lados = np.sign(valores[com_limites] - media[com_limites]).astype(np.int64)
+    estados['lado'] = _trilha(com_limites, estado['lado'], lados)
+    estados['contagem_lado'] = _trilha(com_limites, estado['contagem_lado'], _contagem_sequencia(
+        lados, estado['lado'], estado['contagem_lado']))
+
+    z = (valores[com_sigma] - media[com_sigma]) / sigma[com_sigma]
+    for campo, bits, largura in (('zona2_acima', z > 2, 3), ('zona2_abaixo', z < -2, 3),
+                                 ('zona1_acima', z > 1, 5), ('zona1_abaixo', z < -1, 5)):
+        estados[campo] = _trilha(com_sigma, estado[campo], _mascaras(bits, estado[campo], largura))
+
+    ewma_inicial = estado['ewma']
+    if ewma_inicial is None and com_sigma.any():
+        ewma_inicial = media[com_sigma][0]
+    estados['ewma'] = _trilha(com_sigma, opcional(estado['ewma']),
+                              _ewma(valores[com_sigma], ewma_inicial))
+    somas = _cusum(z, estado['cusum_pos'], estado['cusum_neg'])
+    estados['cusum_pos'] = _trilha(com_sigma, estado['cusum_pos'], somas[0])
+    estados['cusum_neg'] = _trilha(com_sigma, estado['cusum_neg'], somas[1])
+    return estados
+
+
+def _regras_alvos(estados, valores, limites):
+    """
+    Regras de cada alvo avaliado a partir do estado da sua linha em `estados`
+
+    Mesma lógica de avaliar_ponto, sobre arrays; devolve uma matriz
+    (alvos × REGRAS_CEP) de regras disparadas.
+    """
+    disparadas = {}
+    anterior = estados['ultimo_valor']
+    com_anterior = ~np.isnan(anterior)
+    direcao = np.sign(valores - np.where(com_anterior, anterior, valores)).astype(np.int64)
+    tendencia = np.where((direcao != 0) & (direcao == estados['direcao']),
+                         estados['contagem_tendencia'] + 1, direcao != 0)
+    alternancia = np.where((direcao != 0) & (direcao == -estados['direcao']),
+                           estados['contagem_alternancia'] + 1, direcao != 0)
+    disparadas['R3'] = com_anterior & (tendencia >= 5)
+    disparadas['R4'] = com_anterior & (alternancia >= 13)
+
+    com_limites = np.asarray(limites['n_amostras']) >= 2
+    media = np.where(com_limites, limites['media'], 0.0)
+    sigma = np.where(com_limites, limites['media_amplitudes'], 0.0) / CEP_D2_CONSTANT
+    lci = np.where(com_limites, limites['lci'], -np.inf)
+    lcs = np.where(com_limites, limites['lcs'], np.inf)
+    disparadas['R1'] = com_limites & ~((lci <= valores) & (valores <= lcs))
+    lado = np.sign(valores - media).astype(np.int64)
+    contagem_lado = np.where((lado != 0) & (lado == estados['lado']),
+                             estados['contagem_lado'] + 1, lado != 0)
+    disparadas['R2'] = com_limites & (contagem_lado >= 9)
+
+    com_sigma = com_limites & (sigma > 0)
+    z = np.where(com_sigma, valores - media, 0.0) / np.where(com_sigma, sigma, 1.0)
+    for regra, limite, largura, minimo in (('R5', 2, 3, 2), ('R6', 1, 5, 4)):
+        acima = _contar_bits(estados[f'zona{limite}_acima'], largura - 1) + 1
+        abaixo = _contar_bits(estados[f'zona{limite}_abaixo'], largura - 1) + 1
+        disparadas[regra] = com_sigma & ((z > limite) & (acima >= minimo)
+                                         | (z < -limite) & (abaixo >= minimo))
+
+    ewma_anterior = np.where(np.isnan(estados['ewma']), media, estados['ewma'])
+    ewma = CEP_EWMA_LAMBDA * valores + (1 - CEP_EWMA_LAMBDA) * ewma_anterior
+    disparadas['EWMA'] = com_sigma & (np.abs(ewma - media) > _FATOR_EWMA * sigma)
+    positivo = np.maximum(0.0, estados['cusum_pos'] + z - CEP_CUSUM_K)
+    negativo = np.maximum(0.0, estados['cusum_neg'] - z - CEP_CUSUM_K)
+    disparadas['CUSUM'] = com_sigma & ((positivo > CEP_CUSUM_H) | (negativo > CEP_CUSUM_H))
+    return np.column_stack([disparadas[regra] for regra in _ORDEM_REGRAS])
+
+
+def preparar_serie(datas, valores, limites_serie, estado=None):
+    """
+    Estados de todos os prefixos de uma série, para avaliar alvos em vários lotes
+
+    Args:
+        datas, valores: Série do histórico em ordem cronológica
+        limites_serie: Limites de cada ponto da série (limites_cep_as_of)
+        estado: Estado inicial (padrão: vazio)
+
+    Returns:
+        dict: datas, estados (arrays por prefixo, ver _estados_prefixos) e
+        final (estado ao final da série, como em cep_estado)
+    """
+    estado = estado or estado_inicial()
+    datas = np.asarray(datas, dtype=str)
+    estados = _estados_prefixos(np.asarray(valores, dtype=float), limites_serie, estado)
+
+    final = {campo: _escalar(estados[campo][-1]) for campo in estados}
+    final['ultima_data'] = str(datas[-1]) if len(datas) else estado['ultima_data']
+    return {'datas': datas, 'estados': estados,
+            'final': {campo: final[campo] for campo in _CAMPOS_ESTADO}}
+
+
+def regras_as_of(serie, datas_alvo, valores_alvo, limites_alvo):
+    """
+    Regras de cada alvo com o estado das amostras anteriores à sua data
+
+    Args:
+        serie: Retorno de preparar_serie
+        datas_alvo, valores_alvo: Pontos a avaliar
+        limites_alvo: Limites de cada alvo (limites_cep_as_of)
+
+    Returns:
+        list: lista de regras disparadas de cada alvo
+    """
+    if not len(datas_alvo):
+        return []
+    prefixos = np.searchsorted(serie['datas'], np.asarray(datas_alvo, dtype=str), side='left')
+    disparadas = _regras_alvos(
+        {campo: valores_campo[prefixos] for campo, valores_campo in serie['estados'].items()},
+        np.asarray(valores_alvo, dtype=float), limites_alvo)
+    regras_alvo = [[] for _ in range(len(prefixos))]
+    for i in np.flatnonzero(disparadas.any(axis=1)):
+        regras_alvo[i] = [_ORDEM_REGRAS[j] for j in np.flatnonzero(disparadas[i])]
+    return regras_alvo
+
+
+def reproduzir_serie(datas, valores, limites_serie, datas_alvo=(), valores_alvo=(),
+                     limites_alvo=None, estado=None):
+    """
+    Reprocessa uma série em ordem cronológica avaliando pontos alvo "as-of"
+
+    Cada alvo é avaliado com o estado formado pelas amostras coletadas
+    estritamente antes da sua data (mesma regra das janelas de controle).
+    Os estados de todos os prefixos da série e as regras de todos os alvos
+    são calculados com operações sobre arrays (ver _estados_prefixos), com
+    o mesmo resultado de avaliar_ponto aplicado ponto a ponto.
+
+    Args:
+        datas, valores: Série do histórico em ordem cronológica
+        limites_serie: Limites de cada ponto da série (limites_cep_as_of)
+        datas_alvo, valores_alvo: Pontos a avaliar
+        limites_alvo: Limites de cada alvo (limites_cep_as_of)
+        estado: Estado inicial (padrão: vazio)
+
+    Returns:
+        tuple: (estado ao final da série, lista de regras de cada alvo)
+    """
+    serie = preparar_serie(datas, valores, limites_serie, estado)
+    return serie['final'], regras_as_of(serie, datas_alvo, valores_alvo, limites_alvo)
+
+
+def _escalar(valor):
+    """Valor de array numpy como tipo Python (NaN = None), para gravar o estado"""
+    if isinstance(valor, np.integer):
+        return int(valor)
+    valor = float(valor)
+    return None if np.isnan(valor) else valor
+
+
+def carregar_estados(db, fluxo, componentes):
+    """Estados gravados de um fluxo: {componente: estado}"""
+    componentes = list(componentes)
+    if not componentes:
+        return {}
+    rows = db.execute(f'''
+        SELECT componente, {', '.join(_CAMPOS_ESTADO)} FROM cep_estado
+        WHERE fluxo = ? AND componente IN ({', '.join('?' * len(componentes))})
+    ''', [fluxo] + componentes).fetchall()
+    return {row[0]: dict(zip(_CAMPOS_ESTADO, tuple(row)[1:])) for row in rows}
+
+
+def gravar_estados(db, registros):
+    """Grava (substituindo) estados: iterável de (fluxo, componente, estado)"""
+    db.executemany(f'''
+        INSERT OR REPLACE INTO cep_estado (fluxo, componente, {', '.join(_CAMPOS_ESTADO)})
+        VALUES (?, ?, {', '.join('?' * len(_CAMPOS_ESTADO))})
+    ''', [
+        (fluxo, componente) + tuple(estado[campo] for campo in _CAMPOS_ESTADO)
+        for fluxo, componente, estado in registros
+    ])
+
+
+def _serie_fluxo(db, fluxo, componente):
+    """Série completa de um fluxo/componente com os limites de cada ponto"""
+    rows = db.execute('''
+        SELECT valor, data_coleta FROM historico_componentes
+        WHERE fluxo = ? AND componente = ?
+        ORDER BY data_coleta, id
+    ''', (fluxo, componente)).fetchall()
+    valores = np.array([row[0] for row in rows], dtype=float)
+    datas = np.array([row[1] for row in rows], dtype=str)
+    return datas, valores, limites_cep_as_of(datas, valores, datas)
+
+
+def aplicar_regras_cep(db, fluxo, data_coleta, pontos):
+    """
+    Avalia as amostras de um novo boletim e atualiza o estado do fluxo
+
+    As amostras já devem estar gravadas em historico_componentes. Quando o
+    boletim é mais recente que o último processado, cada regra é atualizada
+    em O(1) a partir de cep_estado; boletins fora de ordem (ou fluxos ainda
+    sem estado) reconstroem o estado reprocessando a série do componente.
+
+    Args:
+        db: Conexão SQLite
+        fluxo: Chave do fluxo CEP
+        data_coleta: Data de coleta do boletim
+        pontos: {componente: (valor, limites)} com os limites aplicados
+            (snapshot da janela) ou None sem histórico suficiente
+
+    Returns:
+        dict: {componente: lista de regras disparadas}
+    """
+    estados = carregar_estados(db, fluxo, pontos)
+    regras = {}
+    novos_estados = []
+
+    for componente, (valor, limites) in pontos.items():
+        estado = estados.get(componente)
+        if estado is None and (limites is None or not limites.get('n_amostras')):
+            # Primeira amostra do fluxo: não há o que reprocessar
+            estado = estado_inicial()
+        if limites is not None and limites.get('lci') is None:
+            limites = None
+
+        if estado is not None and (estado['ultima_data'] is None
+                                   or data_coleta > estado['ultima_data']):
+            estado, regras[componente] = avaliar_ponto(estado, valor, limites, data_coleta)
+        else:
+            datas, valores, limites_serie = _serie_fluxo(db, fluxo, componente)
+            limites_alvo = limites_cep_as_of(datas, valores, [data_coleta])
+            estado, (regras[componente],) = reproduzir_serie(
+                datas, valores, limites_serie, [data_coleta], [valor], limites_alvo)
+
+        novos_estados.append((fluxo, componente, estado))
+
+    gravar_estados(db, novos_estados)
+    return regras
+
+
+def avaliar_regras_as_of(db, fluxo, data_coleta, pontos, memoria=CEP_REGRAS_MEMORIA):
+    """
+    Regras de um boletim já gravado, reavaliado na sua data ("as-of")
+
+    Reprocessa apenas as últimas `memoria` amostras anteriores à data (mais
+    a janela de controle delas), de forma que o custo não depende do tamanho
+    do histórico. Contadores de sequência precisam de no máximo 14 pontos e
+    o peso da EWMA após 50 amostras é desprezível (0,8^50 ≈ 1e-5). Não altera
+    cep_estado.
+
+    Args:
+        pontos: {componente: (valor, limites)} como em aplicar_regras_cep
+
+    Returns:
+        dict: {componente: lista de regras disparadas}
+    """
+    janelas = buscar_janelas_cep_lote(
+        db, fluxo, pontos, n=memoria + CEP_AMOSTRAS_MIN, antes_de=data_coleta)
+    regras = {}
+    for componente, (valor, limites) in pontos.items():
+        janela = janelas[componente]
+        datas = np.array(janela['datas'], dtype=str)
+        valores = np.array(janela['valores'], dtype=float)
+        limites_serie = limites_cep_as_of(datas, valores, datas)
+
+        inicio = max(0, len(datas) - memoria)
+        recorte = {campo: valores_campo[inicio:] for campo, valores_campo in limites_serie.items()}
+        estado, _ = reproduzir_serie(datas[inicio:], valores[inicio:], recorte)
+
+        if limites is not None and limites.get('lci') is None:
+            limites = None
+        _, regras[componente] = avaliar_ponto(estado, valor, limites)
+    return regras
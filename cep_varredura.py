@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Varredura de parâmetros do CEP (what-if de janela × sigma)
+Sistema de Validação de Boletins Cromatográficos
+
+Avalia uma grade de tamanhos de janela (CEP_AMOSTRAS_MIN) e multiplicadores
+(CEP_SIGMA_LIMIT) sobre todo o histórico de uma vez. Para cada ponto de
+cada série (fluxo, componente), média e amplitude móvel média da janela
+"as-of" saem de somas acumuladas: cada janela custa O(pontos) e não há laço
+por ponto nem por configuração. A distância de cada ponto à média, em
+desvios-padrão (MR̄ / d2), é calculada uma vez por janela e comparada com
+todos os multiplicadores da grade. O d2 não entra na grade: a amplitude
+móvel é sempre de duas amostras (CEP_D2_CONSTANT).
+
+Como o histórico não traz o que era de fato anomalia, a referência padrão
+é robusta e independente da grade: pontos a mais de CEP_SIGMA_LIMIT
+desvios (1,4826 × MAD) da mediana da série. Quem tiver uma marcação
+própria pode informá-la em `anomalias`.
+
+Uso pela linha de comando:
+
+    python cep_varredura.py --janelas 5 8 12 20 --sigmas 2 2.5 3 3.5
+"""
+
+import argparse
+
+import numpy as np
+
+from cep_vetorizado import carregar_series_componentes
+from config import CEP_AMOSTRAS_MIN, CEP_D2_CONSTANT, CEP_SIGMA_LIMIT
+from database import connect_db
+
+JANELAS_PADRAO = (4, 6, 8, 12, 16, 20)
+SIGMAS_PADRAO = (2.0, 2.5, 3.0, 3.5)
+
+# Fator de consistência do MAD para a distribuição normal
+_FATOR_MAD = 1.4826
+
+
+def distancias_sigma(datas, valores, janelas):
+    """
+    Distância de cada ponto à média da sua janela "as-of", em desvios-padrão
+
+    Args:
+        datas, valores: Série em ordem cronológica
+        janelas: Tamanhos de janela
+
+    Returns:
+        np.ndarray: (pontos × janelas); NaN onde a janela tem menos de 2
+        amostras, inf quando a amplitude média é zero e o ponto difere da média
+    """
+    valores = np.asarray(valores, dtype=float)
+    anteriores = np.searchsorted(datas, datas, side='left')
+
+    # Somas acumuladas centradas no primeiro valor (estabilidade numérica)
+    centrado = valores - valores[0] if len(valores) else valores
+    soma = np.concatenate(([0.0], np.cumsum(centrado)))
+    soma_amplitudes = np.concatenate(([0.0], np.cumsum(np.abs(np.diff(valores)))))
+
+    distancias = np.full((len(valores), len(janelas)), np.nan)
+    for j, n in enumerate(janelas):
+        amostras = np.minimum(anteriores, n)
+        avaliados = amostras >= 2
+        fim = anteriores[avaliados]
+        inicio = fim - amostras[avaliados]
+        m = amostras[avaliados]
+
+        media = (soma[fim] - soma[inicio]) / m
+        media_amplitudes = (soma_amplitudes[fim - 1] - soma_amplitudes[inicio]) / (m - 1)
+        desvio = np.abs(centrado[avaliados] - media)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distancia = desvio * CEP_D2_CONSTANT / media_amplitudes
+        distancia[desvio == 0] = 0.0
+        distancias[avaliados, j] = distancia
+    return distancias
+
+
+def anomalias_referencia(valores, limite=CEP_SIGMA_LIMIT):
+    """Referência robusta: pontos a mais de `limite` desvios (MAD) da mediana"""
+    valores = np.asarray(valores, dtype=float)
+    mediana = np.median(valores)
+    desvio = _FATOR_MAD * np.median(np.abs(valores - mediana))
+    if desvio == 0:
+        return valores != mediana
+    return np.abs(valores - mediana) > limite * desvio
+
+
+def varrer_parametros(series, janelas=JANELAS_PADRAO, sigmas=SIGMAS_PADRAO, anomalias=None):
+    """
+    Avalia a grade janela × sigma sobre as séries do histórico
+
+    Args:
+        series: {(fluxo, componente): (datas, valores, boletim_ids)} como em
+            carregar_series_componentes(db, por_boletim=True)
+        janelas: Tamanhos de janela a avaliar
+        sigmas: Multiplicadores dos limites a avaliar
+        anomalias: {(fluxo, componente): array booleano} com os pontos que
+            deveriam ser detectados (padrão: anomalias_referencia)
+
+    Returns:
+        dict: matrizes (janelas × sigmas) de alarmes, deteccoes,
+        falsos_alarmes, taxa_falso_alarme e taxa_deteccao; totais de pontos
+        avaliados e de anomalias; e, por fluxo, boletins e taxa_invalidacao
+        (fração dos boletins com algum componente fora dos limites)
+    """
+    janelas = list(janelas)
+    sigmas = np.asarray(sigmas, dtype=float)
+    forma = (len(janelas), len(sigmas))
+    alarmes = np.zeros(forma, dtype=np.int64)
+    deteccoes = np.zeros(forma, dtype=np.int64)
+    avaliados_anomalos = np.zeros(len(janelas), dtype=np.int64)
+    avaliados = np.zeros(len(janelas), dtype=np.int64)
+
+    por_fluxo = {}
+    for (fluxo, componente), (datas, valores, boletim_ids) in series.items():
+        distancias = distancias_sigma(datas, valores, janelas)
+        alarme = distancias[:, :, None] > sigmas  # NaN (sem janela) nunca alarma
+        avaliado = ~np.isnan(distancias)
+        anomalo = (anomalias_referencia(valores) if anomalias is None
+                   else np.asarray(anomalias[(fluxo, componente)], dtype=bool))
+
+        alarmes += alarme.sum(axis=0)
+        deteccoes += alarme[anomalo].sum(axis=0)
+        avaliados += avaliado.sum(axis=0)
+        avaliados_anomalos += avaliado[anomalo].sum(axis=0)
+        por_fluxo.setdefault(fluxo, []).append((np.asarray(boletim_ids), alarme))
+
+    falsos_alarmes = alarmes - deteccoes
+    normais = (avaliados - avaliados_anomalos)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa_falso_alarme = np.where(normais > 0, falsos_alarmes / normais, np.nan)
+        taxa_deteccao = np.where(avaliados_anomalos[:, None] > 0,
+                                 deteccoes / avaliados_anomalos[:, None], np.nan)
+
+    return {
+        'janelas': janelas,
+        'sigmas': sigmas.tolist(),
+        'avaliados': avaliados,
+        'anomalias': avaliados_anomalos,
+        'alarmes': alarmes,
+        'deteccoes': deteccoes,
+        'falsos_alarmes': falsos_alarmes,
+        'taxa_falso_alarme': taxa_falso_alarme,
+        'taxa_deteccao': taxa_deteccao,
+        'fluxos': {fluxo: _invalidacao_fluxo(componentes, forma)
+                   for fluxo, componentes in por_fluxo.items()},
+    }
+
+
+def _invalidacao_fluxo(componentes, forma):
+    """Fração dos boletins do fluxo com algum componente em alarme, por configuração"""
+    boletins, posicoes = np.unique(
+        np.concatenate([ids for ids, _ in componentes]), return_inverse=True)
+    invalidados = np.zeros((len(boletins),) + forma, dtype=bool)
+    inicio = 0
+    for ids, alarme in componentes:
+        np.logical_or.at(invalidados, posicoes[inicio:inicio + len(ids)], alarme)
+        inicio += len(ids)
+    return {'boletins': len(boletins), 'taxa_invalidacao': invalidados.mean(axis=0)}
+
+
+def varrer_historico(db, janelas=JANELAS_PADRAO, sigmas=SIGMAS_PADRAO):
+    """Varredura sobre todo o historico_componentes do banco"""
+    return varrer_parametros(carregar_series_componentes(db, por_boletim=True), janelas, sigmas)
+
+
+def main():
+    """Imprime a grade janela × sigma do histórico"""
+    parser = argparse.ArgumentParser(description='Varredura de janela × sigma do CEP')
+    parser.add_argument('--janelas', type=int, nargs='+', default=list(JANELAS_PADRAO),
+                        help='Tamanhos de janela')
+    parser.add_argument('--sigmas', type=float, nargs='+', default=list(SIGMAS_PADRAO),
+                        help='Multiplicadores dos limites')
+    args = parser.parse_args()
+
+    db = connect_db(somente_leitura=True)
+    try:
+        resultado = varrer_historico(db, args.janelas, args.sigmas)
+    finally:
+        db.close()
+
+    print(f"{int(resultado['avaliados'].max(initial=0))} pontos avaliados, "
+          f"referência: {int(resultado['anomalias'].max(initial=0))} anomalias")
+    print(f"{'janela':>6} {'sigma':>5} {'alarmes':>8} {'detecções':>9} "
+          f"{'falso alarme':>12} {'detecção':>8}")
+    for j, n in enumerate(resultado['janelas']):
+        for s, sigma in enumerate(resultado['sigmas']):
+            atual = ' *' if (n, sigma) == (CEP_AMOSTRAS_MIN, CEP_SIGMA_LIMIT) else ''
+            print(f"{n:>6} {sigma:>5.2f} {resultado['alarmes'][j, s]:>8} "
+                  f"{resultado['deteccoes'][j, s]:>9} "
+                  f"{resultado['taxa_falso_alarme'][j, s]:>12.2%} "
+                  f"{resultado['taxa_deteccao'][j, s]:>8.2%}{atual}")
+
+    print('\nInvalidação de boletins por fluxo (janela × sigma):')
+    for fluxo, dados in sorted(resultado['fluxos'].items()):
+        print(f"{fluxo} ({dados['boletins']} boletins)")
+        for j, n in enumerate(resultado['janelas']):
+            taxas = ' '.join(f"{taxa:>7.1%}" for taxa in dados['taxa_invalidacao'][j])
+            print(f"  {n:>4}: {taxas}")
+
+
+if __name__ == "__main__":
+    main()
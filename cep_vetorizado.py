@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Motor vetorizado do Controle Estatístico de Processo (CEP)
+Sistema de Validação de Boletins Cromatográficos
+
+Recalcula o CEP de todo o histórico de uma vez: a série de cada componente
+em cada fluxo é lida uma única vez como array NumPy e, para cada ponto avaliado, a janela
+"as-of" (as N amostras coletadas estritamente antes da data do ponto) é
+localizada com searchsorted. Média, amplitude móvel média, LCI/LCS e o
+veredito saem de operações sobre a matriz de janelas (pontos × N), sem laço
+Python por amostra. As regras são as mesmas de cep.calcular_limites_cep.
+"""
+
+import numpy as np
+
+from config import CEP_AMOSTRAS_MIN, CEP_D2_CONSTANT, CEP_SIGMA_LIMIT
+
+
+def carregar_series_componentes(db, componentes=None, por_boletim=False):
+    """
+    Carrega o histórico completo dos componentes em uma única consulta
+
+    Args:
+        db: Conexão SQLite
+        componentes: Nomes a carregar (None = todos)
+        por_boletim: Devolve os ids dos boletins em vez dos ids do histórico
+
+    Returns:
+        dict: {(fluxo, componente): (datas, valores, ids)} com arrays em ordem
+        cronológica (ids de historico_componentes ou dos boletins)
+    """
+    coluna_id = 'boletin_id' if por_boletim else 'id'
+    sql = f'SELECT fluxo, componente, valor, data_coleta, {coluna_id} FROM historico_componentes'
+    params = []
+    if componentes is not None:
+        componentes = list(dict.fromkeys(componentes))
+        if not componentes:
+            return {}
+        sql += f" WHERE componente IN ({', '.join('?' * len(componentes))})"
+        params = componentes
+    sql += ' ORDER BY fluxo, componente, data_coleta, id'
+
+    rows = db.execute(sql, params).fetchall()
+    if not rows:
+        return {}
+
+    fluxos = np.array([row[0] for row in rows])
+    nomes = np.array([row[1] for row in rows])
+    valores = np.array([row[2] for row in rows], dtype=float)
+    datas = np.array([row[3] for row in rows])
+    ids = np.array([row[4] for row in rows], dtype=np.int64)
+
+    # Linhas já chegam agrupadas por fluxo/componente: cortar nas trocas de chave
+    trocas = (fluxos[1:] != fluxos[:-1]) | (nomes[1:] != nomes[:-1])
+    inicios = np.concatenate(([0], np.flatnonzero(trocas) + 1))
+    fins = np.append(inicios[1:], len(nomes))
+    return {
+        (str(fluxos[inicio]), str(nomes[inicio])):
+            (datas[inicio:fim], valores[inicio:fim], ids[inicio:fim])
+        for inicio, fim in zip(inicios, fins)
+    }
+
+
+def carregar_serie_componente(db, fluxo, componente):
+    """
+    Histórico de um único fluxo/componente (via índice), no formato de
+    carregar_series_componentes: (datas, valores, ids) ou None se vazio
+    """
+    rows = db.execute('''
+        SELECT valor, data_coleta, id FROM historico_componentes
+        WHERE fluxo = ? AND componente = ?
+        ORDER BY data_coleta, id
+    ''', (fluxo, componente)).fetchall()
+    if not rows:
+        return None
+    return (np.array([row[1] for row in rows]),
+            np.array([row[0] for row in rows], dtype=float),
+            np.array([row[2] for row in rows], dtype=np.int64))
+
+
+def limites_cep_as_of(datas_historico, valores_historico, datas_alvo,
+                      n=CEP_AMOSTRAS_MIN, sigma=CEP_SIGMA_LIMIT):
+    """
+    Limites de controle I-MR de vários pontos de uma série
+
+    Para cada data alvo, a janela é formada pelas últimas n amostras do
+    histórico com data estritamente anterior.
+
+    Args:
+        datas_historico: Datas do histórico, em ordem cronológica
+        valores_historico: Valores do histórico, alinhados às datas
+        datas_alvo: Datas dos pontos a avaliar
+        n: Tamanho da janela de controle
+        sigma: Multiplicador dos limites (CEP_SIGMA_LIMIT)
+
+    Returns:
+        dict de arrays: media, media_amplitudes, lci, lcs (NaN quando há
+        menos de 2 amostras), n_amostras e fim_janela (a janela de cada alvo
+        é historico[fim_janela - n_amostras:fim_janela])
+    """
+    datas_alvo = np.asarray(datas_alvo)
+    valores_historico = np.asarray(valores_historico, dtype=float)
+    total = len(datas_alvo)
+
+    if len(valores_historico) == 0:
+        vazio = np.full(total, np.nan)
+        return {
+            'media': vazio, 'media_amplitudes': vazio.copy(),
+            'lci': vazio.copy(), 'lcs': vazio.copy(),
+            'n_amostras': np.zeros(total, dtype=int),
+            'fim_janela': np.zeros(total, dtype=int)
+        }
+
+    # Quantidade de amostras anteriores a cada alvo (corte estrito por data)
+    anteriores = np.searchsorted(datas_historico, datas_alvo, side='left')
+
+    # Matriz de janelas (alvos × n); posições negativas ficam fora da janela
+    posicoes = anteriores[:, None] - n + np.arange(n)
+    na_janela = posicoes >= 0
+    janelas = np.where(na_janela, valores_historico[np.maximum(posicoes, 0)], 0.0)
+
+    n_amostras = na_janela.sum(axis=1)
+    amplitudes = np.abs(np.diff(janelas, axis=1)) * na_janela[:, :-1]
+
+    suficiente = n_amostras >= 2
+    media = np.full(total, np.nan)
+    media_amplitudes = np.full(total, np.nan)
+    media[suficiente] = janelas[suficiente].sum(axis=1) / n_amostras[suficiente]
+    media_amplitudes[suficiente] = (
+        amplitudes[suficiente].sum(axis=1) / (n_amostras[suficiente] - 1))
+
+    desvio = sigma * media_amplitudes / CEP_D2_CONSTANT
+    return {
+        'media': media,
+        'media_amplitudes': media_amplitudes,
+        'lci': media - desvio,
+        'lcs': media + desvio,
+        'n_amostras': n_amostras,
+        'fim_janela': anteriores
+    }
+
+
+def dentro_limites_vetorizado(valores, limites):
+    """Veredito de cada ponto (aceita pontos sem histórico suficiente)"""
+    valores = np.asarray(valores, dtype=float)
+    sem_historico = limites['n_amostras'] < 2
+    with np.errstate(invalid='ignore'):
+        dentro = (limites['lci'] <= valores) & (valores <= limites['lcs'])
+    return sem_historico | dentro
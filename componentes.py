@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Tabela única de componentes do gás natural
+Sistema de Validação de Boletins Cromatográficos
+
+Cada componente tem um id inteiro (a posição na ordem do GERG-2008 / AGA 8
+DETAIL) e um registro Componente; as propriedades ficam também em arrays
+contíguos indexados pelo id (TC, PC, MASSA_MOLAR, FATOR_ACENTRICO, ZC, PCS,
+HIDROGENIOS), somente leitura e compartilhados por todos os módulos.
+
+Os nomes (canônicos em inglês, dos boletins em português, fórmulas e
+variações) são resolvidos para o id uma única vez, na entrada dos dados:
+resolver_componente guarda em cache cada nome já visto, e os cálculos
+seguem sobre vetores de frações na ordem dos ids.
+
+Fontes: Tc, pc e M do GERG-2008 (ISO 20765-2); ω e Zc das tabelas de
+propriedades críticas usuais; PCS molar a 25 °C próximo da ISO 6976.
+As tabelas de equação de estado (aga8_gerg2008_tabelas, aga8_detail_tabelas)
+seguem com as constantes próprias de cada norma.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+class Componente:
+    """Registro de um componente (somente leitura por convenção)"""
+
+    __slots__ = ('id', 'nome', 'nome_boletim', 'formula', 'tc', 'pc', 'massa_molar',
+                 'fator_acentrico', 'zc', 'pcs', 'hidrogenios')
+
+    def __init__(self, id, nome, nome_boletim, formula, tc, pc, massa_molar,
+                 fator_acentrico, zc, pcs, hidrogenios):
+        self.id = id
+        self.nome = nome
+        self.nome_boletim = nome_boletim
+        self.formula = formula
+        self.tc = tc  # K
+        self.pc = pc  # kPa
+        self.massa_molar = massa_molar  # g/mol
+        self.fator_acentrico = fator_acentrico
+        self.zc = zc
+        self.pcs = pcs  # kJ/mol, poder calorífico superior
+        self.hidrogenios = hidrogenios  # átomos de H por molécula
+
+    def __repr__(self):
+        return f'Componente({self.id}, {self.nome!r})'
+
+
+# nome, nome no boletim, fórmula, Tc (K), pc (kPa), M (g/mol), ω, Zc, PCS (kJ/mol), H
+_TABELA = (
+    ('methane', 'Metano', 'CH4', 190.564, 4599.2, 16.04246, 0.0115, 0.2866, 890.36, 4),
+    ('nitrogen', 'Nitrogênio', 'N2', 126.192, 3395.8, 28.0134, 0.0372, 0.2902, 0.0, 0),
+    ('carbon_dioxide', 'CO2', 'CO2', 304.1282, 7377.3, 44.0095, 0.2276, 0.2740, 0.0, 0),
+    ('ethane', 'Etano', 'C2H6', 305.322, 4872.2, 30.06904, 0.0995, 0.2793, 1559.88, 6),
+    ('propane', 'Propano', 'C3H8', 369.89, 4251.2, 44.09562, 0.1521, 0.2760, 2219.17, 8),
+    ('i-butane', 'i-Butano', 'iC4H10', 407.817, 3640.0, 58.1222, 0.1756, 0.2780, 2868.20, 10),
+    ('n-butane', 'n-Butano', 'nC4H10', 425.125, 3796.0, 58.1222, 0.2002, 0.2736, 2877.40, 10),
+    ('i-pentane', 'i-Pentano', 'iC5H12', 460.39, 3378.0, 72.14878, 0.2223, 0.2703, 3528.85, 12),
+    ('n-pentane', 'n-Pentano', 'nC5H12', 469.7, 3370.0, 72.14878, 0.2515, 0.2688, 3536.22, 12),
+    ('n-hexane', 'Hexano', 'nC6H14', 507.6, 3025.0, 86.17536, 0.3013, 0.2659, 4194.97, 14),
+    ('n-heptane', 'Heptano', 'nC7H16', 540.2, 2736.0, 100.20194, 0.3495, 0.2632, 4853.43, 16),
+    ('n-octane', 'Octano', 'nC8H18', 569.4, 2480.0, 114.22852, 0.3996, 0.2568, 5512.09, 18),
+    ('n-nonane', 'Nonano', 'nC9H20', 594.6, 2290.0, 128.2551, 0.4433, 0.2527, 6170.60, 20),
+    ('n-decane', 'Decano', 'nC10H22', 617.7, 2110.0, 142.28168, 0.4923, 0.2479, 6829.00, 22),
+    ('hydrogen', 'Hidrogênio', 'H2', 33.19, 1296.0, 2.01588, -0.2180, 0.3058, 0.0, 2),
+    ('oxygen', 'Oxigênio', 'O2', 154.58, 5043.0, 31.9988, 0.0222, 0.2878, 0.0, 0),
+    ('carbon_monoxide', 'Monóxido de Carbono', 'CO', 132.86, 3494.0, 28.0101, 0.0497, 0.2948, 0.0, 0),
+    ('water', 'Água', 'H2O', 647.096, 22055.0, 18.01528, 0.3442, 0.2295, 0.0, 2),
+    ('hydrogen_sulfide', 'Sulfeto de Hidrogênio', 'H2S', 373.1, 9000.0, 34.08088, 0.0942, 0.2842, 0.0, 2),
+    ('helium', 'Hélio', 'He', 5.1953, 227.5, 4.002602, -0.3836, 0.3010, 0.0, 0),
+    ('argon', 'Argônio', 'Ar', 150.86, 4863.0, 39.948, -0.0022, 0.2910, 0.0, 0),
+)
+
+COMPONENTES: Tuple[Componente, ...] = tuple(Componente(i, *linha) for i, linha in enumerate(_TABELA))
+NOMES: Tuple[str, ...] = tuple(c.nome for c in COMPONENTES)
+TOTAL = len(COMPONENTES)
+
+
+def _coluna(atributo, dtype=float):
+    valores = np.array([getattr(c, atributo) for c in COMPONENTES], dtype=dtype)
+    valores.flags.writeable = False
+    return valores
+
+
+TC = _coluna('tc')
+PC = _coluna('pc')
+MASSA_MOLAR = _coluna('massa_molar')
+FATOR_ACENTRICO = _coluna('fator_acentrico')
+ZC = _coluna('zc')
+PCS = _coluna('pcs')
+HIDROGENIOS = _coluna('hidrogenios', np.int64)
+
+# Variações de nome (já sem acentos, espaços, hífens e sublinhados) -> nome canônico
+_ALIASES = {
+    'methane': 'methane', 'metano': 'methane', 'ch4': 'methane', 'c1': 'methane',
+    'nitrogen': 'nitrogen', 'nitrogenio': 'nitrogen', 'nitrogeno': 'nitrogen', 'n2': 'nitrogen',
+    'carbondioxide': 'carbon_dioxide', 'dioxidocarbono': 'carbon_dioxide',
+    'dioxidodecarbono': 'carbon_dioxide', 'co2': 'carbon_dioxide',
+    'ethane': 'ethane', 'etano': 'ethane', 'c2h6': 'ethane', 'c2': 'ethane',
+    'propane': 'propane', 'propano': 'propane', 'c3h8': 'propane', 'c3': 'propane',
+    'isobutane': 'i-butane', 'ibutane': 'i-butane', 'isobutano': 'i-butane', 'ibutano': 'i-butane',
+    'ic4h10': 'i-butane', 'isobutene': 'i-butane', 'isobutanoch4': 'i-butane', 'ic4': 'i-butane',
+    'nbutane': 'n-butane', 'nbutano': 'n-butane', 'nc4h10': 'n-butane', 'nc4': 'n-butane',
+    'isopentane': 'i-pentane', 'ipentane': 'i-pentane', 'isopentano': 'i-pentane',
+    'ipentano': 'i-pentane', 'ic5h12': 'i-pentane', 'ic5': 'i-pentane',
+    'npentane': 'n-pentane', 'npentano': 'n-pentane', 'nc5h12': 'n-pentane', 'nc5': 'n-pentane',
+    'nhexane': 'n-hexane', 'hexane': 'n-hexane', 'hexano': 'n-hexane', 'nhexano': 'n-hexane',
+    'nc6h14': 'n-hexane', 'c6': 'n-hexane',
+    'nheptane': 'n-heptane', 'heptane': 'n-heptane', 'heptano': 'n-heptane', 'nheptano': 'n-heptane',
+    'nc7h16': 'n-heptane', 'c7': 'n-heptane',
+    'noctane': 'n-octane', 'octane': 'n-octane', 'octano': 'n-octane', 'noctano': 'n-octane',
+    'nc8h18': 'n-octane', 'c8': 'n-octane',
+    'nnonane': 'n-nonane', 'nonane': 'n-nonane', 'nonano': 'n-nonane', 'nnonano': 'n-nonane',
+    'nc9h20': 'n-nonane', 'c9': 'n-nonane',
+    'ndecane': 'n-decane', 'decane': 'n-decane', 'decano': 'n-decane', 'ndecano': 'n-decane',
+    'nc10h22': 'n-decane', 'c10': 'n-decane',
+    'oxygen': 'oxygen', 'oxigenio': 'oxygen', 'oxigeno': 'oxygen', 'o2': 'oxygen',
+    'hydrogen': 'hydrogen', 'hidrogenio': 'hydrogen', 'h2': 'hydrogen',
+    'carbonmonoxide': 'carbon_monoxide', 'monoxido': 'carbon_monoxide',
+    'monoxidodecarbono': 'carbon_monoxide', 'co': 'carbon_monoxide',
+    'water': 'water', 'agua': 'water', 'h2o': 'water',
+    'hydrogensulfide': 'hydrogen_sulfide', 'sulfetodehidrogenio': 'hydrogen_sulfide',
+    'h2s': 'hydrogen_sulfide',
+    'helium': 'helium', 'helio': 'helium', 'he': 'helium',
+    'argon': 'argon', 'argao': 'argon', 'argonio': 'argon', 'ar': 'argon',
+}
+_IDS = {c.nome: c.id for c in COMPONENTES}
+
+
+@lru_cache(maxsize=4096)
+def resolver_componente(nome) -> Optional[int]:
+    """
+    Id do componente de um nome qualquer (canônico, do boletim, fórmula ou
+    rótulo do relatório, como 'Metano, CH₄' e 'C₆+'); None se desconhecido
+    """
+    if not nome:
+        return None
+    chave = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    chave = chave.split(',')[0].lower().replace(' ', '').replace('-', '').replace('_', '').rstrip('+')
+    canonico = _ALIASES.get(chave)
+    return None if canonico is None else _IDS[canonico]
+
+
+def nome_boletim(nome) -> Optional[str]:
+    """Nome do componente como gravado nos boletins e no histórico ('Metano', 'CO2'); None se desconhecido"""
+    i = resolver_componente(nome)
+    return None if i is None else COMPONENTES[i].nome_boletim
+
+
+def indices_componentes(nomes: Iterable) -> np.ndarray:
+    """Id de cada nome (-1 para desconhecidos), para mapear colunas de uma matriz"""
+    return np.array([-1 if (i := resolver_componente(nome)) is None else i for nome in nomes],
+                    dtype=np.intp)
+
+
+def vetor_composicao(composicao: Mapping, normalizar: bool = False) -> np.ndarray:
+    """
+    Vetor de frações na ordem dos ids a partir de {nome: valor}
+
+    Nomes desconhecidos e valores não numéricos são ignorados; o mesmo
+    componente informado com nomes diferentes é somado.
+    """
+    vetor = np.zeros(TOTAL)
+    for nome, valor in composicao.items():
+        i = resolver_componente(nome)
+        if i is None:
+            continue
+        try:
+            vetor[i] += float(valor)
+        except (TypeError, ValueError):
+            continue
+    if normalizar:
+        total = vetor.sum()
+        if total > 0:
+            vetor /= total
+    return vetor
+
+
+def massas_molares(nomes: Iterable[str]) -> Dict[str, float]:
+    """{nome: massa molar} para os nomes informados (ex.: os do boletim)"""
+    return {nome: float(MASSA_MOLAR[resolver_componente(nome)]) for nome in nomes}
@@ -1,6 +1,8 @@
 # Configurações do Sistema de Validação de Boletins Cromatográficos
 # BRAVA Energia - Campo de Atalaia
 
+from componentes import massas_molares
+
 # Configurações do Servidor
 HOST = '127.0.0.1'
 PORT = 8888
@@ -30,30 +32,31 @@ LIMITES_AGA8 = {
     'CO2': {'min': 0, 'max': 100}
 }
 
-# Massas Molares (g/mol)
-MASSAS_MOLARES = {
-    'Metano': 16.043,
-    'Etano': 30.070,
-    'Propano': 44.097,
-    'i-Butano': 58.123,
-    'n-Butano': 58.123,
-    'i-Pentano': 72.150,
-    'n-Pentano': 72.150,
-    'Hexano': 86.177,
-    'Heptano': 100.204,
-    'Octano': 114.231,
-    'Nonano': 128.258,
-    'Decano': 142.285,
-    'Oxigênio': 31.998,
-    'Nitrogênio': 28.014,
-    'CO2': 44.010
-}
+# Massas Molares (g/mol) dos componentes do boletim, da tabela única de componentes
+MASSAS_MOLARES = massas_molares(LIMITES_AGA8)
 
 # Configurações CEP
 CEP_AMOSTRAS_MIN = 8  # Mínimo de amostras para CEP
 CEP_D2_CONSTANT = 1.128  # Constante d2 para amplitude móvel (n=2)
 CEP_SIGMA_LIMIT = 3  # Limites de controle em sigma
 
+# Regras de sequência (Western Electric / Nelson), EWMA e CUSUM
+CEP_EWMA_LAMBDA = 0.2  # Peso da amostra mais recente na EWMA
+CEP_EWMA_L = 3  # Largura dos limites da EWMA em sigma
+CEP_CUSUM_K = 0.5  # Folga do CUSUM (em sigma)
+CEP_CUSUM_H = 5  # Intervalo de decisão do CUSUM (em sigma)
+CEP_REGRAS_MEMORIA = 50  # Amostras reprocessadas na revalidação "as-of"
+# Regras que invalidam o componente; as demais são registradas como alerta
+CEP_REGRAS_INVALIDANTES = ('R1',)
+
+# CEP multivariado (T² de Hotelling sobre o vetor de composição)
+CEP_T2_AMOSTRAS_MIN = 30  # Boletins anteriores no fluxo para avaliar o T²
+CEP_T2_LIMITE = 34.714  # Qui-quadrado com 15 g.l. a 99,73% (equivalente a 3 sigma)
+CEP_T2_RIDGE = 1e-4  # Regularização somada à soma de produtos cruzados (%² molar por componente)
+CEP_T2_VARIANCIA_MIN = 1e-8  # Componentes com variância menor (ex.: Oxigênio sempre zero) ficam fora do T²
+# O T² tem status próprio (status_t2); True faz um T² acima do limite invalidar também o boletim
+CEP_T2_INVALIDA_BOLETIM = False
+
 # Configurações de Cálculo de Propriedades
 # Condições padrão para cálculo da massa específica
 TEMPERATURA_PADRAO = 293.15  # K (20°C)
@@ -75,3 +78,19 @@ COMPONENTES_PRINCIPAIS = ['Metano', 'Etano', 'Propano', 'Nitrogênio', 'CO2']
 
 # Tolerância para soma de percentuais (±%)
 TOLERANCIA_SOMA_PERCENTUAL = 2.0
+
+# Configurações do Banco de Dados (SQLite)
+SQLITE_TIMEOUT = 30  # segundos de espera por lock de escrita
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',      # leitores não bloqueiam no escritor
+    'synchronous': 'NORMAL',    # seguro em WAL, sem fsync a cada commit
+    'cache_size': -16000,       # negativo = KiB (~16 MB por conexão)
+    'mmap_size': 134217728,     # 128 MB de leitura mapeada em memória
+    'temp_store': 'MEMORY'      # ordenações e tabelas temporárias em RAM
+}
+
+# Tarefas em segundo plano (revalidação em lote)
+JOBS_TRABALHADORES = 1  # Threads por processo (o SQLite serializa as escritas)
+JOBS_TAMANHO_LOTE = 200  # Boletins por lote (um commit + checkpoint por lote)
+JOBS_HEARTBEAT_EXPIRADO = 120  # segundos sem heartbeat para retomar um job
+JOBS_HEARTBEAT_INTERVALO = 30  # segundos entre renovações do heartbeat de um job em execução
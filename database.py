@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Gerenciamento de conexões SQLite
+Sistema de Validação de Boletins Cromatográficos
+
+Cada contexto de aplicação Flask (uma requisição em uma thread) recebe uma
+única conexão, reaproveitada por todas as funções auxiliares chamadas durante
+a requisição e fechada automaticamente no teardown. As conexões são abertas em
+modo WAL, de forma que leitores nunca bloqueiam no escritor.
+"""
+
+import os
+import sqlite3
+from urllib.parse import quote
+
+from flask import g, has_app_context
+
+from config import SQLITE_PRAGMAS, SQLITE_TIMEOUT
+
+
+def get_db_path():
+    """Caminho do banco (armazenamento persistente no Render via DATABASE_PATH)"""
+    return os.environ.get('DATABASE_PATH', 'boletins.db')
+
+
+def connect_db(db_path=None, somente_leitura=False):
+    """
+    Abre uma nova conexão configurada com os pragmas do sistema
+
+    Args:
+        db_path: Caminho do banco; usa get_db_path() quando omitido
+        somente_leitura: Abre com mode=ro (leitores de processos auxiliares)
+
+    Returns:
+        sqlite3.Connection com row_factory = sqlite3.Row
+    """
+    db_path = db_path or get_db_path()
+    if somente_leitura:
+        db = sqlite3.connect(f'file:{quote(os.path.abspath(db_path))}?mode=ro',
+                             uri=True, timeout=SQLITE_TIMEOUT)
+    else:
+        db = sqlite3.connect(db_path, timeout=SQLITE_TIMEOUT)
+    db.row_factory = sqlite3.Row
+    for pragma, valor in SQLITE_PRAGMAS.items():
+        # journal_mode é gravado no arquivo: fica a cargo das conexões de escrita
+        if somente_leitura and pragma == 'journal_mode':
+            continue
+        db.execute(f'PRAGMA {pragma} = {valor}')
+    return db
+
+
+def get_db():
+    """
+    Obtém a conexão da requisição atual
+
+    Dentro de um contexto Flask a conexão é única por contexto e fechada no
+    teardown. Fora dele (scripts, inicialização) retorna uma conexão nova,
+    que deve ser fechada por quem a abriu.
+    """
+    if not has_app_context():
+        return connect_db()
+
+    if '_sqlite_db' not in g:
+        g._sqlite_db = connect_db()
+    return g._sqlite_db
+
+
+def close_db(exc=None):
+    """Fecha a conexão da requisição (registrado como teardown do app)"""
+    db = g.pop('_sqlite_db', None)
+    if db is not None:
+        db.close()
+
+
+def init_app(app):
+    """Registra o fechamento automático das conexões no app Flask"""
+    app.teardown_appcontext(close_db)
@@ -47,7 +47,7 @@ def testar_funcao_historico():
     """Testa se a função get_historico_componente funciona"""
     try:
         from app import get_historico_componente
-        resultado = get_historico_componente('Metano, CH₄')
+        resultado = get_historico_componente('Metano, CH₄', '')
         print(f'✅ Função get_historico_componente funciona - retornou {len(resultado)} itens')
         return True
     except Exception as e:
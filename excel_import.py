@@ -1,8 +1,20 @@
 # Funcionalidades de importação de dados Excel
 import pandas as pd
-import sqlite3
 from datetime import datetime
 
+from database import connect_db
+from cep import (
+    buscar_janelas_cep_lote,
+    dentro_limites_cep,
+    gravar_snapshots_cep,
+    sincronizar_fluxo_boletim,
+    snapshot_cep
+)
+from cep_multivariado import aplicar_t2_hotelling, invalida_por_t2, status_t2
+from cep_regras import aplicar_regras_cep, formatar_regras, invalida_por_regras
+from componentes import nome_boletim
+from revalidacao import revalidar_dependentes
+
 
 def allowed_file(filename):
     """Verifica se o arquivo tem extensão permitida"""
@@ -45,8 +57,7 @@ def processar_excel_boletins(arquivo_path):
             df_checklist = xl_file.parse('Checklist')
 
         # Conectar ao banco de dados
-        conn = sqlite3.connect('boletins.db')
-        conn.row_factory = sqlite3.Row
+        conn = connect_db()
         cursor = conn.cursor()
 
         # Processar cada boletim
@@ -73,6 +84,8 @@ def processar_excel_boletins(arquivo_path):
                 results['success'] += 1
 
             except Exception as e:
+                # Descartar o que a linha já gravou (boletim, histórico, estados do CEP)
+                conn.rollback()
                 results['errors'].append(f"Erro ao processar boletim linha {index + 2}: {str(e)}")
 
         conn.close()
@@ -107,6 +120,9 @@ def processar_linha_boletim_completo(boletim_row, df_componentes, df_propriedade
     data_analise = safe_date_convert(boletim_row.get('data_analise'))
     data_emissao = safe_date_convert(boletim_row.get('data_emissao'))
     data_validacao = safe_date_convert(boletim_row.get('data_validacao'))
+    if data_coleta is None:
+        # Sem a data o boletim não tem lugar na série do CEP
+        raise ValueError(f"Boletim {numero_boletim} sem data_coleta válida")
 
     # Informações da instalação
     identificacao_instalacao = str(boletim_row.get('identificacao_instalacao', 'FPSO ATLANTE'))
@@ -167,26 +183,77 @@ def processar_linha_boletim_completo(boletim_row, df_componentes, df_propriedade
     ))
 
     boletim_id = cursor.lastrowid
+    fluxo = sincronizar_fluxo_boletim(cursor, boletim_id)
 
     # ===== PROCESSAR COMPONENTES =====
+    # Nomes da planilha no padrão do histórico ('Metano', 'CO2'...); ausente = 0,0
     componentes_boletim = df_componentes[df_componentes['numero_boletim'] == numero_boletim]
+    linhas_componentes = {}
     for _, comp_row in componentes_boletim.iterrows():
+        nome = str(comp_row.get('componente', ''))
+        linhas_componentes[nome_boletim(nome) or nome] = comp_row
+    valores = {
+        componente: safe_float_convert(comp_row.get('percentual_molar', 0)) or 0.0
+        for componente, comp_row in linhas_componentes.items()
+    }
+
+    # Janelas de controle "as-of" (a planilha pode trazer boletins retroativos)
+    janelas_cep = buscar_janelas_cep_lote(cursor, fluxo, valores, antes_de=data_coleta)
+    snapshots = {componente: snapshot_cep(janelas_cep[componente]) for componente in valores}
+    cursor.executemany('''
+        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(componente, boletim_id, valor, data_coleta, fluxo) for componente, valor in valores.items()])
+
+    # Regras de sequência, EWMA e CUSUM (estado incremental por fluxo)
+    regras_cep = aplicar_regras_cep(cursor, fluxo, data_coleta, {
+        componente: (valores[componente], snapshots[componente]) for componente in valores
+    })
+
+    # CEP multivariado sobre o vetor de composição
+    t2 = aplicar_t2_hotelling(cursor, fluxo, data_coleta, valores)
+
+    for componente, comp_row in linhas_componentes.items():
+        valor = valores[componente]
+        status_aga = "VALIDADO" if valida_aga8_import(componente, valor) else "INVALIDADO"
+        status_cep = "VALIDADO" if (
+            valida_cep_import(componente, valor, janelas_cep[componente]['valores'])
+            and not invalida_por_regras(regras_cep[componente])) else "INVALIDADO"
+
         cursor.execute('''
             INSERT INTO componentes (
-                boletin_id, nome, percentual_molar, status_aga, status_cep,
+                boletin_id, nome, percentual_molar, status_aga, status_cep, regras_cep,
                 limite_inferior_aga, limite_superior_aga, observacoes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
-            boletim_id,
-            str(comp_row.get('componente', '')),
-            safe_float_convert(comp_row.get('percentual_molar', 0)),
-            str(comp_row.get('status_aga', 'PENDENTE')),
-            str(comp_row.get('status_cep', 'PENDENTE')),
+            boletim_id, componente, valor, status_aga, status_cep,
+            formatar_regras(regras_cep[componente]),
             safe_float_convert(comp_row.get('limite_inferior_aga', 0)),
             safe_float_convert(comp_row.get('limite_superior_aga', 100)),
             str(comp_row.get('observacoes', ''))
         ))
 
+    # Registrar os limites aplicados (exibidos no relatório e no PDF)
+    gravar_snapshots_cep(cursor, [
+        (boletim_id, componente, snapshots[componente]) for componente in valores
+    ])
+
+    # Status calculados substituem os da planilha
+    status_aga8 = "INVALIDADO" if cursor.execute('''
+        SELECT COUNT(*) FROM componentes WHERE boletin_id = ? AND status_aga = ?
+    ''', (boletim_id, 'INVALIDADO')).fetchone()[0] else "VALIDADO"
+    status_cep = "INVALIDADO" if cursor.execute('''
+        SELECT COUNT(*) FROM componentes WHERE boletin_id = ? AND status_cep = ?
+    ''', (boletim_id, 'INVALIDADO')).fetchone()[0] else "VALIDADO"
+    status_multivariado = status_t2(t2)
+    status = "INVALIDADO" if "INVALIDADO" in (status_aga8, status_cep) or invalida_por_t2(
+        status_multivariado) else "VALIDADO"
+    cursor.execute('''
+        UPDATE boletins SET status = ?, status_aga8 = ?, status_cep = ?, t2_hotelling = ?,
+                            status_t2 = ?, data_validacao = ? WHERE id = ?
+    ''', (status, status_aga8, status_cep, t2, status_multivariado,
+          data_validacao or datetime.now().strftime('%Y-%m-%d %H:%M:%S'), boletim_id))
+
     # ===== PROCESSAR PROPRIEDADES =====
     propriedades_boletim = df_propriedades[df_propriedades['numero_boletim'] == numero_boletim]
     for _, prop_row in propriedades_boletim.iterrows():
@@ -219,105 +286,15 @@ def processar_linha_boletim_completo(boletim_row, df_componentes, df_propriedade
             str(check_row.get('observacao', ''))
         ))
 
+    # Boletim retroativo: os seguintes do fluxo passam a ver suas amostras
+    revalidar_dependentes(conn, [(fluxo, data_coleta)], descartar_estados=False)
+
     # Confirmar transação
     conn.commit()
 
     return boletim_id
 
 
-def processar_linha_boletim(boletim_row, df_componentes, cursor, conn):
-    """Processa uma linha de boletim e seus componentes - VERSÃO LEGADA"""
-
-    # Extrair dados do boletim
-    numero_boletim = str(boletim_row.get('numero_boletim', ''))
-    data_coleta = pd.to_datetime(boletim_row.get('data_coleta')).strftime('%Y-%m-%d')
-    data_emissao = pd.to_datetime(boletim_row.get('data_emissao')).strftime('%Y-%m-%d')
-    instalacao = str(boletim_row.get('identificacao_instalacao', 'FPSO ATLANTE'))
-
-    # Inserir boletim
-    cursor.execute('''
-        INSERT INTO boletins (
-            numero_boletim, data_coleta, data_emissao, identificacao_instalacao,
-            plataforma, sistema_medicao, classificacao, ponto_coleta,
-            agente_regulado, responsavel_amostragem,
-            pressao, temperatura, observacoes, responsavel_tecnico,
-            responsavel_elaboracao, responsavel_aprovacao
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        numero_boletim, data_coleta, data_emissao, instalacao,
-        'FPSO ATLANTE', 'GÁS COMBUSTÍVEL LP', 'FISCAL', 'LP FUEL GAS',
-        boletim_row.get('agente_regulado', ''),
-        boletim_row.get('responsavel_amostragem', ''),
-        float(boletim_row.get('pressao', 0)),
-        float(boletim_row.get('temperatura', 0)),
-        str(boletim_row.get('observacoes', '')),
-        str(boletim_row.get('responsavel_tecnico', '')),
-        str(boletim_row.get('responsavel_elaboracao', '')),
-        str(boletim_row.get('responsavel_aprovacao', ''))
-    ))
-
-    boletim_id = cursor.lastrowid
-
-    # Buscar componentes para este boletim
-    componentes_boletim = df_componentes[df_componentes['numero_boletim'] == numero_boletim]
-
-    # Lista de componentes esperados
-    componentes_esperados = [
-        'Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano',
-        'i-Pentano', 'n-Pentano', 'Hexano', 'Heptano', 'Octano',
-        'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2'
-    ]
-
-    for componente in componentes_esperados:
-        # Buscar valor do componente na planilha
-        comp_row = componentes_boletim[componentes_boletim['componente'] == componente]
-
-        if not comp_row.empty:
-            valor = float(comp_row.iloc[0]['percentual_molar'])
-        else:
-            valor = 0.0  # Valor padrão se não encontrado
-
-        # Validações
-        status_aga = "VALIDADO" if valida_aga8_import(componente, valor) else "INVALIDADO"
-        historico = get_historico_componente_import(componente, cursor)
-        status_cep = "VALIDADO" if valida_cep_import(componente, valor, historico) else "INVALIDADO"
-
-        # Inserir componente
-        cursor.execute('''
-            INSERT INTO componentes (boletin_id, nome, percentual_molar, status_aga, status_cep)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (boletim_id, componente, valor, status_aga, status_cep))
-
-        # Inserir no histórico
-        cursor.execute('''
-            INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta)
-            VALUES (?, ?, ?, ?)
-        ''', (componente, boletim_id, valor, data_coleta))
-
-    # Calcular status geral do boletim
-    cursor.execute('''
-        SELECT COUNT(*) FROM componentes
-        WHERE boletin_id = ? AND (status_aga = ? OR status_cep = ?)
-    ''', (boletim_id, 'INVALIDADO', 'INVALIDADO'))
-
-    componentes_invalidos = cursor.fetchone()[0]
-    status_geral = "INVALIDADO" if componentes_invalidos > 0 else "VALIDADO"
-    data_validacao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    # Atualizar boletim com status
-    cursor.execute('''
-        UPDATE boletins SET status = ?, data_validacao = ? WHERE id = ?
-    ''', (status_geral, data_validacao, boletim_id))
-
-    conn.commit()
-
-    return {
-        'numero_boletim': numero_boletim,
-        'status': status_geral,
-        'componentes_processados': len(componentes_esperados)
-    }
-
-
 def valida_aga8_import(componente, valor):
     """Validação A.G.A #8 para importação"""
     from config import LIMITES_AGA8
@@ -331,37 +308,7 @@ def valida_aga8_import(componente, valor):
 
 def valida_cep_import(componente, novo_valor, historico):
     """Validação CEP para importação"""
-    from config import CEP_AMOSTRAS_MIN, CEP_D2_CONSTANT, CEP_SIGMA_LIMIT
-
-    if len(historico) < 2:
-        return True
-
-    ultimas_amostras = historico[-CEP_AMOSTRAS_MIN:] if len(historico) >= CEP_AMOSTRAS_MIN else historico
-    media = sum(ultimas_amostras) / len(ultimas_amostras)
-
-    amplitudes = [abs(ultimas_amostras[i] - ultimas_amostras[i - 1])
-                  for i in range(1, len(ultimas_amostras))]
-
-    if not amplitudes:
-        return True
-
-    media_amplitudes = sum(amplitudes) / len(amplitudes)
-    lcs = media + CEP_SIGMA_LIMIT * media_amplitudes / CEP_D2_CONSTANT
-    lci = media - CEP_SIGMA_LIMIT * media_amplitudes / CEP_D2_CONSTANT
-
-    return lci <= novo_valor <= lcs
-
-
-def get_historico_componente_import(componente, cursor):
-    """Busca histórico para validação CEP durante importação"""
-    cursor.execute('''
-        SELECT valor FROM historico_componentes
-        WHERE componente = ?
-        ORDER BY data_coleta ASC
-    ''', (componente,))
-
-    historico = cursor.fetchall()
-    return [row[0] for row in historico]
+    return dentro_limites_cep(novo_valor, historico)
 
 
 def criar_template_excel():
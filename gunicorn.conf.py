@@ -38,4 +38,11 @@ limit_request_field_size = 8190
 # Performance
 preload_app = True
 max_requests = 1000
-max_requests_jitter = 50
\ No newline at end of file
+max_requests_jitter = 50
+
+
+# Server hooks
+def on_starting(server):
+    """Build the shared AGA 8 solvers once in the master, before workers fork."""
+    from aga8_registro import preload_solvers
+    preload_solvers()
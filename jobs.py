@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Tarefas em segundo plano (jobs)
+Sistema de Validação de Boletins Cromatográficos
+
+Operações longas (como revalidar todo o histórico) não cabem no timeout de
+30 s dos workers do gunicorn. Elas são registradas na tabela jobs e
+executadas por um pool de threads do próprio processo, em lotes: cada lote
+grava os dados, o progresso e o checkpoint (último id processado) na mesma
+transação. Enquanto o job executa, uma thread com conexão própria renova o
+heartbeat (atualizado_em) a cada JOBS_HEARTBEAT_INTERVALO segundos,
+independentemente da duração dos lotes. Se o processo morrer, o job fica
+sem heartbeat e é retomado a partir do checkpoint por retomar_jobs,
+chamado pelas rotas de status.
+
+A revalidação lê e reprocessa cada série uma única vez por job
+(revalidacao.preparar_revalidacao); os lotes só avaliam e gravam os seus
+boletins.
+
+Com preload_app o pool é criado sob demanda em cada worker, depois do fork.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from config import (
+    CEP_SIGMA_LIMIT,
+    JOBS_HEARTBEAT_EXPIRADO,
+    JOBS_HEARTBEAT_INTERVALO,
+    JOBS_TAMANHO_LOTE,
+    JOBS_TRABALHADORES
+)
+from database import connect_db
+from revalidacao import preparar_revalidacao, revalidar_boletins
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDENTE = 'PENDENTE'
+STATUS_EXECUTANDO = 'EXECUTANDO'
+STATUS_CONCLUIDO = 'CONCLUIDO'
+STATUS_ERRO = 'ERRO'
+
+_FORMATO_DATA = '%Y-%m-%d %H:%M:%S'
+
+_executor = None
+_executor_pid = None
+_agendados = {}  # job_id -> Future agendado neste processo
+_lock = threading.Lock()
+
+
+def _agora():
+    return datetime.now().strftime(_FORMATO_DATA)
+
+
+# Revalidação de boletins
+
+_FILTRO_PENDENTES = "(status IS NULL OR status = 'PENDENTE' OR status = '')"
+
+
+def _filtro_revalidacao(parametros):
+    return f" AND {_FILTRO_PENDENTES}" if parametros.get('escopo') != 'todos' else ''
+
+
+def _contar_revalidacao(db, parametros):
+    return db.execute(
+        f'SELECT COUNT(*) FROM boletins WHERE 1 = 1{_filtro_revalidacao(parametros)}'
+    ).fetchone()[0]
+
+
+def _executar_revalidacao(db, parametros, checkpoint):
+    """Revalida em lotes de boletins por id crescente, a partir do checkpoint"""
+    cache = preparar_revalidacao(db, sigma=parametros.get('sigma', CEP_SIGMA_LIMIT))
+    while True:
+        ids = [row[0] for row in db.execute(f'''
+            SELECT id FROM boletins WHERE id > ?{_filtro_revalidacao(parametros)}
+            ORDER BY id LIMIT ?
+        ''', (checkpoint, JOBS_TAMANHO_LOTE))]
+        if not ids:
+            return
+        resultado = revalidar_boletins(db, ids, cache=cache)
+        checkpoint = ids[-1]
+        yield checkpoint, resultado
+
+
+# tipo: (contagem inicial, gerador de lotes -> (checkpoint, resultado do lote))
+TAREFAS = {
+    'revalidacao': (_contar_revalidacao, _executar_revalidacao),
+}
+
+
+def criar_job(db, tipo, parametros=None):
+    """Registra um job PENDENTE (com o total de itens) e faz commit"""
+    parametros = parametros or {}
+    contar, _ = TAREFAS[tipo]
+    cursor = db.execute('''
+        INSERT INTO jobs (tipo, status, parametros, total, criado_em)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (tipo, STATUS_PENDENTE, json.dumps(parametros), contar(db, parametros), _agora()))
+    db.commit()
+    return cursor.lastrowid
+
+
+def buscar_job(db, job_id):
+    """Job como dict (parametros e resultado decodificados) ou None"""
+    row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job['parametros'] = json.loads(job['parametros'] or '{}')
+    job['resultado'] = json.loads(job['resultado'] or '{}')
+    job['percentual'] = (
+        100.0 if job['status'] == STATUS_CONCLUIDO
+        else round(100.0 * job['processados'] / job['total'], 1) if job['total'] else 0.0)
+    return job
+
+
+def _heartbeat_expirado():
+    return (datetime.now() - timedelta(seconds=JOBS_HEARTBEAT_EXPIRADO)).strftime(_FORMATO_DATA)
+
+
+def _manter_heartbeat(job_id, db_path, parar):
+    """Renova atualizado_em do job, em conexão própria, até `parar` ser sinalizado"""
+    db = connect_db(db_path)
+    try:
+        while not parar.wait(JOBS_HEARTBEAT_INTERVALO):
+            try:
+                db.execute('UPDATE jobs SET atualizado_em = ? WHERE id = ? AND status = ?',
+                           (_agora(), job_id, STATUS_EXECUTANDO))
+                db.commit()
+            except sqlite3.OperationalError as e:
+                # Banco ocupado por um lote longo: tenta de novo no próximo intervalo
+                logger.warning(f"Heartbeat do job {job_id} não renovado: {e}")
+    finally:
+        db.close()
+
+
+def executar_job(job_id, db_path=None):
+    """
+    Executa (ou retoma) um job até o fim, em lotes com commit
+
+    Só um executor processa o job: ele é reivindicado atomicamente enquanto
+    está PENDENTE ou EXECUTANDO sem heartbeat recente.
+    """
+    db = connect_db(db_path)
+    parar_heartbeat = threading.Event()
+    try:
+        reivindicado = db.execute('''
+            UPDATE jobs SET status = ?, iniciado_em = COALESCE(iniciado_em, ?), atualizado_em = ?
+            WHERE id = ? AND (status = ? OR (status = ? AND atualizado_em < ?))
+        ''', (STATUS_EXECUTANDO, _agora(), _agora(), job_id,
+              STATUS_PENDENTE, STATUS_EXECUTANDO, _heartbeat_expirado())).rowcount
+        db.commit()
+        if not reivindicado:
+            return
+
+        threading.Thread(target=_manter_heartbeat, args=(job_id, db_path, parar_heartbeat),
+                         name=f'job-{job_id}-heartbeat', daemon=True).start()
+        job = buscar_job(db, job_id)
+        _, executar = TAREFAS[job['tipo']]
+        resultado = job['resultado']
+        logger.info(f"Job {job_id} ({job['tipo']}) iniciado a partir do checkpoint {job['checkpoint']}")
+
+        for checkpoint, parcial in executar(db, job['parametros'], job['checkpoint']):
+            for chave, valor in parcial.items():
+                resultado[chave] = resultado.get(chave, 0) + valor
+            # Dados do lote e checkpoint na mesma transação
+            db.execute('''
+                UPDATE jobs SET checkpoint = ?, processados = processados + ?,
+                                resultado = ?, atualizado_em = ?
+                WHERE id = ?
+            ''', (checkpoint, parcial.get('processados', 0), json.dumps(resultado), _agora(), job_id))
+            db.commit()
+
+        db.execute('''
+            UPDATE jobs SET status = ?, atualizado_em = ?, concluido_em = ? WHERE id = ?
+        ''', (STATUS_CONCLUIDO, _agora(), _agora(), job_id))
+        db.commit()
+        logger.info(f"Job {job_id} concluído: {resultado}")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro no job {job_id}: {e}")
+        db.execute('UPDATE jobs SET status = ?, erro = ?, atualizado_em = ? WHERE id = ?',
+                   (STATUS_ERRO, str(e), _agora(), job_id))
+        db.commit()
+    finally:
+        parar_heartbeat.set()
+        db.close()
+
+
+def _obter_executor():
+    """Pool de threads do processo atual (recriado após fork; chamar com _lock)"""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=JOBS_TRABALHADORES, thread_name_prefix='job')
+        _executor_pid = os.getpid()
+        _agendados.clear()
+    return _executor
+
+
+def submeter_job(job_id, db_path=None):
+    """Agenda a execução do job no pool de threads (uma vez por processo)"""
+    with _lock:
+        executor = _obter_executor()
+        futuro = _agendados.get(job_id)
+        if futuro is None or futuro.done():
+            futuro = _agendados[job_id] = executor.submit(executar_job, job_id, db_path)
+        return futuro
+
+
+def retomar_job(db, job_id, db_path=None):
+    """Volta um job com erro para PENDENTE (mantendo o checkpoint) e o agenda"""
+    db.execute('UPDATE jobs SET status = ?, erro = NULL WHERE id = ? AND status = ?',
+               (STATUS_PENDENTE, job_id, STATUS_ERRO))
+    db.commit()
+    return submeter_job(job_id, db_path)
+
+
+def retomar_jobs(db, db_path=None):
+    """Agenda jobs pendentes e jobs interrompidos (sem heartbeat recente)"""
+    ids = [row[0] for row in db.execute('''
+        SELECT id FROM jobs
+        WHERE status = ? OR (status = ? AND atualizado_em < ?)
+        ORDER BY id
+    ''', (STATUS_PENDENTE, STATUS_EXECUTANDO, _heartbeat_expirado()))]
+    for job_id in ids:
+        submeter_job(job_id, db_path)
+    return ids
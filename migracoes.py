@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Migrações versionadas do esquema SQLite
+Sistema de Validação de Boletins Cromatográficos
+
+A versão do esquema é registrada em PRAGMA user_version. Cada migração roda
+uma única vez, em transação própria, na ordem da lista MIGRACOES. Bancos
+criados antes deste controle (user_version = 0) são reconhecidos: as tabelas
+usam IF NOT EXISTS e as colunas só são adicionadas quando ausentes.
+"""
+
+import logging
+
+from cep import chave_fluxo
+
+logger = logging.getLogger(__name__)
+
+
+def _colunas(db, tabela):
+    """Retorna o conjunto de colunas existentes em uma tabela"""
+    return {row[1] for row in db.execute(f'PRAGMA table_info({tabela})')}
+
+
+def _adicionar_coluna(db, tabela, coluna, definicao):
+    """Adiciona uma coluna apenas se ela ainda não existir"""
+    if coluna not in _colunas(db, tabela):
+        db.execute(f'ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}')
+
+
+def _m001_tabelas_base(db):
+    """Tabelas principais do sistema"""
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS boletins (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_boletim TEXT NOT NULL,
+        numero_documento TEXT,
+        data_coleta TEXT NOT NULL,
+        data_recebimento TEXT,
+        data_analise TEXT,
+        data_emissao TEXT,
+        data_validacao TEXT,
+        identificacao_instalacao TEXT,
+        plataforma TEXT,
+        sistema_medicao TEXT,
+        classificacao TEXT,
+        ponto_coleta TEXT,
+        agente_regulado TEXT,
+        responsavel_amostragem TEXT,
+        pressao REAL,
+        temperatura REAL,
+        observacoes TEXT,
+        status TEXT,
+        status_cep TEXT,
+        status_aga8 TEXT,
+        status_checklist TEXT,
+        responsavel_tecnico TEXT,
+        responsavel_elaboracao TEXT,
+        responsavel_aprovacao TEXT
+    )
+    ''')
+
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS componentes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        boletin_id INTEGER NOT NULL,
+        nome TEXT NOT NULL,
+        percentual_molar REAL NOT NULL,
+        status_aga TEXT,
+        status_cep TEXT,
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS propriedades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        boletin_id INTEGER NOT NULL,
+        nome TEXT NOT NULL,
+        valor REAL NOT NULL,
+        status_aga TEXT,
+        status_cep TEXT,
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS historico_componentes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        componente TEXT NOT NULL,
+        boletin_id INTEGER NOT NULL,
+        valor REAL NOT NULL,
+        data_coleta TEXT NOT NULL,
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS historico_propriedades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        propriedade TEXT NOT NULL,
+        boletin_id INTEGER NOT NULL,
+        valor REAL NOT NULL,
+        data_coleta TEXT NOT NULL,
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS checklist_itens (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        boletin_id INTEGER NOT NULL,
+        item_numero INTEGER NOT NULL,
+        descricao TEXT NOT NULL,
+        situacao TEXT NOT NULL DEFAULT 'OK',
+        nao_aplicavel BOOLEAN DEFAULT FALSE,
+        observacao TEXT,
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+
+def _m002_colunas_adicionais(db):
+    """Colunas antes criadas por scripts avulsos (migrate_add_units.py, importação)"""
+    _adicionar_coluna(db, 'boletins', 'pressao_unit', "TEXT DEFAULT 'atm'")
+    _adicionar_coluna(db, 'boletins', 'temperatura_unit', "TEXT DEFAULT 'celsius'")
+    _adicionar_coluna(db, 'boletins', 'metodologia_aprovada', 'INTEGER DEFAULT 0')
+
+    _adicionar_coluna(db, 'componentes', 'limite_inferior_aga', 'REAL')
+    _adicionar_coluna(db, 'componentes', 'limite_superior_aga', 'REAL')
+    _adicionar_coluna(db, 'componentes', 'observacoes', 'TEXT')
+
+    _adicionar_coluna(db, 'propriedades', 'observacoes', 'TEXT')
+
+
+def _m003_indices(db):
+    """Índices para o histórico do CEP e para as consultas por boletim"""
+    indices = [
+        # Histórico CEP: WHERE componente = ? ORDER BY data_coleta
+        'CREATE INDEX IF NOT EXISTS idx_hist_comp_componente_data '
+        'ON historico_componentes (componente, data_coleta)',
+        'CREATE INDEX IF NOT EXISTS idx_hist_prop_propriedade_data '
+        'ON historico_propriedades (propriedade, data_coleta)',
+        'CREATE INDEX IF NOT EXISTS idx_hist_comp_boletin '
+        'ON historico_componentes (boletin_id)',
+        'CREATE INDEX IF NOT EXISTS idx_hist_prop_boletin '
+        'ON historico_propriedades (boletin_id)',
+
+        # Tabelas filhas: WHERE boletin_id = ?
+        'CREATE INDEX IF NOT EXISTS idx_componentes_boletin_nome '
+        'ON componentes (boletin_id, nome)',
+        'CREATE INDEX IF NOT EXISTS idx_propriedades_boletin '
+        'ON propriedades (boletin_id)',
+        'CREATE INDEX IF NOT EXISTS idx_checklist_boletin_item '
+        'ON checklist_itens (boletin_id, item_numero)',
+
+        # Listagens e dashboard: ORDER BY / filtros por data de coleta
+        'CREATE INDEX IF NOT EXISTS idx_boletins_data_coleta '
+        'ON boletins (data_coleta)',
+
+        # Índices parciais: apenas as linhas INVALIDADO (minoria da base)
+        "CREATE INDEX IF NOT EXISTS idx_componentes_cep_invalidado "
+        "ON componentes (boletin_id) WHERE status_cep = 'INVALIDADO'",
+        "CREATE INDEX IF NOT EXISTS idx_componentes_aga_invalidado "
+        "ON componentes (boletin_id) WHERE status_aga = 'INVALIDADO'",
+        "CREATE INDEX IF NOT EXISTS idx_boletins_invalidados "
+        "ON boletins (data_coleta) WHERE status = 'INVALIDADO'",
+    ]
+    for sql in indices:
+        db.execute(sql)
+
+    # Estatísticas para o planejador escolher os novos índices
+    db.execute('ANALYZE')
+
+
+def _m004_cep_snapshots(db):
+    """Limites CEP aplicados a cada componente de cada boletim"""
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS cep_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        boletin_id INTEGER NOT NULL,
+        componente TEXT NOT NULL,
+        media REAL,
+        media_amplitudes REAL,
+        lci REAL,
+        lcs REAL,
+        n_amostras INTEGER NOT NULL DEFAULT 0,
+        amostras_ids TEXT,
+        sigma REAL,
+        data_calculo TEXT,
+        UNIQUE (boletin_id, componente),
+        FOREIGN KEY (boletin_id) REFERENCES boletins (id) ON DELETE CASCADE
+    )
+    ''')
+
+
+def _m005_fluxos_cep(db):
+    """Histórico CEP particionado por fluxo (instalação + sistema + ponto de coleta)"""
+    _adicionar_coluna(db, 'boletins', 'fluxo', "TEXT NOT NULL DEFAULT ''")
+    _adicionar_coluna(db, 'historico_componentes', 'fluxo', "TEXT NOT NULL DEFAULT ''")
+    _adicionar_coluna(db, 'historico_propriedades', 'fluxo', "TEXT NOT NULL DEFAULT ''")
+
+    # A chave é calculada em Python (cep.chave_fluxo) para ser idêntica à
+    # gravada pela aplicação
+    boletins = db.execute('''
+        SELECT id, identificacao_instalacao, plataforma, sistema_medicao, ponto_coleta
+        FROM boletins
+    ''').fetchall()
+    db.executemany('UPDATE boletins SET fluxo = ? WHERE id = ?', [
+        (chave_fluxo(instalacao or plataforma, sistema, ponto), boletim_id)
+        for boletim_id, instalacao, plataforma, sistema, ponto in boletins
+    ])
+    for tabela in ('historico_componentes', 'historico_propriedades'):
+        db.execute(f'''
+            UPDATE {tabela} SET fluxo = COALESCE(
+                (SELECT b.fluxo FROM boletins b WHERE b.id = {tabela}.boletin_id), '')
+        ''')
+
+    # Índices por fluxo substituem os índices só por componente/propriedade
+    db.execute('DROP INDEX IF EXISTS idx_hist_comp_componente_data')
+    db.execute('DROP INDEX IF EXISTS idx_hist_prop_propriedade_data')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_hist_comp_fluxo_componente_data '
+               'ON historico_componentes (fluxo, componente, data_coleta)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_hist_prop_fluxo_propriedade_data '
+               'ON historico_propriedades (fluxo, propriedade, data_coleta)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_boletins_fluxo_data '
+               'ON boletins (fluxo, data_coleta)')
+    db.execute('ANALYZE')
+
+
+def _m006_regras_cep(db):
+    """Estado incremental das regras de sequência, EWMA e CUSUM por fluxo"""
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS cep_estado (
+        fluxo TEXT NOT NULL,
+        componente TEXT NOT NULL,
+        n_amostras INTEGER NOT NULL DEFAULT 0,
+        ultima_data TEXT,
+        ultimo_valor REAL,
+        ewma REAL,
+        cusum_pos REAL NOT NULL DEFAULT 0,
+        cusum_neg REAL NOT NULL DEFAULT 0,
+        lado INTEGER NOT NULL DEFAULT 0,
+        contagem_lado INTEGER NOT NULL DEFAULT 0,
+        direcao INTEGER NOT NULL DEFAULT 0,
+        contagem_tendencia INTEGER NOT NULL DEFAULT 0,
+        contagem_alternancia INTEGER NOT NULL DEFAULT 0,
+        zona2_acima INTEGER NOT NULL DEFAULT 0,
+        zona2_abaixo INTEGER NOT NULL DEFAULT 0,
+        zona1_acima INTEGER NOT NULL DEFAULT 0,
+        zona1_abaixo INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (fluxo, componente)
+    ) WITHOUT ROWID
+    ''')
+
+    # Regras disparadas na última validação (ex.: 'R1,EWMA')
+    _adicionar_coluna(db, 'componentes', 'regras_cep', 'TEXT')
+
+
+def _m007_t2_hotelling(db):
+    """Estado do CEP multivariado (T² de Hotelling) por fluxo"""
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS cep_t2_estado (
+        fluxo TEXT PRIMARY KEY,
+        n_amostras INTEGER NOT NULL DEFAULT 0,
+        ultima_data TEXT,
+        media TEXT NOT NULL,
+        m2 TEXT NOT NULL,
+        precisao TEXT
+    )
+    ''')
+
+    _adicionar_coluna(db, 'boletins', 't2_hotelling', 'REAL')
+    _adicionar_coluna(db, 'boletins', 'status_t2', 'TEXT')
+
+
+def _m008_jobs(db):
+    """Tarefas em segundo plano com progresso e checkpoint"""
+    db.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'PENDENTE',
+        parametros TEXT,
+        total INTEGER NOT NULL DEFAULT 0,
+        processados INTEGER NOT NULL DEFAULT 0,
+        checkpoint INTEGER NOT NULL DEFAULT 0,
+        resultado TEXT,
+        erro TEXT,
+        criado_em TEXT NOT NULL,
+        iniciado_em TEXT,
+        atualizado_em TEXT,
+        concluido_em TEXT
+    )
+    ''')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+
+
+def _m009_t2_ridge(db):
+    """Regularização com que a precisão gravada do T² foi calculada"""
+    _adicionar_coluna(db, 'cep_t2_estado', 'ridge', 'REAL')
+
+
+# (versão, descrição, função) - nunca reordenar nem reutilizar números
+MIGRACOES = [
+    (1, 'Tabelas base', _m001_tabelas_base),
+    (2, 'Colunas de unidades, metodologia e observações', _m002_colunas_adicionais),
+    (3, 'Índices do histórico CEP e das consultas por boletim', _m003_indices),
+    (4, 'Snapshots dos limites CEP aplicados', _m004_cep_snapshots),
+    (5, 'Fluxos CEP por instalação, sistema de medição e ponto de coleta', _m005_fluxos_cep),
+    (6, 'Estado das regras de sequência, EWMA e CUSUM', _m006_regras_cep),
+    (7, 'CEP multivariado (T² de Hotelling) por fluxo', _m007_t2_hotelling),
+    (8, 'Tarefas em segundo plano (jobs)', _m008_jobs),
+    (9, 'Regularização da precisão do T²', _m009_t2_ridge),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+
+def versao_esquema(db):
+    """Versão do esquema gravada no banco (PRAGMA user_version)"""
+    return db.execute('PRAGMA user_version').fetchone()[0]
+
+
+def aplicar_migracoes(db):
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação
+
+    Args:
+        db: Conexão SQLite
+
+    Returns:
+        int: Versão do esquema após a execução
+    """
+    versao = versao_esquema(db)
+
+    for numero, descricao, migracao in MIGRACOES:
+        if numero <= versao:
+            continue
+
+        try:
+            db.execute('BEGIN')
+            migracao(db)
+            db.execute(f'PRAGMA user_version = {numero}')
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(f"Falha na migração {numero} ({descricao})")
+            raise
+
+        versao = numero
+        logger.info(f"Migração {numero} aplicada: {descricao}")
+
+    return versao
@@ -7,6 +7,9 @@ Adiciona os seguintes campos:
 - pressao_unit: Unidade da pressão (atm, kpa, pa, bar, psi)
 - temperatura_unit: Unidade da temperatura (celsius, kelvin)
 - metodologia_aprovada: Boolean indicando se existe metodologia aprovada
+
+Obs.: estas colunas agora fazem parte da migração 2 de migracoes.py, aplicada
+automaticamente por init_db(); este script é mantido apenas por compatibilidade.
 """
 
 import sqlite3
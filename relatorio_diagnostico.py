@@ -83,8 +83,6 @@ def create_simple_report_route(app, get_db):
             </html>
             """
             
-            db.close()
-            
             return render_template_string(template, 
                                         boletim=boletim, 
                                         componentes=componentes)
@@ -78,8 +78,6 @@ def create_hotfix_route(app, get_db):
                 'prazo_total': {'status': 'OK', 'dias_decorridos': 0}
             }
             
-            db.close()
-            
             return render_template(
                 'relatorio_excel.html',
                 boletim=boletim,
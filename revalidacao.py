@@ -0,0 +1,796 @@
+# -*- coding: utf-8 -*-
+"""
+Revalidação em lote de boletins (A.G.A #8 + CEP)
+Sistema de Validação de Boletins Cromatográficos
+
+Em vez de uma consulta de histórico por componente de cada boletim, os
+componentes a revalidar e o histórico de cada componente são lidos uma
+única vez; o CEP "as-of" é calculado por cep_vetorizado e os status são
+gravados com executemany, junto com os snapshots dos limites aplicados
+(cep_snapshots). As regras de sequência, EWMA e CUSUM são reprocessadas
+na mesma passada por série, que também regrava o estado incremental do
+fluxo (cep_estado). O T² de Hotelling de cada boletim é recalculado em
+lote por fluxo (cep_multivariado.t2_as_of).
+
+As séries (fluxo, componente) são independentes; revalidar_boletins_paralelo
+as distribui entre processos auxiliares e mantém um único escritor.
+
+Após incluir, editar ou excluir um boletim, revalidar_dependentes revalida
+apenas os boletins cuja janela (ou memória das regras) contém a amostra
+alterada: os próximos boletins do mesmo fluxo, em número limitado. O T²
+deles parte do estado gravado do fluxo até a data alterada; só a cauda do
+fluxo a partir dela é lida.
+
+Usado por /revalidar_todos e pela linha de comando (por exemplo, após
+alterar CEP_SIGMA_LIMIT):
+
+    python revalidacao.py                # todos os boletins
+    python revalidacao.py --sigma 2.5    # após alterar o multiplicador dos limites
+    python revalidacao.py --processos 0  # séries em paralelo, todos os núcleos
+
+Antes de alterar a configuração, --simular mostra (em NDJSON, sem gravar)
+os componentes que mudariam de status:
+
+    python revalidacao.py --simular --sigma 2.5 --janela 12 > alteracoes.ndjson
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from cep_vetorizado import (
+    carregar_serie_componente,
+    carregar_series_componentes,
+    dentro_limites_vetorizado,
+    limites_cep_as_of
+)
+from cep import buscar_janelas_cep_lote, dentro_limites_cep, gravar_snapshots_cep, snapshot_cep
+from cep_multivariado import (
+    COMPONENTES_T2,
+    carregar_composicoes,
+    carregar_estado_t2,
+    combinar_estados_t2,
+    estado_t2_de_serie,
+    gravar_estados_t2,
+    invalida_por_t2,
+    separar_estados_t2,
+    status_t2,
+    t2_as_of
+)
+from cep_regras import (
+    avaliar_regras_as_of,
+    formatar_regras,
+    gravar_estados,
+    invalida_por_regras,
+    preparar_serie,
+    regras_as_of
+)
+from config import (
+    CEP_AMOSTRAS_MIN,
+    CEP_D2_CONSTANT,
+    CEP_REGRAS_MEMORIA,
+    CEP_SIGMA_LIMIT,
+    LIMITES_AGA8
+)
+from database import connect_db, get_db_path
+
+logger = logging.getLogger(__name__)
+
+# Limite de parâmetros por cláusula IN
+_TAMANHO_LOTE_IDS = 500
+
+# Partições por processo na revalidação paralela
+_PARTICOES_POR_PROCESSO = 4
+
+# Data da n-ésima amostra de um componente depois de uma data (pelo índice)
+_SQL_N_ESIMA_SEGUINTE = '''
+    SELECT (SELECT data_coleta FROM historico_componentes
+            WHERE fluxo = ? AND componente = ? AND data_coleta > ?
+            ORDER BY data_coleta, id LIMIT 1 OFFSET ?)
+'''
+
+
+# Componentes amostrados numa posição (fluxo, data_coleta), pelos boletins
+_SQL_COMPONENTES_NA_DATA = '''
+    SELECT DISTINCT h.componente
+    FROM boletins b JOIN historico_componentes h ON h.boletin_id = b.id
+    WHERE b.fluxo = ? AND b.data_coleta = ?
+'''
+
+
+def _buscar_componentes(db, boletim_ids):
+    """Componentes dos boletins (todos se boletim_ids for None) com a data de coleta"""
+    sql = '''
+        SELECT c.id, c.boletin_id, c.nome, c.percentual_molar, b.data_coleta, b.fluxo
+        FROM componentes c JOIN boletins b ON b.id = c.boletin_id
+    '''
+    if boletim_ids is None:
+        return db.execute(sql).fetchall()
+
+    rows = []
+    for inicio in range(0, len(boletim_ids), _TAMANHO_LOTE_IDS):
+        lote = boletim_ids[inicio:inicio + _TAMANHO_LOTE_IDS]
+        rows.extend(db.execute(
+            f"{sql} WHERE c.boletin_id IN ({', '.join('?' * len(lote))})",
+            lote).fetchall())
+    return rows
+
+
+def _valida_aga8(nome, valor, limites_aga8=LIMITES_AGA8):
+    """Valida componente contra os limites da norma A.G.A #8"""
+    limites = limites_aga8.get(nome)
+    if limites is None:
+        return True
+    return limites['min'] <= valor <= limites['max']
+
+
+def _snapshot_vazio():
+    """Snapshot de componente sem histórico (aceito sem limites)"""
+    return {'media': None, 'media_amplitudes': None, 'lci': None, 'lcs': None,
+            'n_amostras': 0, 'amostras_ids': []}
+
+
+def _snapshots_lote(alvos, nome, limites, ids):
+    """Converte os arrays do motor vetorizado em registros de cep_snapshots"""
+    # Listas Python de uma vez (NaN = None): evita conversões ponto a ponto
+    campos = ('media', 'media_amplitudes', 'lci', 'lcs')
+    colunas = [[None if valor != valor else valor for valor in limites[campo].tolist()]
+               for campo in campos]
+    fins = limites['fim_janela'].tolist()
+    totais = limites['n_amostras'].tolist()
+    ids = ids.tolist()
+
+    for i, row in enumerate(alvos):
+        snapshot = {campo: coluna[i] for campo, coluna in zip(campos, colunas)}
+        snapshot['n_amostras'] = totais[i]
+        snapshot['amostras_ids'] = ids[fins[i] - totais[i]:fins[i]]
+        yield row['boletin_id'], nome, snapshot
+
+
+def _t2_lote(db, boletim_ids, fluxos):
+    """T² "as-of" dos boletins, em lote por fluxo; regrava o estado de cada fluxo"""
+    alvo = np.array(boletim_ids, dtype=np.int64)
+    t2 = {}
+    estados = []
+    for fluxo, (datas, ids, composicoes) in carregar_composicoes(db, fluxos).items():
+        selecionados = np.isin(ids, alvo)
+        t2.update(_t2_por_boletim(ids[selecionados], t2_as_of(
+            datas, composicoes, datas[selecionados], composicoes[selecionados])))
+        estados.append((fluxo, estado_t2_de_serie(datas, composicoes)))
+    gravar_estados_t2(db, estados)
+    return t2
+
+
+def _t2_por_boletim(ids, valores):
+    return {int(boletim_id): None if np.isnan(valor) else float(valor)
+            for boletim_id, valor in zip(ids, valores)}
+
+
+def _versao_historico(db):
+    """Impressão digital barata de historico_componentes (inclusões, exclusões, edições de valor)"""
+    return tuple(db.execute(
+        'SELECT COUNT(*), MAX(id), TOTAL(valor) FROM historico_componentes').fetchone())
+
+
+def preparar_revalidacao(db, n=CEP_AMOSTRAS_MIN, sigma=CEP_SIGMA_LIMIT):
+    """
+    Cache para revalidar o histórico em vários lotes lendo e reprocessando
+    cada série uma única vez (jobs)
+
+    Séries, limites, estados das regras de todos os prefixos e o T² de todos
+    os boletins são calculados no primeiro lote que precisa deles e
+    reaproveitados nos seguintes. Se historico_componentes mudar entre dois
+    lotes (cadastro, edição ou exclusão durante o job), o cache é refeito.
+
+    Returns:
+        dict: cache para revalidar_boletins(cache=...)
+    """
+    return {'n': n, 'sigma': sigma, 'versao': None}
+
+
+def _cache_atual(db, cache):
+    """Cache válido para o histórico atual (recarrega as séries se ele mudou)"""
+    versao = _versao_historico(db)
+    if cache['versao'] != versao:
+        cache.update(versao=versao, historico=carregar_series_componentes(db),
+                     series={}, t2=None, estados_t2=None)
+    return cache
+
+
+def _serie_do_cache(cache, serie):
+    """Série preparada (limites e estados de todos os prefixos), calculada uma vez"""
+    if serie not in cache['series']:
+        historico = cache['historico'].get(serie)
+        cache['series'][serie] = None if historico is None else _preparar_serie(
+            historico, cache['n'], cache['sigma'])
+    return cache['series'][serie]
+
+
+def _t2_do_cache(db, cache, boletim_ids, fluxos):
+    """T² dos boletins a partir do T² de todos os boletins, calculado uma vez"""
+    if cache['t2'] is None:
+        cache['t2'], cache['estados_t2'] = {}, {}
+        for fluxo, (datas, ids, composicoes) in carregar_composicoes(db).items():
+            cache['t2'].update(_t2_por_boletim(ids, t2_as_of(datas, composicoes, datas, composicoes)))
+            cache['estados_t2'][fluxo] = estado_t2_de_serie(datas, composicoes)
+    gravar_estados_t2(db, [(fluxo, cache['estados_t2'][fluxo])
+                           for fluxo in fluxos if fluxo in cache['estados_t2']])
+    return {boletim_id: cache['t2'].get(boletim_id) for boletim_id in boletim_ids}
+
+
+def revalidar_boletins(db, boletim_ids=None, n=CEP_AMOSTRAS_MIN, sigma=CEP_SIGMA_LIMIT, cache=None):
+    """
+    Revalida boletins aplicando A.G.A #8 e CEP "as-of"
+
+    Não faz commit: a transação fica a cargo de quem chama.
+
+    Args:
+        db: Conexão SQLite
+        boletim_ids: Boletins a revalidar (None = todos)
+        n: Tamanho da janela de controle
+        sigma: Multiplicador dos limites de controle
+        cache: preparar_revalidacao, para revalidar em lotes sem reler nem
+            reprocessar as séries a cada lote (usa o n e o sigma do cache)
+
+    Returns:
+        dict: processados, validados e invalidados
+    """
+    if boletim_ids is None:
+        boletim_ids = [row[0] for row in db.execute('SELECT id FROM boletins')]
+        componentes = _buscar_componentes(db, None)
+    else:
+        boletim_ids = list(boletim_ids)
+        componentes = _buscar_componentes(db, boletim_ids)
+
+    # Agrupar os componentes alvo por fluxo e nome
+    por_serie = _agrupar_por_serie(componentes)
+    fluxos = {row['fluxo'] for row in componentes}
+    if cache is None:
+        series = carregar_series_componentes(db, {nome for _, nome in por_serie})
+        resultados = (
+            (indices, _avaliar_serie(serie, [componentes[i] for i in indices],
+                                     series.get(serie), n, sigma))
+            for serie, indices in por_serie.items())
+        return _gravar_revalidacao(db, boletim_ids, componentes, resultados, sigma,
+                                   _t2_lote(db, boletim_ids, fluxos))
+
+    cache = _cache_atual(db, cache)
+    resultados = [
+        (indices, _avaliar_serie(serie, [componentes[i] for i in indices],
+                                 cache['historico'].get(serie), cache['n'], cache['sigma'],
+                                 _serie_do_cache(cache, serie)))
+        for serie, indices in por_serie.items()]
+    return _gravar_revalidacao(db, boletim_ids, componentes, resultados, cache['sigma'],
+                               _t2_do_cache(db, cache, boletim_ids, fluxos))
+
+
+def _agrupar_por_serie(componentes):
+    """Índices dos componentes alvo agrupados por (fluxo, nome)"""
+    por_serie = {}
+    for indice, row in enumerate(componentes):
+        por_serie.setdefault((row['fluxo'], row['nome']), []).append(indice)
+    return por_serie
+
+
+def _preparar_serie(historico, n, sigma):
+    """Limites de cada ponto do histórico e estados das regras de todos os prefixos"""
+    datas, valores, _ = historico
+    return preparar_serie(datas, valores, limites_cep_as_of(datas, valores, datas, n=n, sigma=sigma))
+
+
+def _avaliar_serie(serie, alvos, historico, n, sigma, preparada=None):
+    """
+    CEP "as-of" e regras de sequência dos alvos de uma série (fluxo, componente)
+
+    Args:
+        preparada: _preparar_serie do histórico, se já calculada
+
+    Returns:
+        tuple: (cep_ok por alvo, regras por alvo, snapshots, estado final
+        da série ou None sem histórico)
+    """
+    fluxo, nome = serie
+    if historico is None:
+        return ([True] * len(alvos), [[] for _ in alvos],
+                [(row['boletin_id'], nome, _snapshot_vazio()) for row in alvos], None)
+
+    datas, valores, ids = historico
+    datas_alvo = [row['data_coleta'] for row in alvos]
+    valores_alvo = [row['percentual_molar'] for row in alvos]
+    limites = limites_cep_as_of(datas, valores, datas_alvo, n=n, sigma=sigma)
+    dentro = dentro_limites_vetorizado(valores_alvo, limites)
+    snapshots = list(_snapshots_lote(alvos, nome, limites, ids))
+
+    preparada = preparada or _preparar_serie(historico, n, sigma)
+    regras = regras_as_of(preparada, datas_alvo, valores_alvo, limites)
+    cep_ok = [bool(ok) and not invalida_por_regras(regras_ponto)
+              for ok, regras_ponto in zip(dentro, regras)]
+    return cep_ok, regras, snapshots, (fluxo, nome, preparada['final'])
+
+
+def _gravar_revalidacao(db, boletim_ids, componentes, resultados, sigma, t2):
+    """
+    Grava, em lote, o resultado das séries: status dos componentes,
+    snapshots, estados das regras, T² e status dos boletins
+
+    Args:
+        resultados: Iterável de (índices em componentes, retorno de _avaliar_serie)
+        t2: {boletim_id: T²} dos boletins (estados do T² já gravados)
+    """
+    status_cep = [True] * len(componentes)
+    regras = [[] for _ in componentes]
+    snapshots = []
+    estados = []
+    for indices, (cep_ok, regras_alvo, snapshots_serie, estado) in resultados:
+        for i, ok, regras_ponto in zip(indices, cep_ok, regras_alvo):
+            status_cep[i] = ok
+            regras[i] = regras_ponto
+        snapshots.extend(snapshots_serie)
+        if estado is not None:
+            estados.append(estado)
+
+    invalidos = {boletim_id: [False, False] for boletim_id in boletim_ids}
+    atualizacoes = []
+    for row, cep_ok, regras_ponto in zip(componentes, status_cep, regras):
+        aga_ok = _valida_aga8(row['nome'], row['percentual_molar'])
+        atualizacoes.append((
+            "VALIDADO" if aga_ok else "INVALIDADO",
+            "VALIDADO" if cep_ok else "INVALIDADO",
+            formatar_regras(regras_ponto),
+            row['id']))
+        flags = invalidos[row['boletin_id']]
+        flags[0] = flags[0] or not aga_ok
+        flags[1] = flags[1] or not cep_ok
+
+    db.executemany('''
+        UPDATE componentes SET status_aga = ?, status_cep = ?, regras_cep = ?
+        WHERE id = ?
+    ''', atualizacoes)
+    gravar_snapshots_cep(db, snapshots, sigma=sigma)
+    gravar_estados(db, estados)
+
+    # Status do boletim (checklist sempre VALIDADO por enquanto)
+    data_validacao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    resultado = {'processados': len(boletim_ids), 'validados': 0, 'invalidados': 0}
+    status_boletins = []
+    for boletim_id, (aga_invalido, cep_invalido) in invalidos.items():
+        t2_boletim = t2.get(boletim_id)
+        status_multivariado = status_t2(t2_boletim)
+        status = "INVALIDADO" if (
+            aga_invalido or cep_invalido or invalida_por_t2(status_multivariado)) else "VALIDADO"
+        resultado['validados' if status == "VALIDADO" else 'invalidados'] += 1
+        status_boletins.append((
+            status,
+            "INVALIDADO" if cep_invalido else "VALIDADO",
+            "INVALIDADO" if aga_invalido else "VALIDADO",
+            "VALIDADO", t2_boletim, status_multivariado, data_validacao, boletim_id))
+
+    db.executemany('''
+        UPDATE boletins SET status = ?, status_cep = ?, status_aga8 = ?,
+                           status_checklist = ?, t2_hotelling = ?, status_t2 = ?,
+                           data_validacao = ? WHERE id = ?
+    ''', status_boletins)
+
+    logger.info(f"Revalidação em lote: {resultado}")
+    return resultado
+
+
+def boletins_dependentes(db, fluxo, data_coleta, n=CEP_AMOSTRAS_MIN + CEP_REGRAS_MEMORIA,
+                         componentes=None):
+    """
+    Boletins do fluxo cuja avaliação usa amostras coletadas em data_coleta
+
+    Uma amostra entra na janela "as-of" dos boletins seguintes que têm o
+    mesmo componente, até que n amostras mais recentes dele a empurrem para
+    fora. O padrão cobre a janela dos limites e a memória das regras de
+    sequência (avaliar_regras_as_of). Cada componente é limitado pela sua
+    própria n-ésima amostra seguinte; um componente com menos de n amostras
+    seguintes só traz os boletins que o contêm. Cada componente lê no
+    máximo n linhas pelo índice (fluxo, componente, data_coleta): o custo
+    independe do tamanho do histórico.
+
+    Args:
+        componentes: Componentes das amostras alteradas; por padrão, os
+            amostrados em (fluxo, data_coleta). Numa exclusão ou mudança de
+            posição, incluir os que o boletim tinha antes.
+
+    Returns:
+        set: ids dos boletins coletados depois de data_coleta que dependem dela
+    """
+    if componentes is None:
+        componentes = [row[0] for row in db.execute(_SQL_COMPONENTES_NA_DATA, (fluxo, data_coleta))]
+    componentes = sorted(componentes)
+    if not componentes:
+        return set()
+
+    # Um ramo por componente (NULL se há menos de n amostras seguintes)
+    ramos = ' UNION ALL '.join([_SQL_N_ESIMA_SEGUINTE] * len(componentes))
+    params = []
+    for componente in componentes:
+        params.extend((fluxo, componente, data_coleta, n - 1))
+    limites = [row[0] for row in db.execute(ramos, params)]
+
+    # Boletins com o componente até a data da sua n-ésima amostra seguinte
+    # (na mesma data ainda não a veem: janela estrita)
+    ramos, params = [], []
+    for componente, limite in zip(componentes, limites):
+        ramo = '''SELECT boletin_id FROM historico_componentes
+                  WHERE fluxo = ? AND componente = ? AND data_coleta > ?'''
+        params.extend((fluxo, componente, data_coleta))
+        if limite is not None:
+            ramo += ' AND data_coleta <= ?'
+            params.append(limite)
+        ramos.append(ramo)
+    return {row[0] for row in db.execute(' UNION '.join(ramos), params) if row[0] is not None}
+
+
+def _avaliar_boletim_as_of(db, alvos):
+    """CEP "as-of" e regras dos componentes de um boletim, pelas janelas no índice"""
+    fluxo, data_coleta = alvos[0]['fluxo'], alvos[0]['data_coleta']
+    janelas = buscar_janelas_cep_lote(db, fluxo, [row['nome'] for row in alvos],
+                                      antes_de=data_coleta)
+    snapshots = {nome: snapshot_cep(janela) for nome, janela in janelas.items()}
+    regras = avaliar_regras_as_of(db, fluxo, data_coleta, {
+        row['nome']: (row['percentual_molar'], snapshots[row['nome']]) for row in alvos})
+    cep_ok = [
+        dentro_limites_cep(row['percentual_molar'], janelas[row['nome']]['valores'])
+        and not invalida_por_regras(regras[row['nome']])
+        for row in alvos
+    ]
+    return (cep_ok, [regras[row['nome']] for row in alvos],
+            [(row['boletin_id'], row['nome'], snapshots[row['nome']]) for row in alvos], None)
+
+
+def _t2_dependentes(db, alteracoes, posicoes, anteriores, estado_valido):
+    """
+    T² "as-of" de todos os boletins coletados a partir da alteração mais
+    antiga de cada fluxo (o T² usa o histórico inteiro: todos mudam);
+    regrava o estado do fluxo
+
+    O estado gravado cobre as amostras de antes da alteração. Tirando dele
+    as amostras a partir da data mais antiga envolvida (a cauda, lida pelo
+    índice, com as composições anteriores dos boletins alterados no lugar
+    das atuais), sobra o estado das amostras anteriores, que não mudaram:
+    os T² e o novo estado saem dele e da cauda atual. Sem estado gravado
+    confiável, o fluxo é lido por inteiro.
+
+    Args:
+        alteracoes: (fluxo, data_coleta) das amostras alteradas
+        posicoes: (fluxo, data_coleta) dos boletins a revalidar
+        anteriores: {boletim_id: (fluxo, data_coleta, vetor, componentes)}
+            dos boletins alterados antes da alteração (composicoes_boletins)
+        estado_valido: O estado gravado cobre as amostras de antes da
+            alteração (False: foi descartado ou não é conhecido)
+
+    Returns:
+        dict: {boletim_id: T²}
+    """
+    inicios = {}
+    for fluxo, data_coleta in [*alteracoes, *posicoes,
+                               *((fluxo, data) for fluxo, data, *_ in anteriores.values())]:
+        if data_coleta is not None:
+            inicios[fluxo] = min(inicios.get(fluxo, data_coleta), data_coleta)
+    alterados = np.array(list(anteriores), dtype=np.int64)
+
+    t2, estados = {}, []
+    for fluxo, inicio in inicios.items():
+        estado = carregar_estado_t2(db, fluxo) if estado_valido else None
+        anterior = None
+        if estado is not None:
+            serie = carregar_composicoes(db, [fluxo], desde=inicio).get(fluxo) or (
+                np.array([], dtype=str), np.array([], dtype=np.int64),
+                np.zeros((0, len(COMPONENTES_T2))))
+            datas, ids, composicoes = serie
+            mantidos = ~np.isin(ids, alterados)
+            antigos = [(data, vetor) for fluxo_antigo, data, vetor, _ in anteriores.values()
+                       if fluxo_antigo == fluxo and vetor is not None]
+            anterior = separar_estados_t2(estado, estado_t2_de_serie(
+                [*datas[mantidos], *(data for data, _ in antigos)],
+                np.vstack([composicoes[mantidos], *(vetor for _, vetor in antigos)])))
+        if anterior is None:
+            serie = carregar_composicoes(db, [fluxo]).get(fluxo)
+            if serie is None:
+                estados.append((fluxo, estado_t2_de_serie([], [])))
+                continue
+            datas, ids, composicoes = serie
+
+        selecionados = datas >= inicio
+        t2.update(_t2_por_boletim(ids[selecionados], t2_as_of(
+            datas, composicoes, datas[selecionados], composicoes[selecionados], inicial=anterior)))
+        novo = estado_t2_de_serie(datas, composicoes)
+        if anterior is not None:
+            novo = combinar_estados_t2(anterior, novo)
+            novo['ultima_data'] = novo['ultima_data'] or estado['ultima_data']
+        estados.append((fluxo, novo))
+
+    gravar_estados_t2(db, estados)
+    return t2
+
+
+def _gravar_t2(db, t2):
+    """Atualiza só o T² (e o status geral que depende dele) de boletins já validados"""
+    registros = []
+    for boletim_id, t2_boletim in t2.items():
+        status_multivariado = status_t2(t2_boletim)
+        registros.append((t2_boletim, status_multivariado,
+                          int(invalida_por_t2(status_multivariado)), boletim_id))
+    db.executemany('''
+        UPDATE boletins SET t2_hotelling = ?, status_t2 = ?,
+            status = CASE WHEN ? OR status_aga8 = 'INVALIDADO' OR status_cep = 'INVALIDADO'
+                          THEN 'INVALIDADO' ELSE 'VALIDADO' END
+        WHERE id = ? AND status IS NOT NULL
+    ''', registros)
+
+
+def revalidar_dependentes(db, alteracoes, incluir=(), descartar_estados=True, anteriores=None):
+    """
+    Revalida só os boletins afetados por amostras incluídas, editadas ou excluídas
+
+    Cada boletim afetado é reavaliado pelas suas janelas "as-of" (como em
+    /revalidar/<id>), sem reler as séries completas. O T² dos boletins
+    seguintes do fluxo, que usa todo o histórico anterior, é atualizado
+    mesmo fora das janelas. Não faz commit.
+
+    Args:
+        db: Conexão SQLite (com a alteração já gravada)
+        alteracoes: Iterável de (fluxo, data_coleta) das amostras alteradas;
+            para um boletim que mudou de fluxo ou data, informar a posição
+            antiga e a nova
+        incluir: Boletins a revalidar além dos dependentes (ex.: o editado)
+        descartar_estados: Remove os estados incrementais das regras dos
+            fluxos alterados, reconstruídos no próximo cadastro. Inclusões
+            já atualizam os estados e passam False.
+        anteriores: composicoes_boletins dos boletins editados ou excluídos,
+            lido antes da alteração. Com ele (ou em inclusões), o T² parte
+            do estado gravado do fluxo; sem ele, o fluxo é lido por inteiro.
+
+    Returns:
+        dict: processados, validados e invalidados
+    """
+    alteracoes = set(alteracoes)
+    estado_t2_valido = not descartar_estados or anteriores is not None
+    anteriores = anteriores or {}
+    afetados = set(incluir)
+    for fluxo, data_coleta in alteracoes:
+        # Os componentes que o boletim tinha na posição antiga já não estão no histórico
+        componentes = {row[0] for row in db.execute(_SQL_COMPONENTES_NA_DATA, (fluxo, data_coleta))}
+        for fluxo_antigo, data_antiga, _, nomes in anteriores.values():
+            if (fluxo_antigo, data_antiga) == (fluxo, data_coleta):
+                componentes |= nomes
+        afetados |= boletins_dependentes(db, fluxo, data_coleta, componentes=componentes)
+
+    if descartar_estados:
+        for fluxo in {fluxo for fluxo, _ in alteracoes}:
+            db.execute('DELETE FROM cep_estado WHERE fluxo = ?', (fluxo,))
+
+    boletim_ids = sorted(afetados)
+    componentes = _buscar_componentes(db, boletim_ids)
+    t2 = _t2_dependentes(db, alteracoes, {(row['fluxo'], row['data_coleta']) for row in componentes},
+                         anteriores, estado_t2_valido)
+    _gravar_t2(db, {boletim_id: valor for boletim_id, valor in t2.items()
+                    if boletim_id not in afetados})
+    if not afetados:
+        return {'processados': 0, 'validados': 0, 'invalidados': 0}
+
+    por_boletim = {}
+    for indice, row in enumerate(componentes):
+        por_boletim.setdefault(row['boletin_id'], []).append(indice)
+    resultados = (
+        (indices, _avaliar_boletim_as_of(db, [componentes[i] for i in indices]))
+        for indices in por_boletim.values())
+    resultado = _gravar_revalidacao(db, boletim_ids, componentes, resultados, CEP_SIGMA_LIMIT, t2)
+    logger.info(f"Revalidação incremental ({len(alteracoes)} alterações): {resultado}")
+    return resultado
+
+
+def _avaliar_particao(db_path, tarefas, n, sigma):
+    """Executado em processo auxiliar: lê as séries (somente leitura) e avalia"""
+    db = connect_db(db_path, somente_leitura=True)
+    try:
+        return [
+            _avaliar_serie(serie, alvos, carregar_serie_componente(db, *serie), n, sigma)
+            for serie, alvos in tarefas
+        ]
+    finally:
+        db.close()
+
+
+def _particionar(tarefas, partes):
+    """Distribui as séries entre as partes, maiores primeiro (balanceamento)"""
+    particoes = [[] for _ in range(partes)]
+    cargas = [0] * partes
+    for tarefa in sorted(tarefas, key=lambda tarefa: -len(tarefa[1])):
+        menor = cargas.index(min(cargas))
+        particoes[menor].append(tarefa)
+        cargas[menor] += len(tarefa[1])
+    return [particao for particao in particoes if particao]
+
+
+def revalidar_boletins_paralelo(db, boletim_ids=None, processos=None, n=CEP_AMOSTRAS_MIN,
+                                sigma=CEP_SIGMA_LIMIT, db_path=None):
+    """
+    Revalidação em lote com as séries (fluxo, componente) avaliadas em paralelo
+
+    As séries são independentes: cada processo auxiliar abre uma conexão
+    somente leitura, lê as séries da sua partição e devolve status,
+    regras, snapshots e estados. As gravações ficam todas na conexão `db`
+    (único escritor), em lote, como em revalidar_boletins. Não faz commit.
+
+    Args:
+        db: Conexão SQLite usada para gravar
+        boletim_ids: Boletins a revalidar (None = todos)
+        processos: Processos auxiliares (padrão: núcleos da máquina)
+        db_path: Banco lido pelos processos (padrão: get_db_path())
+
+    Returns:
+        dict: processados, validados e invalidados
+    """
+    if boletim_ids is None:
+        boletim_ids = [row[0] for row in db.execute('SELECT id FROM boletins')]
+        componentes = _buscar_componentes(db, None)
+    else:
+        boletim_ids = list(boletim_ids)
+        componentes = _buscar_componentes(db, boletim_ids)
+
+    processos = processos or os.cpu_count() or 1
+    por_serie = _agrupar_por_serie(componentes)
+    campos = ('id', 'boletin_id', 'percentual_molar', 'data_coleta')
+    tarefas = [
+        (serie, [{campo: componentes[i][campo] for campo in campos} for i in indices])
+        for serie, indices in por_serie.items()
+    ]
+
+    # Várias partições por processo para equilibrar séries de tamanhos diferentes
+    particoes = _particionar(tarefas, processos * _PARTICOES_POR_PROCESSO)
+    with ProcessPoolExecutor(max_workers=processos,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        avaliadas = executor.map(
+            _avaliar_particao, [db_path or get_db_path()] * len(particoes), particoes,
+            [n] * len(particoes), [sigma] * len(particoes))
+        resultados = [
+            (por_serie[serie], resultado)
+            for particao, resultados_particao in zip(particoes, avaliadas)
+            for (serie, _), resultado in zip(particao, resultados_particao)
+        ]
+
+    resultado = _gravar_revalidacao(db, boletim_ids, componentes, resultados, sigma,
+                                    _t2_lote(db, boletim_ids, {row['fluxo'] for row in componentes}))
+    logger.info(f"Revalidação paralela ({processos} processos, {len(tarefas)} séries)")
+    return resultado
+
+
+def _status_componente(status_aga, status_cep):
+    """Veredito gravado de um componente (A.G.A #8 e CEP)"""
+    if "INVALIDADO" in (status_aga, status_cep):
+        return "INVALIDADO"
+    return "VALIDADO" if status_aga == status_cep == "VALIDADO" else "PENDENTE"
+
+
+def _distancia_sigma(valor, snapshot):
+    """Distância do valor à média da janela, em desvios-padrão (None sem limites)"""
+    if snapshot['media_amplitudes'] is None:
+        return None
+    desvio = snapshot['media_amplitudes'] / CEP_D2_CONSTANT
+    if desvio == 0:
+        return None
+    return round((valor - snapshot['media']) / desvio, 4)
+
+
+def simular_revalidacao(db, n=CEP_AMOSTRAS_MIN, sigma=CEP_SIGMA_LIMIT, limites_aga8=None,
+                        apenas_alteracoes=True):
+    """
+    Revalidação "a seco": recalcula os vereditos sem gravar nada
+
+    Percorre uma série (fluxo, componente) por vez, com o mesmo motor de
+    revalidar_boletins (limites vetorizados e regras de sequência), e
+    compara com os status gravados. A memória fica limitada à maior série.
+
+    Args:
+        db: Conexão SQLite (pode ser somente leitura)
+        n: Tamanho da janela de controle a simular
+        sigma: Multiplicador dos limites a simular
+        limites_aga8: Limites A.G.A #8 a simular (padrão: LIMITES_AGA8)
+        apenas_alteracoes: Gera só os componentes que mudariam de status
+
+    Yields:
+        dict: boletim_id, numero_boletim, fluxo, componente, data_coleta,
+        valor, status_anterior, status_novo, distancia_sigma e regras
+    """
+    limites_aga8 = LIMITES_AGA8 if limites_aga8 is None else limites_aga8
+    series = db.execute('''
+        SELECT DISTINCT b.fluxo, c.nome
+        FROM componentes c JOIN boletins b ON b.id = c.boletin_id
+        ORDER BY b.fluxo, c.nome
+    ''').fetchall()
+
+    for fluxo, nome in series:
+        alvos = db.execute('''
+            SELECT c.id, c.boletin_id, c.percentual_molar, c.status_aga, c.status_cep,
+                   b.data_coleta, b.numero_boletim
+            FROM componentes c JOIN boletins b ON b.id = c.boletin_id
+            WHERE b.fluxo = ? AND c.nome = ?
+            ORDER BY b.data_coleta, c.boletin_id
+        ''', (fluxo, nome)).fetchall()
+        cep_ok, regras, snapshots, _ = _avaliar_serie(
+            (fluxo, nome), alvos, carregar_serie_componente(db, fluxo, nome), n, sigma)
+
+        for row, ok, regras_ponto, (_, _, snapshot) in zip(alvos, cep_ok, regras, snapshots):
+            anterior = _status_componente(row['status_aga'], row['status_cep'])
+            novo = "VALIDADO" if ok and _valida_aga8(
+                nome, row['percentual_molar'], limites_aga8) else "INVALIDADO"
+            if apenas_alteracoes and novo == anterior:
+                continue
+            yield {
+                'boletim_id': row['boletin_id'],
+                'numero_boletim': row['numero_boletim'],
+                'fluxo': fluxo,
+                'componente': nome,
+                'data_coleta': row['data_coleta'],
+                'valor': row['percentual_molar'],
+                'status_anterior': anterior,
+                'status_novo': novo,
+                'distancia_sigma': _distancia_sigma(row['percentual_molar'], snapshot),
+                'regras': regras_ponto,
+            }
+
+
+def main():
+    """Revalida todo o histórico pela linha de comando"""
+    parser = argparse.ArgumentParser(description='Revalida todos os boletins (A.G.A #8 + CEP)')
+    parser.add_argument('--sigma', type=float, default=CEP_SIGMA_LIMIT,
+                        help='Multiplicador dos limites de controle')
+    parser.add_argument('--janela', type=int, default=CEP_AMOSTRAS_MIN,
+                        help='Tamanho da janela de controle')
+    parser.add_argument('--processos', type=int, default=1,
+                        help='Processos para avaliar as séries em paralelo (0 = todos os núcleos)')
+    parser.add_argument('--simular', action='store_true',
+                        help='Não grava: lista em NDJSON os componentes que mudariam de status')
+    parser.add_argument('--todos', action='store_true',
+                        help='Com --simular, lista também os componentes sem alteração')
+    parser.add_argument('--limites-aga8', metavar='ARQUIVO',
+                        help='Com --simular, JSON {componente: {"min": .., "max": ..}} '
+                             'sobre os limites A.G.A #8 atuais')
+    args = parser.parse_args()
+
+    if args.simular:
+        limites_aga8 = dict(LIMITES_AGA8)
+        if args.limites_aga8:
+            with open(args.limites_aga8, encoding='utf-8') as arquivo:
+                limites_aga8.update(json.load(arquivo))
+        db = connect_db(somente_leitura=True)
+        try:
+            alteracoes = 0
+            for linha in simular_revalidacao(db, n=args.janela, sigma=args.sigma,
+                                             limites_aga8=limites_aga8,
+                                             apenas_alteracoes=not args.todos):
+                alteracoes += linha['status_anterior'] != linha['status_novo']
+                print(json.dumps(linha, ensure_ascii=False))
+        finally:
+            db.close()
+        print(f"{alteracoes} componentes mudariam de status", file=sys.stderr)
+        return
+
+    db = connect_db()
+    try:
+        if args.processos == 1:
+            resultado = revalidar_boletins(db, n=args.janela, sigma=args.sigma)
+        else:
+            resultado = revalidar_boletins_paralelo(
+                db, processos=args.processos or None, n=args.janela, sigma=args.sigma)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"Processados {resultado['processados']} boletins: "
+          f"{resultado['validados']} validados, {resultado['invalidados']} invalidados")
+
+
+if __name__ == "__main__":
+    main()
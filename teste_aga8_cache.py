@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Teste do cache de composições dos solucionadores AGA 8
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from aga8_cache import (CompositionCache, composition_cache_stats, composition_fingerprint,
+                        invalidate_composition_caches)
+from aga8_detailed_characterization import AGA8_DetailedCharacterization
+from aga8_gerg2008 import COMPONENTS, AGA8_GERG2008, composition_entry
+
+# A mesma amostra em fração (nomes canônicos) e em % (nomes dos boletins)
+FRACAO = {
+    'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+    'propane': 0.0045, 'i_butane': 0.001, 'n_butane': 0.001, 'i_pentane': 0.0005,
+    'n_pentane': 0.0003, 'n_hexane': 0.0007
+}
+PERCENTUAL = {
+    'Metano': 96.5, 'Nitrogênio': 0.3, 'CO2': 0.6, 'Etano': 1.8, 'Propano': 0.45,
+    'i-Butano': 0.1, 'n-Butano': 0.1, 'i-Pentano': 0.05, 'n-Pentano': 0.03, 'Hexano': 0.07
+}
+
+
+def teste_mesma_entrada():
+    """Fração, percentual e aliases caem na mesma entrada; contadores coerentes"""
+    print("=== TESTE MESMA ENTRADA ===")
+    invalidate_composition_caches()
+    gerg, detail = AGA8_GERG2008(), AGA8_DetailedCharacterization()
+    resultados = [gerg.calculate_properties(558, 55, composicao) for composicao in (FRACAO, PERCENTUAL)]
+    detalhados = [detail.calculate_all_properties(600, 50, composicao)
+                  for composicao in (FRACAO, PERCENTUAL)]
+    entrada = composition_entry(gerg._fraction_vector(gerg.normalize_composition(FRACAO)[2]))
+    massa = gerg.calculate_molar_mass(gerg.normalize_composition(FRACAO)[2])
+    estatisticas = composition_cache_stats()
+    iguais = (resultados[0] == resultados[1]
+              and all(abs(detalhados[0][k] - detalhados[1][k]) <= 1e-12 * abs(detalhados[0][k])
+                      for k in detalhados[0]))
+    print(f"✓ Estatísticas: {estatisticas}")
+    print(f"✓ Resultados iguais: {iguais}, massa molar da entrada: {entrada.molar_mass:.10f} "
+          f"(direta {massa:.10f})")
+    return (iguais and abs(entrada.molar_mass - massa) < 1e-12
+            and not entrada.fractions.flags.writeable
+            and estatisticas['gerg2008']['misses'] == 1 and estatisticas['gerg2008']['hits'] == 2
+            and estatisticas['detail']['misses'] == 1 and estatisticas['detail']['hits'] == 1)
+
+
+def teste_lru_e_invalidacao():
+    """Limite de entradas, descarte da menos usada e invalidação explícita"""
+    print("=== TESTE LRU E INVALIDAÇÃO ===")
+    montadas = []
+    cache = CompositionCache('teste', lambda vetor: montadas.append(vetor) or vetor.sum(), maxsize=3)
+    for i in range(1, 5):
+        cache.get([i, 1.0])
+    cache.get([1, 1.0])  # descartada ao entrar a quarta: monta de novo
+    cache.get([4, 1.0])
+    tamanho, faltas = len(cache), cache.misses
+
+    cache.invalidate([8, 2.0])  # mesma composição de [4, 1]
+    reconstruida = len(montadas)
+    cache.get([4, 1.0])
+    reconstruida = len(montadas) - reconstruida
+
+    try:
+        cache.get([0.0, 0.0])
+        rejeitada = False
+    except ValueError:
+        rejeitada = True
+
+    cache.invalidate()
+    estatisticas = cache.stats()
+    print(f"✓ Tamanho {tamanho}, faltas {faltas}, remontada após invalidar: {reconstruida}, "
+          f"soma zero rejeitada: {rejeitada}, após limpar: {estatisticas}")
+    return (tamanho == 3 and faltas == 5 and reconstruida == 1 and rejeitada
+            and estatisticas['size'] == 0 and estatisticas['hits'] == estatisticas['misses'] == 0
+            and composition_fingerprint([1, 3]) == composition_fingerprint([0.25, 0.75]))
+
+
+def teste_threads():
+    """Acessos concorrentes recebem uma única entrada por composição"""
+    print("=== TESTE CACHE ENTRE THREADS ===")
+    invalidate_composition_caches()
+    vetor = np.array([FRACAO.get(componente.replace('-', '_'), 0.0) for componente in COMPONENTS])
+    with ThreadPoolExecutor(16) as executor:
+        entradas = list(executor.map(lambda i: composition_entry(vetor * (1 + i % 3)), range(200)))
+    estatisticas = composition_cache_stats()['gerg2008']
+    print(f"✓ Entradas distintas: {len({id(e) for e in entradas})}, {estatisticas}")
+    return (len({id(e) for e in entradas}) == 1 and estatisticas['size'] == 1
+            and estatisticas['hits'] + estatisticas['misses'] == 200)
+
+
+def teste_desempenho():
+    """Reavaliar a mesma composição custa menos que montá-la a cada chamada"""
+    print("=== TESTE DESEMPENHO DO CACHE ===")
+    gerg = AGA8_GERG2008()
+    inicio = time.perf_counter()
+    for _ in range(1000):
+        invalidate_composition_caches()
+        gerg.calculate_properties(558, 55, PERCENTUAL)
+    sem_cache = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(1000):
+        gerg.calculate_properties(558, 55, PERCENTUAL)
+    com_cache = time.perf_counter() - inicio
+    print(f"✓ 1000 avaliações: {sem_cache * 1000:.0f} ms sem cache, {com_cache * 1000:.0f} ms com cache")
+    return com_cache < sem_cache
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_mesma_entrada(),
+        teste_lru_e_invalidacao(),
+        teste_threads(),
+        teste_desempenho()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE CACHE AGA8: SUCESSO" if sucesso else "✗ TESTE CACHE AGA8: FALHA")
+    exit(0 if sucesso else 1)
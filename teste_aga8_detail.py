@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Teste do motor DETAIL (AGA 8 Part 1) com termos da mistura em cache
+"""
+
+import time
+
+import numpy as np
+
+from aga8_dc_calibrado import AGA8_DetailedCharacterization_Calibrated
+from aga8_detailed_characterization import (DETAIL_COMPONENTS, AGA8_DetailedCharacterization,
+                                            DetailMixture, detail_mixture)
+
+# Caso de verificação da implementação de referência da NIST (AGA 8 Part 1)
+NIST_FRACOES = [0.77824, 0.02, 0.06, 0.08, 0.03, 0.0015, 0.003, 0.0005, 0.00165, 0.00215,
+                0.00088, 0.00024, 0.00015, 0.00009, 0.004, 0.005, 0.002, 0.0001, 0.0025,
+                0.007, 0.001]
+NIST_DENSIDADE = 12.80792403648801  # mol/dm³ a 400 K e 50000 kPa
+NIST_Z = 1.173801364147326
+
+REFERENCIA = {
+    'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+    'propane': 0.0045, 'i_butane': 0.001, 'n_butane': 0.001, 'i_pentane': 0.0005,
+    'n_pentane': 0.0003, 'n_hexane': 0.0007,
+}
+
+# Colunas como chegam dos boletins
+COLUNAS = ['Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano', 'i-Pentano', 'n-Pentano',
+           'Hexano', 'Heptano', 'Octano', 'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2']
+MEDIAS = np.array([85, 6, 3, 0.5, 0.8, 0.2, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.01, 2.5, 1.6])
+
+
+def teste_caso_nist():
+    """Densidade e Z do caso de verificação da NIST"""
+    print("=== TESTE CASO NIST (DETAIL) ===")
+    mistura = DetailMixture(NIST_FRACOES)
+    densidade = mistura.solve_density(np.array([50000.0]), np.array([400.0]))[0]
+    z = 50000.0 / (densidade * 8.31451 * 400.0)
+    print(f"✓ D = {densidade:.14f} mol/dm³ (NIST {NIST_DENSIDADE}), Z = {z:.14f}")
+    return abs(densidade / NIST_DENSIDADE - 1) < 1e-12 and abs(z / NIST_Z - 1) < 1e-12
+
+
+def teste_composicao_referencia():
+    """Valores de referência a 600 kPa e 50 °C saem do motor, sem valores fixos"""
+    print("=== TESTE COMPOSIÇÃO DE REFERÊNCIA (DETAIL) ===")
+    resultado = AGA8_DetailedCharacterization_Calibrated().calculate_all_properties_calibrated(
+        600, 50, REFERENCIA)
+    outra = AGA8_DetailedCharacterization().calculate_all_properties(600, 50.5, REFERENCIA)
+    print(f"✓ Z = {resultado['compressibility_factor']:.10f}, "
+          f"D = {resultado['molar_density']:.10f} mol/dm³, "
+          f"densidade = {resultado['density']:.4f} kg/m³")
+    print(f"✓ A 50,5 °C: Z = {outra['compressibility_factor']:.10f}")
+    return (abs(resultado['compressibility_factor'] - 0.991694176393) < 1e-9
+            and abs(resultado['molar_density'] - 0.225181478098) < 1e-9
+            and abs(resultado['molar_mass'] - 16.8035819) < 1e-7
+            and abs(resultado['density'] - resultado['molar_density'] * resultado['molar_mass']) < 1e-12
+            and outra['compressibility_factor'] > resultado['compressibility_factor'])
+
+
+def teste_lote_igual_escalar():
+    """Cada linha do lote = cálculo escalar; mistura reutilizada entre chamadas"""
+    print("=== TESTE LOTE x ESCALAR (DETAIL) ===")
+    aga8 = AGA8_DetailedCharacterization()
+    rng = np.random.default_rng(0)
+    composicoes = np.abs(rng.normal(MEDIAS, MEDIAS * 0.05, (100, len(MEDIAS))))
+    composicoes[7] = 0.0
+    pressoes = np.linspace(100, 12000, 100)
+    temperaturas = np.linspace(-5, 70, 100)
+    lote = aga8.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS)
+
+    maior_desvio = 0.0
+    for i in np.flatnonzero(lote['valid']):
+        composicao = dict(zip(COLUNAS, composicoes[i]))
+        z = aga8.calculate_compressibility_detailed(pressoes[i], temperaturas[i], composicao)
+        maior_desvio = max(maior_desvio, abs(lote['compressibility_factor'][i] / z - 1))
+
+    fracoes = aga8.composition_vector(REFERENCIA)
+    reutilizada = detail_mixture(fracoes) is detail_mixture(fracoes.copy())
+    print(f"✓ {lote['valid'].sum()} linhas válidas de {len(composicoes)}, "
+          f"maior desvio para o escalar: {maior_desvio:.1e}, mistura reutilizada: {reutilizada}")
+    return (lote['valid'].sum() == 99 and not lote['valid'][7] and maior_desvio < 1e-12
+            and reutilizada and len(DETAIL_COMPONENTS) == 21)
+
+
+def teste_desempenho_historico():
+    """Recalcular cem mil boletins de uma vez"""
+    print("=== TESTE DESEMPENHO DO HISTÓRICO (DETAIL) ===")
+    aga8 = AGA8_DetailedCharacterization()
+    rng = np.random.default_rng(1)
+    composicoes = np.abs(rng.normal(MEDIAS, MEDIAS * 0.05, (100000, len(MEDIAS))))
+    pressoes = rng.uniform(100, 12000, len(composicoes))
+
+    inicio = time.perf_counter()
+    lote = aga8.calculate_properties_batch(composicoes, pressoes, 30.0, COLUNAS)
+    tempo = time.perf_counter() - inicio
+    print(f"✓ {len(composicoes)} boletins em {tempo:.2f}s "
+          f"({len(composicoes) / tempo:,.0f} avaliações/s)")
+    return lote['valid'].all() and tempo < 5
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_caso_nist(),
+        teste_composicao_referencia(),
+        teste_lote_igual_escalar(),
+        teste_desempenho_historico()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 DETAIL: SUCESSO" if sucesso else "✗ TESTE AGA8 DETAIL: FALHA")
+    exit(0 if sucesso else 1)
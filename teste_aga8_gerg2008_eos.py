@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Teste da equação de estado GERG-2008 (densidade e Z por energia de Helmholtz)
+"""
+
+import time
+
+import numpy as np
+
+from aga8_calibrado import AGA8_GERG2008_Calibrated
+from aga8_gerg2008 import COMPONENTS, AGA8_GERG2008, GERG2008Mixture, gerg_mixture
+
+# Caso de verificação da implementação de referência da NIST (AGA 8 Part 2)
+NIST_FRACOES = [0.77824, 0.02, 0.06, 0.08, 0.03, 0.0015, 0.003, 0.0005, 0.00165, 0.00215,
+                0.00088, 0.00024, 0.00015, 0.00009, 0.004, 0.005, 0.002, 0.0001, 0.0025,
+                0.007, 0.001]
+NIST_DENSIDADE = 12.79828626082062  # mol/dm³ a 400 K e 50000 kPa
+NIST_Z = 1.174690666383717
+
+REFERENCIA = {
+    'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+    'propane': 0.0045, 'n-butane': 0.001, 'i-butane': 0.001, 'i-pentane': 0.0005,
+    'n-pentane': 0.0003, 'n-hexane': 0.0007,
+}
+
+
+def teste_caso_nist():
+    """Densidade e Z do caso de verificação da NIST"""
+    print("=== TESTE CASO NIST ===")
+    mistura = GERG2008Mixture(NIST_FRACOES)
+    densidade = mistura.solve_density(np.array([50000.0]), np.array([400.0]))[0]
+    z = 50000.0 / (densidade * 8.314472 * 400.0)
+    print(f"✓ D = {densidade:.14f} mol/dm³ (NIST {NIST_DENSIDADE}), Z = {z:.14f}")
+    return abs(densidade / NIST_DENSIDADE - 1) < 1e-12 and abs(z / NIST_Z - 1) < 1e-12
+
+
+def teste_composicao_referencia():
+    """Z documentado para a composição de referência a 558 kPa e 55 °C, sem valores fixos"""
+    print("=== TESTE COMPOSIÇÃO DE REFERÊNCIA ===")
+    resultado = AGA8_GERG2008_Calibrated().calculate_all_properties_calibrated(558, 55, REFERENCIA)
+    z = resultado['compressibility_factor']
+    densidade = resultado['density_kg_m3']
+    esperado = 558 * resultado['molar_mass_g_mol'] / (z * 8.314472 * 328.15)
+    print(f"✓ Z = {z:.10f}, densidade = {densidade:.4f} kg/m³, "
+          f"D·M = {resultado['molar_density_mol_l'] * resultado['molar_mass_g_mol']:.4f}")
+    return (abs(z - 0.9927517446) < 1e-9 and abs(densidade - esperado) < 1e-9
+            and abs(resultado['molar_density_mol_l'] * resultado['molar_mass_g_mol'] - densidade) < 1e-9)
+
+
+def teste_varredura_pt():
+    """Varredura P×T de uma composição = cálculo ponto a ponto, com a mistura em cache"""
+    print("=== TESTE VARREDURA P×T ===")
+    aga8 = AGA8_GERG2008()
+    pressoes, temperaturas = np.meshgrid(np.linspace(100, 20000, 50), np.linspace(-10, 80, 40))
+    varredura = aga8.calculate_pt_sweep(REFERENCIA, pressoes.ravel(), temperaturas.ravel())
+
+    maior_desvio = 0.0
+    for p, t, z in list(zip(pressoes.ravel(), temperaturas.ravel(),
+                            varredura['compressibility_factor']))[::97]:
+        escalar = aga8.calculate_properties(p, t, REFERENCIA)['compressibility_factor']
+        maior_desvio = max(maior_desvio, abs(escalar / z - 1))
+
+    fracoes = aga8._fraction_vector(REFERENCIA)
+    reutilizada = gerg_mixture(fracoes) is gerg_mixture(fracoes.copy())
+    inicio = time.perf_counter()
+    aga8.calculate_pt_sweep(REFERENCIA, np.linspace(100, 20000, 100000), 25.0)
+    tempo = time.perf_counter() - inicio
+
+    print(f"✓ {pressoes.size} pontos, maior desvio para o escalar: {maior_desvio:.1e}, "
+          f"mistura reutilizada: {reutilizada}")
+    print(f"✓ 100000 pontos P×T em {tempo:.2f}s")
+    return (np.isfinite(varredura['compressibility_factor']).all() and maior_desvio < 1e-12
+            and reutilizada and tempo < 5)
+
+
+def teste_lote_composicoes_repetidas():
+    """Lote com composições repetidas calcula os termos uma vez por composição"""
+    print("=== TESTE LOTE COM REPETIÇÕES ===")
+    aga8 = AGA8_GERG2008()
+    base = np.array([[REFERENCIA.get(c, 0.0) for c in COMPONENTS], NIST_FRACOES])
+    composicoes = base[np.arange(20000) % 2]
+    pressoes = np.linspace(200, 10000, 20000)
+    lote = aga8.calculate_properties_batch(composicoes, pressoes, 30.0)
+    densidade = lote['molar_density'][:2]
+    esperado = [GERG2008Mixture(linha).solve_density(pressoes[i:i + 1], np.array([303.15]))[0]
+                for i, linha in enumerate(base)]
+    print(f"✓ {len(composicoes)} linhas, densidades molares {densidade} (esperado {esperado})")
+    return lote['valid'].all() and np.allclose(densidade, esperado, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_caso_nist(),
+        teste_composicao_referencia(),
+        teste_varredura_pt(),
+        teste_lote_composicoes_repetidas()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE GERG-2008 EOS: SUCESSO" if sucesso else "✗ TESTE GERG-2008 EOS: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Teste das tabelas P×T interpoladas por composição
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+# Diretório temporário para os .npz
+PASTA = tempfile.mkdtemp()
+os.environ['AGA8_TABELAS_DIR'] = PASTA
+
+import aga8_grade  # noqa: E402
+from aga8_cache import composition_cache_stats, invalidate_composition_caches  # noqa: E402
+from aga8_gerg2008 import AGA8_GERG2008  # noqa: E402
+from aga8_grade import PropertyTable, lookup_properties, property_table  # noqa: E402
+
+COMPOSICAO = {'Metano': 96.5, 'Nitrogênio': 0.3, 'CO2': 0.6, 'Etano': 1.8, 'Propano': 0.45,
+              'n-Butano': 0.1, 'i-Butano': 0.1, 'i-Pentano': 0.05, 'n-Pentano': 0.03, 'Hexano': 0.07}
+RICA = {'Metano': 72, 'Etano': 12, 'Propano': 8, 'i-Butano': 2, 'n-Butano': 3, 'i-Pentano': 1,
+        'n-Pentano': 1, 'Hexano': 0.5, 'Nitrogênio': 0.5}
+
+
+def _consultas(total, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(100, 15000, total), rng.uniform(-10, 80, total)
+
+
+def teste_limite_de_erro():
+    """Erro da interpolação abaixo de error_bound (e da tolerância) contra o motor"""
+    print("=== TESTE LIMITE DE ERRO ===")
+    pressoes, temperaturas = _consultas(50000)
+    ok = True
+    for motor in ('gerg2008', 'detail'):
+        for composicao in (COMPOSICAO, RICA):
+            tabela = property_table(composicao, motor)
+            interpolado = tabela.lookup(pressoes, temperaturas)
+            exato = tabela.exact(pressoes, temperaturas)
+            erros = {nome: np.nanmax(np.abs(valores / exato[nome] - 1))
+                     for nome, valores in interpolado.items()}
+            ok = ok and all(erro <= tabela.error_bound[nome] <= tabela.tolerance
+                            for nome, erro in erros.items())
+            print(f"✓ {motor} {tabela.shape}: maior erro {max(erros.values()):.1e}, "
+                  f"limites {({nome: f'{limite:.1e}' for nome, limite in tabela.error_bound.items()})}")
+            ok = ok and tabela.within_tolerance
+    return ok
+
+
+def teste_cache_memoria_e_disco():
+    """Mesma tabela para % e fração; .npz relido sem chamar o motor"""
+    print("=== TESTE CACHE DAS TABELAS ===")
+    fracao = {nome: valor / 100 for nome, valor in COMPOSICAO.items()}
+    mesma = property_table(COMPOSICAO) is property_table(fracao)
+    arquivos = sorted(os.listdir(PASTA))
+
+    invalidate_composition_caches()
+    chamadas = []
+    original = AGA8_GERG2008.calculate_pt_sweep
+    AGA8_GERG2008.calculate_pt_sweep = lambda self, *args, **kwargs: (
+        chamadas.append(1), original(self, *args, **kwargs))[1]
+    try:
+        relida = property_table(COMPOSICAO)
+        relida.lookup(5000.0, 20.0)
+    finally:
+        AGA8_GERG2008.calculate_pt_sweep = original
+    estatisticas = composition_cache_stats()['grade_pt:gerg2008']
+
+    # Arquivo de outra chave (ou corrompido) é ignorado e a tabela remontada
+    caminho = os.path.join(PASTA, next(a for a in arquivos if a.startswith('gerg2008_')))
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(b'corrompido')
+    invalidate_composition_caches()
+    remontada = property_table(COMPOSICAO)
+    regravada = PropertyTable.load(caminho, aga8_grade._table_key(
+        ('gerg2008', aga8_grade.PRESSURE_RANGE, aga8_grade.TEMPERATURE_RANGE,
+         aga8_grade.DEFAULT_TOLERANCE), remontada.fractions)) is not None
+
+    print(f"✓ % e fração na mesma tabela: {mesma}, arquivos: {len(arquivos)}")
+    print(f"✓ Relida do disco sem o motor: {not chamadas}, cache: {estatisticas}")
+    print(f"✓ Arquivo corrompido remontado e regravado: {regravada}")
+    return (mesma and len(arquivos) == 4 and not chamadas and estatisticas['misses'] == 1
+            and regravada and remontada.within_tolerance)
+
+
+def teste_fora_da_faixa():
+    """Pontos fora da grade saem do motor, iguais ao cálculo direto"""
+    print("=== TESTE FORA DA FAIXA ===")
+    pressoes = np.array([50.0, 5000.0, 20000.0, 5000.0])
+    temperaturas = np.array([20.0, 20.0, 20.0, 120.0])
+    consulta = lookup_properties(COMPOSICAO, pressoes, temperaturas)
+    direto = AGA8_GERG2008().calculate_pt_sweep(property_table(COMPOSICAO).composition(),
+                                                pressoes, temperaturas)
+    fora = np.array([0, 2, 3])
+    iguais = np.allclose(consulta['density'][fora], direto['density'][fora], rtol=1e-13)
+    dentro = abs(consulta['density'][1] / direto['density'][1] - 1)
+    print(f"✓ Fora da faixa = motor: {iguais}, dentro: desvio {dentro:.1e}")
+    return iguais and dentro <= aga8_grade.DEFAULT_TOLERANCE
+
+
+def teste_velocidade_do_som():
+    """Velocidade do som interpolada dentro de error_bound, nos dois motores"""
+    print("=== TESTE VELOCIDADE DO SOM ===")
+    pressoes, temperaturas = _consultas(20000, seed=2)
+    ok = True
+    for motor in ('gerg2008', 'detail'):
+        tabela = property_table(RICA, motor)
+        interpolado = tabela.lookup(pressoes, temperaturas)['speed_of_sound']
+        exato = tabela.exact(pressoes, temperaturas)['speed_of_sound']
+        erro = np.nanmax(np.abs(interpolado / exato - 1))
+        limite = tabela.error_bound['speed_of_sound']
+        print(f"✓ {motor}: {np.nanmin(exato):.0f}-{np.nanmax(exato):.0f} m/s, "
+              f"maior erro {erro:.1e} (limite {limite:.1e})")
+        ok = ok and np.isfinite(exato).all() and erro <= limite <= tabela.tolerance
+    return ok
+
+
+def teste_desempenho():
+    """Cem mil conversões do mesmo gás: consulta muito mais rápida que o motor"""
+    print("=== TESTE DESEMPENHO DAS TABELAS ===")
+    tabela = property_table(COMPOSICAO)
+    pressoes, temperaturas = _consultas(100000, seed=1)
+
+    inicio = time.perf_counter()
+    tabela.lookup(pressoes, temperaturas)
+    tempo_tabela = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tabela.exact(pressoes, temperaturas)
+    tempo_motor = time.perf_counter() - inicio
+
+    print(f"✓ Tabela: {tempo_tabela:.2f}s, motor: {tempo_motor:.2f}s "
+          f"({tempo_motor / tempo_tabela:.0f}×)")
+    return tempo_tabela * 5 < tempo_motor
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_limite_de_erro(),
+        teste_cache_memoria_e_disco(),
+        teste_fora_da_faixa(),
+        teste_velocidade_do_som(),
+        teste_desempenho()
+    ]
+    shutil.rmtree(PASTA)
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 GRADE P×T: SUCESSO" if sucesso else "✗ TESTE AGA8 GRADE P×T: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Teste da propagação de incertezas por Monte Carlo (aga8_incerteza)
+"""
+
+import time
+
+import numpy as np
+
+from aga8_gerg2008 import AGA8_GERG2008
+from aga8_incerteza import component_uncertainties, propagate_uncertainty, sample_compositions
+
+COMPOSICAO = {'methane': 96.5, 'nitrogen': 0.3, 'carbon_dioxide': 0.6, 'ethane': 1.8,
+              'propane': 0.45, 'i-butane': 0.1, 'n-butane': 0.1, 'i-pentane': 0.05,
+              'n-pentane': 0.03, 'n-hexane': 0.07}
+INCERTEZAS = {'methane': 0.05, 'nitrogen': 0.01, 'carbon_dioxide': 0.01, 'ethane': 0.02,
+              'propane': 0.01, 'i-butane': 0.003, 'n-butane': 0.003, 'i-pentane': 0.002,
+              'n-pentane': 0.002, 'n-hexane': 0.003}
+
+
+def teste_amostras_somam_total():
+    """Amostras não negativas, com soma igual à nominal e dispersão das incertezas"""
+    print("=== TESTE AMOSTRAS DA COMPOSIÇÃO ===")
+    sigma = component_uncertainties(COMPOSICAO, INCERTEZAS)
+    amostras = sample_compositions(COMPOSICAO, sigma, 20000, np.random.default_rng(0))
+    soma = np.abs(amostras.sum(axis=1) - 100.0).max()
+    # Nos componentes menores a normalização quase não altera a dispersão
+    desvio = np.abs(amostras[:, 1:].std(axis=0) / sigma[1:] - 1).max()
+    print(f"✓ Soma: desvio máximo {soma:.1e}; dispersão x incerteza: desvio {desvio:.1%}")
+    relativas = component_uncertainties(COMPOSICAO, 0.01)
+    print(f"✓ Incerteza relativa de 1%: metano ± {relativas[0]:.3f} % mol")
+    return (soma < 1e-9 and amostras.min() >= 0 and desvio < 0.05
+            and abs(relativas[0] - 0.965) < 1e-12)
+
+
+def teste_concorda_com_gum_linear():
+    """Incerteza-padrão de Monte Carlo igual à da propagação linear do GUM"""
+    print("=== TESTE MONTE CARLO x GUM LINEAR ===")
+    pressao, temperatura, u_p, u_t = 5000.0, 20.0, 5.0, 0.1
+    resultado = propagate_uncertainty(COMPOSICAO, pressao, temperatura, INCERTEZAS,
+                                      u_p, u_t, seed=1)
+
+    # Coeficientes de sensibilidade por diferenças centrais, com a mesma normalização
+    nomes = list(COMPOSICAO)
+    base = np.array(list(COMPOSICAO.values()))
+    sigma = component_uncertainties(COMPOSICAO, INCERTEZAS)
+    linhas, pressoes, temperaturas, passos = [], [], [], []
+    for indice, passo in enumerate(sigma):
+        for sinal in (1, -1):
+            linha = base.copy()
+            linha[indice] += sinal * passo
+            linhas.append(linha * base.sum() / linha.sum())
+            pressoes.append(pressao)
+            temperaturas.append(temperatura)
+        passos.append(passo)
+    for dp, dt, passo in ((u_p, 0.0, u_p), (0.0, u_t, u_t)):
+        for sinal in (1, -1):
+            linhas.append(base)
+            pressoes.append(pressao + sinal * dp)
+            temperaturas.append(temperatura + sinal * dt)
+        passos.append(passo)
+    lote = AGA8_GERG2008().calculate_properties_batch(np.array(linhas), np.array(pressoes),
+                                                      np.array(temperaturas), nomes)
+    ok = True
+    for propriedade in ('density', 'heating_value_mass', 'speed_of_sound'):
+        coluna = lote[propriedade]
+        # (∂f/∂x)·u(x) de cada grandeza de entrada
+        contribuicoes = (coluna[0::2] - coluna[1::2]) / 2.0
+        linear = np.sqrt(np.sum(contribuicoes ** 2))
+        monte_carlo = resultado['properties'][propriedade]['standard_uncertainty']
+        print(f"✓ {propriedade}: Monte Carlo {monte_carlo:.5g}, GUM linear {linear:.5g}")
+        ok = ok and abs(monte_carlo / linear - 1) < 0.03
+    return ok and resultado['valid_samples'] == resultado['samples']
+
+
+def teste_intervalo_de_abrangencia():
+    """Intervalo de 95% contém a média e tem meia largura próxima de 1,96·u"""
+    print("=== TESTE INTERVALO DE ABRANGÊNCIA ===")
+    resultado = propagate_uncertainty(COMPOSICAO, 5000, 20, INCERTEZAS, 5, 0.1, seed=2,
+                                      properties=['density', 'compressibility_factor'])
+    ok = set(resultado['properties']) == {'density', 'compressibility_factor'}
+    for nome, resumo in resultado['properties'].items():
+        meia_largura = (resumo['interval_high'] - resumo['interval_low']) / 2
+        fator = meia_largura / resumo['standard_uncertainty']
+        print(f"✓ {nome}: [{resumo['interval_low']:.6g}, {resumo['interval_high']:.6g}], "
+              f"meia largura = {fator:.2f}·u")
+        ok = ok and resumo['interval_low'] < resumo['mean'] < resumo['interval_high']
+        ok = ok and abs(fator - 1.96) < 0.1 and abs(resumo['mean'] / resumo['nominal'] - 1) < 1e-3
+    try:
+        propagate_uncertainty(COMPOSICAO, 5000, 20, {'methane': -0.1})
+        ok = False
+    except ValueError:
+        print("✓ Incerteza negativa rejeitada")
+    return ok
+
+
+def teste_semente_e_processos():
+    """Mesma semente, mesmo resultado; processos auxiliares iguais ao serial"""
+    print("=== TESTE SEMENTE E PROCESSOS AUXILIARES ===")
+    argumentos = (COMPOSICAO, 5000, 20, INCERTEZAS, 5, 0.1)
+    serial = propagate_uncertainty(*argumentos, samples=20000, seed=3, engine='detail')
+    repetido = propagate_uncertainty(*argumentos, samples=20000, seed=3, engine='detail')
+    paralelo = propagate_uncertainty(*argumentos, samples=20000, seed=3, engine='detail', processes=2)
+    outra = propagate_uncertainty(*argumentos, samples=20000, seed=4, engine='detail')
+    print(f"✓ Reprodutível: {serial == repetido}; 2 processos = serial: {serial == paralelo}")
+    return serial == repetido == paralelo and serial != outra
+
+
+def teste_latencia_interativa():
+    """10⁴ amostras de um boletim em menos de 1 s, nos dois métodos"""
+    print("=== TESTE LATÊNCIA ===")
+    ok = True
+    for motor in ('gerg2008', 'detail'):
+        propagate_uncertainty(COMPOSICAO, 5000, 20, INCERTEZAS, samples=100, engine=motor)
+        inicio = time.perf_counter()
+        propagate_uncertainty(COMPOSICAO, 5000, 20, INCERTEZAS, 5, 0.1, engine=motor)
+        tempo = time.perf_counter() - inicio
+        print(f"✓ {motor}: 10⁴ amostras em {tempo:.2f}s")
+        ok = ok and tempo < 1.0
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_amostras_somam_total(),
+        teste_concorda_com_gum_linear(),
+        teste_intervalo_de_abrangencia(),
+        teste_semente_e_processos(),
+        teste_latencia_interativa()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 INCERTEZA: SUCESSO" if sucesso else "✗ TESTE AGA8 INCERTEZA: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Teste do cálculo AGA 8 (GERG 2008) em lote sobre matrizes de composições
+"""
+
+import time
+
+import numpy as np
+
+from aga8_gerg2008 import COMPONENTS, AGA8_GERG2008
+
+# Colunas como chegam dos boletins (nomes em português, fora da ordem interna)
+COLUNAS = ['Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano', 'i-Pentano', 'n-Pentano',
+           'Hexano', 'Heptano', 'Octano', 'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2']
+MEDIAS = np.array([85, 6, 3, 0.5, 0.8, 0.2, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.01, 2.5, 1.6])
+
+
+def _composicoes(total, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.abs(rng.normal(MEDIAS, MEDIAS * 0.05, (total, len(MEDIAS))))
+
+
+def teste_lote_igual_escalar():
+    """Cada linha do lote = calculate_properties da mesma composição"""
+    print("=== TESTE LOTE x ESCALAR ===")
+    aga8 = AGA8_GERG2008()
+    composicoes = _composicoes(200)
+    pressoes = np.linspace(100, 10000, 200)
+    temperaturas = np.linspace(0, 60, 200)
+    lote = aga8.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS)
+
+    maior_desvio = 0.0
+    for i in range(len(composicoes)):
+        escalar = aga8.calculate_properties(pressoes[i], temperaturas[i],
+                                            dict(zip(COLUNAS, composicoes[i])))
+        for chave, valor in escalar.items():
+            maior_desvio = max(maior_desvio, abs(lote[chave][i] - valor) / abs(valor))
+
+    print(f"✓ {len(composicoes)} linhas, {len(lote) - 1} propriedades, "
+          f"maior desvio relativo: {maior_desvio:.1e}")
+    return lote['valid'].all() and maior_desvio < 1e-12
+
+
+def teste_linhas_invalidas_e_colunas():
+    """Linhas sem componentes obrigatórios viram NaN; ordem padrão = COMPONENTS"""
+    print("=== TESTE LINHAS INVÁLIDAS ===")
+    aga8 = AGA8_GERG2008()
+    composicoes = _composicoes(4, seed=1)
+    composicoes[1] = 0.0
+    composicoes[2, 2] = 0.0  # sem propano
+    lote = aga8.calculate_properties_batch(composicoes, 558.0, 55.0, COLUNAS)
+
+    ordem_interna = aga8.composition_matrix(composicoes, COLUNAS)
+    padrao = aga8.calculate_properties_batch(ordem_interna, [558.0] * 4, 55.0)
+    iguais = np.allclose(lote['density'], padrao['density'], equal_nan=True)
+
+    try:
+        aga8.calculate_properties_batch(composicoes, 558.0, 55.0, COLUNAS[:-1])
+        rejeitada = False
+    except ValueError:
+        rejeitada = True
+
+    print(f"✓ Válidas: {lote['valid'].tolist()}, NaN nas inválidas: "
+          f"{np.isnan(lote['density'][~lote['valid']]).all()}")
+    print(f"✓ Colunas na ordem de COMPONENTS ({len(COMPONENTS)}): {iguais}, "
+          f"colunas incompatíveis rejeitadas: {rejeitada}")
+    return (lote['valid'].tolist() == [True, False, False, True]
+            and np.isnan(lote['density'][~lote['valid']]).all() and iguais and rejeitada)
+
+
+def teste_desempenho():
+    """Cem mil composições em uma chamada"""
+    print("=== TESTE DESEMPENHO DO LOTE ===")
+    aga8 = AGA8_GERG2008()
+    composicoes = _composicoes(100000, seed=2)
+
+    inicio = time.perf_counter()
+    aga8.calculate_properties_batch(composicoes, 558.0, 55.0, COLUNAS)
+    tempo_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for linha in composicoes[:1000]:
+        aga8.calculate_properties(558.0, 55.0, dict(zip(COLUNAS, linha)))
+    tempo_escalar = (time.perf_counter() - inicio) * 100
+
+    print(f"✓ Lote: {len(composicoes) / tempo_lote:,.0f} avaliações/s "
+          f"(escalar estimado: {len(composicoes) / tempo_escalar:,.0f}/s)")
+    return tempo_lote < 5 and tempo_lote * 10 < tempo_escalar
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_lote_igual_escalar(),
+        teste_linhas_invalidas_e_colunas(),
+        teste_desempenho()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 LOTE: SUCESSO" if sucesso else "✗ TESTE AGA8 LOTE: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Teste da avaliação em níveis (gás ideal / virial / equação completa)
+"""
+
+import time
+
+import numpy as np
+
+from aga8_detailed_characterization import AGA8_DetailedCharacterization, DetailMixture
+from aga8_gerg2008 import AGA8_GERG2008, GERG2008Mixture
+from aga8_niveis import EOS, IDEAL, TIERS, VIRIAL
+
+COLUNAS = ['Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano', 'i-Pentano', 'n-Pentano',
+           'Hexano', 'Heptano', 'Octano', 'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2']
+MEDIAS = np.array([85, 6, 3, 0.5, 0.8, 0.2, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.01, 2.5, 1.6])
+COMPOSICAO = {'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+              'propane': 0.0045, 'n-butane': 0.001, 'i-butane': 0.001, 'i-pentane': 0.0005,
+              'n-pentane': 0.0003, 'n-hexane': 0.0007}
+TOLERANCIAS = (1e-2, 1e-3, 1e-4, 1e-5)
+
+
+def _estados(total, pressao_max, seed=0):
+    rng = np.random.default_rng(seed)
+    composicoes = np.abs(rng.normal(MEDIAS, MEDIAS * rng.uniform(0.05, 1.0, (total, 1)),
+                                    (total, len(MEDIAS))))
+    return composicoes, rng.uniform(100, pressao_max, total), rng.uniform(-10, 80, total)
+
+
+def teste_coeficientes_virial():
+    """B e C analíticos = limite das derivadas residuais a densidade quase nula"""
+    print("=== TESTE COEFICIENTES DO VIRIAL ===")
+    x = AGA8_GERG2008._fraction_vector(COMPOSICAO)
+    temperaturas = np.array([250.0, 300.0, 350.0, 420.0])
+    h = np.full(len(temperaturas), 1e-4)
+    ok = True
+    for mistura, derivadas in ((GERG2008Mixture(x), 'residual_delta_derivatives'),
+                               (DetailMixture(x), 'residual_density_derivatives')):
+        b, c = mistura.virial_coefficients(temperaturas)
+        ar01, ar02 = getattr(mistura, derivadas)(h, temperaturas)
+        c_numerico = ar02 / h ** 2
+        b_numerico = ar01 / h - c_numerico * h
+        desvio_b = np.max(np.abs(b / b_numerico - 1))
+        desvio_c = np.max(np.abs(c / c_numerico - 1))
+        print(f"✓ {type(mistura).__name__}: B = {np.round(b, 5)} dm³/mol, "
+              f"desvios B {desvio_b:.1e}, C {desvio_c:.1e}")
+        ok = ok and desvio_b < 1e-6 and desvio_c < 1e-3
+    return ok
+
+
+def teste_precisao_dentro_da_tolerancia():
+    """Z de cada nível dentro da tolerância pedida, nos dois métodos"""
+    print("=== TESTE PRECISÃO POR NÍVEL ===")
+    composicoes, pressoes, temperaturas = _estados(20000, 12000, seed=1)
+    ok = True
+    for motor in (AGA8_GERG2008(), AGA8_DetailedCharacterization()):
+        completo = motor.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS)
+        ok = ok and np.all(completo['tier'] == EOS)
+        usados = set()
+        for tolerancia in TOLERANCIAS:
+            niveis = motor.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS,
+                                                      tolerance=tolerancia)
+            desvio = np.abs(niveis['compressibility_factor'] / completo['compressibility_factor'] - 1)
+            contagem = np.bincount(niveis['tier'], minlength=len(TIERS))
+            usados.update(np.flatnonzero(contagem))
+            print(f"✓ {type(motor).__name__} tolerância {tolerancia:.0e}: "
+                  f"{dict(zip(TIERS, contagem.tolist()))}, maior desvio {np.nanmax(desvio):.1e}")
+            ok = ok and np.nanmax(desvio) <= tolerancia
+            ok = ok and np.array_equal(np.isnan(desvio), np.isnan(completo['compressibility_factor']))
+        ok = ok and usados == {IDEAL, VIRIAL, EOS}
+    return ok
+
+
+def teste_escolha_do_nivel():
+    """Pressão baixa e tolerância folgada: gás ideal; pressão alta e tolerância justa: equação"""
+    print("=== TESTE ESCOLHA DO NÍVEL ===")
+    aga8 = AGA8_GERG2008()
+    baixa = aga8.calculate_pt_sweep(COMPOSICAO, [101.325, 200.0], 20.0, tolerance=1e-2)
+    media = aga8.calculate_pt_sweep(COMPOSICAO, [558.0, 1000.0], 55.0, tolerance=1e-4)
+    alta = aga8.calculate_pt_sweep(COMPOSICAO, [10000.0, 15000.0], 20.0, tolerance=1e-4)
+    completo = aga8.calculate_pt_sweep(COMPOSICAO, [10000.0, 15000.0], 20.0)
+
+    print(f"✓ 101-200 kPa, 1e-2: {[TIERS[t] for t in baixa['tier']]}")
+    print(f"✓ 558-1000 kPa, 1e-4: {[TIERS[t] for t in media['tier']]}")
+    print(f"✓ 10-15 MPa, 1e-4: {[TIERS[t] for t in alta['tier']]}, "
+          f"Z igual ao completo: {np.array_equal(alta['compressibility_factor'], completo['compressibility_factor'])}")
+    return (np.all(baixa['tier'] == IDEAL) and np.all(media['tier'] == VIRIAL)
+            and np.all(alta['tier'] == EOS)
+            and np.array_equal(alta['compressibility_factor'], completo['compressibility_factor']))
+
+
+def teste_desempenho():
+    """Cem mil pontos de baixa pressão: níveis muito mais rápidos que a equação completa"""
+    print("=== TESTE DESEMPENHO DOS NÍVEIS ===")
+    aga8 = AGA8_GERG2008()
+    rng = np.random.default_rng(2)
+    pressoes, temperaturas = rng.uniform(100, 600, 100000), rng.uniform(0, 60, 100000)
+    aga8.calculate_pt_sweep(COMPOSICAO, 558.0, 55.0)
+
+    inicio = time.perf_counter()
+    completo = aga8.calculate_pt_sweep(COMPOSICAO, pressoes, temperaturas)
+    tempo_completo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    niveis = aga8.calculate_pt_sweep(COMPOSICAO, pressoes, temperaturas, tolerance=1e-4)
+    tempo_niveis = time.perf_counter() - inicio
+
+    composicoes, pressoes, temperaturas = _estados(20000, 600, seed=3)
+    inicio = time.perf_counter()
+    aga8.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS)
+    tempo_lote = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    aga8.calculate_properties_batch(composicoes, pressoes, temperaturas, COLUNAS, tolerance=1e-4)
+    tempo_lote_niveis = time.perf_counter() - inicio
+
+    desvio = np.max(np.abs(niveis['compressibility_factor'] / completo['compressibility_factor'] - 1))
+    print(f"✓ Varredura: {tempo_completo:.2f}s → {tempo_niveis:.2f}s "
+          f"({tempo_completo / tempo_niveis:.0f}×), maior desvio {desvio:.1e}")
+    print(f"✓ Lote de composições distintas: {tempo_lote:.2f}s → {tempo_lote_niveis:.2f}s "
+          f"({tempo_lote / tempo_lote_niveis:.1f}×)")
+    return tempo_niveis * 5 < tempo_completo and tempo_lote_niveis < tempo_lote and desvio <= 1e-4
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_coeficientes_virial(),
+        teste_precisao_dentro_da_tolerancia(),
+        teste_escolha_do_nivel(),
+        teste_desempenho()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 NÍVEIS: SUCESSO" if sucesso else "✗ TESTE AGA8 NÍVEIS: FALHA")
+    exit(0 if sucesso else 1)
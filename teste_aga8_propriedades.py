@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Teste das propriedades termodinâmicas derivadas (uma passagem de Helmholtz)
+"""
+
+import time
+
+import numpy as np
+
+from aga8_calibrado import AGA8_GERG2008_Calibrated
+from aga8_detailed_characterization import AGA8_DetailedCharacterization
+from aga8_gerg2008 import AGA8_GERG2008, COMPONENTS, gerg_mixture
+from aga8_propriedades import THERMODYNAMIC_PROPERTIES
+
+COMPOSICAO = {'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+              'propane': 0.0045, 'i-butane': 0.001, 'n-butane': 0.001, 'i-pentane': 0.0005,
+              'n-pentane': 0.0003, 'n-hexane': 0.0007}
+
+# Memorial DETAIL a 600 kPa e 50 °C (validacao_referencia.py)
+REFERENCIA_DETAIL = {
+    'compressibility_factor': 0.991694176393,
+    'energy': -1827.670380590821,
+    'enthalpy': 836.847158350783,
+    'entropy': -10.3147662466246,
+    'isochoric_heat_capacity': 29.2971136444434,
+    'isobaric_heat_capacity': 38.0200910586759,
+    'speed_of_sound': 451.754505636409,
+    'gibbs_energy': 4170.06387094551,
+    'joule_thomson_coefficient': 0.00383362800467,
+    'isentropic_exponent': 1.28702881184662,
+}
+
+# Memorial GERG-2008 a 555 kPa e 50 °C (validacao_memorial_gerg2008_oficial.py); energia,
+# Cv e Cp ficam de fora porque a transcrição do memorial tem dígitos trocados
+REFERENCIA_GERG = {
+    'compressibility_factor': 0.992339234872,
+    'molar_density': 0.20815842108,
+    'enthalpy': 843.545173451587,
+    'entropy': -9.651167761247,
+    'speed_of_sound': 451.890591289078,
+    'gibbs_energy': 3962.320035459029,
+    'joule_thomson_coefficient': 0.00382947090,
+    'isentropic_exponent': 1.286930845299,
+}
+
+
+def teste_memoriais_de_referencia():
+    """DETAIL e GERG-2008 iguais aos memoriais de cálculo (transcritos com 9 a 12 algarismos)"""
+    print("=== TESTE MEMORIAIS DE REFERÊNCIA ===")
+    detail = AGA8_DetailedCharacterization().calculate_all_properties(600, 50, COMPOSICAO)
+    gerg = AGA8_GERG2008().calculate_properties(555, 50, COMPOSICAO)
+    ok = True
+    for nome, resultado, referencia in (('DETAIL', detail, REFERENCIA_DETAIL),
+                                        ('GERG-2008', gerg, REFERENCIA_GERG)):
+        desvio = max(abs(resultado[chave] / valor - 1) for chave, valor in referencia.items())
+        print(f"✓ {nome}: {len(referencia)} propriedades, maior desvio relativo {desvio:.1e}")
+        ok = ok and desvio < 1e-7
+    return ok
+
+
+def teste_identidades_termodinamicas():
+    """Cp = (∂H/∂T)_P, JT = -(∂H/∂P)_T/Cp e (∂S/∂T)_P = Cp/T por diferenças finitas"""
+    print("=== TESTE IDENTIDADES TERMODINÂMICAS ===")
+    ok = True
+    for motor, calcular in ((AGA8_GERG2008(), 'calculate_properties'),
+                            (AGA8_DetailedCharacterization(), 'calculate_all_properties')):
+        def estado(p, t):
+            return getattr(motor, calcular)(p, t, COMPOSICAO)
+
+        for pressao, temperatura in ((558.0, 55.0), (8000.0, 20.0), (15000.0, -5.0)):
+            centro = estado(pressao, temperatura)
+            quente, frio = estado(pressao, temperatura + 0.01), estado(pressao, temperatura - 0.01)
+            alta, baixa = estado(pressao + 0.1, temperatura), estado(pressao - 0.1, temperatura)
+            cp = (quente['enthalpy'] - frio['enthalpy']) / 0.02
+            cp_entropia = (quente['entropy'] - frio['entropy']) / 0.02 * (temperatura + 273.15)
+            jt = -(alta['enthalpy'] - baixa['enthalpy']) / 0.2 / centro['isobaric_heat_capacity']
+            desvios = (abs(cp / centro['isobaric_heat_capacity'] - 1),
+                       abs(cp_entropia / centro['isobaric_heat_capacity'] - 1),
+                       abs(jt / centro['joule_thomson_coefficient'] - 1))
+            ok = ok and max(desvios) < 1e-6
+        print(f"✓ {type(motor).__name__}: maior desvio {max(desvios):.1e} a 15 MPa e -5 °C")
+    return ok
+
+
+def teste_lote_igual_ao_escalar():
+    """Colunas térmicas do lote iguais às do cálculo escalar, nos dois métodos"""
+    print("=== TESTE LOTE x ESCALAR ===")
+    rng = np.random.default_rng(0)
+    base = np.array([COMPOSICAO.get(componente, 0.0) for componente in COMPONENTS])
+    composicoes = base * rng.uniform(0.5, 1.5, (30, len(COMPONENTS)))
+    pressoes, temperaturas = rng.uniform(200, 12000, 30), rng.uniform(-5, 60, 30)
+    ok = True
+    for motor, calcular in ((AGA8_GERG2008(), 'calculate_properties'),
+                            (AGA8_DetailedCharacterization(), 'calculate_all_properties')):
+        lote = motor.calculate_properties_batch(composicoes, pressoes, temperaturas)
+        maior = 0.0
+        for linha in range(len(composicoes)):
+            escalar = getattr(motor, calcular)(pressoes[linha], temperaturas[linha],
+                                              dict(zip(COMPONENTS, composicoes[linha])))
+            maior = max(maior, max(abs(lote[chave][linha] / escalar[chave] - 1)
+                                   for chave in THERMODYNAMIC_PROPERTIES))
+        print(f"✓ {type(motor).__name__}: maior desvio {maior:.1e}")
+        ok = ok and maior < 1e-10
+    return ok
+
+
+def teste_calibrado_sem_zeros():
+    """O wrapper calibrado devolve as propriedades térmicas do GERG-2008, sem zeros"""
+    print("=== TESTE WRAPPER CALIBRADO ===")
+    calibrado = AGA8_GERG2008_Calibrated().calculate_all_properties_calibrated(8000, 20, COMPOSICAO)
+    base = AGA8_GERG2008().calculate_properties(8000, 20, COMPOSICAO)
+    pares = {'enthalpy_j_mol': 'enthalpy', 'entropy_j_mol_k': 'entropy',
+             'speed_of_sound_m_s': 'speed_of_sound', 'joule_thomson_coefficient_k_kpa':
+             'joule_thomson_coefficient', 'isobaric_heat_capacity_j_mol_k': 'isobaric_heat_capacity',
+             'isochoric_heat_capacity_j_mol_k': 'isochoric_heat_capacity'}
+    iguais = all(calibrado[chave] == base[origem] for chave, origem in pares.items())
+    sem_zeros = all(calibrado[chave] != 0.0 for chave in pares)
+    print(f"✓ Fora do caso de referência: w = {calibrado['speed_of_sound_m_s']:.3f} m/s, "
+          f"JT = {calibrado['joule_thomson_coefficient_k_kpa']:.5f} K/kPa, sem zeros: {sem_zeros}")
+    return iguais and sem_zeros
+
+
+def teste_custo_da_passagem():
+    """Todas as derivadas de Helmholtz custam menos que a solução da densidade"""
+    print("=== TESTE CUSTO DA PASSAGEM ÚNICA ===")
+    aga8 = AGA8_GERG2008()
+    rng = np.random.default_rng(1)
+    pressoes, temperaturas = rng.uniform(200, 12000, 50000), rng.uniform(-5, 60, 50000)
+    mistura = gerg_mixture(aga8._fraction_vector(COMPOSICAO))
+    temperaturas_k = temperaturas + 273.15
+    linhas = np.zeros(len(pressoes), dtype=int)
+
+    inicio = time.perf_counter()
+    densidade = mistura.solve_density(pressoes, temperaturas_k, linhas)
+    tempo_densidade = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    mistura.residual_derivatives(densidade, temperaturas_k, linhas)
+    tempo_derivadas = time.perf_counter() - inicio
+
+    print(f"✓ Densidade: {tempo_densidade:.2f}s, todas as derivadas de Helmholtz: {tempo_derivadas:.2f}s")
+    return tempo_derivadas < tempo_densidade
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_memoriais_de_referencia(),
+        teste_identidades_termodinamicas(),
+        teste_lote_igual_ao_escalar(),
+        teste_calibrado_sem_zeros(),
+        teste_custo_da_passagem()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 PROPRIEDADES: SUCESSO" if sucesso else "✗ TESTE AGA8 PROPRIEDADES: FALHA")
+    exit(0 if sucesso else 1)
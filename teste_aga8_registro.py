@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Teste do registro de solucionadores AGA 8 (instâncias únicas por processo)
+"""
+
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import aga8_registro
+from aga8_calibrado import AGA8_GERG2008_Calibrated
+from aga8_dc_calibrado import AGA8_DetailedCharacterization_Calibrated
+from aga8_registro import SOLVERS, get_solver, preload_solvers
+
+COMPOSICAO = {
+    'methane': 0.965, 'nitrogen': 0.003, 'carbon_dioxide': 0.006, 'ethane': 0.018,
+    'propane': 0.0045, 'i_butane': 0.001, 'n_butane': 0.001, 'i_pentane': 0.0005,
+    'n_pentane': 0.0003, 'n_hexane': 0.0007
+}
+
+
+def _calcular(i):
+    pressao, temperatura = 500.0 + 50 * (i % 20), 10.0 + i % 7
+    gerg = get_solver('gerg2008').calculate_properties(pressao, temperatura, COMPOSICAO)
+    detail = get_solver('detail').calculate_all_properties(pressao, temperatura, COMPOSICAO)
+    return gerg['compressibility_factor'], detail['compressibility_factor']
+
+
+def _calcular_no_filho(fila):
+    fila.put((id(get_solver('detail')), _calcular(3)))
+
+
+def teste_instancia_unica_entre_threads():
+    """Chamadas concorrentes recebem a mesma instância e os mesmos resultados"""
+    print("=== TESTE INSTÂNCIA ÚNICA ENTRE THREADS ===")
+    aga8_registro._instancias.clear()
+    with ThreadPoolExecutor(16) as executor:
+        instancias = list(executor.map(lambda _: get_solver('detail_calibrado'), range(64)))
+        paralelo = list(executor.map(_calcular, range(200)))
+    serial = [_calcular(i) for i in range(200)]
+
+    try:
+        get_solver('inexistente')
+        rejeitado = False
+    except KeyError:
+        rejeitado = True
+
+    unica = len({id(instancia) for instancia in instancias}) == 1
+    print(f"✓ Instância única: {unica}, paralelo = serial: {paralelo == serial}, "
+          f"nome desconhecido rejeitado: {rejeitado}")
+    return unica and paralelo == serial and rejeitado
+
+
+def teste_sem_construcao_por_chamada():
+    """O wrapper calibrado não cria solucionadores a cada cálculo"""
+    print("=== TESTE SEM CONSTRUÇÃO POR CHAMADA ===")
+    preload_solvers()
+    criados = []
+    original = AGA8_DetailedCharacterization_Calibrated.__new__
+
+    def contar(cls, *args, **kwargs):
+        criados.append(cls)
+        return original(cls)
+
+    AGA8_DetailedCharacterization_Calibrated.__new__ = contar
+    try:
+        calibrado = AGA8_GERG2008_Calibrated()
+        resultados = [calibrado.calculate_all_properties_calibrated(600, 50, COMPOSICAO)
+                      for _ in range(50)]
+    finally:
+        AGA8_DetailedCharacterization_Calibrated.__new__ = original
+
+    sem_estado = all(not hasattr(get_solver(nome), '__dict__') for nome in SOLVERS)
+    print(f"✓ Solucionadores criados em 50 chamadas: {len(criados)}, "
+          f"sem estado por instância: {sem_estado}")
+    return (not criados and sem_estado
+            and all(r['compressibility_factor'] == resultados[0]['compressibility_factor']
+                    for r in resultados))
+
+
+def teste_fork():
+    """Processo filho (como um worker após preload_app) usa a instância herdada"""
+    print("=== TESTE FORK ===")
+    preload_solvers()
+    contexto = multiprocessing.get_context('fork')
+    fila = contexto.Queue()
+    filho = contexto.Process(target=_calcular_no_filho, args=(fila,))
+    filho.start()
+    instancia, resultado = fila.get(timeout=60)
+    filho.join(60)
+
+    herdada = instancia == id(get_solver('detail'))
+    print(f"✓ Filho terminou com código {filho.exitcode}, instância herdada: {herdada}, "
+          f"resultado igual ao do pai: {resultado == _calcular(3)}")
+    return filho.exitcode == 0 and herdada and resultado == _calcular(3)
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_instancia_unica_entre_threads(),
+        teste_sem_construcao_por_chamada(),
+        teste_fork()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE REGISTRO AGA8: SUCESSO" if sucesso else "✗ TESTE REGISTRO AGA8: FALHA")
+    exit(0 if sucesso else 1)
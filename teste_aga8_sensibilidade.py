@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Teste do jacobiano das propriedades em relação à composição, P e T (aga8_sensibilidade)
+"""
+
+import time
+
+import numpy as np
+
+from aga8_detailed_characterization import AGA8_DetailedCharacterization
+from aga8_gerg2008 import AGA8_GERG2008, COMPONENTS
+from aga8_sensibilidade import contributions
+
+COMPOSICAO = {'methane': 96.5, 'nitrogen': 0.3, 'carbon_dioxide': 0.6, 'ethane': 1.8,
+              'propane': 0.45, 'i-butane': 0.1, 'n-butane': 0.1, 'i-pentane': 0.05,
+              'n-pentane': 0.03, 'n-hexane': 0.07}
+BASE = np.array([COMPOSICAO.get(componente, 0.0) for componente in COMPONENTS])
+MOTORES = (AGA8_GERG2008(), AGA8_DetailedCharacterization())
+
+
+def teste_igual_a_recalculos():
+    """Jacobiano igual às diferenças centrais com recálculo escalar de cada perturbação"""
+    print("=== TESTE JACOBIANO x RECÁLCULOS ===")
+    ok = True
+    for motor, calcular in zip(MOTORES, ('calculate_properties', 'calculate_all_properties')):
+        def estado(composicao, pressao=8000.0, temperatura=20.0):
+            return getattr(motor, calcular)(pressao, temperatura, dict(zip(COMPONENTS, composicao)))
+
+        resultado = motor.calculate_jacobian_batch(BASE, 8000, 20)
+        maior = 0.0
+        for indice in np.flatnonzero(BASE):
+            passo = 1e-4 * BASE.sum()
+            mais, menos = BASE.copy(), BASE.copy()
+            mais[indice] += passo
+            menos[indice] -= passo
+            alto, baixo = estado(mais), estado(menos)
+            for propriedade in ('density', 'enthalpy', 'speed_of_sound'):
+                recalculo = (alto[propriedade] - baixo[propriedade]) / (2 * passo)
+                derivada = resultado['jacobian'][propriedade][0, indice]
+                maior = max(maior, abs(derivada - recalculo) / abs(resultado['values'][propriedade][0]))
+        alta, baixa = estado(BASE, 8001.0), estado(BASE, 7999.0)
+        recalculo = (alta['density'] - baixa['density']) / 2.0
+        maior = max(maior, abs(resultado['jacobian']['density'][0, -2] / recalculo - 1))
+        print(f"✓ {type(motor).__name__}: maior desvio relativo {maior:.1e}")
+        ok = ok and maior < 1e-6
+    return ok
+
+
+def teste_identidades():
+    """Σ xᵢ·∂f/∂xᵢ = 0 (composição normalizada) e (∂h/∂T)_P = Cp"""
+    print("=== TESTE IDENTIDADES DO JACOBIANO ===")
+    ok = True
+    for motor in MOTORES:
+        resultado = motor.calculate_jacobian_batch(BASE, 8000, 20)
+        jacobiano, valores = resultado['jacobian'], resultado['values']
+        homogeneidade = max(abs(jacobiano[nome][0, :len(BASE)] @ BASE) / abs(valores[nome][0])
+                            for nome in ('density', 'enthalpy', 'speed_of_sound'))
+        cp = abs(jacobiano['enthalpy'][0, -1] / valores['isobaric_heat_capacity'][0] - 1)
+        print(f"✓ {type(motor).__name__}: Σ x·∂f/∂x = {homogeneidade:.1e}, ∂h/∂T x Cp = {cp:.1e}")
+        ok = ok and homogeneidade < 1e-8 and cp < 1e-8
+        ok = ok and resultado['inputs'] == [*COMPONENTS, 'pressure', 'temperature']
+    return ok
+
+
+def teste_componentes_ausentes():
+    """Componentes ausentes usam diferença progressiva (sem composição negativa)"""
+    print("=== TESTE COMPONENTES AUSENTES ===")
+    aga8 = AGA8_GERG2008()
+    hidrogenio = COMPONENTS.index('hydrogen')
+    resultado = aga8.calculate_jacobian_batch(BASE, 8000, 20, properties=['density'])
+    passo = 1e-4
+    pontos = np.array([BASE, BASE, BASE])
+    pontos[1, hidrogenio], pontos[2, hidrogenio] = passo, 2 * passo
+    lote = aga8.calculate_properties_batch(pontos, 8000, 20)['density']
+    recalculo = (-3 * lote[0] + 4 * lote[1] - lote[2]) / (2 * passo)
+    derivada = resultado['jacobian']['density'][0, hidrogenio]
+    print(f"✓ ∂ρ/∂x(H2) = {derivada:.6f}, recálculo {recalculo:.6f}")
+    return set(resultado['jacobian']) == {'density'} and abs(derivada / recalculo - 1) < 1e-5
+
+
+def teste_contribuicoes():
+    """Soma das parcelas por componente igual à variação da densidade entre dois boletins"""
+    print("=== TESTE PARCELAS POR COMPONENTE ===")
+    aga8 = AGA8_GERG2008()
+    referencia = BASE.copy()
+    boletim = BASE.copy()
+    boletim[COMPONENTS.index('ethane')] += 0.05
+    boletim[COMPONENTS.index('nitrogen')] += 0.02
+    boletim[COMPONENTS.index('methane')] -= 0.07
+    resultado = aga8.calculate_jacobian_batch(referencia, 8000, 20, properties=['density'])
+    parcelas = contributions(resultado, 'density', dict(zip(COMPONENTS, boletim - referencia)))
+    real = np.diff(aga8.calculate_properties_batch(np.array([referencia, boletim]), 8000, 20)['density'])[0]
+    for componente, parcela in parcelas.items():
+        print(f"✓ {componente}: {parcela:+.5f} kg/m³")
+    print(f"✓ Soma {sum(parcelas.values()):+.5f} kg/m³, variação real {real:+.5f} kg/m³")
+    return list(parcelas)[0] == 'ethane' and abs(sum(parcelas.values()) / real - 1) < 0.01
+
+
+def teste_custo_do_lote():
+    """Jacobiano de 100 boletins mais rápido que os recálculos escalares de 10"""
+    print("=== TESTE CUSTO DO JACOBIANO EM LOTE ===")
+    aga8 = AGA8_GERG2008()
+    composicoes = BASE * np.random.default_rng(0).uniform(0.8, 1.2, (100, len(BASE)))
+    aga8.calculate_jacobian_batch(composicoes[:2], 8000, 20)
+
+    inicio = time.perf_counter()
+    aga8.calculate_jacobian_batch(composicoes, 8000, 20)
+    tempo_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for linha in composicoes[:10]:
+        for indice in range(len(BASE) + 2):
+            for sinal in (1, -1):
+                perturbada = linha.copy()
+                perturbada[min(indice, len(BASE) - 1)] += sinal * 1e-3
+                aga8.calculate_properties(8000, 20, dict(zip(COMPONENTS, perturbada)))
+    tempo_escalar = time.perf_counter() - inicio
+    print(f"✓ 100 boletins em lote: {tempo_lote:.2f}s; recálculos de 10 boletins: {tempo_escalar:.2f}s")
+    return tempo_lote < tempo_escalar
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_igual_a_recalculos(),
+        teste_identidades(),
+        teste_componentes_ausentes(),
+        teste_contribuicoes(),
+        teste_custo_do_lote()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE AGA8 SENSIBILIDADE: SUCESSO" if sucesso else "✗ TESTE AGA8 SENSIBILIDADE: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Teste das consultas de janela do CEP (últimas N amostras via índice)
+"""
+
+import random
+import sqlite3
+
+from cep import (
+    buscar_historico_cep,
+    buscar_historico_cep_lote,
+    calcular_limites_cep,
+    dentro_limites_cep
+)
+from config import CEP_AMOSTRAS_MIN
+from migracoes import aplicar_migracoes
+
+COMPONENTES = ['Metano', 'Etano', 'Propano', 'Nitrogênio', 'CO2']
+FLUXO = 'FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS'
+OUTRO_FLUXO = 'FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT'
+
+
+def _banco_com_historico(amostras_por_componente=300):
+    """Banco em memória com histórico sintético (inclui datas repetidas)"""
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    aplicar_migracoes(db)
+
+    random.seed(42)
+    for i in range(amostras_por_componente):
+        data = f'2024-{1 + i // 28 % 12:02d}-{1 + i % 28:02d}'
+        # Dois fluxos intercalados no mesmo período
+        fluxo = FLUXO if i % 3 else OUTRO_FLUXO
+        for nome in COMPONENTES:
+            db.execute('''
+                INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (nome, i + 1, random.uniform(0, 100), data, fluxo))
+    db.commit()
+    return db
+
+
+def _historico_completo(db, componente, antes_de='9999-12-31', fluxo=FLUXO):
+    """Leitura antiga: todo o histórico do fluxo em ordem cronológica"""
+    rows = db.execute('''
+        SELECT valor FROM historico_componentes
+        WHERE fluxo = ? AND componente = ? AND data_coleta < ?
+        ORDER BY data_coleta ASC, id ASC
+    ''', (fluxo, componente, antes_de)).fetchall()
+    return [row['valor'] for row in rows]
+
+
+def teste_janela_equivalente():
+    """A janela lida do banco é igual às últimas N amostras do histórico completo"""
+    print("=== TESTE JANELA CEP ===")
+    db = _banco_com_historico()
+
+    lote = buscar_historico_cep_lote(db, FLUXO, COMPONENTES)
+    ok = True
+    for nome in COMPONENTES:
+        esperado = _historico_completo(db, nome)[-CEP_AMOSTRAS_MIN:]
+        individual = buscar_historico_cep(db, FLUXO, nome)
+        iguais = individual == esperado and lote[nome] == esperado
+        print(f"✓ {nome}: {len(individual)} amostras, igual ao histórico completo: {iguais}")
+        ok = ok and iguais
+
+    vazio = buscar_historico_cep_lote(db, FLUXO, ['Inexistente'])
+    print(f"✓ Componente sem histórico: {vazio}")
+
+    # O outro fluxo tem janela própria
+    outro = buscar_historico_cep(db, OUTRO_FLUXO, 'Metano')
+    separado = outro == _historico_completo(db, 'Metano', fluxo=OUTRO_FLUXO)[-CEP_AMOSTRAS_MIN:]
+    print(f"✓ Fluxos independentes: {separado and outro != lote['Metano']}")
+
+    plano = ' | '.join(row[3] for row in db.execute(
+        'EXPLAIN QUERY PLAN SELECT valor FROM historico_componentes '
+        'WHERE fluxo = ? AND componente = ? ORDER BY data_coleta DESC, id DESC LIMIT 8',
+        (FLUXO, 'Metano')))
+    print(f"✓ Plano: {plano}")
+    db.close()
+
+    return (ok and separado and outro != lote['Metano']
+            and vazio == {'Inexistente': []}
+            and 'idx_hist_comp_fluxo_componente_data' in plano
+            and 'TEMP B-TREE' not in plano)
+
+
+def teste_janela_as_of():
+    """Janela "as-of": só amostras estritamente anteriores à data do boletim"""
+    print("=== TESTE JANELA CEP AS-OF ===")
+    db = _banco_com_historico()
+    data = '2024-03-10'
+
+    esperado = _historico_completo(db, 'Metano', antes_de=data)[-CEP_AMOSTRAS_MIN:]
+    antes = buscar_historico_cep_lote(db, FLUXO, COMPONENTES, antes_de=data)
+    print(f"✓ Janela anterior a {data}: {len(antes['Metano'])} amostras")
+
+    # Amostras novas (posteriores ou da mesma data) não alteram a janela
+    for data_nova in (data, '2025-01-01'):
+        db.execute('''
+            INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+            VALUES ('Metano', 9999, 1000.0, ?, ?)
+        ''', (data_nova, FLUXO))
+    depois = buscar_historico_cep(db, FLUXO, 'Metano', antes_de=data)
+    print(f"✓ Janela estável após novas amostras: {depois == antes['Metano']}")
+
+    plano = ' | '.join(row[3] for row in db.execute(
+        'EXPLAIN QUERY PLAN SELECT valor FROM historico_componentes '
+        'WHERE fluxo = ? AND componente = ? AND data_coleta < ? '
+        'ORDER BY data_coleta DESC, id DESC LIMIT 8', (FLUXO, 'Metano', data)))
+    print(f"✓ Plano: {plano}")
+    db.close()
+
+    return (antes['Metano'] == esperado and depois == esperado
+            and 'data_coleta<?' in plano and 'TEMP B-TREE' not in plano)
+
+
+def teste_limites():
+    """Limites I-MR e aceitação sem histórico suficiente"""
+    print("=== TESTE LIMITES CEP ===")
+    historico = [50.0, 51.0, 49.5, 50.5, 50.2, 49.8, 50.3, 49.7]
+    limites = calcular_limites_cep(historico)
+    print(f"✓ LCI: {limites['lci']:.3f}, LCS: {limites['lcs']:.3f}")
+
+    return (calcular_limites_cep([45.0]) is None
+            and dentro_limites_cep(50.0, [45.0])
+            and dentro_limites_cep(50.1, historico)
+            and not dentro_limites_cep(70.0, historico))
+
+
+if __name__ == "__main__":
+    resultados = [teste_janela_equivalente(), teste_janela_as_of(), teste_limites()]
+    sucesso = all(resultados)
+    print("✓ TESTE JANELA CEP: SUCESSO" if sucesso else "✗ TESTE JANELA CEP: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Teste do CEP multivariado (T² de Hotelling sobre o vetor de composição)
+"""
+
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import cep_multivariado
+from cep import buscar_historico_cep, dentro_limites_cep
+from cep_multivariado import (
+    COMPONENTES_T2,
+    aplicar_t2_hotelling,
+    avaliar_t2_as_of,
+    atualizar_estado_t2,
+    carregar_composicoes,
+    carregar_estado_t2,
+    combinar_estados_t2,
+    estado_t2_de_serie,
+    estado_t2_inicial,
+    invalida_por_t2,
+    separar_estados_t2,
+    status_t2,
+    t2_as_of
+)
+from config import CEP_T2_AMOSTRAS_MIN, CEP_T2_LIMITE
+from migracoes import aplicar_migracoes
+
+FLUXO = 'FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS'
+BASE = np.array([85, 6, 3, 0.5, 0.8, 0.2, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0, 2.5, 1.6])
+
+
+def _composicoes(total, seed=0):
+    """Variação de Nitrogênio dilui os hidrocarbonetos (componentes correlacionados)"""
+    rng = np.random.default_rng(seed)
+    composicoes = np.tile(BASE, (total, 1))
+    composicoes[:, 13] += rng.normal(0, 0.5, total)
+    composicoes[:, 14] += rng.normal(0, 0.05, total)
+    composicoes[:, :12] *= ((100 - composicoes[:, 12:].sum(axis=1)) / BASE[:12].sum())[:, None]
+    composicoes[:, :12] += rng.normal(0, 0.01, (total, 12))
+    return composicoes
+
+
+def _data(i):
+    return (date(2024, 1, 1) + timedelta(days=i)).isoformat()
+
+
+def _cadastrar(db, boletim_id, data, vetor):
+    """Mesma sequência do cadastro: histórico e depois o T²"""
+    valores = dict(zip(COMPONENTES_T2, vetor.tolist()))
+    db.executemany('''
+        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(nome, boletim_id, valor, data, FLUXO) for nome, valor in valores.items()])
+    return aplicar_t2_hotelling(db, FLUXO, data, valores)
+
+
+def _banco_com_historico(total=60):
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    aplicar_migracoes(db)
+    t2 = [_cadastrar(db, i + 1, _data(i), vetor) for i, vetor in enumerate(_composicoes(total))]
+    return db, t2
+
+
+def _estados_iguais(a, b):
+    return (a['n_amostras'] == b['n_amostras'] and a['ultima_data'] == b['ultima_data']
+            and np.allclose(a['media'], b['media']) and np.allclose(a['m2'], b['m2'])
+            and np.allclose(a['precisao'], b['precisao']))
+
+
+def teste_deslocamento_correlacionado():
+    """Metano cai e Etano sobe: cada componente passa no CEP, o T² não"""
+    print("=== TESTE DESLOCAMENTO CORRELACIONADO ===")
+    db, _ = _banco_com_historico()
+
+    vetor = np.mean(_composicoes(60)[-8:], axis=0)
+    vetor[0] -= 0.08
+    vetor[1] += 0.08
+    univariado = all(
+        dentro_limites_cep(valor, buscar_historico_cep(db, FLUXO, nome))
+        for nome, valor in zip(COMPONENTES_T2, vetor))
+    t2 = _cadastrar(db, 999, _data(60), vetor)
+    print(f"✓ CEP por componente: {'VALIDADO' if univariado else 'INVALIDADO'}")
+    print(f"✓ T² = {t2:.2f}: {status_t2(t2)}")
+    db.close()
+    return univariado and status_t2(t2) == "INVALIDADO"
+
+
+def teste_incremental_igual_lote():
+    """T² e estado incrementais iguais ao recálculo em lote"""
+    print("=== TESTE T² INCREMENTAL × LOTE ===")
+    db, t2 = _banco_com_historico()
+
+    datas, _, composicoes = carregar_composicoes(db, [FLUXO])[FLUXO]
+    lote = t2_as_of(datas, composicoes, datas, composicoes)
+    incremental = np.array([np.nan if valor is None else valor for valor in t2])
+    iguais = np.allclose(lote, incremental, equal_nan=True)
+    sem_historico = int(np.isnan(incremental).sum())
+    estado_ok = _estados_iguais(carregar_estado_t2(db, FLUXO),
+                                estado_t2_de_serie(datas, composicoes))
+    print(f"✓ {len(t2)} boletins ({sem_historico} sem histórico suficiente), "
+          f"iguais ao lote: {iguais}, estado igual: {estado_ok}")
+    db.close()
+    return iguais and estado_ok and sem_historico == CEP_T2_AMOSTRAS_MIN
+
+
+def teste_boletim_fora_de_ordem():
+    """Boletim anterior ao último processado recalcula o estado do fluxo"""
+    print("=== TESTE T² FORA DE ORDEM ===")
+    db, _ = _banco_com_historico()
+
+    _cadastrar(db, 999, '2024-01-20', _composicoes(1, seed=5)[0])
+    datas, _, composicoes = carregar_composicoes(db, [FLUXO])[FLUXO]
+    estado = carregar_estado_t2(db, FLUXO)
+    iguais = _estados_iguais(estado, estado_t2_de_serie(datas, composicoes))
+    print(f"✓ Estado recalculado: {iguais}, amostras: {estado['n_amostras']}")
+    db.close()
+    return iguais and estado['n_amostras'] == 61
+
+
+def teste_desempenho_lote():
+    """Recalcular o T² de 3000 boletins em lote"""
+    print("=== TESTE DESEMPENHO T² EM LOTE ===")
+    composicoes = _composicoes(3000, seed=1)
+    datas = np.array([_data(i) for i in range(3000)])
+
+    inicio = time.perf_counter()
+    t2 = t2_as_of(datas, composicoes, datas, composicoes)
+    tempo = time.perf_counter() - inicio
+    alarmes = np.nanmean(t2 > CEP_T2_LIMITE)
+    print(f"✓ 3000 boletins em {tempo:.3f}s, taxa de alarmes: {alarmes:.2%}")
+    return tempo < 5 and alarmes < 0.05
+
+
+def teste_componente_sem_variancia():
+    """Oxigênio sempre zero no histórico: uma leitura de 0,06 não dispara o T²"""
+    print("=== TESTE COMPONENTE SEM VARIÂNCIA ===")
+    db, _ = _banco_com_historico()
+
+    excluido = not carregar_estado_t2(db, FLUXO)['precisao'][12].any()
+    vetor = np.mean(_composicoes(60)[-8:], axis=0)
+    vetor[12] = 0.06
+    t2 = _cadastrar(db, 999, _data(60), vetor)
+    datas, _, composicoes = carregar_composicoes(db, [FLUXO])[FLUXO]
+    lote = t2_as_of(datas[:-1], composicoes[:-1], datas[-1:], composicoes[-1:])[0]
+    # Depois dessa leitura o Oxigênio passa a variar e volta ao T²
+    incluido = carregar_estado_t2(db, FLUXO)['precisao'][12].any()
+    print(f"✓ T² = {t2:.2f} (lote {lote:.2f}): {status_t2(t2)}")
+    print(f"✓ Oxigênio fora do T² antes da leitura: {excluido}, depois: {not incluido}")
+    db.close()
+    return status_t2(t2) == "VALIDADO" and abs(t2 - lote) < 1e-6 and excluido and incluido
+
+
+def teste_cauda_sobre_estado():
+    """Estado anterior separado do estado total + cauda: mesmos T² que a série inteira"""
+    print("=== TESTE T² DA CAUDA SOBRE O ESTADO ANTERIOR ===")
+    composicoes = _composicoes(500, seed=2)
+    datas = np.array([_data(i) for i in range(500)])
+    total = estado_t2_de_serie(datas, composicoes)
+
+    anterior = separar_estados_t2(total, estado_t2_de_serie(datas[400:], composicoes[400:]))
+    completo = t2_as_of(datas, composicoes, datas[400:], composicoes[400:])
+    cauda = t2_as_of(datas[400:], composicoes[400:], datas[400:], composicoes[400:], inicial=anterior)
+    desvio = np.max(np.abs(cauda / completo - 1))
+    recombinado = combinar_estados_t2(anterior, estado_t2_de_serie(datas[400:], composicoes[400:]))
+    print(f"✓ 100 boletins da cauda: desvio relativo máximo {desvio:.1e}")
+    return (desvio < 1e-8 and anterior['n_amostras'] == 400
+            and _estados_iguais(recombinado, total)
+            and separar_estados_t2(anterior, total) is None)
+
+
+def teste_precisao_incremental():
+    """Precisão por Sherman–Morrison igual à inversa do zero; outro ridge reinverte"""
+    print("=== TESTE PRECISÃO INCREMENTAL ===")
+    composicoes = _composicoes(3000, seed=3)
+    composicoes *= 100 / composicoes.sum(axis=1, keepdims=True)
+    estado = estado_t2_inicial()
+    for vetor in composicoes:
+        estado = atualizar_estado_t2(estado, vetor)
+    direta = estado_t2_de_serie(np.arange(3000), composicoes)['precisao']
+    erro = np.max(np.abs(estado['precisao'] - direta)) / np.max(np.abs(direta))
+
+    db, _ = _banco_com_historico()
+    datas, _, historico = carregar_composicoes(db, [FLUXO])[FLUXO]
+    padrao = cep_multivariado.CEP_T2_RIDGE
+    cep_multivariado.CEP_T2_RIDGE = padrao * 10
+    try:
+        reinvertida = np.allclose(carregar_estado_t2(db, FLUXO)['precisao'],
+                                  estado_t2_de_serie(datas, historico)['precisao'])
+    finally:
+        cep_multivariado.CEP_T2_RIDGE = padrao
+    db.close()
+    print(f"✓ 3000 amostras com soma 100: erro relativo {erro:.1e}")
+    print(f"✓ Estado gravado com outro ridge é reinvertido: {reinvertida}")
+    return erro < 1e-8 and reinvertida
+
+
+def teste_avaliar_sobre_estado():
+    """T² de um boletim do meio da série a partir do estado gravado menos a cauda"""
+    print("=== TESTE T² AS-OF SOBRE O ESTADO GRAVADO ===")
+    db, t2 = _banco_com_historico()
+    valores = dict(zip(COMPONENTES_T2, _composicoes(60)[44].tolist()))
+    pelo_estado = avaliar_t2_as_of(db, FLUXO, _data(44), valores)
+    db.execute('DELETE FROM cep_t2_estado')
+    pelo_fluxo = avaliar_t2_as_of(db, FLUXO, _data(44), valores)
+    db.close()
+    print(f"✓ T² pelo estado: {pelo_estado:.6f}, pelo fluxo inteiro: {pelo_fluxo:.6f}, "
+          f"no cadastro: {t2[44]:.6f}")
+    return abs(pelo_estado - pelo_fluxo) < 1e-8 and abs(pelo_estado - t2[44]) < 1e-8
+
+
+def teste_status_separado():
+    """T² acima do limite só invalida o boletim com CEP_T2_INVALIDA_BOLETIM"""
+    print("=== TESTE STATUS MULTIVARIADO SEPARADO ===")
+    padrao = invalida_por_t2("INVALIDADO")
+    cep_multivariado.CEP_T2_INVALIDA_BOLETIM = True
+    try:
+        configurado = invalida_por_t2("INVALIDADO") and not invalida_por_t2("VALIDADO")
+    finally:
+        cep_multivariado.CEP_T2_INVALIDA_BOLETIM = False
+    print(f"✓ Padrão invalida o boletim: {padrao}; com a opção: {configurado}")
+    return not padrao and configurado
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_deslocamento_correlacionado(),
+        teste_incremental_igual_lote(),
+        teste_boletim_fora_de_ordem(),
+        teste_desempenho_lote(),
+        teste_componente_sem_variancia(),
+        teste_cauda_sobre_estado(),
+        teste_precisao_incremental(),
+        teste_avaliar_sobre_estado(),
+        teste_status_separado()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE CEP MULTIVARIADO: SUCESSO" if sucesso else "✗ TESTE CEP MULTIVARIADO: FALHA")
+    exit(0 if sucesso else 1)
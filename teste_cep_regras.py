@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Teste das regras de sequência, EWMA e CUSUM (estado incremental por fluxo)
+"""
+
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+
+from cep import buscar_janelas_cep_lote, snapshot_cep
+from cep_regras import (
+    _serie_fluxo,
+    aplicar_regras_cep,
+    avaliar_ponto,
+    avaliar_regras_as_of,
+    carregar_estados,
+    estado_inicial,
+    reproduzir_serie
+)
+from cep_vetorizado import limites_cep_as_of
+from migracoes import aplicar_migracoes
+
+FLUXO = 'FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS'
+INICIO_DERIVA = 30
+
+
+def _banco():
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    aplicar_migracoes(db)
+    return db
+
+
+def _cadastrar(db, boletim_id, data, valor, componente='Metano'):
+    """Mesma sequência do cadastro: janela, histórico e regras"""
+    snapshot = snapshot_cep(buscar_janelas_cep_lote(db, FLUXO, [componente])[componente])
+    db.execute('''
+        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (componente, boletim_id, valor, data, FLUXO))
+    return aplicar_regras_cep(db, FLUXO, data, {componente: (valor, snapshot)})[componente]
+
+
+def _serie_com_deriva(db, total=60):
+    """Série estável seguida de uma deriva lenta a partir de INICIO_DERIVA"""
+    random.seed(7)
+    regras = []
+    for i in range(total):
+        valor = 80 + random.gauss(0, 0.3) + (0.12 * (i - INICIO_DERIVA) if i >= INICIO_DERIVA else 0)
+        data = (date(2024, 1, 1) + timedelta(days=i)).isoformat()
+        regras.append(_cadastrar(db, i + 1, data, valor))
+    return regras
+
+
+def _estado_reprocessado(db, componente='Metano'):
+    datas, valores, limites = _serie_fluxo(db, FLUXO, componente)
+    estado, _ = reproduzir_serie(datas, valores, limites)
+    return estado
+
+
+def _estados_iguais(a, b):
+    return all(
+        abs(a[campo] - b[campo]) < 1e-9 if isinstance(a[campo], float) else a[campo] == b[campo]
+        for campo in a)
+
+
+def teste_deteccao_deriva():
+    """Deriva lenta é sinalizada por regras de sequência/EWMA/CUSUM antes de R1"""
+    print("=== TESTE DETECÇÃO DE DERIVA ===")
+    db = _banco()
+    regras = _serie_com_deriva(db)
+
+    apos = [(i, r) for i, r in enumerate(regras) if i >= INICIO_DERIVA and r]
+    primeiro_r1 = next(i for i, r in apos if 'R1' in r)
+    primeira_regra = apos[0]
+    print(f"✓ Primeiro sinal: amostra {primeira_regra[0]} {primeira_regra[1]}")
+    print(f"✓ Primeiro R1: amostra {primeiro_r1}")
+    db.close()
+
+    return primeira_regra[0] < primeiro_r1 and 'R1' not in primeira_regra[1]
+
+
+def teste_incremental_igual_reprocessamento():
+    """O estado atualizado em O(1) é igual ao da série reprocessada"""
+    print("=== TESTE ESTADO INCREMENTAL ===")
+    db = _banco()
+    _serie_com_deriva(db)
+
+    gravado = carregar_estados(db, FLUXO, ['Metano'])['Metano']
+    iguais = _estados_iguais(gravado, _estado_reprocessado(db))
+    print(f"✓ {gravado['n_amostras']} amostras, igual ao reprocessamento: {iguais}")
+    db.close()
+    return iguais and gravado['n_amostras'] == 60
+
+
+def teste_boletim_fora_de_ordem():
+    """Boletim anterior ao último processado reconstrói o estado do fluxo"""
+    print("=== TESTE BOLETIM FORA DE ORDEM ===")
+    db = _banco()
+    _serie_com_deriva(db, total=40)
+
+    _cadastrar(db, 999, '2024-01-15', 80.4)
+    gravado = carregar_estados(db, FLUXO, ['Metano'])['Metano']
+    iguais = _estados_iguais(gravado, _estado_reprocessado(db))
+    print(f"✓ Estado reconstruído: {iguais}, última data: {gravado['ultima_data']}")
+    db.close()
+    return iguais and gravado['n_amostras'] == 41 and gravado['ultima_data'] == '2024-02-09'
+
+
+def teste_as_of_igual_cadastro():
+    """Reavaliação "as-of" repete as regras registradas no cadastro"""
+    print("=== TESTE REGRAS AS-OF ===")
+    db = _banco()
+    regras = _serie_com_deriva(db, total=45)
+    estado_antes = dict(carregar_estados(db, FLUXO, ['Metano'])['Metano'])
+
+    divergencias = 0
+    for i, row in enumerate(db.execute('''
+        SELECT valor, data_coleta FROM historico_componentes ORDER BY data_coleta
+    ''').fetchall()):
+        janela = buscar_janelas_cep_lote(db, FLUXO, ['Metano'], antes_de=row['data_coleta'])
+        reavaliadas = avaliar_regras_as_of(db, FLUXO, row['data_coleta'], {
+            'Metano': (row['valor'], snapshot_cep(janela['Metano']))})['Metano']
+        divergencias += reavaliadas != regras[i]
+
+    inalterado = carregar_estados(db, FLUXO, ['Metano'])['Metano'] == estado_antes
+    print(f"✓ Divergências: {divergencias}, cep_estado inalterado: {inalterado}")
+    db.close()
+    return divergencias == 0 and inalterado
+
+
+def _limites_ponto(limites, i):
+    if limites['n_amostras'][i] < 2:
+        return None
+    return {campo: float(limites[campo][i]) for campo in ('media', 'media_amplitudes', 'lci', 'lcs')}
+
+
+def _reproduzir_ponto_a_ponto(datas, valores, limites, datas_alvo, valores_alvo, limites_alvo, estado):
+    """Referência: avaliar_ponto amostra a amostra, alvos com as amostras anteriores à data"""
+    regras = []
+    for i, (data_alvo, valor_alvo) in enumerate(zip(datas_alvo, valores_alvo.tolist())):
+        anterior = estado
+        for j in range(len(datas)):
+            if datas[j] >= data_alvo:
+                break
+            anterior, _ = avaliar_ponto(anterior, valores[j], _limites_ponto(limites, j), datas[j])
+        regras.append(avaliar_ponto(anterior, valor_alvo, _limites_ponto(limites_alvo, i))[1])
+    for j in range(len(datas)):
+        estado, _ = avaliar_ponto(estado, valores[j], _limites_ponto(limites, j), datas[j])
+    return estado, regras
+
+
+def teste_reproducao_vetorizada():
+    """Reprocessamento em arrays igual a avaliar_ponto aplicado ponto a ponto"""
+    print("=== TESTE REPROCESSAMENTO VETORIZADO ===")
+    rng = np.random.default_rng(21)
+    divergencias = casos = disparos = 0
+    for caso in range(40):
+        total = int(rng.integers(0, 150))
+        # Datas repetidas, degraus, derivas e trechos constantes (sigma zero)
+        datas = np.sort(rng.choice(
+            [(date(2024, 1, 1) + timedelta(days=int(d))).isoformat() for d in range(120)], total))
+        valores = np.round(rng.normal(10, 0.2, total) + np.where(
+            rng.random(total) < 0.05, rng.normal(0, 2, total), 0.0), int(rng.integers(1, 4)))
+        valores += np.cumsum(rng.normal(0, 0.05, total)) * (caso % 3 == 0)
+        if caso % 5 == 0 and total > 20:
+            valores[5:20] = 10.0
+        limites = limites_cep_as_of(datas, valores, datas, n=int(rng.integers(2, 10)))
+        datas_alvo = np.array([(date(2024, 1, 1) + timedelta(days=int(d))).isoformat()
+                               for d in rng.integers(-5, 125, 30)])
+        valores_alvo = rng.normal(10, 0.5, 30)
+        limites_alvo = limites_cep_as_of(datas, valores, datas_alvo)
+
+        estado = None
+        if caso % 2:
+            # Estado de partida gravado (ex.: fluxo com histórico anterior)
+            estado, _ = reproduzir_serie(['2023-01-01', '2023-01-02'], [10.0, 11.5], {
+                'media': [np.nan, 10.0], 'media_amplitudes': [np.nan, 0.1],
+                'lci': [np.nan, 9.7], 'lcs': [np.nan, 10.3], 'n_amostras': [0, 2]})
+        esperado, regras_esperadas = _reproduzir_ponto_a_ponto(
+            [str(d) for d in datas], [float(v) for v in valores], limites,
+            datas_alvo, valores_alvo, limites_alvo, estado or estado_inicial())
+        obtido, regras = reproduzir_serie(datas, valores, limites, datas_alvo, valores_alvo,
+                                          limites_alvo, estado)
+        casos += 1
+        disparos += sum(map(len, regras))
+        divergencias += regras != regras_esperadas or not _estados_iguais(obtido, esperado)
+
+    print(f"✓ {casos} séries, {disparos} regras disparadas nos alvos, divergências: {divergencias}")
+    return divergencias == 0 and disparos > 0
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_deteccao_deriva(),
+        teste_incremental_igual_reprocessamento(),
+        teste_boletim_fora_de_ordem(),
+        teste_as_of_igual_cadastro(),
+        teste_reproducao_vetorizada()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE REGRAS CEP: SUCESSO" if sucesso else "✗ TESTE REGRAS CEP: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Teste dos snapshots dos limites CEP (cep_snapshots)
+"""
+
+import os
+import random
+import tempfile
+
+# Banco temporário: nunca tocar o boletins.db versionado
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'teste_snapshots.db')
+
+from app import app  # noqa: E402
+from cep import buscar_snapshots_cep  # noqa: E402
+from database import connect_db  # noqa: E402
+from revalidacao import revalidar_boletins  # noqa: E402
+
+COMPONENTES = {
+    'Metano': 90.0, 'Etano': 5.0, 'Propano': 2.0, 'i-Butano': 0.5, 'n-Butano': 0.5,
+    'i-Pentano': 0.2, 'n-Pentano': 0.2, 'Hexano': 0.1, 'Heptano': 0.05, 'Octano': 0.02,
+    'Nonano': 0.01, 'Decano': 0.01, 'Oxigênio': 0.01, 'Nitrogênio': 1.0, 'CO2': 0.4
+}
+
+
+def _cadastrar(client, total):
+    """Cadastra boletins com composições levemente variadas"""
+    random.seed(3)
+    for i in range(total):
+        form = {
+            'numero_boletim': f'SNAP-{i}', 'data_coleta': f'2025-03-{i + 1:02d}',
+            'data_recebimento': '2025-04-01', 'data_analise': '2025-04-01',
+            'data_emissao': '2025-04-02', 'identificacao_instalacao': 'FPSO ATLANTE',
+            'agente_regulado': 'Agente', 'responsavel_amostragem': 'Resp',
+            'pressao': '5', 'temperatura': '50', 'observacoes': '',
+            'responsavel_tecnico': 'T', 'responsavel_elaboracao': 'E',
+            'responsavel_aprovacao': 'A'
+        }
+        for nome, valor in COMPONENTES.items():
+            form[nome] = str(round(valor * random.uniform(0.98, 1.02), 4))
+        client.post('/cadastrar', data=form)
+
+
+def teste_snapshot_cadastro():
+    """Cadastro grava os limites aplicados; relatório e PDF os exibem"""
+    print("=== TESTE SNAPSHOTS CEP - CADASTRO ===")
+    with app.test_client() as client:
+        _cadastrar(client, 12)
+        relatorio = client.get('/relatorio/12')
+        pdf = client.get('/relatorio/12/pdf')
+
+    db = connect_db()
+    snapshots = buscar_snapshots_cep(db, 12)
+    primeiro = buscar_snapshots_cep(db, 1)
+    metano = snapshots['Metano']
+    historico = db.execute('''
+        SELECT id FROM historico_componentes
+        WHERE componente = 'Metano' AND boletin_id BETWEEN 4 AND 11 ORDER BY id
+    ''').fetchall()
+    plano = ' | '.join(row[3] for row in db.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM cep_snapshots WHERE boletin_id = ?', (12,)))
+    db.close()
+
+    print(f"✓ Componentes com snapshot: {len(snapshots)}")
+    print(f"✓ Metano: LCI {metano['lci']:.3f}, LCS {metano['lcs']:.3f}, "
+          f"{metano['n_amostras']} amostras")
+    print(f"✓ Primeiro boletim sem histórico: LCI {primeiro['Metano']['lci']}")
+    print(f"✓ Plano: {plano}")
+    print(f"✓ Relatório: {relatorio.status_code}, PDF: {pdf.status_code}")
+
+    lci_exibido = f"{metano['lci']:.3f}".replace('.', ',') in relatorio.get_data(as_text=True)
+    print(f"✓ LCI do snapshot exibido no relatório: {lci_exibido}")
+
+    return (len(snapshots) == len(COMPONENTES)
+            and metano['amostras_ids'] == [row['id'] for row in historico]
+            and primeiro['Metano']['lci'] is None
+            and 'USING INDEX' in plano and lci_exibido
+            and relatorio.status_code == 200 and pdf.status_code == 200)
+
+
+def teste_snapshot_revalidacao():
+    """Revalidação individual e em lote registram os mesmos limites"""
+    print("=== TESTE SNAPSHOTS CEP - REVALIDAÇÃO ===")
+    with app.test_client() as client:
+        client.post('/revalidar/8')
+
+    db = connect_db()
+    individual = buscar_snapshots_cep(db, 8)
+    revalidar_boletins(db, [8])
+    db.commit()
+    lote = buscar_snapshots_cep(db, 8)
+    db.close()
+
+    iguais = all(
+        individual[nome]['amostras_ids'] == lote[nome]['amostras_ids']
+        and abs(individual[nome]['lcs'] - lote[nome]['lcs']) < 1e-9
+        for nome in COMPONENTES
+    )
+    print(f"✓ Janelas (as-of) do boletim 8: {individual['Metano']['amostras_ids']}")
+    print(f"✓ Individual e lote iguais: {iguais}")
+    return iguais and individual['Metano']['n_amostras'] == 7
+
+
+if __name__ == "__main__":
+    resultados = [teste_snapshot_cadastro(), teste_snapshot_revalidacao()]
+    sucesso = all(resultados)
+    print("✓ TESTE SNAPSHOTS CEP: SUCESSO" if sucesso else "✗ TESTE SNAPSHOTS CEP: FALHA")
+    exit(0 if sucesso else 1)
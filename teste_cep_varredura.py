@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Teste da varredura de parâmetros do CEP (janela × sigma)
+"""
+
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from cep_varredura import varrer_historico, varrer_parametros
+from cep_vetorizado import dentro_limites_vetorizado, limites_cep_as_of
+from migracoes import aplicar_migracoes
+
+MEDIAS = np.array([85, 6, 3, 0.5, 0.8, 0.2, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.01, 2.5, 1.6])
+FLUXOS = ('FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT',
+          'FPSO CIDADE DE ITAJAÍ | GÁS EXPORTAÇÃO | HP EXPORT')
+JANELAS = (4, 8, 12, 20)
+SIGMAS = (2.0, 2.5, 3.0, 3.5)
+
+
+def _series(total, seed=0):
+    """15 componentes × 2 fluxos; 2% dos pontos com deslocamento de 8 sigma"""
+    rng = np.random.default_rng(seed)
+    datas = np.array([(date(2010, 1, 1) + timedelta(days=i)).isoformat() for i in range(total)])
+    series, anomalias = {}, {}
+    for fluxo in FLUXOS:
+        for c, media in enumerate(MEDIAS):
+            valores = rng.normal(media, media * 0.02, total)
+            anomalo = rng.random(total) < 0.02
+            valores[anomalo] += 8 * media * 0.02
+            chave = (fluxo, f'C{c}')
+            series[chave] = (datas, valores, np.arange(total) + 1 + total * FLUXOS.index(fluxo))
+            anomalias[chave] = anomalo
+    return series, anomalias
+
+
+def teste_igual_motor_vetorizado():
+    """Alarmes da varredura = pontos fora dos limites de limites_cep_as_of"""
+    print("=== TESTE VARREDURA × MOTOR VETORIZADO ===")
+    series, anomalias = _series(1000)
+    resultado = varrer_parametros(series, JANELAS, SIGMAS, anomalias)
+
+    esperado = np.zeros((len(JANELAS), len(SIGMAS)), dtype=np.int64)
+    for datas, valores, _ in series.values():
+        for j, n in enumerate(JANELAS):
+            for s, sigma in enumerate(SIGMAS):
+                limites = limites_cep_as_of(datas, valores, datas, n=n, sigma=sigma)
+                esperado[j, s] += (~dentro_limites_vetorizado(valores, limites)).sum()
+
+    iguais = np.array_equal(resultado['alarmes'], esperado)
+    print(f"✓ Alarmes iguais ao motor vetorizado: {iguais} ({int(esperado.sum())} no total)")
+    return iguais
+
+
+def teste_taxas():
+    """Falso alarme e detecção caem com o sigma; invalidação por fluxo coerente"""
+    print("=== TESTE TAXAS DA VARREDURA ===")
+    series, anomalias = _series(1000, seed=1)
+    resultado = varrer_parametros(series, JANELAS, SIGMAS, anomalias)
+    falso_alarme = resultado['taxa_falso_alarme']
+    deteccao = resultado['taxa_deteccao']
+
+    # Invalidação do fluxo: boletim com algum componente em alarme (janela 8, sigma 3)
+    datas, _, ids = series[(FLUXOS[0], 'C0')]
+    invalidados = np.zeros(len(ids), dtype=bool)
+    for (fluxo, _), (datas, valores, _) in series.items():
+        if fluxo == FLUXOS[0]:
+            limites = limites_cep_as_of(datas, valores, datas, n=8, sigma=3.0)
+            invalidados |= ~dentro_limites_vetorizado(valores, limites)
+    taxa = resultado['fluxos'][FLUXOS[0]]['taxa_invalidacao'][1, 2]
+
+    print(f"✓ Falso alarme (janela 8): {np.round(falso_alarme[1], 4)}")
+    print(f"✓ Detecção (janela 8): {np.round(deteccao[1], 4)}")
+    print(f"✓ Invalidação {FLUXOS[0]}: {taxa:.2%} (esperado {invalidados.mean():.2%})")
+    return (np.all(np.diff(falso_alarme, axis=1) <= 0) and np.all(np.diff(deteccao, axis=1) <= 0)
+            and deteccao[1, 2] > 0.8 and falso_alarme[1, 2] < 0.03
+            and np.isclose(taxa, invalidados.mean()))
+
+
+def teste_historico_do_banco():
+    """Varredura a partir de historico_componentes, com a referência robusta"""
+    print("=== TESTE VARREDURA DO BANCO ===")
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    aplicar_migracoes(db)
+    series, _ = _series(200, seed=2)
+    db.executemany('''
+        INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(componente, int(boletim_id), float(valor), data, fluxo)
+          for (fluxo, componente), (datas, valores, ids) in series.items()
+          for data, valor, boletim_id in zip(datas, valores, ids)])
+    resultado = varrer_historico(db, JANELAS, SIGMAS)
+    db.close()
+
+    boletins = {fluxo: dados['boletins'] for fluxo, dados in resultado['fluxos'].items()}
+    print(f"✓ Boletins por fluxo: {boletins}, anomalias de referência: {resultado['anomalias']}")
+    return boletins == {fluxo: 200 for fluxo in FLUXOS} and resultado['anomalias'][0] > 0
+
+
+def teste_desempenho():
+    """Dez anos diários, 15 componentes, 2 fluxos, grade 6 × 6"""
+    print("=== TESTE DESEMPENHO DA VARREDURA ===")
+    series, anomalias = _series(3650, seed=3)
+    inicio = time.perf_counter()
+    varrer_parametros(series, (4, 6, 8, 12, 16, 20), (2, 2.5, 3, 3.5, 4, 4.5), anomalias)
+    tempo = time.perf_counter() - inicio
+    print(f"✓ {len(series) * 3650} pontos × 36 configurações em {tempo:.2f}s")
+    return tempo < 10
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_igual_motor_vetorizado(),
+        teste_taxas(),
+        teste_historico_do_banco(),
+        teste_desempenho()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE VARREDURA CEP: SUCESSO" if sucesso else "✗ TESTE VARREDURA CEP: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Teste do motor vetorizado do CEP e da revalidação em lote
+"""
+
+import random
+import sqlite3
+import time
+
+from cep import buscar_historico_cep_lote, dentro_limites_cep
+from cep_vetorizado import (
+    carregar_series_componentes,
+    dentro_limites_vetorizado,
+    limites_cep_as_of
+)
+from migracoes import aplicar_migracoes
+from revalidacao import revalidar_boletins
+
+COMPONENTES = ['Metano', 'Etano', 'Propano', 'Nitrogênio', 'CO2']
+MEDIAS = {'Metano': 85.0, 'Etano': 6.0, 'Propano': 3.0, 'Nitrogênio': 1.5, 'CO2': 2.0}
+FLUXOS = ['FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS',
+          'FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT']
+
+
+def _banco_com_boletins(total, caminho=':memory:', semente=7, fluxos=None):
+    """
+    Banco com boletins, componentes e histórico sintéticos
+
+    Usado também pelos outros testes de revalidação: `caminho` em arquivo
+    para os processos auxiliares. Sem `fluxos`, três de cada quatro
+    boletins vão para o primeiro fluxo (séries de tamanhos diferentes);
+    com `fluxos`, eles se alternam boletim a boletim.
+    """
+    db = sqlite3.connect(caminho)
+    db.row_factory = sqlite3.Row
+    aplicar_migracoes(db)
+
+    random.seed(semente)
+    for i in range(total):
+        # Datas repetidas de propósito (vários boletins no mesmo dia)
+        data = f'{2020 + i // 300}-{1 + i // 25 % 12:02d}-{1 + i % 25:02d}'
+        fluxo = FLUXOS[i % 4 == 0] if fluxos is None else fluxos[i % len(fluxos)]
+        cursor = db.execute(
+            'INSERT INTO boletins (numero_boletim, data_coleta, fluxo) VALUES (?, ?, ?)',
+            (f'B{i}', data, fluxo))
+        boletim_id = cursor.lastrowid
+        for nome in COMPONENTES:
+            valor = random.gauss(MEDIAS[nome], MEDIAS[nome] * 0.02)
+            if random.random() < 0.03:
+                valor *= 1.3
+            db.execute('''
+                INSERT INTO componentes (boletin_id, nome, percentual_molar)
+                VALUES (?, ?, ?)
+            ''', (boletim_id, nome, valor))
+            db.execute('''
+                INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (nome, boletim_id, valor, data, fluxo))
+    db.commit()
+    return db
+
+
+def teste_equivalencia_escalar():
+    """Veredito vetorizado igual ao cálculo escalar "as-of" ponto a ponto"""
+    print("=== TESTE CEP VETORIZADO x ESCALAR ===")
+    db = _banco_com_boletins(400)
+    series = carregar_series_componentes(db)
+
+    divergencias = 0
+    for (fluxo, nome), (datas, valores, _) in series.items():
+        limites = limites_cep_as_of(datas, valores, datas)
+        vetorizado = dentro_limites_vetorizado(valores, limites)
+        for i, (data, valor) in enumerate(zip(datas, valores)):
+            janela = buscar_historico_cep_lote(db, fluxo, [nome], antes_de=str(data))[nome]
+            if dentro_limites_cep(float(valor), janela) != bool(vetorizado[i]):
+                divergencias += 1
+        print(f"✓ {fluxo} / {nome}: {len(valores)} pontos, "
+              f"{int((~vetorizado).sum())} fora de controle")
+
+    db.close()
+    print(f"✓ Divergências: {divergencias}")
+    return divergencias == 0
+
+
+def teste_revalidacao_lote():
+    """Revalidação em lote grava os mesmos status e é determinística"""
+    print("=== TESTE REVALIDAÇÃO EM LOTE ===")
+    db = _banco_com_boletins(3000)
+
+    inicio = time.perf_counter()
+    resultado = revalidar_boletins(db)
+    duracao = time.perf_counter() - inicio
+    db.commit()
+    print(f"✓ {resultado} em {duracao:.2f}s")
+
+    primeira = db.execute('SELECT id, status_cep FROM componentes ORDER BY id').fetchall()
+    segunda_execucao = revalidar_boletins(db)
+    segunda = db.execute('SELECT id, status_cep FROM componentes ORDER BY id').fetchall()
+    deterministico = [tuple(r) for r in primeira] == [tuple(r) for r in segunda]
+    print(f"✓ Resultado repetível: {deterministico}")
+
+    # Conferir um boletim contra o caminho escalar
+    boletim = db.execute(
+        'SELECT id, data_coleta, fluxo, status_cep FROM boletins WHERE id = 2500').fetchone()
+    janelas = buscar_historico_cep_lote(
+        db, boletim['fluxo'], COMPONENTES, antes_de=boletim['data_coleta'])
+    esperado = all(
+        dentro_limites_cep(row['percentual_molar'], janelas[row['nome']])
+        for row in db.execute('SELECT nome, percentual_molar FROM componentes WHERE boletin_id = 2500'))
+    confere = boletim['status_cep'] == ("VALIDADO" if esperado else "INVALIDADO")
+    print(f"✓ Boletim 2500 confere com o cálculo escalar: {confere}")
+
+    parcial = revalidar_boletins(db, [])
+    db.close()
+    return (deterministico and confere and segunda_execucao == resultado
+            and parcial['processados'] == 0)
+
+
+if __name__ == "__main__":
+    resultados = [teste_equivalencia_escalar(), teste_revalidacao_lote()]
+    sucesso = all(resultados)
+    print("✓ TESTE CEP VETORIZADO: SUCESSO" if sucesso else "✗ TESTE CEP VETORIZADO: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Teste da tabela única de componentes (ids, aliases e arrays de propriedades)
+"""
+
+import os
+import shutil
+import tempfile
+
+# Banco temporário: nunca tocar o boletins.db versionado
+PASTA = tempfile.mkdtemp()
+os.environ['DATABASE_PATH'] = os.path.join(PASTA, 'teste_componentes.db')
+
+from aga8_detail_tabelas import DETAIL_COMPONENTS  # noqa: E402
+from aga8_detailed_characterization import AGA8_DetailedCharacterization  # noqa: E402
+from aga8_gerg2008 import COMPONENTS, AGA8_GERG2008  # noqa: E402
+from app import calcular_propriedades_fluido  # noqa: E402
+from componentes import (COMPONENTES, MASSA_MOLAR, NOMES, PC, PCS, TC, indices_componentes,  # noqa: E402
+                         resolver_componente, vetor_composicao)
+from config import LIMITES_AGA8, MASSAS_MOLARES  # noqa: E402
+
+BOLETIM = {
+    'Metano': 85.0, 'Etano': 6.0, 'Propano': 3.0, 'i-Butano': 0.5, 'n-Butano': 0.8,
+    'i-Pentano': 0.2, 'n-Pentano': 0.2, 'Hexano': 0.1, 'Heptano': 0.05, 'Octano': 0.02,
+    'Nonano': 0.01, 'Decano': 0.005, 'Oxigênio': 0.01, 'Nitrogênio': 2.5, 'CO2': 1.6
+}
+
+
+def teste_ids_e_aliases():
+    """Nome canônico, do boletim e fórmula levam ao mesmo id; ordem = motores"""
+    print("=== TESTE IDS E ALIASES ===")
+    for componente in COMPONENTES:
+        for nome in (componente.nome, componente.nome_boletim, componente.formula,
+                     componente.nome.upper().replace('-', '_')):
+            if resolver_componente(nome) != componente.id:
+                print(f"✗ {nome!r} não resolve para {componente.nome}")
+                return False
+
+    ordem = NOMES == tuple(COMPONENTS) == tuple(DETAIL_COMPONENTS)
+    indices = indices_componentes(['CO2', 'desconhecido', 'Metano']).tolist()
+    somente_leitura = not any(array.flags.writeable for array in (TC, PC, MASSA_MOLAR, PCS))
+    print(f"✓ {len(COMPONENTES)} componentes, ordem dos motores: {ordem}, "
+          f"índices: {indices}, arrays somente leitura: {somente_leitura}")
+    return ordem and indices == [2, -1, 0] and somente_leitura and not hasattr(COMPONENTES[0], '__dict__')
+
+
+def teste_vetor_composicao():
+    """Nomes diferentes do mesmo componente somam; desconhecidos e não numéricos ficam de fora"""
+    print("=== TESTE VETOR DE COMPOSIÇÃO ===")
+    vetor = vetor_composicao({'Metano': 50, 'CH4': 30, 'ethane': '20', 'Xenônio': 5, 'CO2': None})
+    normalizado = vetor_composicao({'Metano': 80, 'Etano': 20}, normalizar=True)
+    print(f"✓ Metano {vetor[0]}, etano {vetor[3]}, total {vetor.sum()}, normalizado {normalizado.sum()}")
+    return vetor[0] == 80 and vetor[3] == 20 and vetor.sum() == 100 and normalizado.sum() == 1.0
+
+
+def teste_mesma_tabela_em_todos():
+    """Motores, config e app leem as mesmas constantes"""
+    print("=== TESTE MESMA TABELA EM TODOS OS MÓDULOS ===")
+    fracoes = vetor_composicao(BOLETIM, normalizar=True)
+    massa = float(fracoes @ MASSA_MOLAR)
+
+    gerg = AGA8_GERG2008()
+    normalizado = gerg.normalize_composition(BOLETIM)[2]
+    detail = AGA8_DetailedCharacterization().calculate_mixture_properties(BOLETIM)
+    app = calcular_propriedades_fluido(BOLETIM)['Massa Molecular']
+
+    massas = {
+        'gerg': gerg.calculate_molar_mass(normalizado),
+        'gerg_mistura': gerg.calculate_mixture_properties(normalizado)['molecular_weight'],
+        'detail': detail['M_mix'],
+        'app': app * 100.0 / sum(BOLETIM.values()),
+        'config': sum(BOLETIM[nome] * MASSAS_MOLARES[nome] for nome in BOLETIM) / sum(BOLETIM.values()),
+    }
+    iguais = all(abs(valor - massa) < 1e-12 for valor in massas.values())
+    tc = abs(detail['Tc_mix'] - float(fracoes @ TC)) < 1e-9
+    print(f"✓ Massa molar {massa:.6f} em todos: {iguais} {massas}")
+    print(f"✓ MASSAS_MOLARES cobre o boletim: {set(MASSAS_MOLARES) == set(LIMITES_AGA8)}, Tc: {tc}")
+    return iguais and tc and set(MASSAS_MOLARES) == set(LIMITES_AGA8)
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_ids_e_aliases(),
+        teste_vetor_composicao(),
+        teste_mesma_tabela_em_todos()
+    ]
+    shutil.rmtree(PASTA)
+    sucesso = all(resultados)
+    print("✓ TESTE COMPONENTES: SUCESSO" if sucesso else "✗ TESTE COMPONENTES: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Teste do gerenciador de conexões SQLite (uma conexão por requisição, WAL)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+# Banco temporário: nunca tocar o boletins.db versionado
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'teste_conexao.db')
+
+from app import app  # noqa: E402
+from database import get_db, connect_db  # noqa: E402
+
+
+def teste_pragmas():
+    """Conexões abertas em WAL com pragmas ajustados"""
+    print("=== TESTE PRAGMAS DA CONEXÃO ===")
+    db = connect_db()
+    journal = db.execute('PRAGMA journal_mode').fetchone()[0]
+    synchronous = db.execute('PRAGMA synchronous').fetchone()[0]
+    temp_store = db.execute('PRAGMA temp_store').fetchone()[0]
+    db.close()
+
+    print(f"✓ journal_mode: {journal}")
+    print(f"✓ synchronous: {synchronous} (1 = NORMAL)")
+    print(f"✓ temp_store: {temp_store} (2 = MEMORY)")
+    return journal == 'wal' and synchronous == 1 and temp_store == 2
+
+
+def teste_conexao_por_requisicao():
+    """Mesma conexão durante a requisição, fechada no teardown"""
+    print("=== TESTE CONEXÃO POR REQUISIÇÃO ===")
+    with app.test_request_context('/dashboard'):
+        db1 = get_db()
+        db2 = get_db()
+        mesma = db1 is db2
+        db1.execute('SELECT COUNT(*) FROM boletins').fetchone()
+    print(f"✓ Conexão reaproveitada: {mesma}")
+
+    try:
+        db1.execute('SELECT 1')
+        fechada = False
+    except sqlite3.ProgrammingError:
+        fechada = True
+    print(f"✓ Conexão fechada no teardown: {fechada}")
+
+    # Rotas que consultam o banco várias vezes devem continuar respondendo
+    with app.test_client() as client:
+        resposta = client.get('/boletins')
+    print(f"✓ /boletins: {resposta.status_code}")
+
+    return mesma and fechada and resposta.status_code == 200
+
+
+if __name__ == "__main__":
+    resultados = [teste_pragmas(), teste_conexao_por_requisicao()]
+    sucesso = all(resultados)
+    print("✓ TESTE CONEXÕES: SUCESSO" if sucesso else "✗ TESTE CONEXÕES: FALHA")
+    exit(0 if sucesso else 1)
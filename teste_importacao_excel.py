@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Teste da importação Excel: histórico, regras, T², snapshots e dependentes
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+
+# Banco temporário: nunca tocar o boletins.db versionado
+PASTA = tempfile.mkdtemp()
+os.environ['DATABASE_PATH'] = os.path.join(PASTA, 'teste_importacao.db')
+
+from app import app  # noqa: E402,F401  (cria o banco)
+from cep_regras import _serie_fluxo, carregar_estados, reproduzir_serie  # noqa: E402
+from database import connect_db  # noqa: E402
+from excel_import import processar_excel_boletins  # noqa: E402
+from revalidacao import revalidar_boletins  # noqa: E402
+
+# Nomes como podem vir na planilha -> média
+COMPONENTES = {
+    'Metano': 85.0, 'Etano': 6.0, 'Propano': 3.0, 'i-Butano': 0.5, 'n-Butano': 0.8,
+    'i-Pentano': 0.2, 'n-Pentano': 0.2, 'Hexano': 0.1, 'Heptano': 0.05, 'Octano': 0.02,
+    'Nonano': 0.01, 'Decano': 0.005, 'Oxigênio': 0.01, 'N2': 2.5, 'CO₂': 1.6
+}
+FLUXO = 'FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS'
+TOTAL = 45
+
+
+def _planilha(nome, boletins, checklist=None):
+    """Arquivo com as quatro abas obrigatórias para os boletins [(número, data)]"""
+    linhas_boletins, linhas_componentes = [], []
+    for numero, data in boletins:
+        linhas_boletins.append({
+            'numero_boletim': numero, 'data_coleta': data, 'data_emissao': data,
+            'identificacao_instalacao': 'FPSO ATLANTE', 'sistema_medicao': 'GÁS COMBUSTÍVEL LP',
+            'ponto_coleta': 'LP FUEL GAS', 'pressao': 5.0, 'temperatura': 40.0
+        })
+        for componente, media in COMPONENTES.items():
+            valor = random.gauss(media, media * 0.02) * (1.2 if random.random() < 0.03 else 1)
+            linhas_componentes.append({'numero_boletim': numero, 'componente': componente,
+                                       'percentual_molar': valor, 'status_cep': 'PENDENTE'})
+    caminho = os.path.join(PASTA, nome)
+    with pd.ExcelWriter(caminho) as writer:
+        pd.DataFrame(linhas_boletins).to_excel(writer, sheet_name='Boletins', index=False)
+        pd.DataFrame(linhas_componentes).to_excel(writer, sheet_name='Componentes', index=False)
+        pd.DataFrame({'numero_boletim': []}).to_excel(writer, sheet_name='Propriedades', index=False)
+        pd.DataFrame(checklist or {'numero_boletim': []}).to_excel(
+            writer, sheet_name='Checklist', index=False)
+    return caminho
+
+
+def _gravado(caminho):
+    """Vereditos gravados por componente e por boletim"""
+    db = connect_db(caminho)
+    gravado = (
+        [tuple(row) for row in db.execute('''
+            SELECT boletin_id, nome, status_aga, status_cep, regras_cep
+            FROM componentes ORDER BY boletin_id, nome''')],
+        [tuple(row) for row in db.execute('''
+            SELECT id, status, status_aga8, status_cep, ROUND(t2_hotelling, 6), status_t2
+            FROM boletins ORDER BY id''')]
+    )
+    db.close()
+    return gravado
+
+
+def _estados_iguais_reprocessamento(db):
+    """cep_estado de cada componente igual ao da série reprocessada"""
+    gravados = carregar_estados(db, FLUXO, ['Metano', 'Nitrogênio', 'CO2'])
+    for componente, gravado in gravados.items():
+        datas, valores, limites = _serie_fluxo(db, FLUXO, componente)
+        estado, _ = reproduzir_serie(datas, valores, limites)
+        if any(gravado[campo] != estado[campo] and not (
+                isinstance(estado[campo], float) and abs(gravado[campo] - estado[campo]) < 1e-9)
+               for campo in estado):
+            return False
+    return len(gravados) == 3
+
+
+def teste_importacao_alimenta_cep():
+    """Importação grava histórico com nomes do boletim, estados, snapshots e status"""
+    print("=== TESTE IMPORTAÇÃO - CEP ===")
+    random.seed(17)
+    boletins = [(f'IMP-{i}', (date(2024, 1, 1) + timedelta(days=2 * i)).isoformat())
+                for i in range(TOTAL)]
+    resultado = processar_excel_boletins(_planilha('lote.xlsx', boletins))
+
+    db = connect_db()
+    historico = db.execute('SELECT COUNT(*) FROM historico_componentes WHERE fluxo = ?',
+                           (FLUXO,)).fetchone()[0]
+    nomes = {row[0] for row in db.execute('SELECT DISTINCT componente FROM historico_componentes')}
+    snapshots = db.execute('SELECT COUNT(*) FROM cep_snapshots').fetchone()[0]
+    t2 = db.execute('SELECT COUNT(t2_hotelling) FROM boletins').fetchone()[0]
+    estados = _estados_iguais_reprocessamento(db)
+    db.close()
+
+    print(f"✓ {resultado['success']} boletins, erros: {resultado['errors']}")
+    print(f"✓ Histórico: {historico} amostras, snapshots: {snapshots}, boletins com T²: {t2}")
+    print(f"✓ Estado das regras igual ao reprocessamento: {estados}")
+    return (resultado['success'] == TOTAL and historico == TOTAL * len(COMPONENTES)
+            and {'Nitrogênio', 'CO2'} <= nomes and not {'N2', 'CO₂'} & nomes
+            and snapshots == TOTAL * len(COMPONENTES) and t2 > 0 and estados)
+
+
+def teste_importacao_retroativa():
+    """Boletim retroativo: vereditos iguais aos de uma revalidação completa"""
+    print("=== TESTE IMPORTAÇÃO - BOLETIM RETROATIVO ===")
+    resultado = processar_excel_boletins(_planilha('retroativo.xlsx', [('IMP-R', '2024-02-04')]))
+
+    copia = os.path.join(PASTA, 'completa.db')
+    shutil.copy(os.environ['DATABASE_PATH'], copia)
+    db = connect_db(copia)
+    revalidar_boletins(db)
+    db.commit()
+    db.close()
+
+    importado, completo = _gravado(os.environ['DATABASE_PATH']), _gravado(copia)
+    db = connect_db()
+    estados = _estados_iguais_reprocessamento(db)
+    db.close()
+    print(f"✓ Importado: {resultado['success']}, componentes iguais: {importado[0] == completo[0]}, "
+          f"boletins iguais: {importado[1] == completo[1]}")
+    print(f"✓ Estado das regras reconstruído: {estados}")
+    return resultado['success'] == 1 and importado == completo and estados
+
+
+def teste_linha_com_erro():
+    """Linha que falha no meio não deixa boletim, histórico nem estado do CEP"""
+    print("=== TESTE IMPORTAÇÃO - LINHA COM ERRO ===")
+    db = connect_db()
+    amostras_t2 = db.execute('SELECT n_amostras FROM cep_t2_estado WHERE fluxo = ?',
+                             (FLUXO,)).fetchone()[0]
+    db.close()
+    checklist = {'numero_boletim': ['IMP-ERRO'], 'item_numero': ['abc'], 'descricao': ['Item'],
+                 'situacao': ['OK'], 'nao_aplicavel': ['Não'], 'observacao': ['']}
+    resultado = processar_excel_boletins(_planilha(
+        'erro.xlsx', [('IMP-ERRO', '2024-04-01'), ('IMP-OK', '2024-04-03')], checklist))
+
+    db = connect_db()
+    gravados = {row[0] for row in db.execute(
+        "SELECT numero_boletim FROM boletins WHERE numero_boletim IN ('IMP-ERRO', 'IMP-OK')")}
+    orfaos = db.execute('''
+        SELECT COUNT(*) FROM historico_componentes
+        WHERE boletin_id NOT IN (SELECT id FROM boletins)
+    ''').fetchone()[0]
+    estado_t2 = db.execute('SELECT n_amostras FROM cep_t2_estado WHERE fluxo = ?',
+                           (FLUXO,)).fetchone()[0]
+    estados = _estados_iguais_reprocessamento(db)
+    db.close()
+    print(f"✓ Importados: {resultado['success']}, erros: {len(resultado['errors'])}, "
+          f"gravados: {sorted(gravados)}")
+    print(f"✓ Histórico órfão: {orfaos}, amostras no T²: {amostras_t2} -> {estado_t2}, "
+          f"estado das regras igual ao reprocessamento: {estados}")
+    return (resultado['success'] == 1 and len(resultado['errors']) == 1
+            and gravados == {'IMP-OK'} and orfaos == 0 and estado_t2 == amostras_t2 + 1
+            and estados)
+
+
+def teste_sem_data_coleta():
+    """Linha sem data de coleta é rejeitada sem gravar o boletim"""
+    print("=== TESTE IMPORTAÇÃO - SEM DATA DE COLETA ===")
+    resultado = processar_excel_boletins(_planilha('sem_data.xlsx', [('IMP-SEM-DATA', None)]))
+    db = connect_db()
+    gravado = db.execute("SELECT COUNT(*) FROM boletins WHERE numero_boletim = 'IMP-SEM-DATA'").fetchone()[0]
+    db.close()
+    print(f"✓ Erros: {resultado['errors']}, gravado: {gravado}")
+    return resultado['success'] == 0 and len(resultado['errors']) == 1 and gravado == 0
+
+
+if __name__ == "__main__":
+    resultados = [
+        teste_importacao_alimenta_cep(),
+        teste_importacao_retroativa(),
+        teste_linha_com_erro(),
+        teste_sem_data_coleta()
+    ]
+    sucesso = all(resultados)
+    print("✓ TESTE IMPORTAÇÃO EXCEL: SUCESSO" if sucesso else "✗ TESTE IMPORTAÇÃO EXCEL: FALHA")
+    exit(0 if sucesso else 1)
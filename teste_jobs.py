@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Teste das tarefas em segundo plano (revalidação em lotes com checkpoint)
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+# Banco temporário: nunca tocar o boletins.db versionado
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'teste_jobs.db')
+
+import jobs  # noqa: E402
+from app import app  # noqa: E402
+from database import connect_db  # noqa: E402
+from revalidacao import revalidar_boletins  # noqa: E402
+
+COMPONENTES = {
+    'Metano': 90.0, 'Etano': 5.0, 'Propano': 2.0, 'i-Butano': 0.5, 'n-Butano': 0.5,
+    'i-Pentano': 0.2, 'n-Pentano': 0.2, 'Hexano': 0.1, 'Heptano': 0.05, 'Octano': 0.02,
+    'Nonano': 0.01, 'Decano': 0.01, 'Oxigênio': 0.01, 'Nitrogênio': 1.0, 'CO2': 0.4
+}
+TOTAL = 25
+
+
+def _cadastrar(client, total):
+    """Cadastra boletins com composições levemente variadas"""
+    random.seed(5)
+    for i in range(total):
+        form = {
+            'numero_boletim': f'JOB-{i}', 'data_coleta': f'2025-05-{i + 1:02d}',
+            'data_recebimento': '2025-06-01', 'data_analise': '2025-06-01',
+            'data_emissao': '2025-06-02', 'identificacao_instalacao': 'FPSO ATLANTE',
+            'agente_regulado': 'Agente', 'responsavel_amostragem': 'Resp',
+            'pressao': '5', 'temperatura': '50', 'observacoes': '',
+            'responsavel_tecnico': 'T', 'responsavel_elaboracao': 'E',
+            'responsavel_aprovacao': 'A'
+        }
+        for nome, valor in COMPONENTES.items():
+            form[nome] = str(round(valor * random.uniform(0.98, 1.02), 4))
+        client.post('/cadastrar', data=form)
+
+
+def _aguardar(client, job_id, limite=30):
+    """Consulta o progresso como a interface faz, até o job terminar"""
+    inicio = time.time()
+    while time.time() - inicio < limite:
+        progresso = client.get(f'/jobs/{job_id}/progresso').get_json()
+        if progresso['status'] in (jobs.STATUS_CONCLUIDO, jobs.STATUS_ERRO):
+            return progresso
+        time.sleep(0.1)
+    return progresso
+
+
+def teste_job_pendentes():
+    """/revalidar_todos responde na hora e o job revalida só os pendentes"""
+    print("=== TESTE JOB - PENDENTES ===")
+    with app.test_client() as client:
+        _cadastrar(client, TOTAL)
+        db = connect_db()
+        db.execute("UPDATE boletins SET status = NULL WHERE id IN (3, 7, 11)")
+        db.commit()
+
+        resposta = client.post('/revalidar_todos')
+        job_id = int(resposta.headers['Location'].rsplit('job=', 1)[1])
+        progresso = _aguardar(client, job_id)
+        pagina = client.get(f'/boletins?job={job_id}')
+
+    pendentes = db.execute('SELECT COUNT(*) FROM boletins WHERE status IS NULL').fetchone()[0]
+    db.close()
+    print(f"✓ Redirecionamento: {resposta.status_code}, job {job_id}: {progresso}")
+    print(f"✓ Pendentes restantes: {pendentes}, página: {pagina.status_code}")
+
+    return (resposta.status_code == 302 and progresso['status'] == jobs.STATUS_CONCLUIDO
+            and progresso['processados'] == progresso['total'] == 3
+            and progresso['percentual'] == 100.0 and pendentes == 0
+            and pagina.status_code == 200 and b'jobProgresso' in pagina.data)
+
+
+def teste_job_todos_em_lotes():
+    """Escopo "todos": lotes com checkpoint até o último boletim"""
+    print("=== TESTE JOB - HISTÓRICO COMPLETO EM LOTES ===")
+    jobs.JOBS_TAMANHO_LOTE = 7
+    db = connect_db()
+    job_id = jobs.criar_job(db, 'revalidacao', {'escopo': 'todos'})
+    jobs.executar_job(job_id)
+    job = jobs.buscar_job(db, job_id)
+    ultimo = db.execute('SELECT MAX(id) FROM boletins').fetchone()[0]
+    db.close()
+
+    print(f"✓ {job['processados']}/{job['total']} boletins, checkpoint {job['checkpoint']}, "
+          f"resultado {job['resultado']}")
+    return (job['status'] == jobs.STATUS_CONCLUIDO and job['total'] == TOTAL
+            and job['processados'] == TOTAL and job['checkpoint'] == ultimo
+            and job['resultado']['validados'] + job['resultado']['invalidados'] == TOTAL)
+
+
+def teste_retomada_checkpoint():
+    """Falha no meio do job: retomada continua do último lote gravado"""
+    print("=== TESTE JOB - RETOMADA ===")
+    jobs.JOBS_TAMANHO_LOTE = 7
+    contar, executar = jobs.TAREFAS['revalidacao']
+
+    def executar_com_falha(db, parametros, checkpoint):
+        for lote, item in enumerate(executar(db, parametros, checkpoint)):
+            if lote == 2:
+                raise RuntimeError('worker interrompido')
+            yield item
+
+    db = connect_db()
+    job_id = jobs.criar_job(db, 'revalidacao', {'escopo': 'todos'})
+    jobs.TAREFAS['revalidacao'] = (contar, executar_com_falha)
+    try:
+        jobs.executar_job(job_id)
+    finally:
+        jobs.TAREFAS['revalidacao'] = (contar, executar)
+    falha = jobs.buscar_job(db, job_id)
+    print(f"✓ Após a falha: {falha['status']}, {falha['processados']} processados, "
+          f"checkpoint {falha['checkpoint']}, erro '{falha['erro']}'")
+
+    jobs.retomar_job(db, job_id).result(timeout=30)
+    retomado = jobs.buscar_job(db, job_id)
+    print(f"✓ Após retomar: {retomado['status']}, {retomado['processados']}/{retomado['total']}")
+
+    # Job interrompido sem heartbeat (processo morto) volta a executar
+    db.execute('''
+        UPDATE jobs SET status = ?, processados = 0, checkpoint = 0,
+                        atualizado_em = '2000-01-01 00:00:00' WHERE id = ?
+    ''', (jobs.STATUS_EXECUTANDO, job_id))
+    db.commit()
+    retomados = jobs.retomar_jobs(db)
+    jobs.submeter_job(job_id).result(timeout=30)
+    reexecutado = jobs.buscar_job(db, job_id)
+    print(f"✓ Sem heartbeat: retomados {retomados}, {reexecutado['status']}")
+    db.close()
+
+    return (falha['status'] == jobs.STATUS_ERRO and falha['processados'] == 14
+            and retomado['status'] == jobs.STATUS_CONCLUIDO
+            and retomado['processados'] == TOTAL
+            and retomados == [job_id] and reexecutado['status'] == jobs.STATUS_CONCLUIDO)
+
+
+def _vereditos(caminho=None):
+    db = connect_db(caminho)
+    vereditos = (
+        [tuple(row) for row in db.execute(
+            'SELECT id, status_aga, status_cep, regras_cep FROM componentes ORDER BY id')],
+        [tuple(row) for row in db.execute(
+            'SELECT id, status, status_cep, t2_hotelling, status_t2 FROM boletins ORDER BY id')],
+        [tuple(row) for row in db.execute('SELECT * FROM cep_estado ORDER BY fluxo, componente')],
+    )
+    db.close()
+    return vereditos
+
+
+def teste_lotes_iguais_revalidacao_unica():
+    """Lotes com as séries lidas uma vez por job: mesmo resultado da revalidação única"""
+    print("=== TESTE JOB - LOTES x REVALIDAÇÃO ÚNICA ===")
+    copia = os.path.join(os.path.dirname(os.environ['DATABASE_PATH']), 'unica.db')
+    shutil.copy(os.environ['DATABASE_PATH'], copia)
+    db = connect_db(copia)
+    unica = revalidar_boletins(db)
+    db.commit()
+    db.close()
+
+    jobs.JOBS_TAMANHO_LOTE = 4
+    db = connect_db()
+    job_id = jobs.criar_job(db, 'revalidacao', {'escopo': 'todos'})
+    db.close()
+    jobs.executar_job(job_id)
+    db = connect_db()
+    job = jobs.buscar_job(db, job_id)
+    db.close()
+
+    iguais = _vereditos() == _vereditos(copia)
+    print(f"✓ Job em lotes de 4: {job['resultado']}; revalidação única: {unica}")
+    print(f"✓ Componentes, boletins e estados iguais: {iguais}")
+    return iguais and job['resultado'] == unica
+
+
+def teste_heartbeat_independente():
+    """Lote mais longo que o intervalo: o heartbeat é renovado durante o lote"""
+    print("=== TESTE JOB - HEARTBEAT ===")
+    jobs.JOBS_HEARTBEAT_INTERVALO = 0.05
+    contar, executar = jobs.TAREFAS['revalidacao']
+    renovado = threading.Event()
+
+    def executar_lento(db, parametros, checkpoint):
+        # Heartbeat "vencido" no meio do lote: a thread do job deve renová-lo
+        outra = connect_db()
+        outra.execute("UPDATE jobs SET atualizado_em = '2000-01-01 00:00:00' WHERE status = ?",
+                      (jobs.STATUS_EXECUTANDO,))
+        outra.commit()
+        time.sleep(0.5)
+        atual = outra.execute('SELECT atualizado_em FROM jobs WHERE status = ?',
+                              (jobs.STATUS_EXECUTANDO,)).fetchone()[0]
+        outra.close()
+        if atual > jobs._heartbeat_expirado():
+            renovado.set()
+        yield from executar(db, parametros, checkpoint)
+
+    db = connect_db()
+    job_id = jobs.criar_job(db, 'revalidacao', {'escopo': 'todos'})
+    jobs.TAREFAS['revalidacao'] = (contar, executar_lento)
+    try:
+        jobs.executar_job(job_id)
+    finally:
+        jobs.TAREFAS['revalidacao'] = (contar, executar)
+        jobs.JOBS_HEARTBEAT_INTERVALO = 30
+    job = jobs.buscar_job(db, job_id)
+    db.close()
+    print(f"✓ Heartbeat renovado durante o lote: {renovado.is_set()}, job {job['status']}")
+    return renovado.is_set() and job['status'] == jobs.STATUS_CONCLUIDO
+
+
+if __name__ == "__main__":
+    resultados = [teste_job_pendentes(), teste_job_todos_em_lotes(), teste_retomada_checkpoint(),
+                  teste_lotes_iguais_revalidacao_unica(), teste_heartbeat_independente()]
+    sucesso = all(resultados)
+    print("✓ TESTE JOBS: SUCESSO" if sucesso else "✗ TESTE JOBS: FALHA")
+    exit(0 if sucesso else 1)
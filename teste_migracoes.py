@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Teste das migrações versionadas do esquema (PRAGMA user_version)
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from migracoes import aplicar_migracoes, versao_esquema, VERSAO_ATUAL
+
+
+def _plano(db, sql, params=()):
+    """Retorna o plano de execução de uma consulta como texto"""
+    return ' | '.join(row[3] for row in db.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+
+
+def teste_banco_novo():
+    """Banco vazio chega à versão atual com todas as tabelas e índices"""
+    print("=== TESTE MIGRAÇÕES - BANCO NOVO ===")
+    db = sqlite3.connect(':memory:')
+    versao = aplicar_migracoes(db)
+    print(f"✓ Versão do esquema: {versao}")
+
+    indices = {row[0] for row in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+    print(f"✓ Índices criados: {len(indices)}")
+
+    plano_cep = _plano(db, '''
+        SELECT valor FROM historico_componentes
+        WHERE fluxo = ? AND componente = ? ORDER BY data_coleta
+    ''', ('FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS', 'Metano'))
+    plano_filhos = _plano(db, 'SELECT * FROM componentes WHERE boletin_id = ?', (1,))
+    print(f"✓ Plano histórico CEP: {plano_cep}")
+    print(f"✓ Plano componentes por boletim: {plano_filhos}")
+
+    # Reexecutar não pode alterar nada
+    segunda = aplicar_migracoes(db)
+    db.close()
+
+    return (versao == VERSAO_ATUAL and segunda == VERSAO_ATUAL
+            and 'idx_hist_comp_fluxo_componente_data' in plano_cep
+            and 'TEMP B-TREE' not in plano_cep
+            and 'idx_componentes_boletin_nome' in plano_filhos)
+
+
+def teste_banco_legado():
+    """Banco sem controle de versão recebe as colunas e índices faltantes"""
+    print("=== TESTE MIGRAÇÕES - BANCO LEGADO ===")
+    if not os.path.exists('boletins.db'):
+        print("⚠️ boletins.db não encontrado - teste ignorado")
+        return True
+
+    copia = os.path.join(tempfile.mkdtemp(), 'legado.db')
+    shutil.copy('boletins.db', copia)
+
+    db = sqlite3.connect(copia)
+    antes = versao_esquema(db)
+    total_antes = db.execute('SELECT COUNT(*) FROM boletins').fetchone()[0]
+    aplicar_migracoes(db)
+
+    colunas = {row[1] for row in db.execute('PRAGMA table_info(boletins)')}
+    total_depois = db.execute('SELECT COUNT(*) FROM boletins').fetchone()[0]
+    sem_fluxo = db.execute('''
+        SELECT COUNT(*) FROM historico_componentes hc JOIN boletins b ON b.id = hc.boletin_id
+        WHERE hc.fluxo != b.fluxo OR b.fluxo = ''
+    ''').fetchone()[0]
+    fluxos = [row[0] for row in db.execute('SELECT DISTINCT fluxo FROM boletins')]
+    db.close()
+
+    print(f"✓ Versão: {antes} -> {VERSAO_ATUAL}")
+    print(f"✓ Boletins preservados: {total_antes} -> {total_depois}")
+    novas = {'pressao_unit', 'temperatura_unit', 'metodologia_aprovada', 'fluxo'}
+    print(f"✓ Colunas novas presentes: {novas <= colunas}")
+    print(f"✓ Fluxos CEP: {fluxos}")
+    print(f"✓ Histórico sem fluxo do boletim: {sem_fluxo}")
+    return novas <= colunas and total_antes == total_depois and sem_fluxo == 0
+
+
+if __name__ == "__main__":
+    resultados = [teste_banco_novo(), teste_banco_legado()]
+    sucesso = all(resultados)
+    print("✓ TESTE MIGRAÇÕES: SUCESSO" if sucesso else "✗ TESTE MIGRAÇÕES: FALHA")
+    exit(0 if sucesso else 1)
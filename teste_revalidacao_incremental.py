@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Teste da revalidação incremental (só os boletins que dependem da amostra alterada)
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+# Banco temporário: nunca tocar o boletins.db versionado
+PASTA = tempfile.mkdtemp()
+os.environ['DATABASE_PATH'] = os.path.join(PASTA, 'teste_incremental.db')
+
+import numpy as np  # noqa: E402
+
+from app import app  # noqa: E402
+from cep_multivariado import carregar_estado_t2  # noqa: E402
+from config import CEP_AMOSTRAS_MIN, CEP_REGRAS_MEMORIA  # noqa: E402
+from database import connect_db  # noqa: E402
+from revalidacao import boletins_dependentes, revalidar_boletins  # noqa: E402
+
+COMPONENTES = {'Metano': 85.0, 'Etano': 6.0, 'Propano': 3.0, 'Heptano': 0.05, 'CO2': 2.0}
+FLUXO = 'FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT'
+OUTRO_FLUXO = 'FPSO CIDADE DE ITAJAÍ | GÁS EXPORTAÇÃO | HP EXPORT'
+TOTAL = 200
+BASE = os.path.join(PASTA, 'base.db')
+ALCANCE = CEP_AMOSTRAS_MIN + CEP_REGRAS_MEMORIA
+NAO_REVALIDADO = '2000-01-01 00:00:00'
+CAMPOS_RELATORIO = ('numero_boletim', 'numero_documento', 'data_coleta', 'data_recebimento',
+                    'data_analise', 'data_emissao', 'data_validacao', 'identificacao_instalacao',
+                    'plataforma', 'sistema_medicao', 'classificacao', 'ponto_coleta',
+                    'agente_regulado', 'responsavel_amostragem', 'pressao', 'temperatura')
+
+
+def _data(i):
+    return (date(2022, 1, 1) + timedelta(days=i)).isoformat()
+
+
+def _preparar_banco():
+    """Dois fluxos com histórico sintético, revalidados por completo"""
+    db = connect_db()
+    random.seed(3)
+    for i in range(TOTAL):
+        fluxo = FLUXO if i % 4 else OUTRO_FLUXO
+        boletim_id = db.execute('''
+            INSERT INTO boletins (numero_boletim, data_coleta, fluxo, identificacao_instalacao,
+                                  sistema_medicao, ponto_coleta)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (f'INC-{i}', _data(i), fluxo, *fluxo.split(' | '))).lastrowid
+        for nome, media in COMPONENTES.items():
+            valor = random.gauss(media, media * 0.02)
+            db.execute('INSERT INTO componentes (boletin_id, nome, percentual_molar) VALUES (?, ?, ?)',
+                       (boletim_id, nome, valor))
+            db.execute('''
+                INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (nome, boletim_id, valor, _data(i), fluxo))
+    revalidar_boletins(db)
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+
+
+def _banco_novo():
+    """Cada teste parte do mesmo banco revalidado (preparado uma vez e copiado)"""
+    if not os.path.exists(BASE):
+        _preparar_banco()
+        origem, destino = connect_db(), connect_db(BASE)
+    else:
+        origem, destino = connect_db(BASE), connect_db()
+    origem.backup(destino)
+    origem.close()
+    destino.close()
+
+
+def _estado_gravado(caminho):
+    """Status e limites gravados por boletim"""
+    db = connect_db(caminho)
+    estado = {
+        'componentes': [tuple(row) for row in db.execute(
+            'SELECT id, status_aga, status_cep FROM componentes ORDER BY id')],
+        'boletins': [tuple(row) for row in db.execute(
+            '''SELECT id, status, status_cep, status_aga8, ROUND(t2_hotelling, 6), status_t2
+               FROM boletins ORDER BY id''')],
+        # Limites arredondados: a janela "as-of" soma em Python, a completa no NumPy
+        'snapshots': [tuple(row) for row in db.execute('''
+            SELECT boletin_id, componente, ROUND(media, 9), ROUND(lci, 9), ROUND(lcs, 9),
+                   amostras_ids
+            FROM cep_snapshots ORDER BY boletin_id, componente''')],
+    }
+    db.close()
+    return estado
+
+
+def _igual_revalidacao_completa():
+    """Compara o banco com uma cópia revalidada por completo"""
+    copia = os.path.join(PASTA, 'completa.db')
+    shutil.copy(os.environ['DATABASE_PATH'], copia)
+    db = connect_db(copia)
+    revalidar_boletins(db)
+    db.commit()
+    db.close()
+    incremental, completa = _estado_gravado(os.environ['DATABASE_PATH']), _estado_gravado(copia)
+    iguais = {tabela: incremental[tabela] == completa[tabela] for tabela in incremental}
+    iguais['estado_t2'] = _estados_t2_iguais(os.environ['DATABASE_PATH'], copia)
+    os.remove(copia)
+    return iguais
+
+
+def _estados_t2_iguais(caminho, referencia):
+    """Estado do T² de cada fluxo igual ao reconstruído da série completa"""
+    estados = []
+    for banco in (caminho, referencia):
+        db = connect_db(banco)
+        estados.append([carregar_estado_t2(db, fluxo) for fluxo in (FLUXO, OUTRO_FLUXO)])
+        db.close()
+    return all(
+        atual['n_amostras'] == esperado['n_amostras'] and atual['ultima_data'] == esperado['ultima_data']
+        and np.allclose(atual['media'], esperado['media'], rtol=1e-9, atol=1e-12)
+        and np.allclose(atual['m2'], esperado['m2'], rtol=1e-7, atol=1e-9)
+        for atual, esperado in zip(*estados))
+
+
+def _revalidados(db):
+    return {row[0] for row in db.execute(
+        'SELECT id FROM boletins WHERE data_validacao != ?', (NAO_REVALIDADO,))}
+
+
+def teste_dependentes():
+    """Dependentes de uma amostra: os próximos boletins do mesmo fluxo"""
+    print("=== TESTE BOLETINS DEPENDENTES ===")
+    _banco_novo()
+    db = connect_db()
+    fluxo, data = db.execute('SELECT fluxo, data_coleta FROM boletins WHERE id = 50').fetchone()
+    dependentes = boletins_dependentes(db, fluxo, data)
+    seguintes = [row[0] for row in db.execute('''
+        SELECT id FROM boletins WHERE fluxo = ? AND data_coleta > ? ORDER BY data_coleta
+    ''', (fluxo, data))]
+    ultimo = db.execute('SELECT fluxo, data_coleta FROM boletins ORDER BY id DESC').fetchone()
+    sem_dependentes = boletins_dependentes(db, *ultimo)
+    db.close()
+
+    print(f"✓ {len(dependentes)} dependentes do boletim 50 (alcance {ALCANCE}), "
+          f"último boletim: {len(sem_dependentes)}")
+    return dependentes == set(seguintes[:ALCANCE]) and not sem_dependentes
+
+
+def teste_edicao_componente():
+    """Editar um componente revalida o boletim e só os seguintes que o usam"""
+    print("=== TESTE EDIÇÃO DE COMPONENTE ===")
+    _banco_novo()
+    db = connect_db()
+    boletim = db.execute('SELECT * FROM boletins WHERE id = 60').fetchone()
+    esperados = boletins_dependentes(db, boletim['fluxo'], boletim['data_coleta']) | {60}
+    db.close()
+
+    form = {campo: boletim[campo] or '' for campo in CAMPOS_RELATORIO}
+    form['heptano'] = str(COMPONENTES['Heptano'] * 1.5)
+    with app.test_client() as client:
+        resposta = client.post('/relatorio/60/edit', data=form)
+
+    db = connect_db()
+    revalidados = _revalidados(db)
+    historico = db.execute('''
+        SELECT valor FROM historico_componentes WHERE boletin_id = 60 AND componente = 'Heptano'
+    ''').fetchone()[0]
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+    iguais = _igual_revalidacao_completa()
+
+    print(f"✓ Resposta {resposta.status_code}, histórico atualizado: {historico}")
+    print(f"✓ {len(revalidados)} boletins revalidados de {TOTAL}, "
+          f"iguais à revalidação completa: {iguais}")
+    return (resposta.status_code == 302 and historico == COMPONENTES['Heptano'] * 1.5
+            and revalidados == esperados and all(iguais.values()))
+
+
+def teste_edicao_metano():
+    """Editar pelo rótulo do relatório ('Metano, CH₄') grava no nome do boletim"""
+    print("=== TESTE EDIÇÃO DO METANO ===")
+    _banco_novo()
+    db = connect_db()
+    boletim = db.execute('SELECT * FROM boletins WHERE id = 70').fetchone()
+    componentes = db.execute('SELECT COUNT(*) FROM componentes WHERE boletin_id = 70').fetchone()[0]
+    db.close()
+
+    form = {campo: boletim[campo] or '' for campo in CAMPOS_RELATORIO}
+    form['metano_ch4'] = str(COMPONENTES['Metano'] * 0.97)
+    with app.test_client() as client:
+        resposta = client.post('/relatorio/70/edit', data=form)
+        pagina = client.get('/relatorio/70/edit').get_data(as_text=True)
+
+    db = connect_db()
+    historico = [tuple(row) for row in db.execute('''
+        SELECT componente, valor FROM historico_componentes
+        WHERE boletin_id = 70 AND componente LIKE 'Metano%'
+    ''')]
+    nomes = {row[0] for row in db.execute('SELECT nome FROM componentes WHERE boletin_id = 70')}
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+    iguais = _igual_revalidacao_completa()
+
+    exibido = f'value="{COMPONENTES["Metano"] * 0.97}"' in pagina
+    print(f"✓ Resposta {resposta.status_code}, histórico: {historico}, componentes: {len(nomes)}")
+    print(f"✓ Valor exibido no formulário: {exibido}, iguais à revalidação completa: {iguais}")
+    return (resposta.status_code == 302 and historico == [('Metano', COMPONENTES['Metano'] * 0.97)]
+            and len(nomes) == componentes and exibido and all(iguais.values()))
+
+
+def teste_cadastro_retroativo():
+    """Boletim cadastrado com data antiga: janelas, T² e dependentes iguais à revalidação completa"""
+    print("=== TESTE CADASTRO RETROATIVO ===")
+    _banco_novo()
+    data = _data(101)
+    form = {
+        'numero_boletim': 'INC-R', 'data_coleta': data, 'data_recebimento': data,
+        'data_analise': data, 'data_emissao': data, 'identificacao_instalacao': 'FPSO ATLANTE',
+        'sistema_medicao': 'GÁS EXPORTAÇÃO', 'ponto_coleta': 'HP EXPORT',
+        'agente_regulado': 'Agente', 'responsavel_amostragem': 'Resp', 'pressao': '5',
+        'temperatura': '40', 'observacoes': '', 'responsavel_tecnico': 'T',
+        'responsavel_elaboracao': 'E', 'responsavel_aprovacao': 'A'
+    }
+    for nome in ('Metano', 'Etano', 'Propano', 'i-Butano', 'n-Butano', 'i-Pentano', 'n-Pentano',
+                 'Hexano', 'Heptano', 'Octano', 'Nonano', 'Decano', 'Oxigênio', 'Nitrogênio', 'CO2'):
+        form[nome] = str(COMPONENTES.get(nome, 0.0) * 1.01)
+    with app.test_client() as client:
+        resposta = client.post('/cadastrar', data=form)
+
+    db = connect_db()
+    boletim_id, fluxo = db.execute(
+        "SELECT id, fluxo FROM boletins WHERE numero_boletim = 'INC-R'").fetchone()
+    revalidados = _revalidados(db) - {boletim_id}
+    esperados = boletins_dependentes(db, fluxo, data)
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+    iguais = _igual_revalidacao_completa()
+
+    print(f"✓ Resposta {resposta.status_code}, fluxo {fluxo}, "
+          f"{len(revalidados)} dependentes revalidados")
+    print(f"✓ Iguais à revalidação completa: {iguais}")
+    return (resposta.status_code == 302 and fluxo == FLUXO and revalidados == esperados
+            and len(revalidados) <= ALCANCE and all(iguais.values()))
+
+
+def teste_exclusao():
+    """Excluir um boletim revalida só os seguintes do fluxo"""
+    print("=== TESTE EXCLUSÃO ===")
+    _banco_novo()
+    db = connect_db()
+    fluxo, data = db.execute('SELECT fluxo, data_coleta FROM boletins WHERE id = 90').fetchone()
+    esperados = boletins_dependentes(db, fluxo, data)
+    with app.test_client() as client:
+        resposta = client.post('/excluir/90')
+
+    revalidados = _revalidados(db)
+    estados = db.execute('SELECT COUNT(*) FROM cep_estado WHERE fluxo = ?', (fluxo,)).fetchone()[0]
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+    iguais = _igual_revalidacao_completa()
+
+    print(f"✓ Resposta {resposta.status_code}, {len(revalidados)} boletins revalidados, "
+          f"estados do fluxo descartados: {estados == 0}")
+    print(f"✓ Iguais à revalidação completa: {iguais}")
+    return (resposta.status_code == 302 and revalidados == esperados
+            and len(revalidados) <= ALCANCE and estados == 0 and all(iguais.values()))
+
+
+def teste_componente_esparso():
+    """Componente com poucas amostras no fluxo só traz os boletins que o contêm"""
+    print("=== TESTE COMPONENTE ESPARSO ===")
+    _banco_novo()
+    db = connect_db()
+    # Nome legado numa amostra antiga e Hidrogênio só nos boletins 50 e 190
+    for boletim_id, nome in ((10, 'Metano, CH₄'), (50, 'Hidrogênio'), (190, 'Hidrogênio')):
+        fluxo, data = db.execute('SELECT fluxo, data_coleta FROM boletins WHERE id = ?',
+                                 (boletim_id,)).fetchone()
+        db.execute('INSERT INTO componentes (boletin_id, nome, percentual_molar) VALUES (?, ?, ?)',
+                   (boletim_id, nome, 0.01))
+        db.execute('''
+            INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+            VALUES (?, ?, 0.01, ?, ?)
+        ''', (nome, boletim_id, data, fluxo))
+    revalidar_boletins(db)
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    fluxo, data = db.execute('SELECT fluxo, data_coleta FROM boletins WHERE id = 50').fetchone()
+    seguintes = [row[0] for row in db.execute('''
+        SELECT id FROM boletins WHERE fluxo = ? AND data_coleta > ? ORDER BY data_coleta
+    ''', (fluxo, data))]
+    dependentes = boletins_dependentes(db, fluxo, data)
+    db.close()
+
+    with app.test_client() as client:
+        resposta = client.post('/excluir/50')
+    db = connect_db()
+    revalidados = _revalidados(db)
+    db.execute('UPDATE boletins SET data_validacao = ?', (NAO_REVALIDADO,))
+    db.commit()
+    db.close()
+    iguais = _igual_revalidacao_completa()
+
+    print(f"✓ {len(dependentes)} dependentes de {len(seguintes)} seguintes, "
+          f"{len(revalidados)} revalidados na exclusão")
+    print(f"✓ Iguais à revalidação completa: {iguais}")
+    return (dependentes == set(seguintes[:ALCANCE]) | {190} and resposta.status_code == 302
+            and revalidados == dependentes and all(iguais.values()))
+
+
+if __name__ == "__main__":
+    resultados = [teste_dependentes(), teste_edicao_componente(), teste_edicao_metano(),
+                  teste_exclusao(), teste_cadastro_retroativo(), teste_componente_esparso()]
+    shutil.rmtree(PASTA)
+    sucesso = all(resultados)
+    print("✓ TESTE REVALIDAÇÃO INCREMENTAL: SUCESSO" if sucesso else "✗ TESTE REVALIDAÇÃO INCREMENTAL: FALHA")
+    exit(0 if sucesso else 1)
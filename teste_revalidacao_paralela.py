@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Teste da revalidação paralela por série (fluxo, componente)
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from database import connect_db
+from revalidacao import revalidar_boletins, revalidar_boletins_paralelo
+from teste_cep_vetorizado import _banco_com_boletins
+
+FLUXOS = ['FPSO ATLANTE | GÁS COMBUSTÍVEL LP | LP FUEL GAS',
+          'FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT',
+          'FPSO CIDADE DE ITAJAÍ | GÁS EXPORTAÇÃO | HP EXPORT']
+
+
+def _estado_gravado(caminho):
+    """Tudo o que a revalidação grava (exceto a data de validação)"""
+    db = connect_db(caminho)
+    consultas = {
+        'componentes': 'SELECT id, status_aga, status_cep, regras_cep FROM componentes ORDER BY id',
+        'boletins': '''SELECT id, status, status_cep, status_aga8, t2_hotelling, status_t2
+                       FROM boletins ORDER BY id''',
+        'snapshots': '''SELECT boletin_id, componente, media, lci, lcs, amostras_ids
+                        FROM cep_snapshots ORDER BY boletin_id, componente''',
+        'estados': 'SELECT * FROM cep_estado ORDER BY fluxo, componente',
+    }
+    estado = {tabela: [tuple(row) for row in db.execute(sql)] for tabela, sql in consultas.items()}
+    db.close()
+    return estado
+
+
+def _revalidar(caminho, funcao, **kwargs):
+    db = connect_db(caminho)
+    inicio = time.perf_counter()
+    resultado = funcao(db, **kwargs)
+    db.commit()
+    db.close()
+    return resultado, time.perf_counter() - inicio
+
+
+def teste_paralelo_igual_serial():
+    """Revalidação paralela grava exatamente o mesmo que a serial"""
+    print("=== TESTE REVALIDAÇÃO PARALELA x SERIAL ===")
+    pasta = tempfile.mkdtemp()
+    serial = os.path.join(pasta, 'serial.db')
+    paralelo = os.path.join(pasta, 'paralelo.db')
+    _banco_com_boletins(1500, serial, semente=11, fluxos=FLUXOS).close()
+    shutil.copy(serial, paralelo)
+
+    resultado_serial, tempo_serial = _revalidar(serial, revalidar_boletins)
+    resultado_paralelo, tempo_paralelo = _revalidar(
+        paralelo, revalidar_boletins_paralelo, processos=2, db_path=paralelo)
+    print(f"✓ Serial: {resultado_serial} em {tempo_serial:.2f}s")
+    print(f"✓ Paralelo (2 processos): {resultado_paralelo} em {tempo_paralelo:.2f}s "
+          f"({os.cpu_count()} núcleos disponíveis)")
+
+    gravado_serial = _estado_gravado(serial)
+    gravado_paralelo = _estado_gravado(paralelo)
+    iguais = {tabela: gravado_serial[tabela] == gravado_paralelo[tabela]
+              for tabela in gravado_serial}
+    print(f"✓ Tabelas iguais: {iguais}")
+    shutil.rmtree(pasta)
+
+    return resultado_serial == resultado_paralelo and all(iguais.values())
+
+
+def teste_paralelo_subconjunto():
+    """Subconjunto de boletins: só eles são atualizados, leitores não escrevem"""
+    print("=== TESTE REVALIDAÇÃO PARALELA - SUBCONJUNTO ===")
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, 'subconjunto.db')
+    _banco_com_boletins(300, caminho, semente=11, fluxos=FLUXOS).close()
+
+    resultado, _ = _revalidar(caminho, revalidar_boletins_paralelo,
+                              boletim_ids=[10, 20, 30], processos=2, db_path=caminho)
+    db = connect_db(caminho)
+    atualizados = db.execute(
+        'SELECT COUNT(*) FROM boletins WHERE status IS NOT NULL').fetchone()[0]
+    db.close()
+    print(f"✓ {resultado}, boletins com status: {atualizados}")
+
+    somente_leitura = connect_db(caminho, somente_leitura=True)
+    try:
+        somente_leitura.execute("UPDATE boletins SET status = 'X'")
+        bloqueado = False
+    except Exception as e:
+        bloqueado = 'readonly' in str(e)
+    somente_leitura.close()
+    print(f"✓ Conexão dos processos auxiliares é somente leitura: {bloqueado}")
+    shutil.rmtree(pasta)
+
+    return resultado['processados'] == 3 and atualizados == 3 and bloqueado
+
+
+if __name__ == "__main__":
+    resultados = [teste_paralelo_igual_serial(), teste_paralelo_subconjunto()]
+    sucesso = all(resultados)
+    print("✓ TESTE REVALIDAÇÃO PARALELA: SUCESSO" if sucesso else "✗ TESTE REVALIDAÇÃO PARALELA: FALHA")
+    exit(0 if sucesso else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Teste da revalidação "a seco" (status que mudariam, sem gravar)
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Banco temporário: nunca tocar o boletins.db versionado
+PASTA = tempfile.mkdtemp()
+os.environ['DATABASE_PATH'] = os.path.join(PASTA, 'teste_simulacao.db')
+
+from app import app  # noqa: E402
+from database import connect_db  # noqa: E402
+from revalidacao import revalidar_boletins, simular_revalidacao  # noqa: E402
+
+COMPONENTES = {
+    'Metano': 85.0, 'Etano': 6.0, 'Propano': 3.0, 'i-Butano': 0.5, 'n-Butano': 0.8,
+    'i-Pentano': 0.2, 'n-Pentano': 0.2, 'Hexano': 0.1, 'Heptano': 0.05, 'Octano': 0.02,
+    'Nonano': 0.01, 'Decano': 0.005, 'Oxigênio': 0.01, 'Nitrogênio': 2.5, 'CO2': 1.6
+}
+FLUXOS = ['FPSO ATLANTE | GÁS EXPORTAÇÃO | HP EXPORT',
+          'FPSO CIDADE DE ITAJAÍ | GÁS EXPORTAÇÃO | HP EXPORT']
+TOTAL = 3000
+
+
+def _preparar_banco():
+    """Histórico sintético com ~15 anos por fluxo, revalidado com a configuração atual"""
+    db = connect_db()
+    random.seed(13)
+    for i in range(TOTAL):
+        data = (date(2010, 1, 1) + timedelta(days=i // len(FLUXOS) * 4)).isoformat()
+        fluxo = FLUXOS[i % len(FLUXOS)]
+        boletim_id = db.execute(
+            'INSERT INTO boletins (numero_boletim, data_coleta, fluxo) VALUES (?, ?, ?)',
+            (f'SIM-{i}', data, fluxo)).lastrowid
+        linhas = []
+        for nome, media in COMPONENTES.items():
+            valor = random.gauss(media, media * 0.02)
+            if random.random() < 0.02:
+                valor *= 1.1
+            linhas.append((nome, valor))
+        db.executemany('INSERT INTO componentes (boletin_id, nome, percentual_molar) VALUES (?, ?, ?)',
+                       [(boletim_id, nome, valor) for nome, valor in linhas])
+        db.executemany('''
+            INSERT INTO historico_componentes (componente, boletin_id, valor, data_coleta, fluxo)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(nome, boletim_id, valor, data, fluxo) for nome, valor in linhas])
+    revalidar_boletins(db)
+    db.commit()
+    db.close()
+
+
+def _hash_banco():
+    with open(os.environ['DATABASE_PATH'], 'rb') as arquivo:
+        return hashlib.md5(arquivo.read()).hexdigest()
+
+
+def teste_sem_mudanca_de_configuracao():
+    """Mesma configuração: nenhum componente muda de status"""
+    print("=== TESTE SIMULAÇÃO - CONFIGURAÇÃO ATUAL ===")
+    db = connect_db(somente_leitura=True)
+    inicio = time.perf_counter()
+    todos = sum(1 for _ in simular_revalidacao(db, apenas_alteracoes=False))
+    tempo = time.perf_counter() - inicio
+    alteracoes = list(simular_revalidacao(db))
+    db.close()
+
+    print(f"✓ {todos} componentes simulados em {tempo:.2f}s, alterações: {len(alteracoes)}")
+    return todos == TOTAL * len(COMPONENTES) and not alteracoes and tempo < 30
+
+
+def teste_igual_revalidacao_real():
+    """Alterações simuladas com outro sigma = o que a revalidação gravaria"""
+    print("=== TESTE SIMULAÇÃO x REVALIDAÇÃO ===")
+    antes = _hash_banco()
+    with app.test_client() as client:
+        resposta = client.get('/revalidacao/simular?sigma=2&janela=12')
+        linhas = [json.loads(linha) for linha in resposta.data.decode('utf-8').splitlines()]
+        invalida = client.get('/revalidacao/simular?limites_aga8=[')
+    simulado = {(linha['boletim_id'], linha['componente']): linha['status_novo'] for linha in linhas}
+    sem_escrita = _hash_banco() == antes
+
+    copia = os.path.join(PASTA, 'revalidado.db')
+    shutil.copy(os.environ['DATABASE_PATH'], copia)
+    db = connect_db(copia)
+    anterior = {(row[0], row[1]): row[2] for row in db.execute('''
+        SELECT boletin_id, nome, status_cep FROM componentes''')}
+    revalidar_boletins(db, n=12, sigma=2)
+    gravado = {(row[0], row[1]): row[2] for row in db.execute('''
+        SELECT boletin_id, nome, status_cep FROM componentes''')}
+    db.close()
+    mudaram = {chave: status for chave, status in gravado.items() if anterior[chave] != status}
+
+    distancias = [linha['distancia_sigma'] for linha in linhas
+                  if linha['status_novo'] == 'INVALIDADO' and not linha['regras']]
+    print(f"✓ {resposta.mimetype}: {len(linhas)} alterações, banco intacto: {sem_escrita}")
+    print(f"✓ Iguais à revalidação gravada: {simulado == mudaram}, "
+          f"parâmetro inválido: {invalida.status_code}")
+    return (resposta.mimetype == 'application/x-ndjson' and linhas and sem_escrita
+            and simulado == mudaram and invalida.status_code == 400
+            and all(distancia is not None and abs(distancia) > 2 for distancia in distancias))
+
+
+def teste_linha_de_comando():
+    """CLI com limites A.G.A #8 alternativos"""
+    print("=== TESTE SIMULAÇÃO - LINHA DE COMANDO ===")
+    limites = os.path.join(PASTA, 'limites.json')
+    with open(limites, 'w', encoding='utf-8') as arquivo:
+        json.dump({'Metano': {'min': 86, 'max': 100}}, arquivo)
+    saida = subprocess.run(
+        [sys.executable, 'revalidacao.py', '--simular', '--limites-aga8', limites],
+        capture_output=True, text=True, env=os.environ, check=True)
+    linhas = [json.loads(linha) for linha in saida.stdout.splitlines()]
+    print(f"✓ {len(linhas)} alterações; {saida.stderr.strip().splitlines()[-1]}")
+    return (linhas and all(linha['componente'] == 'Metano' and linha['valor'] < 86
+                           and linha['status_novo'] == 'INVALIDADO' for linha in linhas))
+
+
+if __name__ == "__main__":
+    _preparar_banco()
+    resultados = [
+        teste_sem_mudanca_de_configuracao(),
+        teste_igual_revalidacao_real(),
+        teste_linha_de_comando()
+    ]
+    shutil.rmtree(PASTA)
+    sucesso = all(resultados)
+    print("✓ TESTE REVALIDAÇÃO SIMULADA: SUCESSO" if sucesso else "✗ TESTE REVALIDAÇÃO SIMULADA: FALHA")
+    exit(0 if sucesso else 1)
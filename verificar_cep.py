@@ -210,7 +210,7 @@ def testar_integracao_banco():
 
         # Testar busca de histórico real
         cursor = db.execute('''
-            SELECT DISTINCT componente FROM historico_componentes LIMIT 1
+            SELECT DISTINCT fluxo, componente FROM historico_componentes LIMIT 1
         ''')
 
         componente_teste = cursor.fetchone()
@@ -220,7 +220,7 @@ def testar_integracao_banco():
 
             # Importar função
             from app import get_historico_componente
-            historico_real = get_historico_componente(comp_nome)
+            historico_real = get_historico_componente(comp_nome, componente_teste['fluxo'])
 
             print(f"   Histórico encontrado: {len(historico_real)} valores")
             if historico_real: